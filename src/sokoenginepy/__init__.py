@@ -86,4 +86,16 @@ from .common import (
     is_on_board_1d,
     is_on_board_2d,
 )
-from .game import JumpCommand, MoveCommand, SelectPusherCommand
+from .game import (
+    JumpCommand,
+    MoveCommand,
+    PackedBoardState,
+    PusherSteps,
+    PusherStepView,
+    ReplacementPolicy,
+    SelectPusherCommand,
+    SnapshotTimeline,
+    TranspositionTable,
+    TranspositionTableEntry,
+)
+from .io import BinaryCompression, CanonicalBoard
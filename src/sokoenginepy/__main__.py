@@ -2,14 +2,15 @@ from __future__ import annotations
 
 import enum
 import operator
+import sys
 import textwrap
 import time
 from functools import reduce
 
-from .common import Direction, Tessellation
+from .common import Characters, Config, Direction, Tessellation
 from .game.board_graph import BoardGraph
 from .game.mover import Mover, SolvingMode
-from .io import Puzzle
+from .io import Collection, Puzzle, Rle, Snapshot
 
 
 class BoardType(enum.Enum):
@@ -204,8 +205,188 @@ class MovementBenchmarkPrinter:
         )
 
 
+class PuzzleParsingBenchmark:
+    """
+    Measures time needed to parse square boards of increasing size and memory used
+    by parsed board.
+    """
+
+    WIDTHS = (64, 256, 1024, Config.MAX_WIDTH)
+
+    def __init__(self, width: int):
+        self.width = width
+        self.milliseconds_used = 0.0
+        self.board_bytes = 0
+
+    @property
+    def board(self) -> str:
+        row = ("#" + ((self.width - 2) // 4 + 1) * "$ .@")[: self.width - 1] + "#"
+        return "\n".join(
+            [self.width * "#"] + (self.width - 2) * [row] + [self.width * "#"]
+        )
+
+    def run(self):
+        board = self.board
+        start_time = time.perf_counter()
+        puzzle = Puzzle(Tessellation.SOKOBAN, board=board)
+        puzzle.width
+        end_time = time.perf_counter()
+        self.milliseconds_used = (end_time - start_time) * 1000
+        self.board_bytes = sys.getsizeof(puzzle._parsed_board)
+
+    @classmethod
+    def run_all(cls):
+        print("--------------------------------------------------")
+        print("--           PUZZLE PARSING BENCHMARKS          --")
+        print("--------------------------------------------------")
+
+        print(
+            "{:>12} {:>12} {:>14} {:>10}".format(
+                "Board", "Time [ms]", "Memory [B]", "[B/cell]"
+            )
+        )
+        for width in cls.WIDTHS:
+            benchmarker = cls(width)
+            benchmarker.run()
+            print(
+                "{:>12} {:>12.2f} {:>14} {:>10.2f}".format(
+                    f"{width}x{width}",
+                    benchmarker.milliseconds_used,
+                    benchmarker.board_bytes,
+                    benchmarker.board_bytes / (width * width),
+                ),
+                flush=True,
+            )
+
+
+class SOKParsingBenchmark:
+    """
+    Measures time needed to load large .sok collection and part of it spent in
+    classifying its lines as boards, snapshots or notes.
+    """
+
+    PUZZLES_COUNTS = (100, 1000, 5000)
+
+    def __init__(self, puzzles_count: int):
+        self.puzzles_count = puzzles_count
+        self.data_bytes = 0
+        self.classifying_milliseconds = 0.0
+        self.loading_milliseconds = 0.0
+
+    @property
+    def data(self) -> str:
+        collection = Collection()
+        collection.title = "Benchmark collection"
+        board = BoardType.SMALL.puzzle.board
+        for index in range(self.puzzles_count):
+            puzzle = Puzzle(Tessellation.SOKOBAN, board=board)
+            puzzle.title = f"Puzzle {index}"
+            puzzle.author = "sokoenginepy"
+            puzzle.notes = "Generated puzzle,\nused only for benchmarking."
+            for title in ("Solution", "Snapshot"):
+                snapshot = Snapshot(
+                    Tessellation.SOKOBAN, 40 * "lurdLURD" + "\n" + 40 * "rdluRDLU"
+                )
+                snapshot.title = title
+                snapshot.notes = "Snapshot notes"
+                puzzle.snapshots.append(snapshot)
+            collection.puzzles.append(puzzle)
+        return collection.dumps()
+
+    def run(self):
+        data = self.data
+        self.data_bytes = len(data.encode("utf-8"))
+
+        lines = data.splitlines()
+        start_time = time.perf_counter()
+        for line in lines:
+            Characters.is_board(line)
+            Characters.is_snapshot(line)
+            Characters.is_sokoban_plus(line)
+        end_time = time.perf_counter()
+        self.classifying_milliseconds = (end_time - start_time) * 1000
+
+        start_time = time.perf_counter()
+        Collection().loads(data)
+        end_time = time.perf_counter()
+        self.loading_milliseconds = (end_time - start_time) * 1000
+
+    @classmethod
+    def run_all(cls):
+        print("--------------------------------------------------")
+        print("--             SOK PARSING BENCHMARKS           --")
+        print("--------------------------------------------------")
+
+        print(
+            "{:>10} {:>12} {:>16} {:>12} {:>10}".format(
+                "Puzzles", "Size [kB]", "Classify [ms]", "Load [ms]", "[MB/s]"
+            )
+        )
+        for puzzles_count in cls.PUZZLES_COUNTS:
+            benchmarker = cls(puzzles_count)
+            benchmarker.run()
+            print(
+                "{:>10} {:>12.1f} {:>16.2f} {:>12.2f} {:>10.2f}".format(
+                    puzzles_count,
+                    benchmarker.data_bytes / 1024,
+                    benchmarker.classifying_milliseconds,
+                    benchmarker.loading_milliseconds,
+                    benchmarker.data_bytes
+                    / 2**20
+                    / (benchmarker.loading_milliseconds / 1000),
+                ),
+                flush=True,
+            )
+
+
+class RleBenchmark:
+    """
+    Measures RLE decoding throughput of `.Rle.decode` and of lark based parser it
+    replaced, and RLE encoding throughput.
+    """
+
+    BOARD = "\n".join(["#" * 200] + 198 * ["#" + 49 * "  $." + "  #"] + ["#" * 200])
+
+    @staticmethod
+    def throughput(func, data: str, repeat: int = 3) -> float:
+        """Best of ``repeat`` runs, in characters per second."""
+        best = float("inf")
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            func(data)
+            best = min(best, time.perf_counter() - start_time)
+        return len(data) / max(best, 1e-9)
+
+    @classmethod
+    def run_all(cls):
+        print("--------------------------------------------------")
+        print("--                RLE BENCHMARKS                --")
+        print("--------------------------------------------------")
+
+        encoded = Rle.encode(cls.BOARD)
+        print("{:>20} {:>14} {:>14}".format("Board", "Rle [ch/s]", "Parser [ch/s]"))
+        for title, data in (("decode plain", cls.BOARD), ("decode encoded", encoded)):
+            print(
+                "{:>20} {:>14.3e} {:>14.3e}".format(
+                    title,
+                    cls.throughput(Rle.decode, data),
+                    cls.throughput(Rle._parse, data, 1),
+                ),
+                flush=True,
+            )
+        print(
+            "{:>20} {:>14.3e} {:>14}".format(
+                "encode", cls.throughput(Rle.encode, cls.BOARD), "-"
+            ),
+            flush=True,
+        )
+
+
 def run_benchmarks():
-    return MovementBenchmarkPrinter.run_all()
+    MovementBenchmarkPrinter.run_all()
+    PuzzleParsingBenchmark.run_all()
+    RleBenchmark.run_all()
+    return SOKParsingBenchmark.run_all()
 
 
 if __name__ == "__main__":
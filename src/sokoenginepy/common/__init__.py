@@ -2,8 +2,8 @@
 Common functionality.
 """
 
-from .tile_shape import TileShape
-from .characters import Characters, is_blank
+from .board_lattice import BoardLattice, LatticeSymmetry
+from .characters import Characters, TextKind, is_blank
 from .config import Config
 from .direction import Direction
 from .graph_type import GraphType
@@ -18,3 +18,4 @@ from .tessellation import (
     is_on_board_2d,
 )
 from .tessellation_impl import TessellationImpl
+from .tile_shape import TileShape
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from .tessellation import Tessellation, index_1d, index_column, index_row
+
+_Point = Tuple[int, int]
+
+
+class LatticeSymmetry(NamedTuple):
+    transform: Callable[[int, int], _Point]
+    #: True if transformation turns triangles pointing down into ones pointing up
+    flips_tiles: bool = False
+
+
+class BoardLattice:
+    """
+    Coordinates in which board symmetries allowed by tessellation are plain linear
+    transformations.
+
+    Board cell ``(column, row)`` is converted to lattice point, transformed, and
+    transformed points are translated back to non-negative board coordinates.
+    Translation must keep tile shapes: for tessellations in which tile shape depends
+    on parity of ``column + row``, parity of translation must match
+    ``flips_tiles`` of transformation.
+
+    All symmetries keep board geometry: cells that are neighbors on original board
+    are also neighbors on transformed board. Allowed symmetries are rotations and
+    mirroring for Sokoban and Octoban, rotations by multiples of 60 degrees and
+    mirroring for Hexoban and horizontal and vertical mirroring for Trioban.
+    """
+
+    def __init__(
+        self, symmetries: Tuple[LatticeSymmetry, ...], parity_sensitive: bool = False
+    ):
+        self.symmetries = symmetries
+        self.parity_sensitive = parity_sensitive
+
+    @classmethod
+    def instance(cls, tessellation: Tessellation) -> BoardLattice:
+        return _LATTICES[tessellation]
+
+    def to_lattice(self, column: int, row: int) -> _Point:
+        return column, row
+
+    def from_lattice(self, x: int, y: int) -> _Point:
+        return x, y
+
+    def is_valid_translation(self, dx: int, dy: int, flips_tiles: bool) -> bool:
+        return not self.parity_sensitive or (dx + dy + flips_tiles) % 2 == 0
+
+    def transform(
+        self, symmetry: LatticeSymmetry, cells: Iterable[_Point]
+    ) -> Dict[_Point, _Point]:
+        """
+        Applies ``symmetry`` to board ``cells`` and translates result to the smallest
+        non-negative board coordinates.
+
+        Returns:
+            Mapping ``(column, row) -> (new_column, new_row)``
+        """
+        transformed = {
+            cell: symmetry.transform(*self.to_lattice(*cell)) for cell in cells
+        }
+        if not transformed:
+            return {}
+
+        dx = -min(_[0] for _ in transformed.values())
+        dy = -min(_[1] for _ in transformed.values())
+        if not self.is_valid_translation(dx, dy, symmetry.flips_tiles):
+            dx += 1
+
+        return {
+            cell: self.from_lattice(x + dx, y + dy)
+            for cell, (x, y) in transformed.items()
+        }
+
+    def automorphisms(self, positions: Set[int], width: int) -> List[Dict[int, int]]:
+        """
+        Symmetries of board that map ``positions`` onto themselves, including
+        identity.
+
+        Returns:
+            For each symmetry, mapping of each of ``positions`` to its image.
+        """
+        if not positions:
+            return []
+
+        cells = {
+            position: self.to_lattice(
+                index_column(position, width), index_row(position, width)
+            )
+            for position in positions
+        }
+        min_x = min(_[0] for _ in cells.values())
+        min_y = min(_[1] for _ in cells.values())
+
+        retv = []
+        for symmetry in self.symmetries:
+            transformed = {
+                position: symmetry.transform(*point)
+                for position, point in cells.items()
+            }
+            dx = min_x - min(_[0] for _ in transformed.values())
+            dy = min_y - min(_[1] for _ in transformed.values())
+            if not self.is_valid_translation(dx, dy, symmetry.flips_tiles):
+                continue
+
+            mapping = {}
+            for position, (x, y) in transformed.items():
+                column, row = self.from_lattice(x + dx, y + dy)
+                image = index_1d(column, row, width)
+                if column >= width or image not in positions:
+                    break
+                mapping[position] = image
+            else:
+                retv.append(mapping)
+
+        return retv
+
+
+class _HexobanLattice(BoardLattice):
+    """
+    "Doubled" coordinates: ``x = 2 * column + row % 2``, which accounts for odd rows
+    being shifted right by half of cell. Symmetries are done in axial coordinates
+    ``q = (x - y) / 2, r = y``.
+    """
+
+    def to_lattice(self, column: int, row: int) -> _Point:
+        return 2 * column + row % 2, row
+
+    def from_lattice(self, x: int, y: int) -> _Point:
+        return (x - y % 2) // 2, y
+
+    def is_valid_translation(self, dx: int, dy: int, flips_tiles: bool) -> bool:
+        # x and y of each point must have the same parity
+        return (dx - dy) % 2 == 0
+
+
+def _square_symmetries() -> Tuple[LatticeSymmetry, ...]:
+    return tuple(
+        LatticeSymmetry(transform)
+        for transform in (
+            lambda x, y: (x, y),
+            lambda x, y: (-x, y),
+            lambda x, y: (x, -y),
+            lambda x, y: (-x, -y),
+            lambda x, y: (y, x),
+            lambda x, y: (-y, x),
+            lambda x, y: (y, -x),
+            lambda x, y: (-y, -x),
+        )
+    )
+
+
+def _hexagonal_symmetries() -> Tuple[LatticeSymmetry, ...]:
+    def axial(transform):
+        def retv(x: int, y: int) -> _Point:
+            q, r = transform((x - y) // 2, y)
+            return 2 * q + r, r
+
+        return retv
+
+    def mirror(q: int, r: int) -> _Point:
+        # x -> -x in doubled coordinates
+        return -q - r, r
+
+    rotations = [
+        lambda q, r: (q, r),
+        lambda q, r: (-r, q + r),
+        lambda q, r: (-q - r, q),
+        lambda q, r: (-q, -r),
+        lambda q, r: (r, -q - r),
+        lambda q, r: (q + r, -q),
+    ]
+
+    retv = []
+    for rotation in rotations:
+        retv.append(LatticeSymmetry(axial(rotation)))
+        retv.append(
+            LatticeSymmetry(
+                axial(lambda q, r, rotation=rotation: rotation(*mirror(q, r)))
+            )
+        )
+    return tuple(retv)
+
+
+_LATTICES: Dict[Tessellation, BoardLattice] = {
+    Tessellation.SOKOBAN: BoardLattice(_square_symmetries()),
+    # Octagons and squares alternate like checkerboard fields, which is preserved by
+    # all symmetries of square.
+    Tessellation.OCTOBAN: BoardLattice(_square_symmetries(), parity_sensitive=True),
+    # Rows of triangles can only be mirrored. Vertical mirror turns triangles upside
+    # down.
+    Tessellation.TRIOBAN: BoardLattice(
+        (
+            LatticeSymmetry(lambda x, y: (x, y)),
+            LatticeSymmetry(lambda x, y: (-x, y)),
+            LatticeSymmetry(lambda x, y: (x, -y), flips_tiles=True),
+            LatticeSymmetry(lambda x, y: (-x, -y), flips_tiles=True),
+        ),
+        parity_sensitive=True,
+    ),
+    Tessellation.HEXOBAN: _HexobanLattice(_hexagonal_symmetries()),
+}
@@ -1,5 +1,17 @@
-import re
-from typing import Final, List, Optional, Set, Union
+import enum
+from typing import ClassVar, Final, List, Optional, Set, Union
+
+
+class TextKind(enum.IntFlag):
+    """
+    Kinds of text recognized by :meth:`Characters.classify`.
+    """
+
+    #: Text that is not any of the other kinds, including blank text
+    NOTES = 0
+    BOARD = 1
+    SNAPSHOT = 2
+    SOKOBAN_PLUS = 4
 
 
 class Characters:
@@ -169,28 +181,15 @@ class Characters:
             Doesn't check if it actually contains legal board, it only checks that
             there are no illegal characters.
         """
-        return not cls.contains_only_digits_and_spaces(line) and all(
-            cls._RE_BOARD_STRING.match(l) for l in (line or "").splitlines()
-        )
+        return cls._kinds(line) & cls._BOARD_ONLY == cls._BOARD
 
     @classmethod
     def is_sokoban_plus(cls, line: str) -> bool:
         return cls.contains_only_digits_and_spaces(line) and not is_blank(line)
 
-    _RE_BOARD_STRING = re.compile(
-        r"^([0-9\s"
-        + re.escape("".join(PUZZLE_CHARACTERS))
-        + re.escape("".join({RLE_GROUP_START, RLE_GROUP_END, RLE_EOL}))
-        + "])*$"
-    )
-
     @classmethod
     def contains_only_digits_and_spaces(cls, line: Optional[str]) -> bool:
-        return all(
-            cls._RE_ONLY_DIGITS_AND_SPACES.match(l) for l in (line or "").splitlines()
-        )
-
-    _RE_ONLY_DIGITS_AND_SPACES = re.compile(r"^([0-9\s])*$")
+        return cls._kinds(line) == cls._DIGITS_AND_SPACES
 
     @classmethod
     def is_snapshot(cls, line: str) -> bool:
@@ -202,21 +201,112 @@ class Characters:
         - Rle characters
         - spaces and newlines
         """
-        return (
-            not is_blank(line)
-            and not Characters.contains_only_digits_and_spaces(line)
-            and all(bool(cls._RE_SNAPSHOT_STRING.match(l)) for l in line.splitlines())
+        return cls._kinds(line) & cls._SNAPSHOT_ONLY == cls._SNAPSHOT
+
+    @classmethod
+    def classify(cls, text: Optional[str]) -> TextKind:
+        """
+        Kinds of data ``text`` could contain, judging by its characters only.
+
+        ``text`` can be single line or multiple lines (ie. whole file). It is scanned
+        once, and result is the same as the one of :meth:`is_board`,
+        :meth:`is_snapshot` and :meth:`is_sokoban_plus`:
+
+        - text containing only digits and spaces is :attr:`TextKind.SOKOBAN_PLUS`,
+          or :attr:`TextKind.NOTES` if it is blank
+        - otherwise, text is combination of :attr:`TextKind.BOARD` and
+          :attr:`TextKind.SNAPSHOT`, or :attr:`TextKind.NOTES` if it is neither
+
+        Example:
+
+            >>> from sokoenginepy.common import Characters
+            >>> Characters.classify("#  @$ .#")
+            <TextKind.BOARD: 1>
+            >>> Characters.classify("[lu]rRDD")
+            <TextKind.SNAPSHOT: 2>
+        """
+        kinds = cls._kinds(text)
+        if kinds == cls._DIGITS_AND_SPACES:
+            return TextKind.NOTES if is_blank(text) else TextKind.SOKOBAN_PLUS
+        return cls._TEXT_KINDS[kinds]
+
+    # Plain int values of TextKind, which are faster in bitwise operations. Text
+    # made only of digits and spaces gets all of them.
+    _BOARD: Final[int] = TextKind.BOARD.value
+    _SNAPSHOT: Final[int] = TextKind.SNAPSHOT.value
+    _SOKOBAN_PLUS: Final[int] = TextKind.SOKOBAN_PLUS.value
+    _DIGITS_AND_SPACES: Final[int] = _BOARD | _SNAPSHOT | _SOKOBAN_PLUS
+    _BOARD_ONLY: Final[int] = _BOARD | _SOKOBAN_PLUS
+    _SNAPSHOT_ONLY: Final[int] = _SNAPSHOT | _SOKOBAN_PLUS
+    _TEXT_KINDS: Final[List[TextKind]] = [
+        TextKind.NOTES,
+        TextKind.BOARD,
+        TextKind.SNAPSHOT,
+        TextKind.BOARD | TextKind.SNAPSHOT,
+    ]
+
+    # 256 entry translation table. Deletes digits and whitespace, translates
+    # characters allowed only in boards to "b", allowed only in snapshots to "s",
+    # allowed in both to "x" and everything else to "\0".
+    _KINDS_TABLE: ClassVar[List[Optional[str]]]
+
+    @classmethod
+    def _kinds(cls, text: Optional[str]) -> int:
+        """
+        Bit mask of :class:`TextKind` that all characters of ``text`` are allowed
+        in.
+        """
+        if not text:
+            return cls._DIGITS_AND_SPACES
+
+        kinds = text.translate(cls._KINDS_TABLE)
+        if not kinds:
+            return cls._DIGITS_AND_SPACES
+
+        if not kinds.isascii():
+            # Characters after U+00FF are not in table, only whitespace among them is
+            # allowed
+            kinds = "".join(_ for _ in kinds if _.isascii() or not _.isspace())
+            if not kinds:
+                return cls._DIGITS_AND_SPACES
+            if not kinds.isascii():
+                return 0
+
+        if "\0" in kinds:
+            return 0
+        return (0 if "s" in kinds else cls._BOARD) | (
+            0 if "b" in kinds else cls._SNAPSHOT
         )
 
-    _RE_SNAPSHOT_STRING = re.compile(
-        r"^([0-9\s"
-        + re.escape("".join(MOVE_CHARACTERS))
-        + re.escape("".join(PUSH_CHARACTERS))
-        + re.escape("".join(SNAPSHOT_MARKERS))
-        + re.escape("".join({RLE_GROUP_START, RLE_GROUP_END, RLE_EOL}))
-        + "])*$"
+
+def _kinds_table() -> List[Optional[str]]:
+    rle = {Characters.RLE_GROUP_START, Characters.RLE_GROUP_END, Characters.RLE_EOL}
+    board = Characters.PUZZLE_CHARACTERS | rle
+    snapshot = (
+        Characters.MOVE_CHARACTERS
+        | Characters.PUSH_CHARACTERS
+        | Characters.SNAPSHOT_MARKERS
+        | rle
     )
 
+    retv: List[Optional[str]] = []
+    for _ in range(256):
+        ch = chr(_)
+        if ch.isspace() or ch in "0123456789":
+            retv.append(None)
+        elif ch in board and ch in snapshot:
+            retv.append("x")
+        elif ch in board:
+            retv.append("b")
+        elif ch in snapshot:
+            retv.append("s")
+        else:
+            retv.append("\0")
+    return retv
+
+
+Characters._KINDS_TABLE = _kinds_table()
+
 
 def is_blank(data: Optional[Union[str, List[str]]]) -> bool:
     """Line is blank if it is either length 0 or contains only spaces."""
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
 from collections import namedtuple
-from typing import TYPE_CHECKING, ClassVar, Dict, Tuple, Union
+from typing import TYPE_CHECKING, ClassVar, Dict, Mapping, Tuple, Union
 
 from .tile_shape import TileShape
 from .config import Config
@@ -29,9 +29,7 @@ class TessellationImpl(metaclass=ABCMeta):
     _INSTANCES: ClassVar[Dict[Tessellation, TessellationImpl]] = {}
 
     @classmethod
-    def instance(
-        cls, tessellation: Tessellation
-    ) -> Union[
+    def instance(cls, tessellation: Tessellation) -> Union[
         TriobanTessellation,
         OctobanTessellation,
         HexobanTessellation,
@@ -85,6 +83,14 @@ class TessellationImpl(metaclass=ABCMeta):
         """Type of board graph used in context of this tessellation."""
         return GraphType.DIRECTED
 
+    @property
+    def pusher_step_chars(self) -> Mapping[Tuple[Direction, bool], str]:
+        """
+        Movement characters for ``(direction, is_push_or_pull)`` pairs that are
+        legal in this tessellation.
+        """
+        return self._PUSHER_STEP_TO_CHR
+
     def pusher_step_to_char(self, pusher_step: PusherStep) -> str:
         """
         Converts PusherStepData to movement character.
@@ -9,5 +9,13 @@ from .board_state import BoardState
 from .hashed_board_manager import HashedBoardManager
 from .mover import IllegalMoveError, Mover, NonPlayableBoardError, SolvingMode
 from .mover_commands import JumpCommand, MoveCommand, SelectPusherCommand
+from .packed_board_state import PackedBoardState
 from .pusher_step import PusherStep
+from .pusher_steps import PusherSteps, PusherStepView
+from .snapshot_timeline import SnapshotTimeline
 from .sokoban_plus import SokobanPlus, SokobanPlusDataError
+from .transposition_table import (
+    ReplacementPolicy,
+    TranspositionTable,
+    TranspositionTableEntry,
+)
@@ -2,7 +2,17 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 import networkx as nx
 
@@ -15,6 +25,7 @@ from ..common import (
     TileShape,
 )
 from ..io import Puzzle
+from ..io.puzzle_parsing import PuzzlePrinter
 from .board_cell import BoardCell
 
 # (1, 0, {'direction': Direction.LEFT})
@@ -119,12 +130,35 @@ class BoardGraph:
         )
 
     def to_board_str(self, use_visible_floor=False, rle_encode=False) -> str:
-        puzzle = Puzzle(self._tessellation, self._board_width, self._board_height)
+        return PuzzlePrinter.instance(self._tessellation).print(
+            self._cells_bytes(),
+            self._board_width,
+            self._board_height,
+            use_visible_floor,
+            rle_encode,
+        )
 
-        for pos in range(self._vertices_count):
-            puzzle[pos] = self[pos].to_str()
+    def write_board(self, stream: TextIO, use_visible_floor=False, rle_encode=False):
+        """
+        Writes the same output as `to_board_str` into text ``stream``, without
+        building whole string first.
+        """
+        PuzzlePrinter.instance(self._tessellation).write(
+            stream,
+            self._cells_bytes(),
+            self._board_width,
+            self._board_height,
+            use_visible_floor,
+            rle_encode,
+        )
 
-        return puzzle.to_board_str(use_visible_floor, rle_encode)
+    def _cells_bytes(self) -> bytearray:
+        """Board cells in the same format `.Puzzle` stores parsed board in."""
+        return bytearray(
+            "".join(self[pos].to_str() for pos in range(self._vertices_count)).encode(
+                "ascii"
+            )
+        )
 
     def __str__(self) -> str:
         return self.to_board_str(False)
@@ -330,11 +364,18 @@ class BoardGraph:
             else:
                 self[position].is_in_playable_area = False
 
+        # Pieces in area that was already filled from other piece have the same
+        # reachables
+        filled = set()
         for piece_position in piece_positions:
+            if piece_position in filled:
+                continue
+
             reachables = self._reachables(
                 root=piece_position, is_obstacle_cb=lambda x: self[x].is_wall
             )
 
+            filled.update(reachables)
             for reachable_position in reachables:
                 self[reachable_position].is_in_playable_area = True
 
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from functools import cached_property, partial
-from itertools import permutations
-from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+from itertools import chain, permutations
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple, Union
 
 from ..common import Config
 from .board_state import BoardState
+from .packed_board_state import PackedBoardState
 from .sokoban_plus import SokobanPlus
 from .utilities import Flipdict
 
@@ -642,14 +643,131 @@ class BoardManager:
         """
         Snapshots current board state.
         """
-        pushers_positions = self.pushers_positions
-        boxes_positions = self.boxes_positions
+        # IDs are assigned in ascending order and moving pieces never changes
+        # insertion order of Flipdict keys, so values are already sorted by ID.
         return BoardState(
-            pushers_positions=[
-                pushers_positions[pusher_id]
-                for pusher_id in sorted(pushers_positions.keys())
-            ],
-            boxes_positions=[
-                boxes_positions[box_id] for box_id in sorted(boxes_positions.keys())
-            ],
+            pushers_positions=list(self._pushers.values()),
+            boxes_positions=list(self._boxes.values()),
         )
+
+    def packed_state(self, normalize_pusher: bool = False) -> PackedBoardState:
+        """
+        Snapshots current board state into compact, hashable form.
+
+        Arguments:
+            normalize_pusher: if ``True``, pusher position is replaced with
+                `.BoardGraph.normalized_pusher_position`. This way, all board
+                positions that differ only by where pusher stands within the same
+                area produce equal states. Ignored on boards with more than one
+                pusher.
+
+        See Also:
+            :meth:`pack_state`
+        """
+        pushers_positions = list(self._pushers.values())
+        if normalize_pusher and len(pushers_positions) == 1:
+            pushers_positions[0] = self._board.normalized_pusher_position(
+                pushers_positions[0]
+            )
+
+        return self.pack_state(pushers_positions, list(self._boxes.values()))
+
+    def pack_state(
+        self, pushers_positions: Sequence[int], boxes_positions: Sequence[int]
+    ) -> PackedBoardState:
+        """
+        Packs given positions into `.PackedBoardState` in canonical order.
+
+        Positions don't need to match current board state. This is useful for
+        solvers which need to create states for board positions that were never
+        actually applied to the board.
+
+        Canonical order means that pushers positions get sorted and boxes positions
+        are sorted within groups of boxes that share the same Sokoban+ ID. Resulting
+        boxes positions are still ordered by box ID.
+
+        Arguments:
+            pushers_positions: positions of pushers ordered by pusher ID
+            boxes_positions: positions of boxes ordered by box ID
+        """
+        return PackedBoardState(
+            sorted(pushers_positions), self._canonical_boxes_positions(boxes_positions)
+        )
+
+    def _canonical_boxes_positions(self, boxes_positions: Sequence[int]) -> List[int]:
+        if not self.is_sokoban_plus_enabled:
+            return sorted(boxes_positions)
+
+        groups: Dict[int, List[int]] = {}
+        for index, box_id in enumerate(self.boxes_ids):
+            groups.setdefault(self.box_plus_id(box_id), []).append(index)
+
+        retv = list(boxes_positions)
+        for indexes in groups.values():
+            for index, position in zip(
+                indexes, sorted(boxes_positions[i] for i in indexes)
+            ):
+                retv[index] = position
+
+        return retv
+
+    def restore_state(self, state: Union[BoardState, PackedBoardState]):
+        """
+        Moves all pushers and boxes to positions stored in ``state``.
+
+        Runs in O(boxes + pushers) time, regardless of board size. Positions in
+        ``state`` are assigned to pieces in ID order (first position to piece with
+        ID `Config.DEFAULT_ID`, etc...).
+
+        Raises:
+            :exc:`ValueError`: ``state`` doesn't contain position for each pusher
+                and box on board
+            :exc:`CellAlreadyOccupiedError`: ``state`` puts two pieces on same
+                position or puts piece on wall
+            :exc:`IndexError`: any of positions is off board
+        """
+        pushers_positions = state.pushers_positions
+        boxes_positions = state.boxes_positions
+
+        if (
+            len(pushers_positions) != self.pushers_count
+            or len(boxes_positions) != self.boxes_count
+        ):
+            raise ValueError(
+                "Board state doesn't match count of pushers and boxes on board!"
+            )
+
+        occupied = set()
+        for position in chain(pushers_positions, boxes_positions):
+            if position in occupied or self._board[position].is_wall:
+                raise CellAlreadyOccupiedError(
+                    f"Can't restore board state, position {position} is already "
+                    f"occupied by '{self._board[position]}'"
+                )
+            occupied.add(position)
+
+        pushers_ids = self.pushers_ids
+        boxes_ids = self.boxes_ids
+        old_pushers_positions = list(self._pushers.values())
+        old_boxes_positions = list(self._boxes.values())
+
+        for position in old_pushers_positions:
+            self._board[position].remove_pusher()
+        for position in old_boxes_positions:
+            self._board[position].remove_box()
+
+        self._pushers.clear()
+        for pusher_id, position in zip(pushers_ids, pushers_positions):
+            self._pushers[pusher_id] = position
+            self._board[position].put_pusher()
+
+        self._boxes.clear()
+        for box_id, position in zip(boxes_ids, boxes_positions):
+            self._boxes[box_id] = position
+            self._board[position].put_box()
+
+        for old_position, new_position in zip(old_pushers_positions, pushers_positions):
+            self._pusher_moved(old_position, new_position)
+
+        for old_position, new_position in zip(old_boxes_positions, boxes_positions):
+            self._box_moved(old_position, new_position)
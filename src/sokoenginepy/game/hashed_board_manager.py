@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import random
-from typing import TYPE_CHECKING, List, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set
 
-from ..common import Config
+from ..common import BoardLattice, Config
 from .board_manager import BoardManager
 from .board_state import BoardState
+from .packed_board_state import PackedBoardState
 
 if TYPE_CHECKING:
     from .board_graph import BoardGraph
@@ -41,12 +42,51 @@ class HashedBoardManager(BoardManager):
           incrementally
         - undoing piece movement also updates hash incrementally with additional feature
           that returning to previous board state will return to previous hash value
+
+    Symmetric hashing:
+        Many boards are symmetric: some of reflections and rotations allowed by
+        tessellation (see `.BoardLattice`) map walls, floor and goals of playable area
+        onto themselves. Board positions that are mirror images of each other are
+        then equally hard to solve.
+
+        If ``symmetric_hashing`` is enabled, manager detects these symmetries and, for
+        each of them, keeps Zobrist hash of mirrored board position up to date. This
+        is done with one table of Zobrist factors per symmetry: factor of position
+        in it is the factor of its image. `symmetric_state_hash` is minimum of all
+        these hashes, so all mirror images of board position have the same
+        `symmetric_state_hash`.
+
+        When Sokoban+ is enabled, symmetry must also map each goal to goal with the
+        same Sokoban+ ID.
+
+    Arguments:
+        zobrist_seed: by default, each instance uses different random factors for
+            hashing, so hashes of the same board position differ between instances.
+            If seed is given, all instances created with the same seed for the same
+            board produce the same hashes (ie. in different processes).
+        symmetric_hashing: detect board symmetries and maintain
+            `symmetric_state_hash` and `symmetric_boxes_hash`
     """
 
-    def __init__(self, board: BoardGraph, boxorder: str = "", goalorder: str = ""):
+    def __init__(
+        self,
+        board: BoardGraph,
+        boxorder: str = "",
+        goalorder: str = "",
+        zobrist_seed: Optional[int] = None,
+        symmetric_hashing: bool = False,
+    ):
         super().__init__(board, boxorder, goalorder)
+        self._zobrist_seed = zobrist_seed
+        self._symmetric_hashing = symmetric_hashing
+        self._symmetries: List[Dict[int, int]] = []
+        self._symmetric_pushers_factors: List[List[Optional[int]]] = []
+        self._symmetric_boxes_factors: List[Dict[int, List[Optional[int]]]] = []
+        self._symmetric_state_hashes: List[int] = []
+        self._symmetric_boxes_hashes: List[int] = []
         self._initial_state_hash = None
         self._state_hash = None
+        self._boxes_hash = None
         self._pushers_factors = None
         self._boxes_factors = None
         self._solutions_hashes = None
@@ -75,15 +115,19 @@ class HashedBoardManager(BoardManager):
         )
 
         # generate required set of random numbers
-        # state_backup = random.getstate()
         # Seeding to constant always produces same sequence which then ensures
         # that equal board layouts always produce equal hash
-        # random.seed(42)
+        generator = (
+            random if self._zobrist_seed is None else random.Random(self._zobrist_seed)
+        )
         random_pool: Set[int] = set()
+        random_list: List[int] = []
         while len(random_pool) < random_pool_size:
-            random_pool.add(random.getrandbits(64))
-        random_pool: List[int] = list(random_pool)
-        # random.setstate(state_backup)
+            value = generator.getrandbits(64)
+            if value not in random_pool:
+                random_pool.add(value)
+                random_list.append(value)
+        random_pool: List[int] = random_list
 
         self._initial_state_hash = self._state_hash = random_pool[0]
         random_pool = random_pool[1:]
@@ -106,10 +150,91 @@ class HashedBoardManager(BoardManager):
             self._state_hash ^= self._boxes_factors[self.box_plus_id(box_id)][
                 self.box_position(box_id)
             ]
+        self._boxes_hash = self._state_hash
 
         for pusher_position in self.pushers_positions.values():
             self._state_hash ^= self._pushers_factors[pusher_position]
 
+        if self._symmetric_hashing:
+            self._symmetric_rehash()
+
+    def _symmetric_rehash(self):
+        self._symmetries = self._find_symmetries()
+
+        self._symmetric_pushers_factors = []
+        self._symmetric_boxes_factors = []
+        self._symmetric_state_hashes = []
+        self._symmetric_boxes_hashes = []
+        for symmetry in self._symmetries:
+            self._symmetric_pushers_factors.append(
+                self._mirrored_factors(self._pushers_factors, symmetry)
+            )
+            self._symmetric_boxes_factors.append(
+                {
+                    box_plus_id: self._mirrored_factors(factors, symmetry)
+                    for box_plus_id, factors in self._boxes_factors.items()
+                }
+            )
+
+            image_hash = self._initial_state_hash
+            for box_id in self.boxes_ids:
+                image_hash ^= self._symmetric_boxes_factors[-1][
+                    self.box_plus_id(box_id)
+                ][self.box_position(box_id)]
+            self._symmetric_boxes_hashes.append(image_hash)
+
+            for pusher_position in self.pushers_positions.values():
+                image_hash ^= self._symmetric_pushers_factors[-1][pusher_position]
+            self._symmetric_state_hashes.append(image_hash)
+
+    @staticmethod
+    def _mirrored_factors(
+        factors: List[Optional[int]], symmetry: Dict[int, int]
+    ) -> List[Optional[int]]:
+        # Positions outside of playable area never have pieces on them, so their
+        # factors don't matter
+        return [
+            factors[symmetry.get(position, position)]
+            for position in range(len(factors))
+        ]
+
+    def _find_symmetries(self) -> List[Dict[int, int]]:
+        """
+        Non-identity symmetries of playable area: area reachable by pieces without
+        crossing walls.
+        """
+        board = self.board
+        playable: Set[int] = set()
+        for root in list(self.pushers_positions.values()) + list(
+            self.boxes_positions.values()
+        ):
+            if root in playable:
+                continue
+            playable.add(root)
+            to_visit = [root]
+            while to_visit:
+                for neighbor in board.all_neighbors(to_visit.pop()):
+                    if neighbor not in playable and not board[neighbor].is_wall:
+                        playable.add(neighbor)
+                        to_visit.append(neighbor)
+
+        goals = {
+            position: self.goal_plus_id(goal_id)
+            for goal_id, position in self.goals_positions.items()
+        }
+
+        return [
+            symmetry
+            for symmetry in BoardLattice.instance(board.tessellation).automorphisms(
+                playable, board.board_width
+            )
+            if any(position != image for position, image in symmetry.items())
+            and all(
+                goals.get(symmetry[position]) == goal_plus_id
+                for position, goal_plus_id in goals.items()
+            )
+        ]
+
     def _insert_wall_zeroes(self, lst):
         src_index = 0
 
@@ -129,6 +254,16 @@ class HashedBoardManager(BoardManager):
             self._zobrist_rehash()
         return self._state_hash
 
+    @property
+    def boxes_hash(self) -> int:
+        """
+        Zobrist hash of current boxes layout. Same as `state_hash` but ignores
+        pushers, so it doesn't change when pushers move around.
+        """
+        if self._state_hash is None or self._initial_state_hash is None:
+            self._zobrist_rehash()
+        return self._boxes_hash
+
     @property
     def initial_state_hash(self) -> int:
         """Zobrist hash of initial board state (before any movement happened)."""
@@ -155,29 +290,158 @@ class HashedBoardManager(BoardManager):
         ):
             return BoardState.NO_HASH
 
+        retv = self._positions_hash(
+            board_state.pushers_positions, board_state.boxes_positions
+        )
+        board_state.zobrist_hash = retv
+
+        return retv
+
+    def _positions_hash(
+        self, pushers_positions: Sequence[int], boxes_positions: Sequence[int]
+    ) -> int:
         retv = self.initial_state_hash
-        for index, box_position in enumerate(board_state.boxes_positions):
+        for index, box_position in enumerate(boxes_positions):
             retv ^= self._boxes_factors[self.box_plus_id(Config.DEFAULT_ID + index)][
                 box_position
             ]
 
-        for pusher_position in board_state.pushers_positions:
+        for pusher_position in pushers_positions:
             retv ^= self._pushers_factors[pusher_position]
 
-        board_state.zobrist_hash = retv
-
         return retv
 
+    @property
+    def symmetric_hashing(self) -> bool:
+        return self._symmetric_hashing
+
+    @property
+    def symmetries(self) -> List[Dict[int, int]]:
+        """
+        Detected non-identity board symmetries. Each of them maps each position in
+        playable area to its image. Empty if ``symmetric_hashing`` is disabled.
+        """
+        if self._state_hash is None or self._initial_state_hash is None:
+            self._zobrist_rehash()
+        return self._symmetries
+
+    @property
+    def symmetric_state_hash(self) -> int:
+        """
+        Minimum of Zobrist hashes of current board state and all of its symmetric
+        images. Same as `state_hash` if ``symmetric_hashing`` is disabled or board
+        is not symmetric.
+        """
+        return min([self.state_hash, *self._symmetric_state_hashes])
+
+    @property
+    def symmetric_boxes_hash(self) -> int:
+        """
+        Same as `symmetric_state_hash`, but ignores pushers (see `boxes_hash`).
+        """
+        return min([self.boxes_hash, *self._symmetric_boxes_hashes])
+
+    def symmetric_positions_hash(
+        self,
+        pushers_positions: Sequence[int],
+        boxes_positions: Sequence[int],
+        pusher_area: Optional[Sequence[int]] = None,
+    ) -> int:
+        """
+        Calculates `symmetric_state_hash` of given positions as if they were applied
+        to initial ``board``.
+
+        Arguments:
+            pushers_positions: positions of pushers
+            boxes_positions: positions of boxes sorted by box ID
+            pusher_area: positions single pusher can reach without pushing boxes. If
+                given, ``pushers_positions`` are ignored and pusher is hashed as
+                standing on top-left position of the area in each image. This gives
+                equal hashes to states that differ only by pusher position within
+                the same area (see `.BoardGraph.normalized_pusher_position`).
+        """
+        if self._state_hash is None or self._initial_state_hash is None:
+            self._zobrist_rehash()
+
+        def image_hash(pushers_factors, boxes_factors, symmetry):
+            retv = self._initial_state_hash
+            for index, box_position in enumerate(boxes_positions):
+                retv ^= boxes_factors[self.box_plus_id(Config.DEFAULT_ID + index)][
+                    box_position
+                ]
+            if pusher_area is None:
+                for pusher_position in pushers_positions:
+                    retv ^= pushers_factors[pusher_position]
+            elif symmetry is None:
+                retv ^= pushers_factors[min(pusher_area)]
+            else:
+                # Factors of image positions are in pushers_factors of original
+                # positions
+                retv ^= self._pushers_factors[
+                    min(symmetry.get(_, _) for _ in pusher_area)
+                ]
+            return retv
+
+        return min(
+            [
+                image_hash(self._pushers_factors, self._boxes_factors, None),
+                *(
+                    image_hash(pushers_factors, boxes_factors, symmetry)
+                    for pushers_factors, boxes_factors, symmetry in zip(
+                        self._symmetric_pushers_factors,
+                        self._symmetric_boxes_factors,
+                        self._symmetries,
+                    )
+                ),
+            ]
+        )
+
+    def boxes_positions_hash(self, boxes_positions: Sequence[int]) -> int:
+        """
+        Calculates `boxes_hash` of ``boxes_positions`` as if they were applied to
+        initial ``board``.
+
+        Arguments:
+            boxes_positions: positions of boxes sorted by box ID
+        """
+        return self._positions_hash((), boxes_positions)
+
+    def pack_state(
+        self, pushers_positions: Sequence[int], boxes_positions: Sequence[int]
+    ) -> PackedBoardState:
+        """
+        Same as `.BoardManager.pack_state` but also calculates Zobrist hash of
+        packed positions.
+        """
+        pushers_positions = sorted(pushers_positions)
+        boxes_positions = self._canonical_boxes_positions(boxes_positions)
+        return PackedBoardState(
+            pushers_positions,
+            boxes_positions,
+            self._positions_hash(pushers_positions, boxes_positions),
+        )
+
     def _box_moved(self, old_position: int, to_new_position: int):
         if old_position != to_new_position:
             box_plus_id = self.box_plus_id(self.box_id_on(to_new_position))
             self._state_hash ^= self._boxes_factors[box_plus_id][old_position]
             self._state_hash ^= self._boxes_factors[box_plus_id][to_new_position]
+            self._boxes_hash ^= self._boxes_factors[box_plus_id][old_position]
+            self._boxes_hash ^= self._boxes_factors[box_plus_id][to_new_position]
+            for index, boxes_factors in enumerate(self._symmetric_boxes_factors):
+                factors = boxes_factors[box_plus_id]
+                change = factors[old_position] ^ factors[to_new_position]
+                self._symmetric_state_hashes[index] ^= change
+                self._symmetric_boxes_hashes[index] ^= change
 
     def _pusher_moved(self, old_position: int, to_new_position: int):
         if old_position != to_new_position:
             self._state_hash ^= self._pushers_factors[old_position]
             self._state_hash ^= self._pushers_factors[to_new_position]
+            for index, factors in enumerate(self._symmetric_pushers_factors):
+                self._symmetric_state_hashes[index] ^= (
+                    factors[old_position] ^ factors[to_new_position]
+                )
 
     @BoardManager.boxorder.setter
     def boxorder(self, rv):
@@ -211,7 +475,8 @@ class HashedBoardManager(BoardManager):
 
     @property
     def is_solved(self) -> bool:
-        return self.state_hash in self.solutions_hashes
+        # Solutions don't care about pushers positions
+        return self.boxes_hash in self.solutions_hashes
 
     @property
     def solutions_hashes(self) -> Set[int]:
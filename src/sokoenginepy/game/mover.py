@@ -3,13 +3,18 @@ from __future__ import annotations
 import enum
 from dataclasses import dataclass
 from itertools import groupby
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, Union
 
 from ..common import Config, Direction
 from .board_graph import BoardGraph
 from .board_manager import CellAlreadyOccupiedError
 from .hashed_board_manager import HashedBoardManager
 from .pusher_step import PusherStep
+from .pusher_steps import PusherSteps
+
+if TYPE_CHECKING:
+    from .board_state import BoardState
+    from .packed_board_state import PackedBoardState
 
 
 class SolvingMode(enum.Enum):
@@ -134,6 +139,44 @@ class Mover:
     def pulls_boxes(self, rv: bool):
         self._pulls_boxes = rv
 
+    @property
+    def pull_count(self) -> int:
+        """
+        Count of box pulls performed in `.SolvingMode.REVERSE`. Jumps are allowed only
+        while it is zero.
+
+        See Also:
+            :meth:`.jump`
+        """
+        return self._pull_count
+
+    def restore_state(
+        self,
+        state: Union[BoardState, PackedBoardState],
+        selected_pusher: int = Config.DEFAULT_ID,
+        pull_count: int = 0,
+    ):
+        """
+        Moves all pushers and boxes to positions stored in ``state`` (see
+        `.BoardManager.restore_state`) and restores pusher selection and
+        :attr:`pull_count` saved together with it.
+
+        Clears :attr:`last_move`, because undoing it wouldn't lead back to state
+        before restoring.
+
+        Raises:
+            KeyError: no pusher with ID ``selected_pusher``
+            ValueError: ``pull_count`` is negative or ``state`` doesn't match board
+        """
+        if pull_count < 0:
+            raise ValueError(f"Pull count {pull_count} is invalid value!")
+        self._manager.pusher_position(selected_pusher)
+
+        self._manager.restore_state(state)
+        self._selected_pusher = selected_pusher
+        self._pull_count = pull_count
+        self._last_move = []
+
     @property
     def last_move(self) -> List[PusherStep]:
         """
@@ -147,9 +190,10 @@ class Mover:
         GUI has enough information to know what was performed and to choose which
         animations to render for that.
 
-        It is also possible to set this to some external sequence of moves. In that
-        case, calling :meth:`.undo_last_move` will cause Mover to try to undo that
-        external sequence of pusher steps.
+        It is also possible to set this to some external sequence of moves (list of
+        :class:`.PusherStep` or :class:`.PusherSteps`). In that case, calling
+        :meth:`.undo_last_move` will cause Mover to try to undo that external
+        sequence of pusher steps.
 
         Example:
 
@@ -194,7 +238,7 @@ class Mover:
         return self._last_move
 
     @last_move.setter
-    def last_move(self, rv: List[PusherStep]):
+    def last_move(self, rv: Union[List[PusherStep], PusherSteps]):
         self._last_move = rv
 
     def select_pusher(self, pusher_id: int):
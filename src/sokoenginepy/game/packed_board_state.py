@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import Iterable, List, Union
+
+from .board_state import BoardState
+
+# Board positions can go up to Config.MAX_WIDTH * Config.MAX_HEIGHT which doesn't fit
+# into 16 bits, so positions are always packed as unsigned 32b integers.
+_POSITION_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+_POSITION_SIZE = 4
+_BULK_HEADER = struct.Struct("<4sIII")
+_BULK_MAGIC = b"SPBS"
+_HASH = struct.Struct("<Q")
+_IS_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class PackedBoardState:
+    """
+    Compact, immutable and hashable sample of board state.
+
+    Unlike :class:`.BoardState`, which keeps positions in Python lists, this one packs
+    all positions into single `bytes` object. This makes it cheap to store millions of
+    them (ie. in solver open and closed sets), fast to compare and usable as `dict` key.
+
+    Instances are usually created by :meth:`.BoardManager.packed_state` or
+    :meth:`.BoardManager.pack_state` which put positions into canonical order:
+
+    - pushers positions are sorted (all pushers are treated equal)
+    - boxes positions are sorted within each group of boxes sharing the same Sokoban+
+      ID. Resulting sequence is still ordered by box ID, so it can be fed back to
+      :meth:`.BoardManager.restore_state`.
+
+    This means that two board positions that differ only in IDs of interchangeable
+    boxes or pushers produce equal packed states.
+
+    Note:
+        Equality takes into account `zobrist_hash`. Compare only states produced by
+        the same `.HashedBoardManager` (or states produced without hash).
+
+    Arguments:
+        pushers_positions: Positions of pushers sorted by pusher ID.
+        boxes_positions: Positions of boxes sorted by box ID.
+        zobrist_hash: Zobrist hash of state.
+
+    See Also:
+        - :class:`.BoardState`
+        - :meth:`.BoardManager.restore_state`
+    """
+
+    __slots__ = ["_positions", "_pushers_count", "_zobrist_hash"]
+
+    def __init__(
+        self,
+        pushers_positions: Iterable[int] = (),
+        boxes_positions: Iterable[int] = (),
+        zobrist_hash: int = BoardState.NO_HASH,
+    ):
+        pushers = array(_POSITION_TYPECODE, pushers_positions)
+        positions = pushers + array(_POSITION_TYPECODE, boxes_positions)
+        self._pushers_count: int = len(pushers)
+        self._positions: bytes = positions.tobytes()
+        self._zobrist_hash: int = zobrist_hash
+
+    @classmethod
+    def _from_packed(
+        cls, positions: bytes, pushers_count: int, zobrist_hash: int
+    ) -> PackedBoardState:
+        retv = cls.__new__(cls)
+        retv._positions = positions
+        retv._pushers_count = pushers_count
+        retv._zobrist_hash = zobrist_hash
+        return retv
+
+    @classmethod
+    def from_board_state(cls, board_state: BoardState) -> PackedBoardState:
+        """
+        Packs ``board_state`` as is, without reordering any of its positions.
+        """
+        return cls(
+            board_state.pushers_positions,
+            board_state.boxes_positions,
+            board_state.zobrist_hash,
+        )
+
+    def to_board_state(self) -> BoardState:
+        return BoardState(
+            pushers_positions=self.pushers_positions,
+            boxes_positions=self.boxes_positions,
+            zobrist_hash=self._zobrist_hash,
+        )
+
+    def __reduce__(self):
+        return (
+            self.__class__._from_packed,
+            (self._positions, self._pushers_count, self._zobrist_hash),
+        )
+
+    def __eq__(self, rv) -> bool:
+        return (
+            isinstance(rv, PackedBoardState)
+            and self._zobrist_hash == rv._zobrist_hash
+            and self._pushers_count == rv._pushers_count
+            and self._positions == rv._positions
+        )
+
+    def __ne__(self, rv) -> bool:
+        return not self == rv
+
+    def __hash__(self) -> int:
+        if self._zobrist_hash != BoardState.NO_HASH:
+            return self._zobrist_hash
+        return hash((self._pushers_count, self._positions))
+
+    def __bytes__(self) -> bytes:
+        """
+        Packed pushers and boxes positions. Doesn't include `zobrist_hash` and is the
+        same for all states of the same board.
+        """
+        return self._positions
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"pushers_positions={self.pushers_positions}, "
+            f"boxes_positions={self.boxes_positions}, "
+            f"zobrist_hash={self._zobrist_hash})"
+        )
+
+    def __str__(self):
+        return repr(self)
+
+    @property
+    def _unpacked(self) -> array:
+        retv = array(_POSITION_TYPECODE)
+        retv.frombytes(self._positions)
+        return retv
+
+    @property
+    def pushers_positions(self) -> List[int]:
+        """Positions of pushers sorted by pusher ID."""
+        return self._unpacked[: self._pushers_count].tolist()
+
+    @property
+    def boxes_positions(self) -> List[int]:
+        """Positions of boxes sorted by box ID."""
+        return self._unpacked[self._pushers_count :].tolist()
+
+    @property
+    def pushers_count(self) -> int:
+        return self._pushers_count
+
+    @property
+    def boxes_count(self) -> int:
+        return len(self._positions) // _POSITION_SIZE - self._pushers_count
+
+    @property
+    def boxes_data(self) -> bytes:
+        """
+        Packed boxes positions. Useful as dictionary key for box configurations
+        regardless of pushers positions.
+        """
+        return self._positions[self._pushers_count * _POSITION_SIZE :]
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        Zobrist hash of state.
+
+        See Also:
+            `.HashedBoardManager`
+        """
+        return self._zobrist_hash
+
+    @classmethod
+    def pack_many(cls, states: Iterable[PackedBoardState]) -> bytes:
+        """
+        Serializes sequence of states into single buffer.
+
+        All states must have the same number of pushers and boxes (which is always
+        true for states produced by the same `.BoardManager`).
+
+        Raises:
+            ValueError: states have different pushers or boxes counts
+        """
+        records: List[bytes] = []
+        pushers_count = boxes_count = None
+
+        for state in states:
+            if pushers_count is None:
+                pushers_count = state.pushers_count
+                boxes_count = state.boxes_count
+            elif (
+                state.pushers_count != pushers_count or state.boxes_count != boxes_count
+            ):
+                raise ValueError(
+                    "Can't pack states with different pushers or boxes counts!"
+                )
+
+            positions = state._positions
+            if _IS_BIG_ENDIAN:
+                swapped = array(_POSITION_TYPECODE, positions)
+                swapped.byteswap()
+                positions = swapped.tobytes()
+
+            records.append(_HASH.pack(state._zobrist_hash))
+            records.append(positions)
+
+        header = _BULK_HEADER.pack(
+            _BULK_MAGIC, len(records) // 2, pushers_count or 0, boxes_count or 0
+        )
+
+        return header + b"".join(records)
+
+    @classmethod
+    def unpack_many(
+        cls, data: Union[bytes, bytearray, memoryview]
+    ) -> List[PackedBoardState]:
+        """
+        Deserializes states from buffer created by :meth:`pack_many`.
+
+        Raises:
+            ValueError: ``data`` is not valid buffer of packed states
+        """
+        data = memoryview(data)
+        if len(data) < _BULK_HEADER.size:
+            raise ValueError("Buffer is too short to contain packed states!")
+
+        magic, count, pushers_count, boxes_count = _BULK_HEADER.unpack_from(data)
+        if magic != _BULK_MAGIC:
+            raise ValueError("Buffer doesn't contain packed states!")
+
+        positions_size = (pushers_count + boxes_count) * _POSITION_SIZE
+        record_size = _HASH.size + positions_size
+        if len(data) != _BULK_HEADER.size + count * record_size:
+            raise ValueError("Buffer size doesn't match packed states count!")
+
+        retv = []
+        offset = _BULK_HEADER.size
+        for _ in range(count):
+            (zobrist_hash,) = _HASH.unpack_from(data, offset)
+            positions = bytes(data[offset + _HASH.size : offset + record_size])
+            if _IS_BIG_ENDIAN:
+                swapped = array(_POSITION_TYPECODE, positions)
+                swapped.byteswap()
+                positions = swapped.tobytes()
+            retv.append(cls._from_packed(positions, pushers_count, zobrist_hash))
+            offset += record_size
+
+        return retv
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from typing import Final
+
 from ..common import Config, Direction
 
 
@@ -43,6 +47,17 @@ class PusherStep:
         "is_current_pos",
     ]
 
+    #: Bits of :meth:`packed` step that hold value of its `Direction`
+    PACKED_DIRECTION_MASK: Final[int] = 0x07
+    #: Bit set in :meth:`packed` value of push or pull
+    PACKED_PUSH: Final[int] = 0x08
+    #: Bit set in :meth:`packed` value of jump
+    PACKED_JUMP: Final[int] = 0x10
+    #: Bit set in :meth:`packed` value of pusher selection
+    PACKED_PUSHER_SELECTION: Final[int] = 0x20
+    #: Bit set in :meth:`packed` value of step marked as current position
+    PACKED_CURRENT_POS: Final[int] = 0x40
+
     def __init__(
         self,
         direction: Direction = Direction.LEFT,
@@ -136,6 +151,51 @@ class PusherStep:
     def __ne__(self, rv):
         return not self == rv
 
+    def packed(self) -> int:
+        """
+        Step packed into single byte value, suitable for storing long sequences of
+        steps in :class:`bytes` or :class:`array.array`.
+
+        Packed value keeps everything that is written into :class:`.Snapshot`:
+        direction, type of step and current position flag. IDs of pusher and moved
+        box are not kept.
+
+        Example:
+
+            >>> from sokoenginepy import Config, Direction, PusherStep
+            >>> step = PusherStep(Direction.RIGHT, moved_box_id=Config.DEFAULT_ID)
+            >>> PusherStep.from_packed(step.packed()) == step
+            True
+        """
+        return (
+            self.direction.value
+            | (self.PACKED_PUSH if self.is_push_or_pull else 0)
+            | (self.PACKED_JUMP if self._pusher_jumped else 0)
+            | (self.PACKED_PUSHER_SELECTION if self._pusher_selected else 0)
+            | (self.PACKED_CURRENT_POS if self.is_current_pos else 0)
+        )
+
+    @classmethod
+    def from_packed(cls, value: int) -> PusherStep:
+        """
+        Unpacks step created by :meth:`packed`. Moved box gets `Config.DEFAULT_ID`.
+
+        Raises:
+            ValueError: ``value`` is not valid packed step
+        """
+        if value >> 7 or bin(value & 0x38).count("1") > 1:
+            raise ValueError(f"Invalid packed pusher step {value}!")
+
+        return cls(
+            direction=Direction(value & cls.PACKED_DIRECTION_MASK),
+            moved_box_id=(
+                Config.DEFAULT_ID if value & cls.PACKED_PUSH else Config.NO_ID
+            ),
+            is_jump=bool(value & cls.PACKED_JUMP),
+            is_pusher_selection=bool(value & cls.PACKED_PUSHER_SELECTION),
+            is_current_pos=bool(value & cls.PACKED_CURRENT_POS),
+        )
+
     @property
     def moved_box_id(self) -> int:
         """
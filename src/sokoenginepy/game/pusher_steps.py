@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Union, overload
+
+from ..common import Config, Direction
+from .pusher_step import PusherStep
+
+if TYPE_CHECKING:
+    from ..common import Tessellation
+
+# Pushers and boxes IDs are small positive integers or Config.NO_ID
+_ID_TYPECODE = "i"
+_DIRECTIONS = tuple(Direction(_) for _ in range(len(Direction)))
+
+
+class PusherStepView:
+    """
+    Read only view of single step in :class:`PusherSteps`.
+
+    Has the same attributes as :class:`.PusherStep` and compares equal to
+    :class:`.PusherStep` with the same direction and type of step, but doesn't copy
+    any data out of :class:`PusherSteps`.
+    """
+
+    __slots__ = ["_steps", "_index"]
+
+    def __init__(self, steps: PusherSteps, index: int):
+        self._steps = steps
+        self._index = index
+
+    def __repr__(self):
+        return repr(self.to_pusher_step())
+
+    def __str__(self):
+        return repr(self)
+
+    def __eq__(self, rv):
+        return (
+            self.direction == rv.direction
+            and self.is_push_or_pull == rv.is_push_or_pull
+            and self.is_pusher_selection == rv.is_pusher_selection
+            and self.is_jump == rv.is_jump
+        )
+
+    def __ne__(self, rv):
+        return not self == rv
+
+    def packed(self) -> int:
+        """See `.PusherStep.packed`."""
+        return self._steps._packed[self._index]
+
+    @property
+    def direction(self) -> Direction:
+        return _DIRECTIONS[self.packed() & PusherStep.PACKED_DIRECTION_MASK]
+
+    @property
+    def moved_box_id(self) -> int:
+        return self._steps._moved_box_ids[self._index]
+
+    @property
+    def pusher_id(self) -> int:
+        return self._steps._pusher_ids[self._index]
+
+    @property
+    def is_move(self) -> bool:
+        return not self.packed() & (
+            PusherStep.PACKED_PUSH
+            | PusherStep.PACKED_JUMP
+            | PusherStep.PACKED_PUSHER_SELECTION
+        )
+
+    @property
+    def is_push_or_pull(self) -> bool:
+        return bool(self.packed() & PusherStep.PACKED_PUSH)
+
+    @property
+    def is_jump(self) -> bool:
+        return bool(self.packed() & PusherStep.PACKED_JUMP)
+
+    @property
+    def is_pusher_selection(self) -> bool:
+        return bool(self.packed() & PusherStep.PACKED_PUSHER_SELECTION)
+
+    @property
+    def is_current_pos(self) -> bool:
+        return bool(self.packed() & PusherStep.PACKED_CURRENT_POS)
+
+    def to_pusher_step(self) -> PusherStep:
+        """Copies viewed step into new :class:`.PusherStep`."""
+        retv = PusherStep.from_packed(self.packed())
+        retv.pusher_id = self.pusher_id
+        if retv.is_push_or_pull:
+            retv.moved_box_id = self.moved_box_id
+        return retv
+
+
+class PusherSteps(Sequence):
+    """
+    Compact sequence of pusher steps.
+
+    Instead of keeping :class:`.PusherStep` object per step, steps are stored in
+    parallel :class:`array.array` columns:
+
+    - :attr:`packed`: direction and type of each step, as created by
+      `.PusherStep.packed`, one byte per step
+    - :attr:`pusher_ids`: ID of pusher that performed each step
+    - :attr:`moved_box_ids`: ID of box moved by each step or `.Config.NO_ID`
+
+    Indexing returns :class:`PusherStepView` and slicing returns new
+    :class:`PusherSteps`. Both :class:`.Mover` and :class:`.Snapshot` accept
+    :class:`PusherSteps` wherever they accept list of :class:`.PusherStep`.
+
+    Arguments:
+        pusher_steps: initial steps
+
+    Example:
+
+        >>> from sokoenginepy import PusherSteps, Tessellation
+        >>> steps = PusherSteps.from_moves_data(Tessellation.SOKOBAN, "3(lU)rrr")
+        >>> len(steps)
+        9
+        >>> steps[1]
+        PusherStep(Direction.UP, moved_box_id=Config.DEFAULT_ID)
+        >>> steps[4:].to_moves_data(Tessellation.SOKOBAN, rle_encode=True)
+        'lU3r'
+    """
+
+    __slots__ = ["_packed", "_pusher_ids", "_moved_box_ids"]
+
+    def __init__(self, pusher_steps: Iterable[PusherStep] = ()):
+        self._packed = array("B")
+        self._pusher_ids = array(_ID_TYPECODE)
+        self._moved_box_ids = array(_ID_TYPECODE)
+        self.extend(pusher_steps)
+
+    @classmethod
+    def from_packed(cls, packed: Iterable[int]) -> PusherSteps:
+        """
+        Creates steps from values created by `.PusherStep.packed`. All steps are
+        performed by pusher with `.Config.DEFAULT_ID` and all pushes move box with
+        `.Config.DEFAULT_ID`.
+
+        Raises:
+            ValueError: ``packed`` contains invalid values
+        """
+        retv = cls()
+        retv._packed = array("B", packed)
+        for value in set(retv._packed):
+            PusherStep.from_packed(value)
+
+        count = len(retv._packed)
+        retv._pusher_ids = array(_ID_TYPECODE, [Config.DEFAULT_ID]) * count
+        retv._moved_box_ids = array(
+            _ID_TYPECODE,
+            (
+                Config.DEFAULT_ID if _ & PusherStep.PACKED_PUSH else Config.NO_ID
+                for _ in retv._packed
+            ),
+        )
+        return retv
+
+    @classmethod
+    def from_moves_data(
+        cls, tessellation: Tessellation, moves_data: str
+    ) -> PusherSteps:
+        """
+        Parses snapshot string (see :class:`.Snapshot`), without creating
+        intermediate list of :class:`.PusherStep`.
+
+        Raises:
+            ValueError: ``moves_data`` is not valid snapshot string
+        """
+        from ..io import Snapshot
+
+        return cls(Snapshot(tessellation, moves_data).iter_pusher_steps())
+
+    def to_moves_data(self, tessellation: Tessellation, rle_encode=False) -> str:
+        """
+        Converts steps to snapshot string.
+
+        Raises:
+            ValueError: steps contain directions that are not legal in
+                ``tessellation``
+        """
+        from ..io import Snapshot
+
+        snapshot = Snapshot(tessellation)
+        snapshot.pusher_steps = self
+        return snapshot.to_str(rle_encode=rle_encode)
+
+    @property
+    def packed(self) -> array:
+        """Direction and type of each step. Should not be modified."""
+        return self._packed
+
+    @property
+    def pusher_ids(self) -> array:
+        """ID of pusher that performed each step. Should not be modified."""
+        return self._pusher_ids
+
+    @property
+    def moved_box_ids(self) -> array:
+        """ID of box moved in each step. Should not be modified."""
+        return self._moved_box_ids
+
+    def __len__(self) -> int:
+        return len(self._packed)
+
+    @overload
+    def __getitem__(self, index: int) -> PusherStepView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PusherSteps: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[PusherStepView, PusherSteps]:
+        if isinstance(index, slice):
+            retv = self.__class__()
+            retv._packed = self._packed[index]
+            retv._pusher_ids = self._pusher_ids[index]
+            retv._moved_box_ids = self._moved_box_ids[index]
+            return retv
+
+        count = len(self._packed)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("PusherSteps index out of range!")
+        return PusherStepView(self, index)
+
+    def __iter__(self) -> Iterator[PusherStepView]:
+        for index in range(len(self._packed)):
+            yield PusherStepView(self, index)
+
+    def __eq__(self, rv):
+        if isinstance(rv, PusherSteps):
+            # Packed steps keep exactly the data PusherStep equality compares and
+            # current position flag, which is ignored by it
+            mask = ~PusherStep.PACKED_CURRENT_POS & 0xFF
+            return len(self) == len(rv) and all(
+                (a & mask) == (b & mask) for a, b in zip(self._packed, rv._packed)
+            )
+        if isinstance(rv, (list, tuple)):
+            return len(self) == len(rv) and all(a == b for a, b in zip(self, rv))
+        return NotImplemented
+
+    def __ne__(self, rv):
+        retv = self.__eq__(rv)
+        return retv if retv is NotImplemented else not retv
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_list()!r})"
+
+    def __str__(self):
+        return repr(self)
+
+    def append(self, pusher_step: PusherStep):
+        self._packed.append(pusher_step.packed())
+        self._pusher_ids.append(pusher_step.pusher_id)
+        self._moved_box_ids.append(pusher_step.moved_box_id)
+
+    def extend(self, pusher_steps: Iterable[PusherStep]):
+        if isinstance(pusher_steps, PusherSteps):
+            self._packed.extend(pusher_steps._packed)
+            self._pusher_ids.extend(pusher_steps._pusher_ids)
+            self._moved_box_ids.extend(pusher_steps._moved_box_ids)
+        else:
+            for _ in pusher_steps:
+                self.append(_)
+
+    def to_list(self) -> List[PusherStep]:
+        """Copies steps into list of :class:`.PusherStep`."""
+        return [_.to_pusher_step() for _ in self]
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import bisect
+import math
+import sys
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+
+from .board_graph import BoardGraph
+from .board_state import BoardState
+from .mover import Mover, SolvingMode
+from .packed_board_state import PackedBoardState
+
+if TYPE_CHECKING:
+    from ..common import Direction
+    from ..io import Puzzle, Snapshot
+
+
+class _Checkpoint(NamedTuple):
+    # Pieces positions ordered by their IDs, not in canonical order, so that restoring
+    # it doesn't change pieces IDs
+    state: PackedBoardState
+    selected_pusher: int
+    pull_count: int
+
+
+# Single replay action: plain step (move, push or pull), whole jump or whole pusher
+# selection.
+_MOVE = 0
+_JUMP = 1
+_SELECT_PUSHER = 2
+
+
+class SnapshotTimeline:
+    """
+    Random access to board states along :class:`.Snapshot`.
+
+    Snapshot is replayed with :class:`.Mover` once, when timeline is created, and
+    board state is stored every :attr:`checkpoint_interval` steps. Board state after
+    any step is then reconstructed by restoring nearest preceding checkpoint and
+    replaying at most :attr:`checkpoint_interval` steps from it. Moving forward step
+    by step continues from previous position and doesn't need checkpoints at all.
+
+    Checkpoints are stored as :class:`.PackedBoardState`. If ``checkpoint_interval``
+    is not given, it is chosen as the smallest one for which all checkpoints fit into
+    ``memory_budget``.
+
+    Timeline positions are counted in pusher steps: ``state_at(0)`` is initial
+    board and ``state_at(len(timeline))`` is board after last step. Jumps and pusher
+    selections are replayed as a whole: for positions inside of them, board state is
+    the one from before jump or selection.
+
+    Snapshots containing jumps are replayed in `.SolvingMode.REVERSE`.
+
+    Arguments:
+        puzzle: puzzle ``snapshot`` belongs to
+        snapshot: replayed snapshot
+        checkpoint_interval: number of steps between checkpoints
+        memory_budget: memory in bytes that checkpoints may use, used when
+            ``checkpoint_interval`` is not given
+
+    Raises:
+        IllegalMoveError: ``snapshot`` contains move that is illegal on ``puzzle``
+        NonPlayableBoardError: ``puzzle`` is not playable
+        ValueError: ``checkpoint_interval`` < 1
+
+    Example:
+
+        >>> from sokoenginepy import Puzzle, Snapshot, SnapshotTimeline, Tessellation
+        >>> puzzle = Puzzle(Tessellation.SOKOBAN, board="#######\\n#@ $ .#\\n#######")
+        >>> snapshot = Snapshot(Tessellation.SOKOBAN, "rRR")
+        >>> timeline = SnapshotTimeline(puzzle, snapshot)
+        >>> len(timeline)
+        3
+        >>> timeline.state_at(2).boxes_positions
+        [11]
+    """
+
+    #: Default value of ``memory_budget``
+    DEFAULT_MEMORY_BUDGET: int = 2**20
+
+    def __init__(
+        self,
+        puzzle: Puzzle,
+        snapshot: Snapshot,
+        checkpoint_interval: Optional[int] = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ):
+        self._puzzle = puzzle
+        self._snapshot = snapshot
+
+        pusher_steps = snapshot.pusher_steps
+        self._steps_count = len(pusher_steps)
+        self._is_reverse = snapshot.is_reverse
+        self._mover = Mover(
+            BoardGraph(puzzle),
+            SolvingMode.REVERSE if self._is_reverse else SolvingMode.FORWARD,
+        )
+
+        # Replay actions and, for each of them, number of steps done after it
+        self._actions: List[Tuple[int, Tuple[Direction, ...], bool]] = []
+        self._actions_ends: List[int] = []
+        step_index = 0
+        while step_index < self._steps_count:
+            pusher_step = pusher_steps[step_index]
+            if pusher_step.is_jump or pusher_step.is_pusher_selection:
+                kind = _JUMP if pusher_step.is_jump else _SELECT_PUSHER
+                group_end = step_index
+                while group_end < self._steps_count and (
+                    pusher_steps[group_end].is_jump == pusher_step.is_jump
+                    and pusher_steps[group_end].is_pusher_selection
+                    == pusher_step.is_pusher_selection
+                ):
+                    group_end += 1
+                self._actions.append(
+                    (
+                        kind,
+                        tuple(_.direction for _ in pusher_steps[step_index:group_end]),
+                        False,
+                    )
+                )
+                step_index = group_end
+            else:
+                self._actions.append(
+                    (_MOVE, (pusher_step.direction,), pusher_step.is_push_or_pull)
+                )
+                step_index += 1
+            self._actions_ends.append(step_index)
+
+        initial = self._checkpoint()
+        if checkpoint_interval is None:
+            checkpoint_interval = max(
+                1,
+                math.ceil(
+                    len(self._actions) * self._checkpoint_size(initial) / memory_budget
+                ),
+            )
+        if checkpoint_interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1!")
+        self._checkpoint_interval = checkpoint_interval
+
+        self._checkpoints: List[_Checkpoint] = [initial]
+        for action_index in range(len(self._actions)):
+            self._perform(action_index)
+            if (action_index + 1) % checkpoint_interval == 0:
+                self._checkpoints.append(self._checkpoint())
+        # Number of actions performed on mover's board
+        self._position = len(self._actions)
+
+    def __len__(self) -> int:
+        """Number of pusher steps in snapshot."""
+        return self._steps_count
+
+    @property
+    def puzzle(self) -> Puzzle:
+        return self._puzzle
+
+    @property
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    @property
+    def checkpoint_interval(self) -> int:
+        """
+        Number of replay steps between checkpoints. Jump or pusher selection counts
+        as single replay step.
+        """
+        return self._checkpoint_interval
+
+    @property
+    def checkpoints_count(self) -> int:
+        return len(self._checkpoints)
+
+    @property
+    def memory_usage(self) -> int:
+        """Approximate memory in bytes used by checkpoints."""
+        return sum(self._checkpoint_size(_) for _ in self._checkpoints)
+
+    def state_at(self, step: int) -> BoardState:
+        """
+        Board state after first ``step`` pusher steps of snapshot.
+
+        Raises:
+            IndexError: ``step`` is not in range ``0 <= step <= len(self)``
+        """
+        if not 0 <= step <= self._steps_count:
+            raise IndexError(f"Step {step} is out of timeline range!")
+
+        target = bisect.bisect_right(self._actions_ends, step)
+        checkpoint_index = target // self._checkpoint_interval
+        checkpoint_position = checkpoint_index * self._checkpoint_interval
+
+        if not checkpoint_position <= self._position <= target:
+            self._restore(self._checkpoints[checkpoint_index])
+            self._position = checkpoint_position
+
+        while self._position < target:
+            self._perform(self._position)
+            self._position += 1
+
+        return self._mover.board_manager.state
+
+    def _checkpoint(self) -> _Checkpoint:
+        manager = self._mover.board_manager
+        return _Checkpoint(
+            PackedBoardState(
+                manager.pushers_positions.values(), manager.boxes_positions.values()
+            ),
+            self._mover.selected_pusher,
+            self._mover.pull_count,
+        )
+
+    def _restore(self, checkpoint: _Checkpoint):
+        self._mover.restore_state(
+            checkpoint.state, checkpoint.selected_pusher, checkpoint.pull_count
+        )
+
+    @staticmethod
+    def _checkpoint_size(checkpoint: _Checkpoint) -> int:
+        return (
+            sys.getsizeof(checkpoint)
+            + sys.getsizeof(checkpoint.state)
+            + sys.getsizeof(bytes(checkpoint.state))
+        )
+
+    def _perform(self, action_index: int):
+        kind, directions, is_push_or_pull = self._actions[action_index]
+        mover = self._mover
+
+        if kind == _MOVE:
+            if self._is_reverse:
+                mover.pulls_boxes = is_push_or_pull
+            mover.move(directions[0])
+            return
+
+        manager = mover.board_manager
+        destination = manager.board.path_destination(
+            manager.pusher_position(mover.selected_pusher), directions
+        )
+        if kind == _JUMP:
+            mover.jump(destination)
+        else:
+            mover.select_pusher(manager.pusher_id_on(destination))
@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import enum
+import struct
+from typing import NamedTuple, Optional, Union
+
+from .board_state import BoardState
+from .packed_board_state import PackedBoardState
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+
+_MASK_32 = 0xFFFFFFFF
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_SIGN_32 = 0x80000000
+
+_SHARED_HEADER = struct.Struct("<4sQIII")
+_SHARED_MAGIC = b"SPTT"
+_SHARED_ALIGNMENT = 64
+
+
+class ReplacementPolicy(enum.IntEnum):
+    """
+    What :class:`.TranspositionTable` does when all slots that could hold new entry
+    are already occupied.
+    """
+
+    #: New entry always overwrites entry in the first slot of its bucket.
+    ALWAYS_REPLACE = 0
+
+    #: Entries with smaller depth (closer to initial state) are kept. New entry
+    #: overwrites deepest entry in its bucket, but only if it is not deeper itself.
+    #: Otherwise, new entry is discarded.
+    DEPTH_PREFERRED = 1
+
+    def __repr__(self):
+        return str(self)
+
+
+class TranspositionTableEntry(NamedTuple):
+    """Data stored in :class:`.TranspositionTable` for single board state."""
+
+    depth: int
+    value: int
+
+
+class TranspositionTable:
+    """
+    Fixed size store of visited board states keyed by Zobrist hash.
+
+    Table is open addressing hash table backed by NumPy arrays. Its size never grows
+    beyond ``memory_limit`` bytes: when table fills up, new entries replace existing
+    ones according to ``policy``. Each state hash is looked up in at most
+    ``max_probes`` consecutive slots (its bucket).
+
+    Besides hash, each entry holds two 32b signed integers: ``depth`` (ie. number of
+    pushes needed to reach the state) used by `.ReplacementPolicy.DEPTH_PREFERRED` and
+    arbitrary ``value`` (ie. heuristic estimate or index into some other container).
+
+    Zobrist hashes may collide. If that is not acceptable, create table with
+    ``verify_size`` set to length of ``bytes(state)`` of states that will be stored
+    (see :meth:`for_board_manager`) and pass ``state`` to :meth:`store` and
+    :meth:`probe`. Table then keeps full states and compares them on lookup.
+
+    Table can be used from multiple threads or processes without locking. Each entry
+    is stored as ``state_hash ^ data`` and ``data`` so that entries torn by concurrent
+    writes are detected and treated as missing instead of returning wrong data. Two
+    writers can still overwrite each other's entries, which only means that some
+    state will be searched more than once.
+
+    Table can be created in shared memory (:meth:`create_shared`) so that multiple
+    worker processes share it. Shared tables are pickled by name, which means they can
+    be passed to :mod:`multiprocessing` workers directly.
+
+    Requires NumPy.
+
+    Arguments:
+        memory_limit: maximal number of bytes table will use for its data
+        policy: replacement policy used when bucket is full
+        verify_size: size of states stored for collision verification in bytes; 0
+            disables verification.
+        max_probes: length of bucket
+
+    Raises:
+        ImportError: NumPy is not installed
+        ValueError: ``memory_limit`` is not enough for even one bucket or
+            ``max_probes`` is less than 1
+
+    Note:
+        `.BoardState.NO_HASH` (``0``) is reserved for empty slots and can't be stored.
+
+    Example:
+
+        >>> from sokoenginepy import (
+        ...     BoardGraph, HashedBoardManager, Puzzle, Tessellation, TranspositionTable
+        ... )
+        >>> puzzle = Puzzle(Tessellation.SOKOBAN, board="#####\\n#@$.#\\n#####")
+        >>> manager = HashedBoardManager(BoardGraph(puzzle))
+        >>> table = TranspositionTable.for_board_manager(manager, memory_limit=2**16)
+        >>> state = manager.packed_state()
+        >>> table.store(state.zobrist_hash, depth=0, value=1, state=state)
+        True
+        >>> table.probe(state.zobrist_hash, state=state)
+        TranspositionTableEntry(depth=0, value=1)
+    """
+
+    def __init__(
+        self,
+        memory_limit: int = 64 * 2**20,
+        policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED,
+        verify_size: int = 0,
+        max_probes: int = 8,
+    ):
+        self._init_layout(
+            self._capacity_for(memory_limit, verify_size, max_probes),
+            verify_size,
+            max_probes,
+            policy,
+        )
+        self._shm = None
+        self._keys = np.zeros(self._capacity, dtype=np.uint64)
+        self._data = np.zeros(self._capacity, dtype=np.uint64)
+        self._states = np.zeros((self._capacity, verify_size), dtype=np.uint8)
+
+    def _init_layout(
+        self,
+        capacity: int,
+        verify_size: int,
+        max_probes: int,
+        policy: ReplacementPolicy,
+    ):
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._verify_size = verify_size
+        self._max_probes = min(max_probes, capacity)
+        self._policy = ReplacementPolicy(policy)
+
+    @staticmethod
+    def _entry_size(verify_size: int) -> int:
+        return 2 * 8 + verify_size
+
+    @classmethod
+    def _capacity_for(cls, memory_limit: int, verify_size: int, max_probes: int):
+        if np is None:
+            raise ImportError("TranspositionTable requires NumPy!")
+        if max_probes < 1:
+            raise ValueError("max_probes must be at least 1!")
+        if verify_size < 0:
+            raise ValueError("verify_size can't be negative!")
+
+        entries = memory_limit // cls._entry_size(verify_size)
+        if entries < max_probes:
+            raise ValueError(
+                f"memory_limit {memory_limit} is too small for even one bucket!"
+            )
+
+        # Round down to power of 2 so that slot index is just masked hash.
+        return 1 << (entries.bit_length() - 1)
+
+    @classmethod
+    def for_board_manager(
+        cls, board_manager, with_verification: bool = True, **kwargs
+    ) -> TranspositionTable:
+        """
+        Creates table sized for verification of states packed by
+        ``board_manager`` (see `.BoardManager.packed_state`).
+
+        Arguments:
+            board_manager: :class:`.HashedBoardManager` that will produce states
+            with_verification: if False, creates table without state verification
+            kwargs: any other constructor argument
+        """
+        if with_verification:
+            kwargs["verify_size"] = len(bytes(board_manager.packed_state()))
+        return cls(**kwargs)
+
+    @classmethod
+    def create_shared(
+        cls,
+        memory_limit: int = 64 * 2**20,
+        policy: ReplacementPolicy = ReplacementPolicy.DEPTH_PREFERRED,
+        verify_size: int = 0,
+        max_probes: int = 8,
+        name: Optional[str] = None,
+    ) -> TranspositionTable:
+        """
+        Creates table in :class:`multiprocessing.shared_memory.SharedMemory`.
+
+        Other processes can use the same table either by receiving pickled instance
+        or by calling :meth:`attach` with :attr:`shared_memory_name`.
+
+        Creator of shared table is responsible for calling :meth:`unlink` once
+        table is no longer needed by any process.
+
+        Arguments:
+            name: name of shared memory block; if not given, random name is used
+        """
+        capacity = cls._capacity_for(memory_limit, verify_size, max_probes)
+        data_offset = cls._shared_data_offset()
+        shm = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=data_offset + capacity * cls._entry_size(verify_size),
+        )
+        _SHARED_HEADER.pack_into(
+            shm.buf,
+            0,
+            _SHARED_MAGIC,
+            capacity,
+            verify_size,
+            min(max_probes, capacity),
+            int(policy),
+        )
+        retv = cls._from_shared_memory(shm)
+        retv.clear()
+        return retv
+
+    @classmethod
+    def attach(cls, name: str) -> TranspositionTable:
+        """
+        Attaches to shared table created by :meth:`create_shared`.
+
+        Raises:
+            FileNotFoundError: shared memory block with ``name`` doesn't exist
+            ValueError: shared memory block doesn't contain transposition table
+        """
+        if np is None:
+            raise ImportError("TranspositionTable requires NumPy!")
+        return cls._from_shared_memory(shared_memory.SharedMemory(name=name))
+
+    @staticmethod
+    def _shared_data_offset() -> int:
+        return (
+            (_SHARED_HEADER.size + _SHARED_ALIGNMENT - 1)
+            // _SHARED_ALIGNMENT
+            * _SHARED_ALIGNMENT
+        )
+
+    @classmethod
+    def _from_shared_memory(cls, shm) -> TranspositionTable:
+        magic, capacity, verify_size, max_probes, policy = _SHARED_HEADER.unpack_from(
+            shm.buf, 0
+        )
+        if magic != _SHARED_MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory {shm.name} is not transposition table!")
+
+        retv = cls.__new__(cls)
+        retv._init_layout(capacity, verify_size, max_probes, policy)
+        retv._shm = shm
+
+        offset = cls._shared_data_offset()
+        retv._keys = np.ndarray(
+            (capacity,), dtype=np.uint64, buffer=shm.buf, offset=offset
+        )
+        offset += capacity * 8
+        retv._data = np.ndarray(
+            (capacity,), dtype=np.uint64, buffer=shm.buf, offset=offset
+        )
+        offset += capacity * 8
+        retv._states = np.ndarray(
+            (capacity, verify_size), dtype=np.uint8, buffer=shm.buf, offset=offset
+        )
+
+        return retv
+
+    def __reduce__(self):
+        if self._shm is None:
+            return super().__reduce__()
+        return (self.__class__.attach, (self._shm.name,))
+
+    @property
+    def shared_memory_name(self) -> Optional[str]:
+        """Name of shared memory block or None if table is not shared."""
+        return None if self._shm is None else self._shm.name
+
+    def close(self):
+        """
+        Detaches this instance from shared memory. Table can't be used after that.
+        Does nothing for tables that are not shared.
+        """
+        if self._shm is not None:
+            # Views into shared buffer must be released before it can be closed
+            self._keys = self._data = self._states = None
+            self._shm.close()
+
+    def unlink(self):
+        """
+        Closes this instance and destroys underlying shared memory block.
+        Does nothing for tables that are not shared.
+        """
+        if self._shm is not None:
+            self.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(capacity={self._capacity}, "
+            f"policy={self._policy!r}, verify_size={self._verify_size}, "
+            f"max_probes={self._max_probes}, "
+            f"shared_memory_name={self.shared_memory_name!r})"
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Maximal number of entries table can hold."""
+        return self._capacity
+
+    @property
+    def policy(self) -> ReplacementPolicy:
+        return self._policy
+
+    @property
+    def verify_size(self) -> int:
+        return self._verify_size
+
+    @property
+    def max_probes(self) -> int:
+        return self._max_probes
+
+    @property
+    def memory_usage(self) -> int:
+        """Number of bytes used for table data."""
+        return self._keys.nbytes + self._data.nbytes + self._states.nbytes
+
+    def __len__(self):
+        """Number of occupied slots. Runs in O(capacity)."""
+        return int(np.count_nonzero(self._keys ^ self._data))
+
+    def clear(self):
+        self._keys.fill(0)
+        self._data.fill(0)
+        self._states.fill(0)
+
+    def __contains__(self, state_hash: int) -> bool:
+        return self._find(state_hash, None) is not None
+
+    def _state_bytes(self, state: Union[None, bytes, PackedBoardState]):
+        if state is None:
+            if self._verify_size:
+                raise ValueError("Table with verification requires state!")
+            return None
+
+        if not self._verify_size:
+            return None
+
+        retv = bytes(state)
+        if len(retv) != self._verify_size:
+            raise ValueError(
+                f"State size {len(retv)} doesn't match table verify_size "
+                f"{self._verify_size}!"
+            )
+        return retv
+
+    def _find(self, state_hash: int, state_bytes: Optional[bytes]) -> Optional[int]:
+        keys = self._keys
+        data = self._data
+        mask = self._mask
+        index = state_hash & mask
+        for _ in range(self._max_probes):
+            # Read data before key; entry is valid only if they still match
+            entry_data = int(data[index])
+            if int(keys[index]) ^ entry_data == state_hash:
+                if state_bytes is None or self._states[index].tobytes() == state_bytes:
+                    return index
+            index = (index + 1) & mask
+        return None
+
+    def probe(
+        self,
+        state_hash: int,
+        state: Union[None, bytes, PackedBoardState] = None,
+    ) -> Optional[TranspositionTableEntry]:
+        """
+        Looks up entry for ``state_hash``.
+
+        Arguments:
+            state_hash: Zobrist hash of state
+            state: state used for verification, required if table was created with
+                ``verify_size``
+
+        Returns:
+            Found entry or None
+        """
+        index = self._find(state_hash, self._state_bytes(state))
+        if index is None:
+            return None
+        return self._unpack_data(int(self._data[index]))
+
+    def store(
+        self,
+        state_hash: int,
+        depth: int = 0,
+        value: int = 0,
+        state: Union[None, bytes, PackedBoardState] = None,
+    ) -> bool:
+        """
+        Stores entry for ``state_hash``.
+
+        If entry for the same state is already in table, it is updated. When using
+        `.ReplacementPolicy.DEPTH_PREFERRED`, existing entry is updated only if new
+        ``depth`` is not greater than existing one. Otherwise, entry is stored into
+        first free slot of its bucket, replacing existing one if bucket is full.
+
+        Arguments:
+            state_hash: Zobrist hash of state
+            depth: 32b signed integer
+            value: 32b signed integer
+            state: state used for verification, required if table was created with
+                ``verify_size``
+
+        Returns:
+            True if entry was stored, False if it was rejected by replacement policy
+
+        Raises:
+            ValueError: ``state_hash`` is `.BoardState.NO_HASH`
+        """
+        if state_hash == BoardState.NO_HASH:
+            raise ValueError("Can't store BoardState.NO_HASH!")
+
+        state_bytes = self._state_bytes(state)
+        depth_preferred = self._policy == ReplacementPolicy.DEPTH_PREFERRED
+
+        keys = self._keys
+        data = self._data
+        mask = self._mask
+        index = state_hash & mask
+
+        free_index = None
+        victim_index = index
+        victim_depth = None
+
+        for _ in range(self._max_probes):
+            entry_data = int(data[index])
+            entry_hash = int(keys[index]) ^ entry_data
+
+            if entry_hash == BoardState.NO_HASH:
+                if free_index is None:
+                    free_index = index
+
+            elif entry_hash == state_hash and (
+                state_bytes is None or self._states[index].tobytes() == state_bytes
+            ):
+                if depth_preferred and depth > self._unpack_data(entry_data).depth:
+                    return False
+                self._write(index, state_hash, depth, value, state_bytes)
+                return True
+
+            elif depth_preferred:
+                entry_depth = self._unpack_data(entry_data).depth
+                if victim_depth is None or entry_depth > victim_depth:
+                    victim_index = index
+                    victim_depth = entry_depth
+
+            index = (index + 1) & mask
+
+        if free_index is not None:
+            self._write(free_index, state_hash, depth, value, state_bytes)
+            return True
+
+        if depth_preferred and depth > victim_depth:
+            return False
+
+        self._write(victim_index, state_hash, depth, value, state_bytes)
+        return True
+
+    def _write(
+        self,
+        index: int,
+        state_hash: int,
+        depth: int,
+        value: int,
+        state_bytes: Optional[bytes],
+    ):
+        entry_data = ((depth & _MASK_32) << 32) | (value & _MASK_32)
+
+        # Invalidate slot first, so that concurrent readers never see new key paired
+        # with old state
+        self._keys[index] = int(self._keys[index]) ^ _MASK_64
+        if state_bytes is not None:
+            self._states[index] = np.frombuffer(state_bytes, dtype=np.uint8)
+        self._data[index] = entry_data
+        self._keys[index] = state_hash ^ entry_data
+
+    @staticmethod
+    def _unpack_data(entry_data: int) -> TranspositionTableEntry:
+        depth = (entry_data >> 32) & _MASK_32
+        value = entry_data & _MASK_32
+        return TranspositionTableEntry(
+            depth=depth - (1 << 32) if depth & _SIGN_32 else depth,
+            value=value - (1 << 32) if value & _SIGN_32 else value,
+        )
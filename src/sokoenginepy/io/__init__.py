@@ -2,7 +2,14 @@
 I/O and text processing.
 """
 
+from .binary_collection import (
+    BinaryCollectionReader,
+    BinaryCollectionWriter,
+    BinaryCompression,
+)
 from .collection import Collection
 from .puzzle import Puzzle
+from .puzzle_fingerprint import CanonicalBoard
 from .rle import Rle
 from .snapshot import Snapshot
+from .sok_file_format import SOKWriter
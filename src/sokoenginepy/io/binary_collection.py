@@ -0,0 +1,518 @@
+from __future__ import annotations
+
+import enum
+import io
+import lzma
+import struct
+import zlib
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..common import Characters, Tessellation
+from .puzzle import Puzzle
+from .snapshot import Snapshot, _packed_steps_table
+from .snapshot_parsing import Steps
+
+if TYPE_CHECKING:
+    from .collection import Collection
+
+
+class BinaryCompression(enum.IntEnum):
+    """
+    Compression of puzzle blocks in binary collection, see
+    `.Collection.dump_binary`.
+    """
+
+    NONE = 0
+    ZLIB = 1
+    LZMA = 2
+
+
+# Layout of binary collection (all integers are little endian):
+#
+#   file:       MAGIC, u8 VERSION, collection metadata, puzzle blocks, offsets table,
+#               trailer
+#   metadata:   str title, author, created_at, updated_at, notes, tags
+#   tags:       u32 count, (str tag, str value) * count, one for each tag value
+#   str:        u32 length, UTF-8 bytes
+#   block:      u8 compression, u32 length, puzzle (compressed if compression != 0)
+#   puzzle:     u8 tessellation, u8 board encoding, board, str title, author,
+#               boxorder, goalorder, notes, tags, u32 snapshots count, snapshots
+#   board:      u32 width, u32 height, 4-bit cell codes, two cells per byte
+#               or str board if board couldn't be parsed or rebuilt from cells
+#   snapshot:   str title, solver, notes, tags, u8 moves encoding, moves
+#   moves:      u32 steps count, `.PusherStep.packed` steps, one byte per step
+#               or str moves_data if snapshot couldn't be parsed or rebuilt from
+#               steps
+#   offsets:    u64 offset of each puzzle block from start of file
+#   trailer:    u64 puzzles count, u64 offset of offsets table, MAGIC
+MAGIC: Final[bytes] = b"SOKB"
+VERSION: Final[int] = 1
+
+_U8: Final[struct.Struct] = struct.Struct("<B")
+_U32: Final[struct.Struct] = struct.Struct("<I")
+_SIZE: Final[struct.Struct] = struct.Struct("<II")
+_BLOCK_HEADER: Final[struct.Struct] = struct.Struct("<BI")
+_TRAILER: Final[struct.Struct] = struct.Struct("<QQ4s")
+
+_TESSELLATIONS: Final[Tuple[Tessellation, ...]] = (
+    Tessellation.SOKOBAN,
+    Tessellation.HEXOBAN,
+    Tessellation.TRIOBAN,
+    Tessellation.OCTOBAN,
+)
+
+# Code of each board cell is index of its character in this string
+_CELLS: Final[bytes] = "".join(
+    [
+        Characters.VISIBLE_FLOOR,
+        Characters.WALL,
+        Characters.PUSHER,
+        Characters.PUSHER_ON_GOAL,
+        Characters.BOX,
+        Characters.BOX_ON_GOAL,
+        Characters.GOAL,
+        Characters.FLOOR,
+        Characters.ALT_PUSHER1,
+        Characters.ALT_PUSHER2,
+        Characters.ALT_PUSHER_ON_GOAL1,
+        Characters.ALT_PUSHER_ON_GOAL2,
+        Characters.ALT_BOX1,
+        Characters.ALT_BOX_ON_GOAL1,
+        Characters.ALT_GOAL1,
+        Characters.ALT_VISIBLE_FLOOR1,
+    ]
+).encode("ascii")
+_NOT_A_CELL: Final[int] = 0xFF
+_CELL_CODES: Final[bytes] = bytes(
+    _CELLS.index(_) if _ in _CELLS else _NOT_A_CELL for _ in range(256)
+)
+# Two cells for each byte of packed board
+_CELL_PAIRS: Final[List[bytes]] = [
+    bytes((_CELLS[_ >> 4], _CELLS[_ & 0x0F])) for _ in range(256)
+]
+
+_PARSED: Final[int] = 0
+_TEXT: Final[int] = 1
+# Packed steps of reverse snapshot whose moves start with empty jump, which is lost
+# in pusher steps
+_PARSED_WITH_EMPTY_JUMP: Final[int] = 2
+
+_EMPTY_JUMP: Final[str] = Characters.JUMP_BEGIN + Characters.JUMP_END
+
+
+class _PackedMoves:
+    """
+    Conversion between packed steps and snapshot strings.
+
+    Snapshots that are only moves and pushes (which are most of snapshots) are
+    translated directly, one character per packed step, without building
+    :class:`.PusherStep` for each step.
+    """
+
+    _INSTANCES: Dict[Tessellation, _PackedMoves] = {}
+
+    def __init__(self, tessellation: Tessellation):
+        self.tessellation = tessellation
+        chars, values, plain = bytearray(256), bytearray(256), bytearray()
+        for value, token in enumerate(_packed_steps_table(tessellation)):
+            if token is not None and token[0] is Steps and len(token[1]) == 1:
+                chars[value] = ord(token[1])
+                values[chars[value]] = value
+                plain.append(value)
+        self._chars = bytes(chars)
+        self._values = bytes(values)
+        self._plain_values = bytes(plain)
+        self._plain_chars = bytes(plain).translate(self._chars)
+
+    @classmethod
+    def instance(cls, tessellation: Tessellation) -> _PackedMoves:
+        retv = cls._INSTANCES.get(tessellation, None)
+        if retv is None:
+            retv = cls._INSTANCES[tessellation] = cls(tessellation)
+        return retv
+
+    def to_packed(self, snapshot: Snapshot) -> bytes:
+        """
+        Raises:
+            ValueError: ``snapshot`` is not valid
+        """
+        moves_data = snapshot.to_str().encode("ascii")
+        if not moves_data.translate(None, self._plain_chars):
+            return moves_data.translate(self._values)
+        return bytes(_.packed() for _ in snapshot.iter_pusher_steps())
+
+    def to_moves_data(self, packed: bytes) -> str:
+        """
+        Raises:
+            ValueError: ``packed`` contains invalid values
+        """
+        if not packed.translate(None, self._plain_values):
+            return packed.translate(self._chars).decode("ascii")
+
+        snapshot = Snapshot(self.tessellation)
+        snapshot.pusher_steps = packed
+        return snapshot.moves_data
+
+
+class _BlockWriter:
+    def __init__(self):
+        self.data = bytearray()
+
+    def u8(self, value: int):
+        self.data += _U8.pack(value)
+
+    def u32(self, value: int):
+        self.data += _U32.pack(value)
+
+    def str(self, value: Optional[str]):
+        encoded = (value or "").encode("utf-8")
+        self.data += _U32.pack(len(encoded))
+        self.data += encoded
+
+    def bytes(self, value: bytes):
+        self.data += _U32.pack(len(value))
+        self.data += value
+
+    def tags(self, tags: Dict[str, List[str]]):
+        self.u32(sum(len(_) for _ in tags.values()))
+        for tag, values in tags.items():
+            for value in values:
+                self.str(tag)
+                self.str(value)
+
+
+class _BlockReader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def u8(self) -> int:
+        retv = self.data[self.offset]
+        self.offset += 1
+        return retv
+
+    def u32(self) -> int:
+        (retv,) = _U32.unpack_from(self.data, self.offset)
+        self.offset += _U32.size
+        return retv
+
+    def bytes(self, length: Optional[int] = None) -> bytes:
+        if length is None:
+            length = self.u32()
+        end = self.offset + length
+        if end > len(self.data):
+            raise ValueError("Binary collection data is truncated!")
+        retv = bytes(self.data[self.offset : end])
+        self.offset = end
+        return retv
+
+    def str(self) -> str:
+        return self.bytes().decode("utf-8")
+
+    def tags(self) -> Dict[str, List[str]]:
+        count = self.u32()
+        retv: Dict[str, List[str]] = {}
+        for _ in range(count):
+            tag = self.str()
+            retv.setdefault(tag, []).append(self.str())
+        return retv
+
+
+class BinaryCollectionWriter:
+    """
+    Writes collection in binary format.
+
+    Boards are stored as 4-bit codes of their cells and snapshots as one byte per
+    pusher step, so loading them back doesn't need any text parsing. Board and
+    moves that can't be parsed, or that wouldn't be rebuilt exactly the same from
+    cells and steps, are stored as text.
+
+    Arguments:
+        dest: destination stream, opened in binary mode
+        compression: compression of each puzzle block. Block is stored
+            uncompressed if compression doesn't make it smaller.
+    """
+
+    def __init__(
+        self, dest: BinaryIO, compression: BinaryCompression = BinaryCompression.NONE
+    ):
+        self.dest = dest
+        self.compression = BinaryCompression(compression)
+        self._offset = 0
+        self._offsets = array("Q")
+
+    def write(self, src: Collection):
+        self.write_header(src)
+        for puzzle in src.puzzles:
+            self.write_puzzle(puzzle)
+        self.close()
+
+    def write_header(self, src: Collection):
+        block = _BlockWriter()
+        block.data += MAGIC
+        block.u8(VERSION)
+        block.str(src.title)
+        block.str(src.author)
+        block.str(src.created_at)
+        block.str(src.updated_at)
+        block.str(src.notes)
+        block.tags(src.tags)
+        self._write(block.data)
+
+    def write_puzzle(self, puzzle: Puzzle):
+        block = _BlockWriter()
+        block.u8(_TESSELLATIONS.index(puzzle.tessellation))
+        self._write_board(block, puzzle)
+        block.str(puzzle.title)
+        block.str(puzzle.author)
+        block.str(puzzle.boxorder)
+        block.str(puzzle.goalorder)
+        block.str(puzzle.notes)
+        block.tags(puzzle.tags)
+
+        block.u32(len(puzzle.snapshots))
+        for snapshot in puzzle.snapshots:
+            self._write_snapshot(block, snapshot)
+
+        data = bytes(block.data)
+        compression = self.compression
+        if compression == BinaryCompression.ZLIB:
+            compressed = zlib.compress(data)
+        elif compression == BinaryCompression.LZMA:
+            compressed = lzma.compress(data)
+        else:
+            compressed = data
+        if len(compressed) >= len(data):
+            compression, compressed = BinaryCompression.NONE, data
+
+        self._offsets.append(self._offset)
+        self._write(_BLOCK_HEADER.pack(compression, len(compressed)))
+        self._write(compressed)
+
+    def close(self):
+        """Writes offsets table and trailer."""
+        table_offset = self._offset
+        self._write(self._offsets.tobytes())
+        self._write(_TRAILER.pack(len(self._offsets), table_offset, MAGIC))
+        self._offsets = array("Q")
+
+    def _write(self, data: Union[bytes, bytearray]):
+        self.dest.write(data)
+        self._offset += len(data)
+
+    @staticmethod
+    def _write_board(block: _BlockWriter, puzzle: Puzzle):
+        try:
+            width, height = puzzle.width, puzzle.height
+            cells = puzzle.internal_board.encode("ascii")
+            codes = cells.translate(_CELL_CODES)
+        except ValueError:
+            codes = None
+
+        if (
+            codes is None
+            or _NOT_A_CELL in codes
+            # Board rebuilt from cells must be written the same as original (it
+            # isn't for ie. Hexoban boards or boards using alternative floor)
+            or Puzzle._from_internal_board(
+                puzzle.tessellation, width, height, cells
+            ).board.rstrip()
+            != puzzle.board.rstrip()
+        ):
+            block.u8(_TEXT)
+            block.str(puzzle.board)
+            return
+
+        if len(codes) % 2:
+            codes += b"\0"
+        block.u8(_PARSED)
+        block.data += _SIZE.pack(width, height)
+        block.data += bytes(
+            high << 4 | low for high, low in zip(codes[0::2], codes[1::2])
+        )
+
+    @staticmethod
+    def _write_snapshot(block: _BlockWriter, snapshot: Snapshot):
+        block.str(snapshot.title)
+        block.str(snapshot.solver)
+        block.str(snapshot.notes)
+        block.tags(snapshot.tags)
+
+        try:
+            moves = _PackedMoves.instance(snapshot.tessellation)
+            packed = moves.to_packed(snapshot)
+            # Snapshot rebuilt from packed steps must be the same as original, so
+            # RLE encoded, wrapped or otherwise formatted moves are kept as text
+            expected = snapshot.moves_data
+            actual = moves.to_moves_data(packed)
+        except ValueError:
+            packed = None
+
+        if packed is None:
+            block.u8(_TEXT)
+            block.str(snapshot.moves_data)
+        elif actual == expected:
+            block.u8(_PARSED)
+            block.bytes(packed)
+        elif _EMPTY_JUMP + actual == expected:
+            block.u8(_PARSED_WITH_EMPTY_JUMP)
+            block.bytes(packed)
+        else:
+            block.u8(_TEXT)
+            block.str(snapshot.moves_data)
+
+
+class BinaryCollectionReader:
+    """
+    Reads collection written by :class:`BinaryCollectionWriter`.
+
+    Puzzles are read on demand, using offsets table, so any puzzle can be loaded
+    without reading the ones before it.
+
+    Arguments:
+        src: source stream opened in binary mode. Must be seekable.
+
+    Raises:
+        ValueError: ``src`` doesn't contain binary collection
+    """
+
+    def __init__(self, src: BinaryIO):
+        self.src = src
+
+        src.seek(0, io.SEEK_END)
+        size = src.tell()
+        if size < len(MAGIC) + 1 + _TRAILER.size:
+            raise ValueError("Not a binary collection!")
+
+        src.seek(size - _TRAILER.size)
+        count, table_offset, magic = _TRAILER.unpack(src.read(_TRAILER.size))
+        src.seek(0)
+        if magic != MAGIC or src.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a binary collection!")
+        version = src.read(1)[0]
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary collection version {version}!")
+
+        table_end = table_offset + count * 8
+        if table_end != size - _TRAILER.size:
+            raise ValueError("Binary collection data is corrupted!")
+
+        self._header_offset = src.tell()
+        src.seek(table_offset)
+        self._offsets = array("Q")
+        self._offsets.frombytes(src.read(count * 8))
+        self._ends = self._offsets[1:]
+        self._ends.append(table_offset)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> Puzzle:
+        count = len(self._offsets)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(f"Puzzle index {index} is out of range!")
+        return self._read_puzzle(index)
+
+    def __iter__(self) -> Iterator[Puzzle]:
+        for index in range(len(self._offsets)):
+            yield self._read_puzzle(index)
+
+    def read(self, dest: Collection):
+        self.read_header(dest)
+        dest.puzzles = list(self)
+
+    def read_header(self, dest: Collection):
+        self.src.seek(self._header_offset)
+        length = (self._offsets[0] if self._offsets else self._ends[-1]) - (
+            self._header_offset
+        )
+        block = _BlockReader(self.src.read(length))
+        dest.title = block.str()
+        dest.author = block.str()
+        dest.created_at = block.str()
+        dest.updated_at = block.str()
+        dest.notes = block.str()
+        dest.tags = block.tags()
+
+    def _read_puzzle(self, index: int) -> Puzzle:
+        start = self._offsets[index]
+        self.src.seek(start)
+        data = self.src.read(self._ends[index] - start)
+        compression, length = _BLOCK_HEADER.unpack_from(data)
+        data = data[_BLOCK_HEADER.size : _BLOCK_HEADER.size + length]
+        if len(data) != length:
+            raise ValueError("Binary collection data is truncated!")
+
+        if compression == BinaryCompression.ZLIB:
+            data = zlib.decompress(data)
+        elif compression == BinaryCompression.LZMA:
+            data = lzma.decompress(data)
+        elif compression != BinaryCompression.NONE:
+            raise ValueError(f"Unknown compression {compression}!")
+
+        block = _BlockReader(data)
+        code = block.u8()
+        if code >= len(_TESSELLATIONS):
+            raise ValueError(f"Unknown tessellation {code}!")
+        tessellation = _TESSELLATIONS[code]
+        retv = self._read_board(block, tessellation)
+        retv.title = block.str()
+        retv.author = block.str()
+        retv.boxorder = block.str()
+        retv.goalorder = block.str()
+        retv.notes = block.str()
+        retv.tags = block.tags()
+
+        for _ in range(block.u32()):
+            retv.snapshots.append(self._read_snapshot(block, tessellation))
+
+        return retv
+
+    @staticmethod
+    def _read_board(block: _BlockReader, tessellation: Tessellation) -> Puzzle:
+        encoding = block.u8()
+        if encoding == _TEXT:
+            return Puzzle(tessellation, board=block.str())
+
+        width, height = _SIZE.unpack(block.bytes(_SIZE.size))
+        size = width * height
+        cells = b"".join(_CELL_PAIRS[_] for _ in block.bytes((size + 1) // 2))[:size]
+        return Puzzle._from_internal_board(tessellation, width, height, cells)
+
+    @staticmethod
+    def _read_snapshot(block: _BlockReader, tessellation: Tessellation) -> Snapshot:
+        title = block.str()
+        solver = block.str()
+        notes = block.str()
+        tags = block.tags()
+
+        encoding = block.u8()
+        if encoding == _TEXT:
+            moves_data = block.str()
+        else:
+            moves_data = _PackedMoves.instance(tessellation).to_moves_data(
+                block.bytes()
+            )
+            if encoding == _PARSED_WITH_EMPTY_JUMP:
+                moves_data = _EMPTY_JUMP + moves_data
+
+        retv = Snapshot(tessellation, moves_data)
+
+        retv.title = title
+        retv.solver = solver
+        retv.notes = notes
+        retv.tags = tags
+        return retv
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import io
+import multiprocessing
 from pathlib import Path
-from typing import List, Union
+from typing import Dict, Iterable, List, Union
 
 from ..common import Tessellation
+from .binary_collection import (
+    BinaryCollectionReader,
+    BinaryCollectionWriter,
+    BinaryCompression,
+)
 from .puzzle import Puzzle
+from .puzzle_fingerprint import _board_fingerprint
+from .snapshot import Snapshot
 from .sok_file_format import SOKFileFormat
 
 
@@ -19,6 +27,9 @@ class Collection:
         created_at (str): datetime string of unspecified format (it is not parsed)
         updated_at (str): datetime string of unspecified format (it is not parsed)
         notes (str): collection notes
+        tags (Dict[str, List[str]]): values of tagged lines at the start of
+            collection notes, whose tags are not recognized by loader, if collection
+            was loaded with ``keep_unknown_tags=True``
         puzzles (List[Puzzle]): collection puzzles
     """
 
@@ -35,6 +46,7 @@ class Collection:
         self.created_at: str = created_at
         self.updated_at: str = updated_at
         self.notes: str = notes
+        self.tags: Dict[str, List[str]] = {}
         self.puzzles: List[Puzzle] = []
 
     def load(
@@ -49,6 +61,7 @@ class Collection:
             io.BytesIO,
         ],
         tessellation_hint: Tessellation = Tessellation.SOKOBAN,
+        keep_unknown_tags: bool = False,
     ):
         """
         Loads collection from ``src``.
@@ -61,17 +74,24 @@ class Collection:
             src: source file path or input stream object
             tessellation_hint: If puzzles in file don't specify their game tessellation
                 assume this value.
+            keep_unknown_tags: If True, ``Tag: value`` lines (ie.
+                ``Time: 00:01:00``) with tags that are not recognized and that are
+                at the start of notes of collection, puzzle or snapshot are stored
+                in its ``tags`` instead of being left in its ``notes``. Values of
+                repeated tags are kept in order. :meth:`dump` writes them back
+                before notes, so none of them are lost or reordered.
         """
         if isinstance(src, (str, Path)):
             with open(src, "r") as f:
-                SOKFileFormat.read(f, self, tessellation_hint)
+                SOKFileFormat.read(f, self, tessellation_hint, keep_unknown_tags)
         else:
-            SOKFileFormat.read(src, self, tessellation_hint)
+            SOKFileFormat.read(src, self, tessellation_hint, keep_unknown_tags)
 
     def loads(
         self,
         data: Union[str, bytes],
         tessellation_hint: Tessellation = Tessellation.SOKOBAN,
+        keep_unknown_tags: bool = False,
     ):
         """
         Loads collections from ``data``.
@@ -80,11 +100,12 @@ class Collection:
             data: raw collection data
             tessellation_hint: If puzzles in file don't specify their game tessellation
                 assume this value.
+            keep_unknown_tags: See :meth:`load`.
         """
         if isinstance(data, bytes):
             data = data.decode(encoding="utf-8")
         f = io.StringIO(data)
-        self.load(f, tessellation_hint)
+        self.load(f, tessellation_hint, keep_unknown_tags)
 
     def dump(
         self,
@@ -113,8 +134,137 @@ class Collection:
         else:
             SOKFileFormat.write(self, dst)
 
+    @staticmethod
+    def append_puzzles(path: Union[str, Path], puzzles: Iterable[Puzzle]):
+        """
+        Appends ``puzzles`` to existing SokobanYASC .sok file without loading and
+        rewriting puzzles that are already in it.
+
+        File is replaced atomically: new content is written to temporary file in
+        the same directory, which then replaces ``path``.
+        """
+        SOKFileFormat.append_puzzles(path, puzzles)
+
+    @staticmethod
+    def append_snapshots(
+        path: Union[str, Path], puzzle_index: int, snapshots: Iterable[Snapshot]
+    ):
+        """
+        Inserts ``snapshots`` into existing SokobanYASC .sok file, after existing
+        snapshots of puzzle with ``puzzle_index``.
+
+        File is not loaded. Instead, lightweight index of puzzles positions in it is
+        built and only inserted snapshots are serialized. File is replaced
+        atomically, as in :meth:`append_puzzles`.
+
+        Note:
+            If puzzle that follows ``puzzle_index`` doesn't have title line, last
+            notes line of inserted snapshots is read as its title. The same happens
+            when such collection is written by :meth:`dump`.
+
+        Raises:
+            IndexError: there is no puzzle with ``puzzle_index`` in file
+        """
+        SOKFileFormat.append_snapshots(path, puzzle_index, snapshots)
+
     def dumps(self) -> str:
         """Saves collection to `str`."""
         out = io.StringIO()
         self.dump(out)
         return out.getvalue()
+
+    def load_binary(self, src: Union[str, Path, io.BufferedReader, io.BytesIO]):
+        """
+        Loads collection saved by :meth:`dump_binary`.
+
+        Arguments:
+            src: source file path or seekable binary input stream object
+
+        Raises:
+            ValueError: ``src`` doesn't contain binary collection
+        """
+        if isinstance(src, (str, Path)):
+            with open(src, "rb") as f:
+                BinaryCollectionReader(f).read(self)
+        else:
+            BinaryCollectionReader(src).read(self)
+
+    def dump_binary(
+        self,
+        dst: Union[str, Path, io.BufferedWriter, io.BytesIO],
+        compression: BinaryCompression = BinaryCompression.NONE,
+    ):
+        """
+        Saves collection to ``dst`` in compact binary format.
+
+        Board cells are stored as 4-bit codes and snapshots as one byte per step, so
+        loading doesn't need to parse them. Offsets table at the end of file gives
+        random access to each puzzle (see :class:`.BinaryCollectionReader`).
+
+        Saving to binary format and back to .sok is lossless: :meth:`dumps` of
+        loaded collection is the same as of original one. Boards and snapshots that
+        wouldn't be rebuilt exactly the same from packed cells and steps (ie.
+        Hexoban boards or RLE encoded moves) are stored as text.
+
+        Arguments:
+            dst: Path to destination file or binary destination stream object.
+            compression: Compression of each puzzle block. Blocks that wouldn't get
+                smaller are stored uncompressed.
+        """
+        if isinstance(dst, (str, Path)):
+            with open(dst, "wb") as f:
+                BinaryCollectionWriter(f, compression).write(self)
+        else:
+            BinaryCollectionWriter(dst, compression).write(self)
+
+    def fingerprints(self, workers: int = 1, mp_context=None) -> List[str]:
+        """
+        :meth:`.Puzzle.fingerprint` of each puzzle in collection.
+
+        Arguments:
+            workers: number of worker processes. If 1, everything runs in current
+                process.
+            mp_context: :mod:`multiprocessing` context used to start workers. Default
+                is default context of current platform.
+
+        Raises:
+            ValueError: ``workers`` < 1
+        """
+        if workers < 1:
+            raise ValueError("Fingerprinting needs at least one worker!")
+
+        if workers == 1:
+            return [puzzle.fingerprint() for puzzle in self.puzzles]
+
+        tasks = [
+            (puzzle.tessellation, puzzle.to_board_str(use_visible_floor=True))
+            for puzzle in self.puzzles
+        ]
+        mp_context = mp_context or multiprocessing.get_context()
+        with mp_context.Pool(workers) as pool:
+            return pool.starmap(
+                _board_fingerprint,
+                tasks,
+                chunksize=max(1, len(tasks) // (4 * workers)),
+            )
+
+    def duplicates(self, workers: int = 1, mp_context=None) -> List[List[int]]:
+        """
+        Groups puzzles that have equal :meth:`.Puzzle.fingerprint`.
+
+        Arguments:
+            workers: number of worker processes used to calculate fingerprints
+            mp_context: :mod:`multiprocessing` context used to start workers. Default
+                is default context of current platform.
+
+        Returns:
+            Groups of two or more indexes into :attr:`puzzles`, ordered by their first
+            index.
+
+        Raises:
+            ValueError: ``workers`` < 1
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, fingerprint in enumerate(self.fingerprints(workers, mp_context)):
+            groups.setdefault(fingerprint, []).append(index)
+        return [group for group in groups.values() if len(group) > 1]
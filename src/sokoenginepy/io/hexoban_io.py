@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 from ..common import Characters, index_1d, index_x, index_y
 from .puzzle_parsing import PuzzleParser, PuzzlePrinter, PuzzleResizer
-from .rle import Rle
 
 
 class HexobanIo:
@@ -24,30 +23,24 @@ class HexobanIo:
 class HexobanTextConverter:
     def convert_to_string(
         self,
-        parsed_board: List[str],
+        parsed_board: bytearray,
         width: int,
         height: int,
         use_visible_floor: bool,
     ) -> str:
         floor = Characters.VISIBLE_FLOOR if use_visible_floor else Characters.FLOOR
+        table = PuzzlePrinter.translation_table(use_visible_floor)
 
+        # Each cell is printed preceded by floor character
+        line = bytearray(floor.encode("ascii") * (2 * width))
         retv: List[str] = []
         for row in range(0, height):
-            line = ""
+            line[1::2] = parsed_board[row * width : (row + 1) * width].translate(table)
             if row % 2 == 1:
                 # beginning half hex for odd rows
-                line += floor
-
-            for col in range(0, width):
-                puzzle_char = parsed_board[index_1d(col, row, width)]
-
-                line += floor
-                if Characters.is_empty_floor(puzzle_char):
-                    line += floor
-                else:
-                    line += puzzle_char
-
-            retv.append(line)
+                retv.append(floor + line.decode("ascii"))
+            else:
+                retv.append(line.decode("ascii"))
 
         retv = PuzzleParser.normalize_width(retv, floor)
         if self.is_type1(retv):
@@ -298,20 +291,20 @@ class HexobanTextConverter:
 
 
 class HexobanPuzzlePrinter(PuzzlePrinter):
-    def print(
+    def rows(
         self,
-        parsed_board: List[str],
+        parsed_board: bytearray,
         width: int,
         height: int,
         use_visible_floor: bool,
-        rle_encode: bool,
-    ) -> str:
-        retv = HexobanTextConverter().convert_to_string(
-            parsed_board, width, height, use_visible_floor
+    ) -> Iterable[str]:
+        if height == 0:
+            return []
+        return (
+            HexobanTextConverter()
+            .convert_to_string(parsed_board, width, height, use_visible_floor)
+            .split("\n")
         )
-        if rle_encode:
-            return Rle.encode(retv)
-        return retv
 
 
 class HexobanPuzzleParser(PuzzleParser):
@@ -329,9 +322,81 @@ class HexobanPuzzleParser(PuzzleParser):
 
 
 class HexobanPuzzleResizer(PuzzleResizer):
+    """
+    Adding or removing rows on top of Hexoban board changes parity of all other rows
+    and removing rows on bottom can change textual layout scheme. These are done on
+    textual representation of board, in single round-trip for any number of rows.
+    Columns and rows added on bottom are handled as for other tessellations.
+    """
+
+    def reframe(
+        self,
+        parsed_board: bytearray,
+        width: int,
+        height: int,
+        left: int = 0,
+        top: int = 0,
+        right: int = 0,
+        bottom: int = 0,
+    ) -> Tuple[bytearray, int, int]:
+        if left != 0:
+            parsed_board, width, height = super().reframe(
+                parsed_board, width, height, left=left
+            )
+
+        if top != 0 or bottom < 0:
+            converter = HexobanTextConverter()
+            printed_board = converter.convert_to_string(
+                parsed_board, width, height, True
+            ).splitlines()
+
+            if top > 0:
+                printed_board = (
+                    top
+                    * [
+                        HexobanPuzzleParser.calculate_width(printed_board)
+                        * Characters.VISIBLE_FLOOR
+                    ]
+                    + printed_board
+                )
+            elif top < 0:
+                printed_board = printed_board[-top:]
+            if bottom < 0:
+                printed_board = printed_board[: max(0, len(printed_board) + bottom)]
+
+            parsed_board, width, height = self._to_internal(converter, printed_board)
+
+        return super().reframe(
+            parsed_board, width, height, right=right, bottom=max(0, bottom)
+        )
+
+    def trim(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        # Trimming rows can change layout scheme and with it width of board, so blank
+        # columns can be found only after rows had been trimmed
+        parsed_board, width, height = self.trim_top(parsed_board, width, height)
+        parsed_board, width, height = self.trim_bottom(parsed_board, width, height)
+        parsed_board, width, height = self.trim_left(parsed_board, width, height)
+        return self.trim_right(parsed_board, width, height)
+
+    def trim_right(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        parsed_board, width, height = self.reverse_columns(parsed_board, width, height)
+        parsed_board, width, height = self.trim_left(parsed_board, width, height)
+        return self.reverse_columns(parsed_board, width, height)
+
+    def trim_bottom(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        parsed_board, width, height = self.reverse_rows(parsed_board, width, height)
+        parsed_board, width, height = self.trim_top(parsed_board, width, height)
+        return self.reverse_rows(parsed_board, width, height)
+
     def reverse_columns(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
         converter = HexobanTextConverter()
 
         printed_board = converter.convert_to_string(
@@ -346,59 +411,18 @@ class HexobanPuzzleResizer(PuzzleResizer):
         printed_board = converter.reverse_columns(printed_board)
         printed_board = converter.remove_column_right(printed_board)
 
-        new_parsed_board, _ = converter.convert_to_internal("\n".join(printed_board))
-        new_width = len(new_parsed_board[0]) if new_parsed_board else 0
-        new_height = len(new_parsed_board)
-
-        return list("".join(new_parsed_board)), new_width, new_height
-
-    def add_row_top(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        converter = HexobanTextConverter()
-
-        printed_board = converter.convert_to_string(
-            parsed_board, width, height, True
-        ).splitlines()
-
-        printed_board = converter.add_row_top(printed_board)
-
-        new_parsed_board, _ = converter.convert_to_internal("\n".join(printed_board))
-        new_width = len(new_parsed_board[0]) if new_parsed_board else 0
-        new_height = len(new_parsed_board)
-
-        return list("".join(new_parsed_board)), new_width, new_height
-
-    def remove_row_top(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        converter = HexobanTextConverter()
-
-        printed_board = converter.convert_to_string(
-            parsed_board, width, height, True
-        ).splitlines()
-
-        printed_board = converter.remove_row_top(printed_board)
-
-        new_parsed_board, _ = converter.convert_to_internal("\n".join(printed_board))
-        new_width = len(new_parsed_board[0]) if new_parsed_board else 0
-        new_height = len(new_parsed_board)
-
-        return list("".join(new_parsed_board)), new_width, new_height
-
-    def remove_row_bottom(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        converter = HexobanTextConverter()
-
-        printed_board = converter.convert_to_string(
-            parsed_board, width, height, True
-        ).splitlines()
-
-        printed_board = converter.remove_row_bottom(printed_board)
+        return self._to_internal(converter, printed_board)
 
+    @staticmethod
+    def _to_internal(
+        converter: HexobanTextConverter, printed_board: List[str]
+    ) -> Tuple[bytearray, int, int]:
         new_parsed_board, _ = converter.convert_to_internal("\n".join(printed_board))
         new_width = len(new_parsed_board[0]) if new_parsed_board else 0
         new_height = len(new_parsed_board)
 
-        return list("".join(new_parsed_board)), new_width, new_height
+        return (
+            bytearray("".join(new_parsed_board).encode("ascii")),
+            new_width,
+            new_height,
+        )
@@ -3,7 +3,7 @@ from __future__ import annotations
 import textwrap
 from functools import reduce
 from operator import add
-from typing import Final, List, Optional
+from typing import Dict, Final, List, Optional, TextIO
 
 from ..common import (
     TileShape,
@@ -14,6 +14,7 @@ from ..common import (
 )
 from .hexoban_io import HexobanIo
 from .octoban_io import OctobanIo
+from .puzzle_fingerprint import CanonicalBoard, canonical_board, fingerprint
 from .puzzle_parsing import PuzzleParser, PuzzlePrinter, PuzzleResizer
 from .snapshot import Snapshot
 from .sokoban_io import SokobanIo
@@ -52,6 +53,8 @@ class Puzzle:
     FLOOR: Final[str] = Characters.FLOOR
     VISIBLE_FLOOR: Final[str] = Characters.VISIBLE_FLOOR
 
+    _VISIBLE_FLOOR_BYTE: Final[bytes] = Characters.VISIBLE_FLOOR.encode("ascii")
+
     def __init__(
         self,
         tessellation: Tessellation,
@@ -70,6 +73,7 @@ class Puzzle:
         self.boxorder = ""
         self.goalorder = ""
         self.notes = ""
+        self.tags: Dict[str, List[str]] = {}
         self.snapshots: List[Snapshot] = []
 
         self._pushers_count: Optional[int] = None
@@ -83,9 +87,10 @@ class Puzzle:
         self._height: int
         self._was_parsed: bool
         self._original_board: str
-        # not str but list of single character strings. str is immutable and we need to
-        # be able to modify individual board cells.
-        self._parsed_board: List[str]
+        # not str but bytearray of ASCII board characters. str is immutable and we need
+        # to be able to modify individual board cells. List of single character strings
+        # would need ~50 bytes per cell.
+        self._parsed_board: bytearray
 
         if is_blank(board) or board is None:
             self._width = width
@@ -94,7 +99,7 @@ class Puzzle:
                 raise ValueError("Board dimensions can't be less than zero!")
             self._was_parsed = True
             self._original_board = ""
-            self._parsed_board = width * height * [self.VISIBLE_FLOOR]
+            self._parsed_board = bytearray(self._VISIBLE_FLOOR_BYTE * (width * height))
 
         else:
             if not Characters.is_board(board):
@@ -103,7 +108,29 @@ class Puzzle:
             self._height = 0
             self._was_parsed = False
             self._original_board = board
-            self._parsed_board = []
+            self._parsed_board = bytearray()
+
+    @classmethod
+    def _from_internal_board(
+        cls, tessellation: Tessellation, width: int, height: int, cells: bytes
+    ) -> Puzzle:
+        """
+        Creates puzzle from already parsed board cells (see :attr:`internal_board`),
+        skipping board parsing.
+        """
+        if len(cells) != width * height:
+            raise ValueError("Board cells don't match board dimensions!")
+        retv = cls(tessellation, width, height)
+        retv._parsed_board = bytearray(cells)
+
+        # Trailing floor is dropped, unless that would make board narrower or shorter
+        # when it is parsed again
+        lines = retv.to_board_str().split("\n")
+        stripped = [_.rstrip() for _ in lines]
+        if stripped[-1] and max(map(len, stripped)) == max(map(len, lines)):
+            lines = stripped
+        retv._original_board = "\n".join(lines)
+        return retv
 
     @property
     def tessellation(self) -> Tessellation:
@@ -129,7 +156,7 @@ class Puzzle:
             raise IndexError(f"Position {position} is invalid value!")
 
         self._reparse_if_not_parsed()
-        return self._parsed_board[position]
+        return chr(self._parsed_board[position])
 
     def __setitem__(self, position: int, c: str):
         if position < 0:
@@ -139,7 +166,7 @@ class Puzzle:
             raise ValueError(f"'{c}' is not a board character!")
 
         self._reparse_if_not_parsed()
-        self._parsed_board[position] = c
+        self._parsed_board[position] = ord(c)
 
     def __contains__(self, position: int):
         self._reparse_if_not_parsed()
@@ -170,6 +197,21 @@ class Puzzle:
             self._parsed_board, self.width, self.height, use_visible_floor, rle_encode
         )
 
+    def write_board(self, stream: TextIO, use_visible_floor=False, rle_encode=False):
+        """
+        Writes the same output as `to_board_str` into text ``stream``, without
+        building whole string first.
+        """
+        self._reparse_if_not_parsed()
+        self._printer.write(
+            stream,
+            self._parsed_board,
+            self.width,
+            self.height,
+            use_visible_floor,
+            rle_encode,
+        )
+
     @property
     def board(self) -> str:
         """Original, unparsed board."""
@@ -189,7 +231,7 @@ class Puzzle:
     def internal_board(self) -> str:
         """Internal, parsed board. For debugging purposes."""
         self._reparse_if_not_parsed()
-        return "".join(self._parsed_board)
+        return self._parsed_board.decode("ascii")
 
     @property
     def width(self) -> int:
@@ -348,28 +390,9 @@ class Puzzle:
             raise ValueError(f"Board height {new_height} is invalid value!")
 
         self._reparse_if_not_parsed()
-        old_width = self.width
-        old_height = self.height
-
-        if new_height != old_height:
-            if new_height > old_height:
-                amount = new_height - old_height
-                for _ in range(0, amount):
-                    self.add_row_bottom()
-            else:
-                amount = old_height - new_height
-                for _ in range(0, amount):
-                    self.remove_row_bottom()
-
-        if new_width != old_width:
-            if new_width > old_width:
-                amount = new_width - old_width
-                for _ in range(0, amount):
-                    self.add_column_right()
-            else:
-                amount = old_width - new_width
-                for _ in range(0, amount):
-                    self.remove_column_right()
+        self._parsed_board, self._width, self._height = self._resizer.resize(
+            self._parsed_board, self._width, self._height, new_width, new_height
+        )
 
     def resize_and_center(self, new_width: int, new_height: int):
         """
@@ -395,13 +418,9 @@ class Puzzle:
             bottom = new_height - self.height - top
 
         if (left, right, top, bottom) != (0, 0, 0, 0):
-            for _ in range(0, left):
-                self.add_column_left()
-            for _ in range(0, top):
-                self.add_row_top()
-
-            if (right, bottom) != (0, 0):
-                self.resize(self.width + right, self.height + bottom)
+            self._parsed_board, self._width, self._height = self._resizer.reframe(
+                self._parsed_board, self._width, self._height, left, top, right, bottom
+            )
 
     def trim(self):
         """
@@ -409,20 +428,54 @@ class Puzzle:
 
         Removes outer, blank rows and columns.
         """
-        self.trim_top()
-        self.trim_bottom()
-        self.trim_left()
-        self.trim_right()
+        self._reparse_if_not_parsed()
+        self._parsed_board, self._width, self._height = self._resizer.trim(
+            self._parsed_board, self._width, self._height
+        )
+
+    def canonical_board(self) -> CanonicalBoard:
+        """
+        Board in form that is the same for all puzzles that differ only in layout.
+
+        Canonical board is created by:
+
+        - replacing everything outside of playable area (see
+          `.BoardGraph.mark_play_area`) with floor, except walls that border playable
+          area
+        - trimming blank rows and columns
+        - applying each of symmetries allowed by tessellation and choosing smallest
+          result
+
+        Allowed symmetries are rotations and mirroring for Sokoban and Octoban,
+        rotations by multiples of 60 degrees and mirroring for Hexoban and horizontal
+        and vertical mirroring for Trioban. All of them keep board geometry: the
+        same cells are neighbors in transformed board.
+
+        Because of that, Hexoban boards written in different text layouts also have
+        equal canonical boards.
+
+        Sokoban+ data, metadata and snapshots are ignored.
+        """
+        return canonical_board(self)
+
+    def fingerprint(self) -> str:
+        """
+        SHA-256 hex digest of :meth:`canonical_board` and tessellation.
+
+        Puzzles with equal fingerprints are duplicates of each other.
+        """
+        return fingerprint(self)
 
     def _reparse(self):
         if not is_blank(self._original_board):
             board_rows = self._parser.parse(self._original_board)
             self._height = len(board_rows)
             self._width = len(board_rows[0]) if self._height else 0
-            self._parsed_board = sum((list(_) for _ in board_rows), [])
-            for idx, val in enumerate(self._parsed_board):
-                if val == self.FLOOR:
-                    self._parsed_board[idx] = self.VISIBLE_FLOOR
+            self._parsed_board = bytearray(
+                "".join(board_rows)
+                .replace(self.FLOOR, self.VISIBLE_FLOOR)
+                .encode("ascii")
+            )
 
         self._was_parsed = True
 
@@ -456,12 +509,4 @@ class Puzzle:
 
     @property
     def _printer(self) -> PuzzlePrinter:
-        if self._tessellation == Tessellation.SOKOBAN:
-            return SokobanIo.printer()
-        if self._tessellation == Tessellation.TRIOBAN:
-            return TriobanIo.printer()
-        if self._tessellation == Tessellation.HEXOBAN:
-            return HexobanIo.printer()
-        if self._tessellation == Tessellation.OCTOBAN:
-            return OctobanIo.printer()
-        raise ValueError(f"Unknown tessellation {self._tessellation}")
+        return PuzzlePrinter.instance(self._tessellation)
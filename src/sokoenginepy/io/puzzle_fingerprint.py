@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Dict, NamedTuple, Tuple
+
+from ..common import (
+    BoardLattice,
+    Characters,
+    Tessellation,
+    index_column,
+    index_row,
+)
+
+if TYPE_CHECKING:
+    from .puzzle import Puzzle
+
+
+class CanonicalBoard(NamedTuple):
+    """
+    Canonical form of puzzle board, see :meth:`.Puzzle.canonical_board`.
+    """
+
+    width: int
+    height: int
+    #: Board cells in internal layout, row by row, using visible floor characters
+    cells: str
+
+
+def canonical_board(puzzle: Puzzle) -> CanonicalBoard:
+    """
+    Implementation of :meth:`.Puzzle.canonical_board`.
+    """
+    from ..game import BoardGraph
+
+    if puzzle.size == 0:
+        return CanonicalBoard(0, 0, "")
+
+    lattice = BoardLattice.instance(puzzle.tessellation)
+    width = puzzle.width
+
+    # Copy, so that marking play area doesn't change cells of ``puzzle``
+    board = BoardGraph(puzzle)
+    board.mark_play_area()
+
+    cells: Dict[Tuple[int, int], str] = {}
+    for position in range(board.size):
+        cell = board[position]
+        if cell.is_in_playable_area:
+            if cell.is_empty_floor:
+                continue
+        elif not (
+            cell.is_wall
+            and any(board[_].is_in_playable_area for _ in board.all_neighbors(position))
+        ):
+            continue
+        cells[(index_column(position, width), index_row(position, width))] = (
+            cell.to_str(use_visible_floor=True)
+        )
+
+    if not cells:
+        return CanonicalBoard(0, 0, "")
+
+    retv = None
+    for symmetry in lattice.symmetries:
+        transformed = {
+            image: cells[cell]
+            for cell, image in lattice.transform(symmetry, cells).items()
+        }
+        new_width = max(_[0] for _ in transformed) + 1
+        new_height = max(_[1] for _ in transformed) + 1
+        candidate = CanonicalBoard(
+            new_width,
+            new_height,
+            "".join(
+                transformed.get((column, row), Characters.VISIBLE_FLOOR)
+                for row in range(new_height)
+                for column in range(new_width)
+            ),
+        )
+        if retv is None or candidate < retv:
+            retv = candidate
+
+    return retv
+
+
+def fingerprint(puzzle: Puzzle) -> str:
+    """
+    Implementation of :meth:`.Puzzle.fingerprint`.
+    """
+    canonical = canonical_board(puzzle)
+    return hashlib.sha256(
+        (
+            f"{puzzle.tessellation.name}:{canonical.width}:{canonical.height}:"
+            f"{canonical.cells}"
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def _board_fingerprint(tessellation: Tessellation, board: str) -> str:
+    """
+    :func:`fingerprint` for plain data arguments, so that it can run in worker
+    processes.
+    """
+    from .puzzle import Puzzle
+
+    return fingerprint(Puzzle(tessellation, board=board))
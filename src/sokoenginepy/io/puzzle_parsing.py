@@ -1,278 +1,225 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import List, Tuple
+from typing import Final, Iterable, List, Optional, TextIO, Tuple
 
-from ..common import Characters, index_1d, is_blank
+from ..common import Characters, Tessellation, is_blank
 from .rle import Rle
 
+_VISIBLE_FLOOR = Characters.VISIBLE_FLOOR.encode("ascii")
 
-class PuzzleResizer:
-    def add_row_top(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-        old_height = height
+# Translation of parsed board cells: 1 for border elements, 0 for everything else
+_BORDER_MASK = bytes(
+    1 if Characters.is_border_element(chr(_)) else 0 for _ in range(256)
+)
 
-        new_height = height + 1
-        new_width = width
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
 
-        for x in range(0, new_width):
-            for y in range(0, old_height):
-                new_body[index_1d(x, y + 1, new_width)] = old_body[
-                    index_1d(x, y, new_width)
-                ]
+class PuzzleResizer:
+    """
+    Resizing of parsed boards.
 
-        return new_body, new_width, new_height
+    Parsed board is ``bytearray`` of board characters, row by row. All operations
+    return new board together with its new width and height. They copy whole rows
+    (or their parts) at once, so cost of each of them is proportional to board size
+    regardless of how many rows and columns are added or removed.
+    """
 
-    def add_row_bottom(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-        old_height = height
+    def reframe(
+        self,
+        parsed_board: bytearray,
+        width: int,
+        height: int,
+        left: int = 0,
+        top: int = 0,
+        right: int = 0,
+        bottom: int = 0,
+    ) -> Tuple[bytearray, int, int]:
+        """
+        Adds (positive amount) or removes (negative amount) given number of columns
+        and rows on each side of board, in single pass.
+
+        If all columns or all rows are removed, result is empty board.
+        """
+        new_width = width + left + right
+        new_height = height + top + bottom
+        if (new_width <= 0 and (left < 0 or right < 0)) or (
+            new_height <= 0 and (top < 0 or bottom < 0)
+        ):
+            return bytearray(), 0, 0
+
+        if left == 0 and right == 0 and top <= 0 and bottom <= 0:
+            return (
+                parsed_board[-top * width : (height + bottom) * width],
+                new_width,
+                new_height,
+            )
 
-        new_height = height + 1
-        new_width = width
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
+        new_body = bytearray(_VISIBLE_FLOOR * (new_width * new_height))
 
-        for x in range(0, new_width):
-            for y in range(0, old_height):
-                new_body[index_1d(x, y, new_width)] = old_body[
-                    index_1d(x, y, new_width)
-                ]
+        src_left = max(0, -left)
+        dst_left = max(0, left)
+        row_width = width - src_left - max(0, -right)
+        if row_width > 0:
+            for y in range(max(0, -top), height - max(0, -bottom)):
+                src = y * width + src_left
+                dst = (y + top) * new_width + dst_left
+                new_body[dst : dst + row_width] = parsed_board[src : src + row_width]
 
         return new_body, new_width, new_height
 
-    def add_column_left(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-        old_width = width
+    def resize(
+        self,
+        parsed_board: bytearray,
+        width: int,
+        height: int,
+        new_width: int,
+        new_height: int,
+    ) -> Tuple[bytearray, int, int]:
+        """
+        Adds or removes rows at the bottom of board and then columns on the right side
+        of it.
+        """
+        return self.reframe(
+            parsed_board,
+            width,
+            height,
+            right=new_width - width,
+            bottom=new_height - height,
+        )
 
-        new_height = height
-        new_width = width + 1
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
+    def add_row_top(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, top=1)
 
-        for x in range(0, old_width):
-            for y in range(0, new_height):
-                new_body[index_1d(x + 1, y, new_width)] = old_body[
-                    index_1d(x, y, old_width)
-                ]
+    def add_row_bottom(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, bottom=1)
 
-        return new_body, new_width, new_height
+    def add_column_left(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, left=1)
 
     def add_column_right(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-        old_width = width
-
-        new_height = height
-        new_width = width + 1
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, old_width):
-            for y in range(0, new_height):
-                new_body[index_1d(x, y, new_width)] = old_body[
-                    index_1d(x, y, old_width)
-                ]
-
-        return new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, right=1)
 
     def remove_row_top(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-
-        new_height = height - 1
-        new_width = width
-        if new_height <= 0:
-            return [], 0, 0
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, new_width):
-            for y in range(0, new_height):
-                new_body[index_1d(x, y, new_width)] = old_body[
-                    index_1d(x, y + 1, new_width)
-                ]
-
-        return new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, top=-1)
 
     def remove_row_bottom(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-
-        new_height = height - 1
-        new_width = width
-        if new_height <= 0:
-            return [], 0, 0
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, new_width):
-            for y in range(0, new_height):
-                new_body[index_1d(x, y, new_width)] = old_body[
-                    index_1d(x, y, new_width)
-                ]
-
-        return new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, bottom=-1)
 
     def remove_column_left(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-        old_width = width
-
-        new_height = height
-        new_width = width - 1
-        if new_width <= 0:
-            return [], 0, 0
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, new_width):
-            for y in range(0, new_height):
-                new_body[index_1d(x, y, new_width)] = old_body[
-                    index_1d(x + 1, y, old_width)
-                ]
-
-        return new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, left=-1)
 
     def remove_column_right(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = parsed_board
-        old_width = width
-
-        new_height = height
-        new_width = width - 1
-        if new_width <= 0:
-            return [], 0, 0
-        new_body = new_height * new_width * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, new_width):
-            for y in range(0, new_height):
-                new_body[index_1d(x, y, new_width)] = old_body[
-                    index_1d(x, y, old_width)
-                ]
-
-        return new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return self.reframe(parsed_board, width, height, right=-1)
+
+    @staticmethod
+    def border_box(
+        parsed_board: bytearray, width: int, height: int
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Number of blank columns and rows on each side of board: columns and rows that
+        don't contain any of border elements (see `.Characters.is_border_element`).
 
-    def trim_left(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        amount = width
-        for y in range(0, height):
-            border_found = False
-            for x in range(0, width):
-                border_found = Characters.is_border_element(
-                    parsed_board[index_1d(x, y, width)]
+        Returns:
+            ``(left, top, right, bottom)`` or None if board doesn't contain any
+            border elements
+        """
+        mask = parsed_board.translate(_BORDER_MASK)
+        first = mask.find(1)
+        if first < 0:
+            return None
+        last = mask.rfind(1)
+
+        left = width
+        right = width
+        for y in range(first // width, last // width + 1):
+            row_start = y * width
+            row_first = mask.find(1, row_start, row_start + width)
+            if row_first >= 0:
+                left = min(left, row_first - row_start)
+                right = min(
+                    right,
+                    row_start + width - 1 - mask.rfind(1, row_start, row_start + width),
                 )
-                if border_found and x < amount:
-                    amount = x
-                    break
-
-        new_body = deepcopy(parsed_board)
-        new_width = width
-        new_height = height
-        for _ in range(0, amount):
-            new_body, new_width, new_height = self.remove_column_left(
-                new_body, new_width, new_height
-            )
 
-        return new_body, new_width, new_height
+        return left, first // width, right, height - 1 - last // width
+
+    def trim(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        """Removes blank columns and rows on all sides of board."""
+        box = self.border_box(parsed_board, width, height)
+        if box is None:
+            return bytearray(), 0, 0
+        left, top, right, bottom = box
+        return self.reframe(parsed_board, width, height, -left, -top, -right, -bottom)
+
+    def trim_left(
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        box = self.border_box(parsed_board, width, height)
+        return self.reframe(parsed_board, width, height, left=-(box or (width,))[0])
 
     def trim_right(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        new_body = deepcopy(parsed_board)
-        new_width = width
-        new_height = height
-
-        new_body, new_width, new_height = self.reverse_columns(
-            new_body, new_width, new_height
-        )
-        new_body, new_width, new_height = self.trim_left(
-            new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        box = self.border_box(parsed_board, width, height)
+        return self.reframe(
+            parsed_board, width, height, right=-(box[2] if box else width)
         )
-        new_body, new_width, new_height = self.reverse_columns(
-            new_body, new_width, new_height
-        )
-
-        return new_body, new_width, new_height
 
     def trim_top(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        amount = height
-        for x in range(0, width):
-            border_found = False
-            for y in range(0, height):
-                border_found = Characters.is_border_element(
-                    parsed_board[index_1d(x, y, width)]
-                )
-                if border_found:
-                    if y < amount:
-                        amount = y
-                    break
-
-        new_body = deepcopy(parsed_board)
-        new_width = width
-        new_height = height
-
-        for _ in range(0, amount):
-            new_body, new_width, new_height = self.remove_row_top(
-                new_body, new_width, new_height
-            )
-
-        return new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        box = self.border_box(parsed_board, width, height)
+        return self.reframe(
+            parsed_board, width, height, top=-(box[1] if box else height)
+        )
 
     def trim_bottom(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        new_body = deepcopy(parsed_board)
-        new_width = width
-        new_height = height
-
-        new_body, new_width, new_height = self.reverse_rows(
-            new_body, new_width, new_height
-        )
-        new_body, new_width, new_height = self.trim_top(new_body, new_width, new_height)
-        new_body, new_width, new_height = self.reverse_rows(
-            new_body, new_width, new_height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        box = self.border_box(parsed_board, width, height)
+        return self.reframe(
+            parsed_board, width, height, bottom=-(box[3] if box else height)
         )
 
-        return new_body, new_width, new_height
-
     def reverse_rows(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = deepcopy(parsed_board)
-
-        new_body = width * height * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, width):
-            for y in range(0, height):
-                new_body[index_1d(x, y, width)] = str(
-                    old_body[index_1d(x, height - y - 1, width)]
-                )
-
-        return new_body, width, height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return (
+            bytearray().join(
+                parsed_board[y * width : (y + 1) * width]
+                for y in range(height - 1, -1, -1)
+            ),
+            width,
+            height,
+        )
 
     def reverse_columns(
-        self, parsed_board: List[str], width: int, height: int
-    ) -> Tuple[List[str], int, int]:
-        old_body = deepcopy(parsed_board)
-
-        new_body = width * height * [Characters.VISIBLE_FLOOR]
-
-        for x in range(0, width):
-            for y in range(0, height):
-                new_body[index_1d(x, y, width)] = str(
-                    old_body[index_1d(width - x - 1, y, width)]
-                )
-
-        return new_body, width, height
+        self, parsed_board: bytearray, width: int, height: int
+    ) -> Tuple[bytearray, int, int]:
+        return (
+            bytearray().join(
+                parsed_board[y * width : (y + 1) * width][::-1] for y in range(height)
+            ),
+            width,
+            height,
+        )
 
 
 class PuzzleParser:
@@ -315,33 +262,99 @@ class PuzzleParser:
 
 
 class PuzzlePrinter:
+    """
+    Printing of parsed boards.
+
+    Cells are converted to output characters through byte translation table, one
+    board row at a time.
+    """
+
+    _EMPTY_FLOORS: Final[bytes] = "".join(
+        (Characters.FLOOR, Characters.VISIBLE_FLOOR, Characters.ALT_VISIBLE_FLOOR1)
+    ).encode("ascii")
+    _FLOOR_TABLE: Final[bytes] = bytes.maketrans(
+        _EMPTY_FLOORS, len(_EMPTY_FLOORS) * Characters.FLOOR.encode("ascii")
+    )
+    _VISIBLE_FLOOR_TABLE: Final[bytes] = bytes.maketrans(
+        _EMPTY_FLOORS, len(_EMPTY_FLOORS) * _VISIBLE_FLOOR
+    )
+
+    @staticmethod
+    def instance(tessellation: Tessellation) -> PuzzlePrinter:
+        """Printer for boards of ``tessellation``."""
+        from .hexoban_io import HexobanIo
+        from .octoban_io import OctobanIo
+        from .sokoban_io import SokobanIo
+        from .trioban_io import TriobanIo
+
+        if tessellation == Tessellation.SOKOBAN:
+            return SokobanIo.printer()
+        if tessellation == Tessellation.TRIOBAN:
+            return TriobanIo.printer()
+        if tessellation == Tessellation.HEXOBAN:
+            return HexobanIo.printer()
+        if tessellation == Tessellation.OCTOBAN:
+            return OctobanIo.printer()
+        raise ValueError(f"Unknown tessellation {tessellation}")
+
+    @classmethod
+    def translation_table(cls, use_visible_floor: bool) -> bytes:
+        """Table that converts all empty floor characters to the one used in output."""
+        return cls._VISIBLE_FLOOR_TABLE if use_visible_floor else cls._FLOOR_TABLE
+
     def print(
         self,
-        parsed_board: List[str],
+        parsed_board: bytearray,
         width: int,
         height: int,
         use_visible_floor: bool,
         rle_encode: bool,
     ) -> str:
-        retv_list: List[str] = []
+        retv = "\n".join(self.rows(parsed_board, width, height, use_visible_floor))
 
-        for y in range(height):
-            tmp: str = ""
-            for x in range(width):
-                c = parsed_board[index_1d(x, y, width)]
-                if Characters.is_empty_floor(c):
-                    c = (
-                        Characters.VISIBLE_FLOOR
-                        if use_visible_floor
-                        else Characters.FLOOR
-                    )
-                tmp += c
+        if rle_encode:
+            retv = Rle.encode(retv)
 
-            retv_list.append(tmp)
+        return retv
 
-        retv = "\n".join(retv_list)
+    def write(
+        self,
+        stream: TextIO,
+        parsed_board: bytearray,
+        width: int,
+        height: int,
+        use_visible_floor: bool,
+        rle_encode: bool,
+    ):
+        """
+        Same as `print` but writes output into ``stream``, row by row.
 
+        RLE encoding needs whole board, so with ``rle_encode`` output is built first
+        and written at once.
+        """
         if rle_encode:
-            retv = Rle.encode(retv)
+            stream.write(
+                self.print(parsed_board, width, height, use_visible_floor, rle_encode)
+            )
+            return
 
-        return retv
+        for index, row in enumerate(
+            self.rows(parsed_board, width, height, use_visible_floor)
+        ):
+            if index > 0:
+                stream.write("\n")
+            stream.write(row)
+
+    def rows(
+        self,
+        parsed_board: bytearray,
+        width: int,
+        height: int,
+        use_visible_floor: bool,
+    ) -> Iterable[str]:
+        """Printed board rows, without line endings."""
+        table = self.translation_table(use_visible_floor)
+        return (
+            parsed_board[y * width : (y + 1) * width].translate(table).decode("ascii")
+            for y in range(height)
+        )
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from itertools import groupby
-from typing import Final, Optional
+import re
+from typing import Final, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import lark
 
 from ..common import Characters
 
 
+class _RleGroup(NamedTuple):
+    count: int
+    nodes: List[_RleNode]
+
+
+# Decoded text or group of nodes that is repeated
+_RleNode = Union[str, _RleGroup]
+
+
 class Rle:
     """
     Rle encoding and decoding.
@@ -23,12 +32,13 @@ class Rle:
         if not line:
             return line
 
-        digits = {str(_) for _ in range(10)}
-        if all(_ in digits for _ in line):
+        if cls._RE_ONLY_DIGITS.match(line):
             raise ValueError("Cant encode fully numeric strings!")
 
-        encoded = [(len(list(g)), k) for k, g in groupby(line.replace("\n", cls.EOL))]
-        return "".join("".join((str(c) if c > 1 else "", v)) for c, v in encoded)
+        return cls._RE_RUN.sub(
+            lambda m: f"{m.end() - m.start()}{m.group(1)}",
+            line.replace("\n", cls.EOL),
+        )
 
     @classmethod
     def decode(cls, data: Optional[str]) -> str:
@@ -40,6 +50,148 @@ class Rle:
         if not data:
             return ""
 
+        # Without counts and groups, only thing to decode are line endings
+        if not cls._RE_COUNT_OR_GROUP.search(data):
+            return data.replace(cls.EOL, "\n")
+
+        nodes = cls._syntax_tree(data)
+        if nodes is None:
+            # Malformed input, let the parser produce error
+            return cls._parse(data)
+        return cls._render(nodes)
+
+    #: Default size of chunks yielded by :meth:`iter_decode`
+    DEFAULT_CHUNK_SIZE: Final[int] = 2**16
+
+    @classmethod
+    def iter_decode(
+        cls, data: Optional[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[str]:
+        """
+        Decodes RLE encoded string incrementally.
+
+        Yields the same output as :meth:`decode`, split into chunks of about
+        ``chunk_size`` characters. Memory used doesn't depend on length of decoded
+        string, only on length of ``data``.
+
+        Errors in ``data`` are raised before first chunk is yielded.
+        """
+        if not data:
+            return
+
+        if not cls._RE_COUNT_OR_GROUP.search(data):
+            for start in range(0, len(data), chunk_size):
+                yield data[start : start + chunk_size].replace(cls.EOL, "\n")
+            return
+
+        nodes = cls._syntax_tree(data)
+        if nodes is None:
+            yield cls._parse(data)
+            return
+
+        buffer: List[str] = []
+        buffered = 0
+
+        # Nodes being expanded, index of next node in each of them and number of
+        # repetitions left
+        stack: List[Tuple[List[_RleNode], int, int]] = [(nodes, 0, 1)]
+        while stack:
+            nodes, index, repeat = stack[-1]
+            if index == len(nodes):
+                if repeat > 1:
+                    stack[-1] = (nodes, 0, repeat - 1)
+                else:
+                    stack.pop()
+                continue
+            stack[-1] = (nodes, index + 1, repeat)
+
+            node = nodes[index]
+            if isinstance(node, str):
+                buffer.append(node)
+                buffered += len(node)
+
+            elif len(node.nodes) == 1 and isinstance(node.nodes[0], str):
+                # Repeated text is expanded in pieces that fit into chunk
+                text = node.nodes[0]
+                per_chunk = max(1, chunk_size // max(1, len(text)))
+                for start in range(0, node.count, per_chunk):
+                    piece = min(per_chunk, node.count - start) * text
+                    buffer.append(piece)
+                    buffered += len(piece)
+                    if buffered >= chunk_size:
+                        yield "".join(buffer)
+                        buffer = []
+                        buffered = 0
+
+            elif node.count > 0:
+                stack.append((node.nodes, 0, node.count))
+
+            if buffered >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+
+        if buffer:
+            yield "".join(buffer)
+
+    @classmethod
+    def _syntax_tree(cls, data: str) -> Optional[List[_RleNode]]:
+        """
+        Iterative parser equivalent to :attr:`_GRAMMAR`.
+
+        Returns:
+            Decoded text and repeated groups or None if ``data`` is not valid RLE
+            string.
+        """
+        # Nodes of enclosing groups and repeat counts of groups that contain them
+        stack: List[Tuple[List[_RleNode], int]] = []
+        nodes: List[_RleNode] = []
+        count: Optional[int] = None
+
+        for match in cls._RE_TOKEN.finditer(data):
+            digits, atoms = match.group(1), match.group(2)
+            if digits is not None:
+                if count is not None:
+                    return None
+                count = int(digits)
+
+            elif atoms is not None:
+                if count is not None:
+                    # Count applies only to first atom and atoms it repeats keep RLE
+                    # line endings as they are
+                    nodes.append(_RleGroup(count, [atoms[0]]))
+                    atoms = atoms[1:]
+                    count = None
+                if atoms:
+                    nodes.append(atoms.replace(cls.EOL, "\n"))
+
+            elif match.group(0) == cls.GROUP_START:
+                stack.append((nodes, 1 if count is None else count))
+                nodes = []
+                count = None
+
+            else:
+                if count is not None or not nodes or not stack:
+                    return None
+                group = nodes
+                nodes, group_count = stack.pop()
+                nodes.append(_RleGroup(group_count, group))
+
+        if count is not None or stack:
+            return None
+
+        return nodes
+
+    @classmethod
+    def _render(cls, nodes: List[_RleNode]) -> str:
+        return "".join(
+            node if isinstance(node, str) else node.count * cls._render(node.nodes)
+            for node in nodes
+        )
+
+    @classmethod
+    def _parse(cls, data: str) -> str:
+        """Decodes ``data`` using :attr:`_PARSER`."""
         try:
             parsed = LarkTreeTransformer().transform(cls._PARSER.parse(data))
 
@@ -60,6 +212,18 @@ class Rle:
         # To effectively normalize new lines in final output, we must do following:
         return "".join(parsed)
 
+    _RE_ONLY_DIGITS = re.compile(r"[0-9]+\Z")
+    _RE_RUN = re.compile(r"(.)\1+", re.DOTALL)
+    _RE_COUNT_OR_GROUP = re.compile("[0-9" + re.escape(GROUP_START + GROUP_END) + "]")
+    _RE_TOKEN = re.compile(
+        "([0-9]+)|([^0-9"
+        + re.escape(GROUP_START + GROUP_END)
+        + "]+)|"
+        + re.escape(GROUP_START)
+        + "|"
+        + re.escape(GROUP_END)
+    )
+
     _GRAMMAR = f"""
         data: expr+
         expr: atoms | term | group
@@ -1,14 +1,75 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Final, List, Optional
+import itertools
+from array import array
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from ..common import Characters, Tessellation, TessellationImpl, is_blank
 from .rle import Rle
-from .snapshot_parsing import Jump, MovementTokens, Parser, PusherSelection, Steps
+from .snapshot_parsing import (
+    Jump,
+    MovementTokens,
+    Parser,
+    PusherSelection,
+    Steps,
+    steps_counts,
+)
 
 if TYPE_CHECKING:
+    from ..game import PusherStep, PusherSteps
+
+#: Sequence of values created by `.PusherStep.packed`
+PackedPusherSteps = Union[bytes, bytearray, memoryview, array]
+
+_TokenType = Type[Union[Jump, PusherSelection, Steps]]
+
+# For each tessellation, token type and characters of each legal packed step value
+_PACKED_STEPS_TABLES: Dict[Tessellation, List[Optional[Tuple[_TokenType, str]]]] = {}
+
+
+def _packed_steps_table(
+    tessellation: Tessellation,
+) -> List[Optional[Tuple[_TokenType, str]]]:
+    retv = _PACKED_STEPS_TABLES.get(tessellation, None)
+    if retv is not None:
+        return retv
+
     from ..game import PusherStep
 
+    to_char = TessellationImpl.instance(tessellation).pusher_step_chars
+    retv = [None] * 256
+    for value in range(256):
+        try:
+            step = PusherStep.from_packed(value)
+        except ValueError:
+            continue
+        ch = to_char.get((step.direction, step.is_push_or_pull), None)
+        if ch is None:
+            continue
+        if step.is_current_pos:
+            ch += Characters.CURRENT_POSITION_CH
+        if step.is_jump:
+            retv[value] = (Jump, ch)
+        elif step.is_pusher_selection:
+            retv[value] = (PusherSelection, ch)
+        else:
+            retv[value] = (Steps, ch)
+
+    _PACKED_STEPS_TABLES[tessellation] = retv
+    return retv
+
 
 class Snapshot:
     """
@@ -49,6 +110,7 @@ class Snapshot:
         self.title: str = ""
         self.solver: str = ""
         self.notes: str = ""
+        self.tags: Dict[str, List[str]] = {}
 
         self._tessellation = tessellation
         self._tessellation_obj_val: Optional[TessellationImpl] = None
@@ -59,6 +121,7 @@ class Snapshot:
 
         self._parsed_moves: MovementTokens = []
         self._was_parsed = False
+        self._was_counted = False
         self._pushes_count: int = 0
         self._moves_count: int = 0
         self._jumps_count: int = 0
@@ -113,73 +176,160 @@ class Snapshot:
             raise ValueError("Invalid characters in snapshot string!")
         self._moves_data = rv or ""
         self._was_parsed = False
+        self._was_counted = False
 
     @property
     def pusher_steps(self) -> List[PusherStep]:
         """
         Game engine representation of pusher steps.
 
+        Can be set to sequence of :class:`.PusherStep`, to :class:`.PusherSteps` or
+        to sequence of packed steps (:class:`bytes`, :class:`bytearray` or
+        :class:`array.array` of values created by `.PusherStep.packed`).
+
         Warning:
             Setting this property will also replace ``moves_data``.
+
+        Raises:
+            ValueError: when setting steps with directions that are not legal in
+                snapshot's tessellation or invalid packed steps
         """
         self._reparse_if_not_parsed()
-        return sum(
-            (_.pusher_steps(self._tessellation_obj) for _ in self._parsed_moves), []
-        )
+        retv: List[PusherStep] = []
+        for _ in self._parsed_moves:
+            retv.extend(_.pusher_steps(self._tessellation_obj))
+        return retv
 
     @pusher_steps.setter
-    def pusher_steps(self, rv: List[PusherStep]):
-        i = 0
-        iend = len(rv)
+    def pusher_steps(
+        self, rv: Union[Iterable[PusherStep], PusherSteps, PackedPusherSteps]
+    ):
+        from ..game import PusherSteps
+
+        if isinstance(rv, PusherSteps):
+            steps_chars = self._packed_steps_chars(rv.packed)
+        elif isinstance(rv, (bytes, bytearray, memoryview, array)):
+            steps_chars = self._packed_steps_chars(rv)
+        else:
+            steps_chars = self._pusher_steps_chars(rv)
 
         self._parsed_moves = []
         self._pushes_count = 0
         self._moves_count = 0
         self._jumps_count = 0
-        self._is_reverse = False
-        self._was_parsed = True
 
-        while i < iend:
-            if rv[i].is_jump:
-                jump = Jump("")
-                while i < iend and rv[i].is_jump:
-                    jump.data += self._tessellation_obj.pusher_step_to_char(rv[i])
-                    if rv[i].is_current_pos:
-                        jump.data += Characters.CURRENT_POSITION_CH
-                    i += 1
-                self._parsed_moves.append(jump)
+        for token_type, group in itertools.groupby(steps_chars, key=itemgetter(0)):
+            token = token_type("".join(map(itemgetter(1), group)))
+            self._parsed_moves.append(token)
+            if token_type is PusherSelection:
+                continue
+            if token_type is Jump:
                 self._jumps_count += 1
-                self._is_reverse = True
-                self._moves_count += jump.moves_count
-
-            elif rv[i].is_pusher_selection:
-                pusher_selection = PusherSelection("")
-                while i < iend and rv[i].is_pusher_selection:
-                    pusher_selection.data += self._tessellation_obj.pusher_step_to_char(
-                        rv[i]
-                    )
-                    if rv[i].is_current_pos:
-                        pusher_selection.data += Characters.CURRENT_POSITION_CH
-                    i += 1
-                self._parsed_moves.append(pusher_selection)
+            moves, pushes = steps_counts(token.data)
+            self._moves_count += moves
+            self._pushes_count += pushes
 
+        self._is_reverse = self._jumps_count > 0
+        self._was_parsed = True
+        self._was_counted = True
+        self._moves_data = self.to_str(rle_encode=False)
+
+    def _pusher_steps_chars(
+        self, pusher_steps: Iterable[PusherStep]
+    ) -> Iterator[Tuple[_TokenType, str]]:
+        """
+        Type of token each of ``pusher_steps`` belongs to and its characters.
+        """
+        to_char = self._tessellation_obj.pusher_step_chars
+        for step in pusher_steps:
+            try:
+                ch = to_char[(step.direction, step.is_push_or_pull)]
+            except KeyError:
+                raise ValueError(
+                    f"Illegal PusherStepData direction {step.direction} in "
+                    f"{self._tessellation_obj.__class__.__name__}!"
+                )
+            if step.is_current_pos:
+                ch += Characters.CURRENT_POSITION_CH
+
+            if step.is_jump:
+                yield Jump, ch
+            elif step.is_pusher_selection:
+                yield PusherSelection, ch
             else:
-                steps = Steps("")
-                while i < iend and not rv[i].is_jump and not rv[i].is_pusher_selection:
-                    steps.data += self._tessellation_obj.pusher_step_to_char(rv[i])
-                    if rv[i].is_current_pos:
-                        steps.data += Characters.CURRENT_POSITION_CH
-                    i += 1
-                self._parsed_moves.append(steps)
-                self._pushes_count += steps.pushes_count
-                self._moves_count += steps.moves_count
+                yield Steps, ch
 
-        self._moves_data = self.to_str(rle_encode=False)
+    def _packed_steps_chars(
+        self, packed_steps: PackedPusherSteps
+    ) -> Iterator[Tuple[_TokenType, str]]:
+        """
+        :meth:`_pusher_steps_chars` for packed steps.
+        """
+        table = _packed_steps_table(self._tessellation)
+        # Each distinct value is validated once, so that steps can be looked up
+        # without per step checks
+        for value in set(packed_steps):
+            if not 0 <= value < len(table) or table[value] is None:
+                raise ValueError(
+                    f"Illegal packed pusher step {value} in "
+                    f"{self._tessellation_obj.__class__.__name__}!"
+                )
+        return map(table.__getitem__, packed_steps)
+
+    def iter_pusher_steps(self) -> Iterator[PusherStep]:
+        """
+        Generates the same steps as :attr:`pusher_steps`, decoding and parsing
+        ``moves_data`` incrementally.
+
+        Memory used doesn't depend on count of steps in snapshot, which makes this
+        suitable for replaying very long RLE encoded snapshots.
+
+        Raises:
+            ValueError: ``moves_data`` is not valid snapshot string. Steps preceding
+                error are generated before error is raised.
+
+        Example:
+
+            >>> from sokoenginepy import Snapshot, Tessellation
+            >>> snapshot = Snapshot(Tessellation.SOKOBAN, "1000000(rl)")
+            >>> sum(1 for _ in snapshot.iter_pusher_steps())
+            2000000
+        """
+        if is_blank(self._moves_data):
+            return
+
+        tessellation = self._tessellation_obj
+        # Step is held back until next one is known, so that following
+        # CURRENT_POSITION_CH can still mark it
+        pending: Optional[PusherStep] = None
+
+        for token, is_continuation in Parser.iter_parse(
+            Rle.iter_decode(self._moves_data)
+        ):
+            if not is_continuation and pending is not None:
+                yield pending
+                pending = None
+
+            is_jump = isinstance(token, Jump)
+            is_pusher_selection = isinstance(token, PusherSelection)
+            for ch in token.data:
+                if ch == Characters.CURRENT_POSITION_CH:
+                    if pending is not None:
+                        pending.is_current_pos = True
+                    continue
+                if pending is not None:
+                    yield pending
+                pending = tessellation.char_to_pusher_step(ch)
+                pending.is_jump = is_jump
+                pending.is_pusher_selection = is_pusher_selection
+
+        if pending is not None:
+            yield pending
 
     @property
     def pushes_count(self) -> int:
         """Count of box pushing steps."""
-        self._reparse_if_not_parsed()
+        self._recount_if_not_counted()
         return self._pushes_count
 
     @property
@@ -187,7 +337,7 @@ class Snapshot:
         """
         Count of steps that are not pushing a box and are not selecting pusher.
         """
-        self._reparse_if_not_parsed()
+        self._recount_if_not_counted()
         return self._moves_count
 
     @property
@@ -196,19 +346,50 @@ class Snapshot:
         Count of groups of steps that are jumps. Jumps are possible when board is
         being solved in reverse mode.
         """
-        self._reparse_if_not_parsed()
+        self._recount_if_not_counted()
         return self._jumps_count
 
     @property
     def is_reverse(self) -> bool:
         """True if snapshot contains any jumps."""
-        self._reparse_if_not_parsed()
+        self._recount_if_not_counted()
         return self._is_reverse
 
     def _reparse_if_not_parsed(self):
         if not self._was_parsed:
             self._reparse()
 
+    def _recount_if_not_counted(self):
+        if not self._was_counted:
+            self._recount()
+
+    def _recount(self):
+        """
+        Streaming equivalent of counting done in :meth:`_reparse`. Doesn't
+        materialize decoded ``moves_data`` nor parsed tokens.
+        """
+        pushes_count = 0
+        moves_count = 0
+        jumps_count = 0
+
+        if not is_blank(self._moves_data):
+            for token, is_continuation in Parser.iter_parse(
+                Rle.iter_decode(self._moves_data)
+            ):
+                if isinstance(token, PusherSelection):
+                    continue
+                if isinstance(token, Jump) and not is_continuation:
+                    jumps_count += 1
+                moves, pushes = steps_counts(token.data)
+                moves_count += moves
+                pushes_count += pushes
+
+        self._pushes_count = pushes_count
+        self._moves_count = moves_count
+        self._jumps_count = jumps_count
+        self._is_reverse = jumps_count > 0
+        self._was_counted = True
+
     def _reparse(self):
         self._parsed_moves = []
         self._pushes_count = 0
@@ -226,3 +407,4 @@ class Snapshot:
             self._pushes_count += _.pushes_count
 
         self._was_parsed = True
+        self._was_counted = True
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List, Union
-
-import lark
+from typing import (
+    TYPE_CHECKING,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Tuple,
+    Union,
+)
 
 from ..common import Characters, TessellationImpl, is_blank
 from .rle import Rle
@@ -12,17 +20,42 @@ if TYPE_CHECKING:
     from ..game import PusherStep
 
 
+def _steps_table() -> bytes:
+    retv = bytearray(256)
+    for _ in Characters.MOVE_CHARACTERS:
+        retv[ord(_)] = ord("m")
+    for _ in Characters.PUSH_CHARACTERS:
+        retv[ord(_)] = ord("p")
+    return bytes(retv)
+
+
+# Translates move characters to b"m", push characters to b"p" and everything else to
+# b"\0"
+_STEPS_TABLE: Final[bytes] = _steps_table()
+
+
+def steps_counts(data: str) -> Tuple[int, int]:
+    """
+    Counts of move and push characters in ``data``.
+
+    ``data`` is classified through translation table in single pass, without creating
+    any per character objects.
+    """
+    classified = data.encode("ascii", "ignore").translate(_STEPS_TABLE)
+    return classified.count(b"m"), classified.count(b"p")
+
+
 @dataclass
 class Steps:
     data: str
 
     @property
     def pushes_count(self):
-        return sum(1 for _ in self.data if _ in Characters.PUSH_CHARACTERS)
+        return steps_counts(self.data)[1]
 
     @property
     def moves_count(self):
-        return sum(1 for _ in self.data if _ in Characters.MOVE_CHARACTERS)
+        return steps_counts(self.data)[0]
 
     def __str__(self):
         return self.data
@@ -51,7 +84,7 @@ class Jump:
 
     @property
     def moves_count(self):
-        return sum(1 for _ in self.data if _ in Characters.MOVE_CHARACTERS)
+        return steps_counts(self.data)[0]
 
     def __str__(self):
         return Characters.JUMP_BEGIN + self.data + Characters.JUMP_END
@@ -82,7 +115,19 @@ class PusherSelection:
 MovementTokens = List[Union[Jump, PusherSelection, Steps]]
 
 
+class TokenPart(NamedTuple):
+    """
+    Piece of movement token produced by :meth:`Parser.iter_parse`.
+    """
+
+    #: Jump, pusher selection or steps holding characters of this piece
+    token: Union[Jump, PusherSelection, Steps]
+    #: False for first piece of token, True for pieces that continue it
+    is_continuation: bool
+
+
 class Parser:
+    #: Syntax of snapshot strings, after RLE decoding. WS is any of " \t\f\r\n".
     GRAMMAR = f"""
         snapshot: (jump | pusher_selection | steps)+
 
@@ -98,63 +143,126 @@ class Parser:
         moves: /[{''.join(Characters.MOVE_CHARACTERS)}\\{Characters.CURRENT_POSITION_CH}]+/
         pushes: /[{''.join(Characters.PUSH_CHARACTERS)}]+/
 
-        %import common.WS
         %ignore WS
     """
 
-    # Reference: .venv/lib/python3.9/site-packages/lark/grammars/common.lark
-    #
-    #     WS: /[ \t\f\r\n]/+
-
-    PARSER = lark.Lark(GRAMMAR, parser="lalr", start="snapshot")
-
     @classmethod
     def parse(cls, data: str) -> MovementTokens:
+        """
+        Parses snapshot string into movement tokens.
+
+        Accepts strings described by :attr:`GRAMMAR`, in linear time.
+        """
         if is_blank(data):
             return []
 
-        data = Rle.decode(data)
-
-        try:
-            parsed = LarkTreeTransformer().transform(cls.PARSER.parse(data))
-
-        except lark.exceptions.VisitError as e:
-            # raise ValueError(str(e))
-            raise e.orig_exc from e
-
-        except lark.exceptions.UnexpectedInput as e:
-            raise ValueError("Unexpected input in Snapshot string! " + str(e)) from e
-
-        return parsed
-
-
-class LarkTreeTransformer(lark.Transformer):
-    def snapshot(self, args: MovementTokens):
-        return args
-
-    def jump(self, args):
-        return Jump("".join(args))
-
-    def pusher_selection(self, args):
-        return PusherSelection("".join(args))
-
-    def steps(self, args):
-        return Steps("".join(args))
-
-    def pushes(self, args):
-        return "".join(args)
-
-    def moves(self, args):
-        return "".join(args)
+        retv: MovementTokens = []
+        # Pieces of last token in ``retv``
+        pieces: List[str] = []
+        for token, is_continuation in cls.iter_parse([Rle.decode(data)]):
+            if is_continuation:
+                pieces.append(token.data)
+            else:
+                if retv:
+                    retv[-1].data = "".join(pieces)
+                retv.append(token)
+                pieces = [token.data]
+        retv[-1].data = "".join(pieces)
 
-    def jump_begin(self, args):
-        return lark.visitors.Discard
+        return retv
 
-    def jump_end(self, args):
-        return lark.visitors.Discard
+    _WS: Final[str] = " \t\f\r\n"
+    _MOVES: Final[str] = re.escape(
+        "".join(Characters.MOVE_CHARACTERS) + Characters.CURRENT_POSITION_CH
+    )
+    _PUSHES: Final[str] = re.escape("".join(Characters.PUSH_CHARACTERS))
 
-    def pusher_change_begin(self, args):
-        return lark.visitors.Discard
+    # Tokens outside and inside of jumps and pusher selections
+    _RE_STEPS_TOKEN: Final[re.Pattern] = re.compile(
+        f"([{_MOVES}{_PUSHES}]+)|[{_WS}]+|(.)", re.DOTALL
+    )
+    _RE_MOVES_TOKEN: Final[re.Pattern] = re.compile(
+        f"([{_MOVES}]+)|[{_WS}]+|(.)", re.DOTALL
+    )
 
-    def pusher_change_end(self, args):
-        return lark.visitors.Discard
+    @classmethod
+    def iter_parse(cls, chunks: Iterable[str]) -> Iterator[TokenPart]:
+        """
+        Streaming equivalent of :meth:`parse`.
+
+        Consumes RLE decoded snapshot string in ``chunks`` (ie. the ones produced by
+        :meth:`.Rle.iter_decode`) and yields pieces of movement tokens as soon as
+        they are read. Steps, jumps and pusher selections longer than single chunk
+        are yielded in multiple pieces.
+
+        Raises:
+            ValueError: snapshot string is not valid. Pieces preceding error are
+                yielded before error is raised.
+        """
+        # Type of currently opened jump or pusher selection, if any
+        group = None
+        group_is_empty = True
+        group_is_sealed = False
+        is_continuation = False
+        is_empty = True
+
+        for chunk in chunks:
+            position = 0
+            while position < len(chunk):
+                regex = cls._RE_STEPS_TOKEN if group is None else cls._RE_MOVES_TOKEN
+                match = regex.match(chunk, position)
+                position = match.end()
+                data, other = match.group(1), match.group(2)
+
+                if data is not None:
+                    is_empty = False
+                    if group is None:
+                        yield TokenPart(Steps(data), is_continuation)
+                        is_continuation = True
+                    elif group_is_sealed:
+                        raise ValueError(
+                            "Unexpected input in Snapshot string! "
+                            f"Unexpected characters: {data!r}"
+                        )
+                    else:
+                        group_is_empty = False
+                        yield TokenPart(group(data), True)
+
+                elif other is None:
+                    # Pusher selection is single word, whitespace can't split it
+                    group_is_sealed = group is PusherSelection and not group_is_empty
+
+                else:
+                    if group is None and other in (
+                        Characters.JUMP_BEGIN,
+                        Characters.PUSHER_CHANGE_BEGIN,
+                    ):
+                        group = (
+                            Jump if other == Characters.JUMP_BEGIN else PusherSelection
+                        )
+                        group_is_empty = True
+                        group_is_sealed = False
+                        is_empty = False
+                        is_continuation = False
+                        yield TokenPart(group(""), False)
+
+                    elif (group is Jump and other == Characters.JUMP_END) or (
+                        group is PusherSelection
+                        and other == Characters.PUSHER_CHANGE_END
+                        and not group_is_empty
+                    ):
+                        group = None
+
+                    else:
+                        raise ValueError(
+                            "Unexpected input in Snapshot string! "
+                            f"Unexpected character: {other!r}"
+                        )
+
+        if group is not None:
+            raise ValueError(
+                "Unexpected input in Snapshot string! Unexpected end of input"
+            )
+
+        if is_empty:
+            raise ValueError("Unexpected input in Snapshot string! Empty snapshot")
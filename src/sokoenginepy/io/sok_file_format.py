@@ -1,15 +1,33 @@
 from __future__ import annotations
 
+import contextlib
+import enum
 import io
+import itertools
+import os
 import re
+import shutil
+import tempfile
 import textwrap
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Final, List, Optional, Pattern, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 
 import arrow
 
-from ..common import Characters, Tessellation, is_blank
+from ..common import Characters, Tessellation, TextKind, is_blank
 from .puzzle import Puzzle
 from .snapshot import Snapshot
 
@@ -29,8 +47,11 @@ class SOKFileFormat:
         ],
         dest: Collection,
         tessellation_hint: Optional[Tessellation] = None,
+        keep_unknown_tags: bool = False,
     ):
-        reader = SOKReader(src, dest, tessellation_hint or Tessellation.SOKOBAN)
+        reader = SOKReader(
+            src, dest, tessellation_hint or Tessellation.SOKOBAN, keep_unknown_tags
+        )
         reader.read()
         reader.close()
 
@@ -46,6 +67,67 @@ class SOKFileFormat:
         writer.write(src)
         writer.close()
 
+    @classmethod
+    def append_puzzles(cls, path: Union[str, Path], puzzles: Iterable[Puzzle]):
+        index = SOKIndex.build(path)
+
+        out = io.StringIO()
+        writer = SOKWriter(out)
+        writer.write_puzzles(puzzles)
+        writer.flush()
+
+        cls._insert(path, index.size, index.separator(len(index)), out.getvalue())
+
+    @classmethod
+    def append_snapshots(
+        cls, path: Union[str, Path], puzzle_index: int, snapshots: Iterable[Snapshot]
+    ):
+        index = SOKIndex.build(path)
+        if not 0 <= puzzle_index < len(index):
+            raise IndexError(f"Puzzle index {puzzle_index} is out of range!")
+
+        out = io.StringIO()
+        writer = SOKWriter(out)
+        for snapshot in snapshots:
+            writer._write_snapshot(snapshot)
+        writer.flush()
+        data = out.getvalue()
+        if data and not data.endswith("\n\n"):
+            # Keeps title line of next puzzle recognizable
+            data += "\n"
+
+        cls._insert(
+            path,
+            index.puzzle_end(puzzle_index),
+            index.separator(puzzle_index + 1),
+            data,
+        )
+
+    @staticmethod
+    def _insert(path: Union[str, Path], offset: int, separator: str, data: str):
+        """
+        Writes ``path`` with ``data`` inserted at byte ``offset``, by copying
+        unchanged parts of file to temporary file which then replaces ``path``.
+        """
+        if not data:
+            return
+
+        path = Path(path)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".")
+        try:
+            with open(path, "rb") as src, os.fdopen(fd, "wb") as dest:
+                _copy_bytes(src, dest, offset)
+                dest.write((separator + data).encode("utf-8"))
+                shutil.copyfileobj(src, dest)
+                dest.flush()
+                os.fsync(dest.fileno())
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            raise
+
 
 class SOKReader:
     def __init__(
@@ -55,6 +137,7 @@ class SOKReader:
         ],
         dest: Collection,
         tessellation_hint: Tessellation,
+        keep_unknown_tags: bool = False,
     ):
         self._stream_was_wrapped = False
         self.src: Union[io.TextIOWrapper, io.StringIO]
@@ -79,6 +162,7 @@ class SOKReader:
             self.src = src
         self.dest = dest
         self.supplied_tessellation_hint = tessellation_hint
+        self.keep_unknown_tags = keep_unknown_tags
         self._data: CollectionData
 
     def read(self):
@@ -102,6 +186,7 @@ class SOKReader:
         self.dest.created_at = self._data.created_at or ""
         self.dest.updated_at = self._data.updated_at or ""
         self.dest.notes = "\n".join(self._data.notes)
+        self.dest.tags = self._data.tags
 
         for puzzle_data in self._data.puzzles:
             puzzle = Puzzle(
@@ -111,6 +196,7 @@ class SOKReader:
             for attr in {"title", "author", "boxorder", "goalorder"}:
                 setattr(puzzle, attr, getattr(puzzle_data, attr))
             puzzle.notes = "\n".join(puzzle_data.notes)
+            puzzle.tags = puzzle_data.tags
 
             for snapshot_data in puzzle_data.snapshots:
                 snapshot = Snapshot(
@@ -120,98 +206,73 @@ class SOKReader:
                 for attr in {"title", "solver"}:
                     setattr(snapshot, attr, getattr(snapshot_data, attr))
                 snapshot.notes = "\n".join(snapshot_data.notes)
+                snapshot.tags = snapshot_data.tags
                 puzzle.snapshots.append(snapshot)
 
             self.dest.puzzles.append(puzzle)
 
     def _split_input(self, input_lines: List[str]):
-        first_board_line = first_index_of(input_lines, Characters.is_board)
-        if first_board_line is not None:
-            self._data.notes = input_lines[:first_board_line]
-            remaining_lines = input_lines[first_board_line:]
-        else:
-            self._data.notes = input_lines
-            remaining_lines = []
+        kinds = SOKLineKind.classify_lines(input_lines)
+        count = len(input_lines)
 
-        self._split_puzzle_chunks(remaining_lines)
-        self._split_snapshot_chunks()
+        index = self._find_line(kinds, 0, count, SOKLineKind.BOARD)
+        self._data.notes = input_lines[:index]
 
-    def _split_puzzle_chunks(self, lines: List[str]):
-        remaining_lines = lines
-        while remaining_lines:
+        while index < count:
             puzzle = PuzzleData()
 
-            first_note_line = first_index_of(
-                remaining_lines, lambda x: not Characters.is_board(x)
-            )
-            if first_note_line is not None:
-                puzzle.board = "".join(remaining_lines[:first_note_line])
-                remaining_lines = remaining_lines[first_note_line:]
-            else:
-                puzzle.board = "".join(remaining_lines)
-                remaining_lines = []
+            board_end = self._find_line(kinds, index, count, SOKLineKind.BOARD, False)
+            puzzle.board = "".join(input_lines[index:board_end])
 
-            if len(remaining_lines) > 0:
-                first_board_line = first_index_of(remaining_lines, Characters.is_board)
-
-                if first_board_line is not None:
-                    puzzle.notes = remaining_lines[:first_board_line]
-                    remaining_lines = remaining_lines[first_board_line:]
-                else:
-                    puzzle.notes = remaining_lines
-                    remaining_lines = []
-            else:
-                puzzle.notes = []
+            index = self._find_line(kinds, board_end, count, SOKLineKind.BOARD)
+            self._split_snapshot_chunks(puzzle, input_lines, kinds, board_end, index)
 
             self._data.puzzles.append(puzzle)
 
-    def _split_snapshot_chunks(self):
-        for puzzle in self._data.puzzles:
-            remaining_lines = puzzle.notes
-
-            first_moves_line = first_index_of(remaining_lines, Characters.is_snapshot)
-            if first_moves_line is not None:
-                puzzle.notes = remaining_lines[:first_moves_line]
-                remaining_lines = remaining_lines[first_moves_line:]
-            else:
-                puzzle.notes = remaining_lines
-                remaining_lines = []
-
-            puzzle.snapshots = []
+    @staticmethod
+    def _split_snapshot_chunks(
+        puzzle: PuzzleData,
+        input_lines: List[str],
+        kinds: array,
+        start: int,
+        end: int,
+    ):
+        """
+        Splits lines ``start:end`` that follow puzzle board into puzzle notes and
+        snapshots.
+        """
+        index = SOKReader._find_line(kinds, start, end, SOKLineKind.SNAPSHOT)
+        puzzle.notes = input_lines[start:index]
+        puzzle.snapshots = []
 
-            while len(remaining_lines) > 0:
-                snapshot = SnapshotData()
+        while index < end:
+            snapshot = SnapshotData()
 
-                first_note_line = first_index_of(
-                    remaining_lines, lambda x: not Characters.is_snapshot(x)
-                )
-                if first_note_line is not None:
-                    snapshot.moves_data = "".join(
-                        moves_line.strip()
-                        for moves_line in remaining_lines[:first_note_line]
-                    )
-                    remaining_lines = remaining_lines[first_note_line:]
-                else:
-                    snapshot.moves_data = "".join(
-                        moves_line.strip() for moves_line in remaining_lines
-                    )
-                    remaining_lines = []
+            moves_end = SOKReader._find_line(
+                kinds, index, end, SOKLineKind.SNAPSHOT, False
+            )
+            snapshot.moves_data = "".join(
+                moves_line.strip() for moves_line in input_lines[index:moves_end]
+            )
 
-                if len(remaining_lines) > 0:
-                    first_moves_line = first_index_of(
-                        remaining_lines, Characters.is_snapshot
-                    )
+            index = SOKReader._find_line(kinds, moves_end, end, SOKLineKind.SNAPSHOT)
+            snapshot.notes = input_lines[moves_end:index]
 
-                    if first_moves_line is not None:
-                        snapshot.notes = remaining_lines[:first_moves_line]
-                        remaining_lines = remaining_lines[first_moves_line:]
-                    else:
-                        snapshot.notes = remaining_lines
-                        remaining_lines = []
-                else:
-                    snapshot.notes = []
+            puzzle.snapshots.append(snapshot)
 
-                puzzle.snapshots.append(snapshot)
+    @staticmethod
+    def _find_line(
+        kinds: array, start: int, end: int, kind: SOKLineKind, is_kind: bool = True
+    ) -> int:
+        """
+        Index of first line in ``start:end`` that is (or isn't, depending on
+        ``is_kind``) of ``kind``, or ``end`` if there is no such line.
+        """
+        mask = int(kind)
+        for index in range(start, end):
+            if bool(kinds[index] & mask) == is_kind:
+                return index
+        return end
 
     def _notes_before_puzzle(self, puzzle_index: int) -> List[str]:
         if puzzle_index == 0:
@@ -278,7 +339,7 @@ class SOKReader:
 
     def _parse_notes(self):
         remaining_lines = SOKTags.extract_collection_attributes(
-            self._data, self._data.notes
+            self._data, self._data.notes, self._unknown_tags(self._data)
         )
         self._data.notes = self._cleanup_whitespace(remaining_lines)
 
@@ -288,15 +349,21 @@ class SOKReader:
                 puzzle_data.notes,
                 self._data.header_tessellation_hint,
                 self.supplied_tessellation_hint,
+                self._unknown_tags(puzzle_data),
             )
             puzzle_data.notes = self._cleanup_whitespace(remaining_lines)
 
             for snapshot in puzzle_data.snapshots:
                 remaining_lines = SOKTags.extract_snapshot_attributes(
-                    snapshot, snapshot.notes
+                    snapshot, snapshot.notes, self._unknown_tags(snapshot)
                 )
                 snapshot.notes = self._cleanup_whitespace(remaining_lines)
 
+    def _unknown_tags(
+        self, data: Union[CollectionData, PuzzleData, SnapshotData]
+    ) -> Optional[Dict[str, List[str]]]:
+        return data.tags if self.keep_unknown_tags else None
+
     @staticmethod
     def _cleanup_whitespace(lst) -> List[str]:
         i = first_index_of(lst, lambda x: not is_blank(x))
@@ -317,6 +384,7 @@ class SnapshotData:
     title: Optional[str] = None
     solver: Optional[str] = None
     notes: List[str] = field(default_factory=list)
+    tags: Dict[str, List[str]] = field(default_factory=dict)
 
 
 @dataclass
@@ -328,6 +396,7 @@ class PuzzleData:
     boxorder: Optional[str] = None
     goalorder: Optional[str] = None
     notes: List[str] = field(default_factory=list)
+    tags: Dict[str, List[str]] = field(default_factory=dict)
     snapshots: List[SnapshotData] = field(default_factory=list, init=False, repr=False)
 
 
@@ -338,6 +407,7 @@ class CollectionData:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     notes: List[str] = field(default_factory=list)
+    tags: Dict[str, List[str]] = field(default_factory=dict)
     header_tessellation_hint: Optional[Tessellation] = None
     puzzles: List[PuzzleData] = field(default_factory=list, init=False, repr=False)
 
@@ -354,6 +424,7 @@ class SOKTags:
     DATE_OF_LAST_CHANGE: Final[str] = "Date of Last Change"
     RAW_FILE_NOTES: Final[str] = "::"
     TAG_DELIMITERS: Final[str] = "=:"
+    UNKNOWN_TAG_DELIMITER: Final[str] = ":"
 
     COLLECTION_TAGS: Final[Dict[str, str]] = {
         AUTHOR: "author",
@@ -378,29 +449,34 @@ class SOKTags:
         SOLVER: "solver",
     }
 
+    # Known tags, by normalized tag name
+    _COLLECTION_KEYS: Final[Dict[str, str]] = {
+        tag.lower(): attr for tag, attr in COLLECTION_TAGS.items()
+    }
+    _PUZZLE_KEYS: Final[Dict[str, str]] = {
+        tag.lower(): attr for tag, attr in PUZZLE_TAGS.items()
+    }
+    _SNAPSHOT_KEYS: Final[Dict[str, str]] = {
+        tag.lower(): attr for tag, attr in SNAPSHOT_TAGS.items()
+    }
+
+    _TAG_SPLITTER: Final[Pattern] = re.compile(
+        "|".join(map(re.escape, list(TAG_DELIMITERS)))
+    )
+
     @classmethod
     def extract_collection_attributes(
-        cls, dest: CollectionData, notes: List[str]
+        cls,
+        dest: CollectionData,
+        notes: List[str],
+        unknown_tags: Optional[Dict[str, List[str]]] = None,
     ) -> List[str]:
-        remaining_lines = []
-        tessellation = None
-        for line in notes:
-            if cls.is_raw_file_notes_line(line):
-                continue
-
-            was_tagged = False
-            for tag, attr in cls.COLLECTION_TAGS.items():
-                found, value = cls.get_tag_data(tag, line)
-                if found:
-                    if tag == cls.VARIANT:
-                        tessellation = value
-                    else:
-                        setattr(dest, attr, value)
-                    was_tagged = True
-                    break
-
-            if not was_tagged:
-                remaining_lines.append(line)
+        remaining_lines, tessellation = cls._extract_attributes(
+            dest,
+            (_ for _ in notes if not cls.is_raw_file_notes_line(_)),
+            cls._COLLECTION_KEYS,
+            unknown_tags,
+        )
 
         if not is_blank(tessellation):
             dest.header_tessellation_hint = Tessellation[tessellation.strip().upper()]
@@ -414,23 +490,11 @@ class SOKTags:
         notes: List[str],
         collection_header_tessellation_hint: Optional[Tessellation],
         supplied_tessellation_hint: Optional[Tessellation],
+        unknown_tags: Optional[Dict[str, List[str]]] = None,
     ) -> List[str]:
-        remaining_lines = []
-        tessellation = None
-        for line in notes:
-            was_tagged = False
-            for tag, attr in cls.PUZZLE_TAGS.items():
-                found, value = cls.get_tag_data(tag, line)
-                if found:
-                    if tag == cls.VARIANT:
-                        tessellation = value
-                    else:
-                        setattr(dest, attr, value)
-                    was_tagged = True
-                    break
-
-            if not was_tagged:
-                remaining_lines.append(line)
+        remaining_lines, tessellation = cls._extract_attributes(
+            dest, notes, cls._PUZZLE_KEYS, unknown_tags
+        )
 
         if not is_blank(tessellation):
             dest.tessellation = Tessellation[tessellation.strip().upper()]
@@ -445,26 +509,66 @@ class SOKTags:
 
     @classmethod
     def extract_snapshot_attributes(
-        cls, dest: SnapshotData, notes: List[str]
+        cls,
+        dest: SnapshotData,
+        notes: List[str],
+        unknown_tags: Optional[Dict[str, List[str]]] = None,
     ) -> List[str]:
+        remaining_lines, _ = cls._extract_attributes(
+            dest, notes, cls._SNAPSHOT_KEYS, unknown_tags
+        )
+        return remaining_lines
+
+    @classmethod
+    def _extract_attributes(
+        cls,
+        dest: Union[CollectionData, PuzzleData, SnapshotData],
+        notes: Iterable[str],
+        known_tags: Dict[str, str],
+        unknown_tags: Optional[Dict[str, List[str]]],
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        Splits each of ``notes`` once and sets attributes of ``dest`` from lines
+        tagged with one of ``known_tags``.
+
+        If ``unknown_tags`` is not None, ``Tag: value`` lines with other tags that
+        precede first non blank, not tagged line are moved into it instead of being
+        left in notes. Writers put them back to the same place, before notes.
+
+        Returns:
+            Remaining, not tagged lines and value of :attr:`VARIANT` tag, if found
+        """
         remaining_lines = []
+        tessellation = None
+        variant_key = cls.VARIANT.lower()
+        split = cls._TAG_SPLITTER.split
+        in_tags_block = unknown_tags is not None
+
         for line in notes:
-            was_tagged = False
-            for tag, attr in cls.SNAPSHOT_TAGS.items():
-                found, value = cls.get_tag_data(tag, line)
-                if found:
+            line = str(line)
+            components = split(line, 1)
+            tag = components[0].strip()
+            key = tag.lower()
+            attr = known_tags.get(key, None)
+
+            if attr is not None:
+                value = "".join(components[1:]).strip()
+                if key == variant_key:
+                    tessellation = value
+                else:
                     setattr(dest, attr, value)
-                    was_tagged = True
-                    break
-
-            if not was_tagged:
+            elif (
+                in_tags_block
+                and len(components) > 1
+                and tag
+                and line[len(components[0])] == cls.UNKNOWN_TAG_DELIMITER
+            ):
+                unknown_tags.setdefault(tag, []).append(components[1].strip())
+            else:
+                in_tags_block = in_tags_block and is_blank(line)
                 remaining_lines.append(line)
 
-        return remaining_lines
-
-    _TAG_SPLITTER: Final[Pattern] = re.compile(
-        "|".join(map(re.escape, list(TAG_DELIMITERS)))
-    )
+        return remaining_lines, tessellation
 
     @classmethod
     def get_tag_data(cls, tag: str, line: str) -> Tuple[bool, Optional[str]]:
@@ -490,14 +594,221 @@ class SOKTags:
         dest.write(tag.strip() + ": " + data.rstrip() + "\n")
         return True
 
+    @classmethod
+    def write_all_tagged(
+        cls, dest: Union[io.StringIO, io.TextIOWrapper], tags: Dict[str, List[str]]
+    ) -> bool:
+        """
+        Writes each value of each of ``tags`` in its own line. Unlike
+        :meth:`write_tagged`, writes tags with blank values too.
+        """
+        written = False
+        for tag, values in tags.items():
+            if is_blank(tag):
+                continue
+            for data in values:
+                data = (data or "").rstrip()
+                dest.write(
+                    tag.strip()
+                    + cls.UNKNOWN_TAG_DELIMITER
+                    + (" " + data if data else "")
+                    + "\n"
+                )
+                written = True
+        return written
+
+
+class SOKLineKind(enum.IntFlag):
+    """
+    Labels of lines in SOK file, see :meth:`classify_lines`.
+
+    Line that contains only characters that are both board and snapshot characters
+    (ie. ``"***"``) is labeled as both :attr:`BOARD` and :attr:`SNAPSHOT`.
+    """
+
+    NOTE = 0
+    BOARD = int(TextKind.BOARD)
+    SNAPSHOT = int(TextKind.SNAPSHOT)
+    BLANK = 8
+    TAG = 16
+
+    @classmethod
+    def classify_lines(cls, lines: List[str]) -> array:
+        """
+        Labels each of ``lines`` once, so that SOK file can be split into puzzles
+        and snapshots without rescanning them.
+
+        Returns:
+            Labels of lines, one byte per line.
+        """
+        board_or_snapshot = int(TextKind.BOARD | TextKind.SNAPSHOT)
+        blank = int(cls.BLANK)
+        tag = int(cls.TAG)
+        note = int(cls.NOTE)
+        tag_splitter = SOKTags._TAG_SPLITTER
+
+        retv = array("B", bytes(len(lines)))
+        for index, line in enumerate(lines):
+            kind = int(Characters.classify(line)) & board_or_snapshot
+            if kind:
+                retv[index] = kind
+            elif not line.strip():
+                retv[index] = blank
+            elif tag_splitter.search(line):
+                retv[index] = tag
+            else:
+                retv[index] = note
+        return retv
+
+
+class SOKIndex:
+    """
+    Byte offsets of puzzles in SOK file.
+
+    Chunk of each puzzle starts with its title line (or with its board if puzzle
+    doesn't have title) and contains puzzle board, notes and snapshots. It ends where
+    chunk of next puzzle starts. Index is built from :class:`SOKLineKind` of each
+    line, without parsing puzzles and snapshots.
+    """
+
+    #: Number of lines classified at once while building index
+    LINES_BATCH: Final[int] = 2**14
+
+    def __init__(self):
+        #: Size of indexed file in bytes
+        self.size: int = 0
+        #: Byte offset at which chunk of each puzzle starts
+        self.starts = array("Q")
+        # For each puzzle chunk, True if line before it is blank
+        self._blank_before = array("B")
+        self._ends_with_newline = True
+        self._ends_with_blank = True
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def build(cls, path: Union[str, Path]) -> SOKIndex:
+        offsets = array("Q")
+        kinds = array("B")
+        retv = cls()
+
+        with open(path, "rb") as f:
+            last_line = b""
+            while True:
+                lines = list(itertools.islice(f, cls.LINES_BATCH))
+                if not lines:
+                    break
+                for line in lines:
+                    offsets.append(retv.size)
+                    retv.size += len(line)
+                kinds.extend(
+                    SOKLineKind.classify_lines(
+                        [_.decode("utf-8", "replace") for _ in lines]
+                    )
+                )
+                last_line = lines[-1]
+
+        retv._ends_with_newline = not last_line or last_line.endswith(b"\n")
+        retv._ends_with_blank = not kinds or kinds[-1] == SOKLineKind.BLANK
+
+        board = SOKLineKind.BOARD
+        count = len(kinds)
+        notes_start = 0
+        index = SOKReader._find_line(kinds, 0, count, board)
+        while index < count:
+            title_line = cls._title_line(kinds, notes_start, index)
+            start = index if title_line is None else title_line
+            retv.starts.append(offsets[start])
+            retv._blank_before.append(
+                start > 0 and kinds[start - 1] == SOKLineKind.BLANK
+            )
+
+            board_end = SOKReader._find_line(kinds, index, count, board, False)
+            index = SOKReader._find_line(kinds, board_end, count, board)
+
+            # Notes before next puzzle start after last snapshot of this one
+            notes_start = board_end
+            for i in range(index - 1, board_end - 1, -1):
+                if kinds[i] & SOKLineKind.SNAPSHOT:
+                    notes_start = i + 1
+                    break
+
+        return retv
+
+    @staticmethod
+    def _title_line(kinds: array, start: int, end: int) -> Optional[int]:
+        """
+        Same rules as in `SOKReader._get_and_remove_title_line` applied to lines
+        ``start:end``.
+        """
+        blank = SOKLineKind.BLANK
+        for candidate in range(end - 1, start - 1, -1):
+            if kinds[candidate] != blank:
+                if candidate - start <= 1 or kinds[candidate - 1] == blank:
+                    return candidate
+                return None
+        return None
+
+    def puzzle_end(self, puzzle_index: int) -> int:
+        """Byte offset at which chunk of puzzle ends."""
+        if puzzle_index + 1 < len(self.starts):
+            return self.starts[puzzle_index + 1]
+        return self.size
+
+    def separator(self, puzzle_index: int) -> str:
+        """
+        Text that needs to be written before data inserted at start of chunk of
+        puzzle (or at the end of file, if ``puzzle_index == len(self)``) so that
+        inserted data starts after blank line.
+        """
+        if puzzle_index < len(self.starts):
+            return "" if self._blank_before[puzzle_index] else "\n"
+        if self.size == 0:
+            return ""
+        retv = "" if self._ends_with_newline else "\n"
+        return retv if self._ends_with_blank else retv + "\n"
+
 
 class SOKWriter:
+    """
+    Writes collections in SokobanYASC .sok format.
+
+    Besides writing whole :class:`.Collection` with :meth:`write`, it can also
+    stream puzzles one by one, so that they don't need to be in memory at once.
+    Output is written to ``dest`` in blocks of at least :attr:`BUFFER_SIZE`
+    characters and is identical to the one of `.Collection.dump` for the same data.
+
+    Example:
+
+        >>> import io
+        >>> from sokoenginepy import Collection, Puzzle, Tessellation
+        >>> from sokoenginepy.io import SOKWriter
+        >>> def generate():
+        ...     for i in range(3):
+        ...         puzzle = Puzzle(Tessellation.SOKOBAN, board="#####\\n#@$.#\\n#####")
+        ...         puzzle.title = f"Level {i + 1}"
+        ...         yield puzzle
+        >>> out = io.StringIO()
+        >>> with SOKWriter.open(out, Collection(title="Generated")) as writer:
+        ...     writer.write_puzzles(generate())
+        >>> collection = Collection()
+        >>> collection.loads(out.getvalue())
+        >>> [_.title for _ in collection.puzzles]
+        ['Level 1', 'Level 2', 'Level 3']
+    """
+
+    #: Minimal size of blocks written to destination stream, in characters
+    BUFFER_SIZE: Final[int] = 2**16
+
     def __init__(
         self,
         dest: Union[
             io.BufferedWriter, io.TextIOWrapper, io.FileIO, io.StringIO, io.BytesIO
         ],
     ):
+        self._buffer = io.StringIO()
+        self._dest_was_opened = False
         self._stream_was_wrapped = False
         self.dest: Union[io.TextIOWrapper, io.StringIO]
         if isinstance(dest, io.StringIO):
@@ -520,87 +831,160 @@ class SOKWriter:
             # isinstance(src, io.TextIOWrapper) == True
             self.dest = dest
 
+    @classmethod
+    def open(
+        cls,
+        dest: Union[
+            str,
+            Path,
+            io.BufferedWriter,
+            io.TextIOWrapper,
+            io.FileIO,
+            io.StringIO,
+            io.BytesIO,
+        ],
+        header: Optional[Collection] = None,
+    ) -> SOKWriter:
+        """
+        Creates writer and writes collection header to ``dest``. Puzzles are then
+        written with :meth:`write_puzzle` or :meth:`write_puzzles` and writing is
+        finished by :meth:`close`.
+
+        Arguments:
+            dest: Path to destination file or destination stream object.
+            header: Collection whose title, author, dates, notes and tags are
+                written in header. Its puzzles are ignored.
+        """
+        if header is None:
+            from .collection import Collection
+
+            header = Collection()
+
+        if isinstance(dest, (str, Path)):
+            retv = cls(open(dest, "w"))
+            retv._dest_was_opened = True
+        else:
+            retv = cls(dest)
+
+        retv._write_collection_header(header)
+        return retv
+
+    def __enter__(self) -> SOKWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def close(self):
-        if self._stream_was_wrapped:
+        """
+        Flushes remaining output. If ``dest`` was opened by :meth:`open`, closes it.
+        """
+        self.flush()
+        if self._dest_was_opened:
+            self.dest.close()
+        elif self._stream_was_wrapped:
             self.dest.detach()
 
+    def flush(self):
+        """Writes buffered output to ``dest``."""
+        if self._buffer.tell():
+            self.dest.write(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
     def write(self, src: Collection):
         self._write_collection_header(src)
-        for puzzle in src.puzzles:
-            self._write_puzzle(puzzle)
+        self.write_puzzles(src.puzzles)
+
+    def write_puzzle(self, puzzle: Puzzle):
+        self._write_puzzle(puzzle)
+        if self._buffer.tell() >= self.BUFFER_SIZE:
+            self.flush()
+
+    def write_puzzles(self, puzzles: Iterable[Puzzle]):
+        for puzzle in puzzles:
+            self.write_puzzle(puzzle)
 
     def _write_collection_header(self, src: Collection):
         for line in open(_SOK_FORMAT_SPEC_PATH):
-            self.dest.write(line.rstrip() + "\n")
+            self._buffer.write(line.rstrip() + "\n")
 
         SOKTags.write_tagged(
-            self.dest,
+            self._buffer,
             SOKTags.DATE_CREATED,
             src.created_at.strip() or arrow.utcnow().isoformat(),
         )
         SOKTags.write_tagged(
-            self.dest,
+            self._buffer,
             SOKTags.DATE_OF_LAST_CHANGE,
             src.updated_at.strip() or arrow.utcnow().isoformat(),
         )
 
-        self.dest.write(
+        self._buffer.write(
             "::::::::::::::::::::::::::::::::::::::::::::::::::::::::::::" + "\n\n"
         )
 
         written = False
         written = (
-            SOKTags.write_tagged(self.dest, SOKTags.COLLECTION, src.title) or written
+            SOKTags.write_tagged(self._buffer, SOKTags.COLLECTION, src.title) or written
+        )
+        written = (
+            SOKTags.write_tagged(self._buffer, SOKTags.AUTHOR, src.author) or written
         )
-        written = SOKTags.write_tagged(self.dest, SOKTags.AUTHOR, src.author) or written
+        written = SOKTags.write_all_tagged(self._buffer, src.tags) or written
 
         if not is_blank(src.notes):
-            self.dest.write(src.notes.rstrip() + "\n")
+            self._buffer.write(src.notes.rstrip() + "\n")
             written = True
 
         if written:
-            self.dest.write("\n")
+            self._buffer.write("\n")
 
     def _write_puzzle(self, src: Puzzle):
         if is_blank(src.board):
             return
 
         if not is_blank(src.title):
-            self.dest.write(src.title.strip() + "\n\n")
+            self._buffer.write(src.title.strip() + "\n\n")
 
-        self.dest.write(src.board.rstrip() + "\n\n")
+        self._buffer.write(src.board.rstrip() + "\n\n")
 
         written = False
 
         if src.tessellation != Tessellation.SOKOBAN:
             written = (
                 SOKTags.write_tagged(
-                    self.dest, SOKTags.VARIANT, str(src.tessellation.name).capitalize()
+                    self._buffer,
+                    SOKTags.VARIANT,
+                    str(src.tessellation.name).capitalize(),
                 )
                 or written
             )
 
         if not is_blank(src.boxorder) and not is_blank(src.goalorder):
             written = (
-                SOKTags.write_tagged(self.dest, SOKTags.BOXORDER, src.boxorder)
+                SOKTags.write_tagged(self._buffer, SOKTags.BOXORDER, src.boxorder)
                 or written
             )
             written = (
-                SOKTags.write_tagged(self.dest, SOKTags.GOALORDER, src.goalorder)
+                SOKTags.write_tagged(self._buffer, SOKTags.GOALORDER, src.goalorder)
                 or written
             )
 
         if not is_blank(src.author):
             written = (
-                SOKTags.write_tagged(self.dest, SOKTags.AUTHOR, src.author) or written
+                SOKTags.write_tagged(self._buffer, SOKTags.AUTHOR, src.author)
+                or written
             )
 
+        written = SOKTags.write_all_tagged(self._buffer, src.tags) or written
+
         if not is_blank(src.notes):
-            self.dest.write(src.notes.rstrip() + "\n")
+            self._buffer.write(src.notes.rstrip() + "\n")
             written = True
 
         if written:
-            self.dest.write("\n")
+            self._buffer.write("\n")
 
         for snapshot in src.snapshots:
             self._write_snapshot(snapshot)
@@ -610,18 +994,28 @@ class SOKWriter:
             return
 
         if not is_blank(src.title):
-            self.dest.write(src.title.strip() + "\n")
+            self._buffer.write(src.title.strip() + "\n")
 
-        self.dest.write("\n".join(textwrap.wrap(src.moves_data.strip(), 70)) + "\n")
+        self._buffer.write("\n".join(textwrap.wrap(src.moves_data.strip(), 70)) + "\n")
 
-        written = SOKTags.write_tagged(self.dest, SOKTags.SOLVER, src.solver)
+        written = SOKTags.write_tagged(self._buffer, SOKTags.SOLVER, src.solver)
+        written = SOKTags.write_all_tagged(self._buffer, src.tags) or written
 
         if not is_blank(src.notes):
-            self.dest.write(src.notes.rstrip() + "\n")
+            self._buffer.write(src.notes.rstrip() + "\n")
             written = True
 
         if written:
-            self.dest.write("\n")
+            self._buffer.write("\n")
+
+
+def _copy_bytes(src: BinaryIO, dest: BinaryIO, count: int, chunk_size: int = 2**20):
+    while count > 0:
+        data = src.read(min(chunk_size, count))
+        if not data:
+            break
+        dest.write(data)
+        count -= len(data)
 
 
 def first_index_of(lst, predicate):
@@ -0,0 +1,45 @@
+"""
+Push-optimal puzzle solvers built on top of game engine.
+"""
+
+from .benchmark import (
+    BENCHMARK_PUZZLES,
+    SCALING_BENCHMARK_PUZZLE,
+    SCALING_BENCHMARK_WORKERS,
+    SYMMETRY_BENCHMARK_PUZZLES,
+    SymmetryBenchmarkResult,
+    benchmark_puzzle,
+    run_scaling_benchmark,
+    run_solver_benchmark,
+    run_symmetry_benchmark,
+)
+from .deadlocks import (
+    DeadlockDetector,
+    DeadSquares,
+    FrozenBlocks,
+    ReverseDeadSquares,
+    default_deadlock_detectors,
+)
+from .heuristics import (
+    Heuristic,
+    MinimumMatchingLowerBound,
+    NullHeuristic,
+    SimpleLowerBound,
+)
+from .matching import BoxGoalMatcher
+from .optimizer import OptimizationResult, SolutionOptimizer, optimize_collection
+from .parallel import ParallelSolver
+from .pattern_database import (
+    PatternDatabase,
+    PatternDatabaseHeuristic,
+    PatternLookup,
+)
+from .search_space import Push, SearchSpace, Successor
+from .solver import (
+    SearchAlgorithm,
+    Solver,
+    SolverResult,
+    SolverStatistics,
+    SolverStatus,
+    solve,
+)
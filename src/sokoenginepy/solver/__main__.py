@@ -0,0 +1,28 @@
+from .benchmark import (
+    run_scaling_benchmark,
+    run_solver_benchmark,
+    run_symmetry_benchmark,
+)
+
+
+def run_benchmarks():
+    print("--------------------------------------------------")
+    print("--              SOLVER BENCHMARKS               --")
+    print("--------------------------------------------------")
+    retv = run_solver_benchmark()
+
+    print("--------------------------------------------------")
+    print("--         PARALLEL SOLVER SCALING              --")
+    print("--------------------------------------------------")
+    retv += run_scaling_benchmark()
+
+    print("--------------------------------------------------")
+    print("--              BOARD SYMMETRIES                --")
+    print("--------------------------------------------------")
+    retv += run_symmetry_benchmark()
+
+    return retv
+
+
+if __name__ == "__main__":
+    run_benchmarks()
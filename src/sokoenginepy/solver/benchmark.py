@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import textwrap
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..common import Tessellation
+from ..game import BoardGraph, HashedBoardManager
+from ..io import Puzzle
+from .parallel import ParallelSolver
+from .search_space import SearchSpace
+from .solver import SearchAlgorithm, Solver, SolverResult
+
+#: Small, well known puzzles used for solver benchmarks. First levels of "Microban"
+#: collection by David W. Skinner.
+BENCHMARK_PUZZLES: Dict[str, str] = {
+    "Microban 1": """
+        ####
+        # .#
+        #  ###
+        #*@  #
+        #  $ #
+        #  ###
+        ####
+    """,
+    "Microban 2": """
+        ######
+        #    #
+        # #@ #
+        # $* #
+        # .* #
+        #    #
+        ######
+    """,
+    "Microban 3": """
+          ####
+        ###  ####
+        #     $ #
+        # #  #$ #
+        # . .#@ #
+        #########
+    """,
+    "Microban 4": """
+        ########
+        #      #
+        # .**$@#
+        #      #
+        #####  #
+            ####
+    """,
+    "Microban 5": """
+         #######
+         #     #
+         # .$. #
+        ## $@$ #
+        #  .$. #
+        #      #
+        ########
+    """,
+}
+
+#: Puzzle used for :func:`run_scaling_benchmark`. It is larger than
+#: :data:`BENCHMARK_PUZZLES`, so that work done by workers outweighs cost of
+#: exchanging states between them.
+SCALING_BENCHMARK_PUZZLE: str = """
+    ###########
+    #    #    #
+    # $  .  $ #
+    #   ...   #
+    # $  @  $ #
+    #         #
+    ###########
+"""
+
+#: Default worker counts used by :func:`run_scaling_benchmark`
+SCALING_BENCHMARK_WORKERS = (1, 2, 4, 8, 16)
+
+
+#: Symmetric puzzles used for :func:`run_symmetry_benchmark`
+SYMMETRY_BENCHMARK_PUZZLES: Dict[str, str] = {
+    "Mirror": """
+        #########
+        #   #   #
+        # $ . $ #
+        #   .   #
+        ##  @  ##
+         #######
+    """,
+    "Square": """
+        #######
+        #     #
+        # $.$ #
+        # .@. #
+        # $.$ #
+        #     #
+        #######
+    """,
+}
+
+
+def _puzzle_from(board: str, title: str) -> Puzzle:
+    retv = Puzzle(
+        Tessellation.SOKOBAN, board=textwrap.dedent(board.lstrip("\n").rstrip())
+    )
+    retv.title = title
+    return retv
+
+
+def benchmark_puzzle(title: str) -> Puzzle:
+    """
+    Creates new :class:`.Puzzle` from :data:`BENCHMARK_PUZZLES`.
+
+    Raises:
+        KeyError: there is no benchmark puzzle with ``title``
+    """
+    return _puzzle_from(BENCHMARK_PUZZLES[title], title)
+
+
+@dataclass
+class SolverBenchmarkResult:
+    title: str
+    algorithm: SearchAlgorithm
+    result: SolverResult
+
+    def __str__(self):
+        stats = self.result.statistics
+        pushes = len(self.result.pushes) if self.result.is_solved else "-"
+        memory = (
+            f"{stats.peak_memory / 2**20:.2f}" if stats.peak_memory is not None else "-"
+        )
+        return (
+            f"{self.title:<12} {self.algorithm.name:<13} "
+            f"{self.result.status.name:<11} {pushes:>6} "
+            f"{stats.nodes_expanded:>10} {stats.seconds * 1000:>10.2f} "
+            f"{stats.nodes_per_second:>10.2e} {memory:>8}"
+        )
+
+    @staticmethod
+    def header() -> str:
+        return (
+            f"{'Puzzle':<12} {'Algo':<13} {'Status':<11} {'Pushes':>6} "
+            f"{'Nodes':>10} {'Time [ms]':>10} {'Nodes/s':>10} {'Mem [MB]':>8}"
+        )
+
+
+def run_solver_benchmark(
+    algorithms: Iterable[SearchAlgorithm] = tuple(SearchAlgorithm),
+    titles: Optional[Iterable[str]] = None,
+    time_limit: Optional[float] = 60,
+    track_memory: bool = True,
+    verbose: bool = True,
+) -> List[SolverBenchmarkResult]:
+    """
+    Solves each of :data:`BENCHMARK_PUZZLES` with each of ``algorithms``.
+
+    Arguments:
+        titles: subset of :data:`BENCHMARK_PUZZLES` to solve, default is all of them
+        time_limit: time limit in seconds for each solver run
+        track_memory: measure peak memory usage (slows down solvers)
+        verbose: print results table while benchmarking
+    """
+    retv = []
+
+    if verbose:
+        print(SolverBenchmarkResult.header())
+
+    for title in titles or BENCHMARK_PUZZLES.keys():
+        for algorithm in algorithms:
+            solver = Solver(
+                benchmark_puzzle(title),
+                algorithm,
+                time_limit=time_limit,
+                track_memory=track_memory,
+            )
+            benchmark_result = SolverBenchmarkResult(title, algorithm, solver.solve())
+            retv.append(benchmark_result)
+            if verbose:
+                print(benchmark_result, flush=True)
+
+    return retv
+
+
+@dataclass
+class ScalingBenchmarkResult:
+    workers: int
+    result: SolverResult
+
+    #: Ratio of nodes per second of this run and of single worker run
+    speedup: float = 1.0
+
+    def __str__(self):
+        stats = self.result.statistics
+        pushes = len(self.result.pushes) if self.result.is_solved else "-"
+        return (
+            f"{self.workers:>7} {self.result.status.name:<11} {pushes:>6} "
+            f"{stats.nodes_expanded:>10} {stats.seconds * 1000:>10.2f} "
+            f"{stats.nodes_per_second:>10.2e} {self.speedup:>8.2f}"
+        )
+
+    @staticmethod
+    def header() -> str:
+        return (
+            f"{'Workers':>7} {'Status':<11} {'Pushes':>6} {'Nodes':>10} "
+            f"{'Time [ms]':>10} {'Nodes/s':>10} {'Speedup':>8}"
+        )
+
+
+def run_scaling_benchmark(
+    workers: Sequence[int] = SCALING_BENCHMARK_WORKERS,
+    puzzle: Optional[Puzzle] = None,
+    time_limit: Optional[float] = 60,
+    verbose: bool = True,
+) -> List[ScalingBenchmarkResult]:
+    """
+    Solves the same puzzle with :class:`.ParallelSolver` using each of ``workers``
+    worker counts and compares aggregate nodes per second.
+
+    Speedup is relative to the first worker count in ``workers``.
+
+    Arguments:
+        puzzle: puzzle to solve, default is :data:`SCALING_BENCHMARK_PUZZLE`
+        time_limit: time limit in seconds for each solver run
+        verbose: print results table while benchmarking
+    """
+    retv: List[ScalingBenchmarkResult] = []
+    puzzle = puzzle or _puzzle_from(SCALING_BENCHMARK_PUZZLE, "Scaling")
+
+    if verbose:
+        print(ScalingBenchmarkResult.header())
+
+    for workers_count in workers:
+        result = ParallelSolver(
+            puzzle, workers=workers_count, time_limit=time_limit
+        ).solve()
+        benchmark_result = ScalingBenchmarkResult(workers_count, result)
+        if retv and retv[0].result.statistics.nodes_per_second > 0:
+            benchmark_result.speedup = (
+                result.statistics.nodes_per_second
+                / retv[0].result.statistics.nodes_per_second
+            )
+        retv.append(benchmark_result)
+        if verbose:
+            print(benchmark_result, flush=True)
+
+    return retv
+
+
+@dataclass
+class SymmetryBenchmarkResult:
+    title: str
+
+    #: Number of non-identity board symmetries
+    symmetries: int
+
+    #: Number of distinct states (with normalized pusher position) explored
+    states: int
+
+    #: Number of distinct `.HashedBoardManager.symmetric_positions_hash` of explored
+    #: states
+    symmetric_states: int
+
+    seconds: float = 0.0
+
+    #: True if whole state space was explored
+    is_complete: bool = True
+
+    @property
+    def reduction(self) -> float:
+        """Ratio of number of states and number of symmetric states."""
+        return self.states / self.symmetric_states if self.symmetric_states else 1.0
+
+    def __str__(self):
+        states = f"{self.states}" + ("" if self.is_complete else "+")
+        return (
+            f"{self.title:<12} {self.symmetries:>10} {states:>10} "
+            f"{self.symmetric_states:>10} {self.reduction:>9.2f} "
+            f"{self.seconds * 1000:>10.2f}"
+        )
+
+    @staticmethod
+    def header() -> str:
+        return (
+            f"{'Puzzle':<12} {'Symmetries':>10} {'States':>10} {'Symmetric':>10} "
+            f"{'Reduction':>9} {'Time [ms]':>10}"
+        )
+
+
+def run_symmetry_benchmark(
+    titles: Optional[Iterable[str]] = None,
+    states_limit: int = 100_000,
+    verbose: bool = True,
+) -> List[SymmetryBenchmarkResult]:
+    """
+    Measures how much symmetric hashing (see `.HashedBoardManager`) reduces state
+    space of each of :data:`SYMMETRY_BENCHMARK_PUZZLES`.
+
+    All states reachable from initial one are explored by breadth first search, and
+    number of distinct states is compared to number of distinct symmetric hashes of
+    them. Deadlocked states are not pruned.
+
+    Arguments:
+        titles: subset of :data:`SYMMETRY_BENCHMARK_PUZZLES` to explore, default is
+            all of them
+        states_limit: search for each puzzle stops after this many states
+        verbose: print results table while benchmarking
+    """
+    retv = []
+
+    if verbose:
+        print(SymmetryBenchmarkResult.header())
+
+    for title in titles or SYMMETRY_BENCHMARK_PUZZLES.keys():
+        puzzle = _puzzle_from(SYMMETRY_BENCHMARK_PUZZLES[title], title)
+        space = SearchSpace(puzzle)
+        manager = HashedBoardManager(BoardGraph(puzzle), symmetric_hashing=True)
+
+        started = time.perf_counter()
+        visited = {space.initial_state}
+        symmetric_hashes = set()
+        to_expand = [space.initial_state]
+        for state in to_expand:
+            boxes_positions = state.boxes_positions
+            symmetric_hashes.add(
+                manager.symmetric_positions_hash(
+                    state.pushers_positions,
+                    boxes_positions,
+                    space.reachable_positions(
+                        state.pushers_positions[0], set(boxes_positions)
+                    ),
+                )
+            )
+            if len(visited) >= states_limit:
+                continue
+            for child, _, _ in space.successors(state):
+                if child not in visited and len(visited) < states_limit:
+                    visited.add(child)
+                    to_expand.append(child)
+
+        benchmark_result = SymmetryBenchmarkResult(
+            title,
+            len(manager.symmetries),
+            len(visited),
+            len(symmetric_hashes),
+            time.perf_counter() - started,
+            len(visited) < states_limit,
+        )
+        retv.append(benchmark_result)
+        if verbose:
+            print(benchmark_result, flush=True)
+
+    return retv
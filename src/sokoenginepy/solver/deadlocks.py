@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+
+from ..common import Tessellation
+
+if TYPE_CHECKING:
+    from .search_space import SearchSpace
+
+
+class DeadlockDetector(ABC):
+    """
+    Base class for recognizers of boxes configurations from which board can't be
+    solved.
+
+    Detector is attached to :class:`.SearchSpace` before search starts and is then
+    asked about each new state right after box has been pushed. Detectors must never
+    report false positives, otherwise solvable boards will be reported as unsolvable.
+    """
+
+    def __init__(self):
+        self._space: Optional[SearchSpace] = None
+
+    @property
+    def space(self) -> Optional[SearchSpace]:
+        return self._space
+
+    def attach(self, space: SearchSpace):
+        """Prepares detector for searching ``space``."""
+        self._space = space
+
+    @abstractmethod
+    def is_deadlock(self, boxes_positions: Set[int], pushed_box_position: int) -> bool:
+        """
+        Checks if boxes configuration is deadlocked.
+
+        Arguments:
+            boxes_positions: positions of all boxes, after push
+            pushed_box_position: position box was just pushed onto
+        """
+        pass
+
+
+class DeadSquares(DeadlockDetector):
+    """
+    Detects boxes pushed onto positions from which box can't be pushed onto any goal,
+    even when there are no other boxes on board (ie. corners without goals).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._dead: List[bool] = []
+
+    def attach(self, space: SearchSpace):
+        super().attach(space)
+        self._dead = [
+            _ == space.NO_POS for _ in space.push_distances(space.goals_positions)
+        ]
+
+    @property
+    def dead_positions(self) -> List[int]:
+        return [position for position, is_dead in enumerate(self._dead) if is_dead]
+
+    def is_deadlock(self, boxes_positions: Set[int], pushed_box_position: int) -> bool:
+        return self._dead[pushed_box_position]
+
+
+class ReverseDeadSquares(DeadSquares):
+    """
+    Reverse search counterpart of :class:`.DeadSquares`: detects boxes pulled onto
+    positions that box can't reach from any of initial boxes positions.
+    """
+
+    def attach(self, space: SearchSpace):
+        DeadlockDetector.attach(self, space)
+        self._dead = [
+            _ == space.NO_POS
+            for _ in space.pull_distances(space.initial_state.boxes_positions)
+        ]
+
+
+class FrozenBlocks(DeadlockDetector):
+    """
+    Detects 2x2 blocks of walls and boxes that contain at least one box not placed on
+    goal. None of boxes in such block can ever be moved.
+
+    Works only for `.Tessellation.SOKOBAN`. For other tessellations it never detects
+    anything.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._blocks: List[List[Tuple[int, int, int]]] = []
+        self._goals: Set[int] = set()
+
+    def attach(self, space: SearchSpace):
+        super().attach(space)
+        self._goals = set(space.goals_positions)
+        self._blocks = [[] for _ in range(space.size)]
+
+        if space.puzzle.tessellation != Tessellation.SOKOBAN:
+            return
+
+        width = space.board.board_width
+        height = space.board.board_height
+        for position in range(space.size):
+            if space.is_wall(position):
+                continue
+            row, column = divmod(position, width)
+            # All four 2x2 squares containing position, as positions of other three
+            # cells in square
+            for row_offset in (-1, 0):
+                for column_offset in (-1, 0):
+                    top = row + row_offset
+                    left = column + column_offset
+                    if not (0 <= top < height - 1 and 0 <= left < width - 1):
+                        continue
+                    square = (
+                        top * width + left,
+                        top * width + left + 1,
+                        (top + 1) * width + left,
+                        (top + 1) * width + left + 1,
+                    )
+                    self._blocks[position].append(
+                        tuple(_ for _ in square if _ != position)
+                    )
+
+    def is_deadlock(self, boxes_positions: Set[int], pushed_box_position: int) -> bool:
+        space = self._space
+        goals = self._goals
+
+        for block in self._blocks[pushed_box_position]:
+            has_box_off_goal = pushed_box_position not in goals
+            for position in block:
+                if position in boxes_positions:
+                    has_box_off_goal = has_box_off_goal or position not in goals
+                elif not space.is_wall(position):
+                    break
+            else:
+                if has_box_off_goal:
+                    return True
+
+        return False
+
+
+def default_deadlock_detectors() -> List[DeadlockDetector]:
+    """Creates new instances of all deadlock detectors that are used by default."""
+    return [DeadSquares(), FrozenBlocks()]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from .matching import BoxGoalMatcher
+
+if TYPE_CHECKING:
+    from .search_space import SearchSpace
+
+
+class Heuristic(ABC):
+    """
+    Base class for estimators of number of pushes needed to solve board from given
+    boxes positions.
+
+    Heuristic is attached to :class:`.SearchSpace` before search starts, which gives
+    it chance to precompute whatever it needs. For A* and IDA* to find push-optimal
+    solutions, :meth:`estimate` must never overestimate (must be admissible).
+    """
+
+    #: Estimate for boxes positions from which board can't be solved
+    INFINITY: int = 2**31 - 1
+
+    def __init__(self):
+        self._space: Optional[SearchSpace] = None
+
+    @property
+    def space(self) -> Optional[SearchSpace]:
+        return self._space
+
+    def attach(self, space: SearchSpace):
+        """Prepares heuristic for searching ``space``."""
+        self._space = space
+
+    @abstractmethod
+    def estimate(self, boxes_positions: Sequence[int]) -> int:
+        """
+        Estimates number of pushes needed to get from ``boxes_positions`` to solved
+        board.
+
+        Arguments:
+            boxes_positions: positions of boxes, ordered by box ID
+
+        Returns:
+            Estimate or :attr:`INFINITY` if board can't be solved from
+            ``boxes_positions``.
+        """
+        pass
+
+
+class NullHeuristic(Heuristic):
+    """Always estimates zero pushes. Turns A* into uniform cost search."""
+
+    def estimate(self, boxes_positions: Sequence[int]) -> int:
+        return 0
+
+
+class SimpleLowerBound(Heuristic):
+    """
+    Sum of push distances of each box to its nearest goal, ignoring all other boxes.
+
+    Goals are chosen independently for each box, so two boxes may be assigned to the
+    same goal. This makes it weaker than assignment based estimates but it is very
+    cheap to calculate. If Sokoban+ is enabled, only goals with the same Sokoban+ ID as
+    box are considered.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._distances: List[List[int]] = []
+
+    def attach(self, space: SearchSpace):
+        super().attach(space)
+
+        distances_by_plus_id: Dict[int, List[int]] = {}
+        for plus_id in set(space.boxes_plus_ids):
+            distances = space.push_distances(
+                [
+                    position
+                    for position, goal_plus_id in space.goals_plus_ids.items()
+                    if goal_plus_id == plus_id
+                ]
+            )
+            distances_by_plus_id[plus_id] = [
+                self.INFINITY if _ == space.NO_POS else _ for _ in distances
+            ]
+
+        self._distances = [
+            distances_by_plus_id[plus_id] for plus_id in space.boxes_plus_ids
+        ]
+
+    def estimate(self, boxes_positions: Sequence[int]) -> int:
+        retv = 0
+        for distances, box_position in zip(self._distances, boxes_positions):
+            distance = distances[box_position]
+            if distance == self.INFINITY:
+                return self.INFINITY
+            retv += distance
+        return retv
+
+
+class MinimumMatchingLowerBound(Heuristic):
+    """
+    Cost of minimum cost perfect matching of boxes to goals, where cost of assigning
+    box to goal is push distance ignoring all other boxes.
+
+    Unlike :class:`SimpleLowerBound`, each goal takes exactly one box, which gives
+    much better estimates. Matching is maintained by :class:`.BoxGoalMatcher` which
+    repairs previous matching after each push instead of re-calculating it, and caches
+    recent matchings. If Sokoban+ is enabled, boxes are matched only to goals with the
+    same Sokoban+ ID.
+
+    Arguments:
+        cache_size: maximal number of matchings cached by :class:`.BoxGoalMatcher`
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        super().__init__()
+        self._cache_size = cache_size
+        self._matcher: Optional[BoxGoalMatcher] = None
+
+    @property
+    def matcher(self) -> Optional[BoxGoalMatcher]:
+        return self._matcher
+
+    def attach(self, space: SearchSpace):
+        super().attach(space)
+        self._matcher = BoxGoalMatcher(
+            space.board_manager,
+            {goal: space.push_distances([goal]) for goal in space.goals_positions},
+            self._cache_size,
+        )
+
+    def estimate(self, boxes_positions: Sequence[int]) -> int:
+        retv = self._matcher.lower_bound(boxes_positions)
+        return self.INFINITY if retv is None else retv
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..common import Config
+
+if TYPE_CHECKING:
+    from ..game import HashedBoardManager
+
+# Cost of assigning box to goal it can't reach or to goal with different Sokoban+ ID.
+# Larger than any sum of real push distances, so optimal matching uses such
+# assignment only if there is no other choice.
+_FORBIDDEN = 2**40
+
+_Matching = Tuple[List[int], List[int], List[int], List[int], int]
+
+
+class BoxGoalMatcher:
+    """
+    Minimum cost perfect matching of boxes to goals, maintained incrementally for
+    boxes layouts of single `.HashedBoardManager`.
+
+    Cost of assigning box to goal is push distance from box position to goal, taken
+    from ``distances``. Sum of costs of optimal matching is lower bound of number of
+    pushes needed to solve the board.
+
+    Matching is calculated with Hungarian algorithm which takes O(n^3) time for ``n``
+    boxes. Matcher remembers last optimal matching together with its dual solution.
+    When next boxes layout differs from it in only a few boxes (which is the usual
+    case in search where each push moves single box), matching is repaired by
+    re-assigning only moved boxes, each in O(n^2) time.
+
+    Recently calculated matchings are cached by `.HashedBoardManager.boxes_hash` of
+    boxes layout. That hash ignores pushers, so all states that differ only in
+    pusher position share single cache entry.
+
+    If Sokoban+ is enabled in ``board_manager``, boxes are matched only to goals with
+    the same Sokoban+ ID. Sokoban+ IDs are read from ``board_manager`` when matcher is
+    created.
+
+    Arguments:
+        board_manager: manager of board whose boxes are matched
+        distances: for each goal position, list of push distances from all board
+            positions to that goal. Unreachable positions are `.Config.NO_POS`.
+        cache_size: maximal number of cached matchings
+    """
+
+    def __init__(
+        self,
+        board_manager: HashedBoardManager,
+        distances: Mapping[int, Sequence[int]],
+        cache_size: int = 4096,
+    ):
+        self._manager = board_manager
+        self._cache_size = cache_size
+        self._cache: OrderedDict[int, _Matching] = OrderedDict()
+
+        self._boxes_ids = list(board_manager.boxes_ids)
+        self._boxes_plus_ids: List[int] = [
+            board_manager.box_plus_id(box_id) for box_id in self._boxes_ids
+        ]
+        self._goals_positions: List[int] = []
+        self._goals_plus_ids: List[int] = []
+        for goal_id, position in board_manager.goals_positions.items():
+            self._goals_positions.append(position)
+            self._goals_plus_ids.append(board_manager.goal_plus_id(goal_id))
+        self._distances = distances
+        self._costs_rows: Dict[Tuple[int, int], List[int]] = {}
+
+        self._size = len(self._boxes_ids)
+        self._positions: List[int] = []
+        self._cost: List[List[int]] = []
+        self._u: List[int] = []
+        self._v: List[int] = []
+        self._p: List[int] = []
+        self._total = 0
+
+        self._full_solves = 0
+        self._repairs = 0
+        self._cache_hits = 0
+
+    @property
+    def board_manager(self) -> HashedBoardManager:
+        return self._manager
+
+    @property
+    def full_solves(self) -> int:
+        """Number of matchings calculated from scratch."""
+        return self._full_solves
+
+    @property
+    def repairs(self) -> int:
+        """Number of single box re-assignments done while repairing matchings."""
+        return self._repairs
+
+    @property
+    def cache_hits(self) -> int:
+        """Number of matchings found in cache."""
+        return self._cache_hits
+
+    @property
+    def matching(self) -> Dict[int, int]:
+        """Last calculated matching as box position -> goal position."""
+        return {
+            self._positions[row]: self._goals_positions[column]
+            for column, row in enumerate(self._p[: self._size])
+        }
+
+    def clear(self):
+        """Forgets last matching and empties cache."""
+        self._cache.clear()
+        self._positions = []
+
+    def lower_bound(
+        self, boxes_positions: Optional[Sequence[int]] = None
+    ) -> Optional[int]:
+        """
+        Cost of optimal matching of boxes on ``boxes_positions`` to goals.
+
+        Arguments:
+            boxes_positions: positions of boxes sorted by box ID. If not given,
+                current boxes positions in ``board_manager`` are used.
+
+        Returns:
+            Sum of push distances in optimal matching or None if there is no matching
+            in which all boxes can reach their goals.
+        """
+        if boxes_positions is None:
+            boxes_positions = [
+                self._manager.box_position(box_id) for box_id in self._boxes_ids
+            ]
+            key = self._manager.boxes_hash
+        else:
+            key = self._manager.boxes_positions_hash(boxes_positions)
+
+        cached = self._cache.get(key, None)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            self._restore(cached)
+        else:
+            self._update(boxes_positions)
+            self._cache[key] = (
+                list(self._positions),
+                list(self._p),
+                list(self._u),
+                list(self._v),
+                self._total,
+            )
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+        return self._total if self._total < _FORBIDDEN else None
+
+    def _costs_row(self, box_plus_id: int, position: int) -> List[int]:
+        key = (box_plus_id, position)
+        retv = self._costs_rows.get(key, None)
+        if retv is None:
+            retv = []
+            for goal_position, goal_plus_id in zip(
+                self._goals_positions, self._goals_plus_ids
+            ):
+                distance = self._distances[goal_position][position]
+                retv.append(
+                    _FORBIDDEN
+                    if goal_plus_id != box_plus_id or distance == Config.NO_POS
+                    else distance
+                )
+            self._costs_rows[key] = retv
+        return retv
+
+    def _restore(self, matching: _Matching):
+        positions, p, u, v, self._total = matching
+        self._positions = list(positions)
+        self._p = list(p)
+        self._u = list(u)
+        self._v = list(v)
+        self._cost = [
+            self._costs_row(box_plus_id, position)
+            for box_plus_id, position in zip(self._boxes_plus_ids, self._positions)
+        ]
+
+    def _update(self, boxes_positions: Sequence[int]):
+        if not self._positions:
+            self._solve(boxes_positions)
+            return
+
+        # Rows of matching are bound to Sokoban+ IDs, not to box IDs. Boxes sharing
+        # the same Sokoban+ ID are interchangeable, so any row with matching ID can
+        # take over any moved box.
+        new_boxes = set(zip(self._boxes_plus_ids, boxes_positions))
+        moved_rows = [
+            row
+            for row, box in enumerate(zip(self._boxes_plus_ids, self._positions))
+            if box not in new_boxes
+        ]
+
+        if 2 * len(moved_rows) > self._size:
+            self._solve(boxes_positions)
+            return
+
+        old_boxes = set(zip(self._boxes_plus_ids, self._positions))
+        added: Dict[int, List[int]] = {}
+        for box_plus_id, position in new_boxes - old_boxes:
+            added.setdefault(box_plus_id, []).append(position)
+
+        for row in moved_rows:
+            self._repair(row, added[self._boxes_plus_ids[row]].pop())
+
+        self._total = sum(
+            self._cost[row][column] for column, row in enumerate(self._p[: self._size])
+        )
+
+    def _solve(self, boxes_positions: Sequence[int]):
+        self._full_solves += 1
+        size = self._size
+
+        self._positions = list(boxes_positions)
+        self._cost = [
+            self._costs_row(box_plus_id, position)
+            for box_plus_id, position in zip(self._boxes_plus_ids, self._positions)
+        ]
+        self._u = [0] * size
+        self._v = [0] * (size + 1)
+        self._p = [-1] * (size + 1)
+
+        for row in range(size):
+            self._augment(row)
+
+        self._total = sum(
+            self._cost[row][column] for column, row in enumerate(self._p[:size])
+        )
+
+    def _repair(self, row: int, new_position: int):
+        """
+        Moves box of ``row`` to ``new_position`` and re-assigns it.
+
+        Costs change only in ``row``, so after it is unassigned and its dual
+        variable is lowered to keep dual solution feasible, all remaining assignments
+        stay optimal. Single augmenting path then completes the matching.
+        """
+        self._repairs += 1
+
+        self._p[self._p.index(row)] = -1
+        self._positions[row] = new_position
+        costs = self._costs_row(self._boxes_plus_ids[row], new_position)
+        self._cost[row] = costs
+        v = self._v
+        self._u[row] = min(costs[column] - v[column] for column in range(self._size))
+
+        self._augment(row)
+
+    def _augment(self, row: int):
+        """
+        Assigns unassigned ``row`` along shortest augmenting path, updating dual
+        variables (single phase of Hungarian algorithm, O(n^2)).
+
+        Column ``size`` is virtual column that is the root of alternating tree.
+        """
+        size = self._size
+        cost, u, v, p = self._cost, self._u, self._v, self._p
+        infinity = _FORBIDDEN * (size + 1)
+
+        p[size] = row
+        column0 = size
+        min_v = [infinity] * (size + 1)
+        used = [False] * (size + 1)
+        way = [size] * (size + 1)
+
+        while True:
+            used[column0] = True
+            row0 = p[column0]
+            row_costs = cost[row0]
+            u_row0 = u[row0]
+            delta = infinity
+            column1 = -1
+
+            for column in range(size):
+                if not used[column]:
+                    current = row_costs[column] - u_row0 - v[column]
+                    if current < min_v[column]:
+                        min_v[column] = current
+                        way[column] = column0
+                    if min_v[column] < delta:
+                        delta = min_v[column]
+                        column1 = column
+
+            for column in range(size + 1):
+                if used[column]:
+                    u[p[column]] += delta
+                    v[column] -= delta
+                else:
+                    min_v[column] -= delta
+
+            column0 = column1
+            if p[column0] == -1:
+                break
+
+        while column0 != size:
+            column1 = way[column0]
+            p[column0] = p[column1]
+            column0 = column1
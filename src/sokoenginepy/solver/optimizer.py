@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import multiprocessing
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from ..game import BoardGraph, IllegalMoveError, Mover, PackedBoardState, PusherStep
+from ..io import Puzzle, Snapshot
+
+if TYPE_CHECKING:
+    from ..common import Direction
+    from ..io import Collection
+
+
+class _RecordedPush(NamedTuple):
+    pusher_id: int
+    # Pusher position before the walk that precedes push
+    walk_start: int
+    walk: Tuple[Direction, ...]
+    direction: Direction
+
+
+class SolutionOptimizer:
+    """
+    Shortens existing forward snapshots of single puzzle.
+
+    Snapshot is replayed with :class:`.Mover` and split into pushes, each preceded by
+    pusher walk. Optimization then:
+
+    - removes cycles: if board returns to previously seen state, all pushes done
+      in between are dropped. Two states are considered equal if they have the same
+      boxes layout and pusher can walk between its positions in them without pushing
+      anything (see `.BoardManager.packed_state`). On boards with multiple pushers,
+      all pushers positions must be equal. On puzzles with Sokoban+, only boxes with
+      the same Sokoban+ ID are interchangeable.
+    - replaces each walk with the shortest one, found by `.BoardGraph.find_move_path`
+    - drops steps after last push of snapshot that solves the board
+
+    Resulting snapshot is replayed with :class:`.Mover` while it is built, so it is
+    guaranteed to be valid. It never has more moves or pushes than original one.
+
+    Arguments:
+        puzzle: puzzle whose snapshots will be optimized
+
+    Example:
+
+        >>> from sokoenginepy import Puzzle, Snapshot, Tessellation
+        >>> from sokoenginepy.solver import SolutionOptimizer
+        >>> puzzle = Puzzle(Tessellation.SOKOBAN, board="\\n".join([
+        ...     "#######",
+        ...     "#@ $ .#",
+        ...     "#     #",
+        ...     "#######",
+        ... ]))
+        >>> optimizer = SolutionOptimizer(puzzle)
+        >>> optimizer.optimize(Snapshot(Tessellation.SOKOBAN, "drulrRLRR")).to_str()
+        'rRR'
+    """
+
+    def __init__(self, puzzle: Puzzle):
+        self._puzzle = puzzle
+
+    @property
+    def puzzle(self) -> Puzzle:
+        return self._puzzle
+
+    def optimize(self, snapshot: Snapshot) -> Snapshot:
+        """
+        Creates optimized copy of ``snapshot``. Snapshot metadata (``title``,
+        ``solver`` and ``notes``) is copied to it.
+
+        Raises:
+            IllegalMoveError: ``snapshot`` contains move that is illegal on puzzle
+            NonPlayableBoardError: puzzle is not playable
+            ValueError: ``snapshot`` is reverse snapshot
+        """
+        if snapshot.is_reverse:
+            raise ValueError("Only forward snapshots can be optimized!")
+
+        pushes, states, final_pushers, is_solved = self._record(snapshot)
+        final_pushers = None if is_solved else final_pushers
+
+        pusher_steps = self._rebuild(
+            [pushes[_] for _ in self._remove_cycles(states)], final_pushers
+        )
+        retv = Snapshot(snapshot.tessellation)
+        retv.pusher_steps = pusher_steps
+
+        # Walk to first push after removed cycle starts from different position than
+        # in original snapshot. In rare cases it is longer than whole cycle was.
+        if retv.moves_count > snapshot.moves_count:
+            retv.pusher_steps = self._rebuild(pushes, final_pushers)
+
+        retv.title = snapshot.title
+        retv.solver = snapshot.solver
+        retv.notes = snapshot.notes
+        return retv
+
+    def _record(
+        self, snapshot: Snapshot
+    ) -> Tuple[List[_RecordedPush], List[PackedBoardState], Dict[int, int], bool]:
+        """
+        Replays ``snapshot``, splitting it into pushes.
+
+        Returns:
+            Recorded pushes, states before first and after each push, pushers
+            positions at the end of replay and whether final state is solved.
+        """
+        mover = self._mover()
+        manager = mover.board_manager
+        board = manager.board
+
+        pushes: List[_RecordedPush] = []
+        states = [manager.packed_state(normalize_pusher=True)]
+
+        walk: List[Direction] = []
+        walk_start = manager.pusher_position(mover.selected_pusher)
+
+        pusher_steps = snapshot.pusher_steps
+        steps_count = len(pusher_steps)
+        index = 0
+        while index < steps_count:
+            pusher_step = pusher_steps[index]
+
+            if pusher_step.is_pusher_selection:
+                group_end = index
+                while (
+                    group_end < steps_count
+                    and pusher_steps[group_end].is_pusher_selection
+                ):
+                    group_end += 1
+                destination = board.path_destination(
+                    manager.pusher_position(mover.selected_pusher),
+                    [_.direction for _ in pusher_steps[index:group_end]],
+                )
+                mover.select_pusher(manager.pusher_id_on(destination))
+                walk = []
+                walk_start = destination
+                index = group_end
+                continue
+
+            mover.move(pusher_step.direction)
+            if mover.last_move[-1].is_push_or_pull:
+                pushes.append(
+                    _RecordedPush(
+                        mover.selected_pusher,
+                        walk_start,
+                        tuple(walk),
+                        pusher_step.direction,
+                    )
+                )
+                states.append(manager.packed_state(normalize_pusher=True))
+                walk = []
+                walk_start = manager.pusher_position(mover.selected_pusher)
+            else:
+                walk.append(pusher_step.direction)
+            index += 1
+
+        return pushes, states, dict(manager.pushers_positions), manager.is_solved
+
+    def _mover(self) -> Mover:
+        """
+        Mover that plays by Sokoban+ rules if puzzle has them, so that boxes with
+        different Sokoban+ IDs are distinguished in states and in solved check.
+        """
+        retv = Mover(BoardGraph(self._puzzle))
+        if self._puzzle.has_sokoban_plus:
+            manager = retv.board_manager
+            manager.boxorder = self._puzzle.boxorder
+            manager.goalorder = self._puzzle.goalorder
+            manager.enable_sokoban_plus()
+        return retv
+
+    @staticmethod
+    def _remove_cycles(states: List[PackedBoardState]) -> List[int]:
+        """
+        Indexes of pushes that remain after removing all cycles from sequence of
+        states. ``states[0]`` is initial state and ``states[i + 1]`` is state after
+        push ``i``.
+        """
+        # Position in ``path`` of each state on it
+        seen: Dict[PackedBoardState, int] = {states[0]: 0}
+        path: List[int] = []
+        for push_index, state in enumerate(states[1:]):
+            position = seen.get(state, None)
+            if position is None:
+                path.append(push_index)
+                seen[state] = len(path)
+            else:
+                for removed in path[position:]:
+                    del seen[states[removed + 1]]
+                del path[position:]
+        return path
+
+    def _rebuild(
+        self, pushes: List[_RecordedPush], final_pushers: Optional[Dict[int, int]]
+    ) -> List[PusherStep]:
+        mover = self._mover()
+        manager = mover.board_manager
+        board = manager.board
+        retv: List[PusherStep] = []
+
+        def walk_to(
+            pusher_id: int,
+            destination: int,
+            known_walk: Optional[Tuple[int, Tuple[Direction, ...]]] = None,
+        ):
+            if pusher_id != mover.selected_pusher:
+                mover.select_pusher(pusher_id)
+                retv.extend(mover.last_move)
+
+            position = manager.pusher_position(pusher_id)
+            if position == destination:
+                return
+            # Walk of single step can't be shortened
+            if (
+                known_walk is not None
+                and known_walk[0] == position
+                and len(known_walk[1]) == 1
+            ):
+                directions = known_walk[1]
+            else:
+                path = board.find_move_path(position, destination)
+                if not path:
+                    raise IllegalMoveError(
+                        f"Pusher ID: {pusher_id} can't walk from {position} to "
+                        f"{destination}"
+                    )
+                # `.BoardGraph.positions_path_to_directions_path` returns direction
+                # of each edge between two positions and on ie. Trioban boards
+                # there can be more than one of them
+                directions = tuple(
+                    next(_.direction for _ in board.out_edges(src) if _.v == dst)
+                    for src, dst in zip(path, path[1:])
+                )
+
+            for direction in directions:
+                mover.move(direction)
+                retv.extend(mover.last_move)
+
+        for push in pushes:
+            push_source = board.path_destination(push.walk_start, push.walk)
+            walk_to(push.pusher_id, push_source, (push.walk_start, push.walk))
+            mover.move(push.direction)
+            retv.extend(mover.last_move)
+
+        if final_pushers is not None:
+            for pusher_id, position in final_pushers.items():
+                walk_to(pusher_id, position)
+
+        return retv
+
+
+@dataclass
+class OptimizationResult:
+    """
+    Result of optimizing single snapshot in :func:`optimize_collection`.
+    """
+
+    #: Index of puzzle in `.Collection.puzzles`
+    puzzle_index: int
+
+    #: Index of snapshot in `.Puzzle.snapshots`
+    snapshot_index: int
+
+    original: Snapshot
+
+    #: Optimized snapshot or None if snapshot couldn't be optimized (it is reverse
+    #: snapshot or contains illegal moves)
+    snapshot: Optional[Snapshot] = None
+
+    @property
+    def is_improved(self) -> bool:
+        """True if optimized snapshot has less moves or less pushes than original."""
+        return self.snapshot is not None and (
+            self.snapshot.moves_count < self.original.moves_count
+            or self.snapshot.pushes_count < self.original.pushes_count
+        )
+
+
+def _optimize_puzzle(
+    puzzle_data: Tuple, snapshots_data: List[str]
+) -> List[Optional[str]]:
+    """
+    Optimizes snapshots of single puzzle. Arguments and results are plain data, so
+    that this can run in worker processes.
+    """
+    tessellation, board, boxorder, goalorder = puzzle_data
+    puzzle = Puzzle(tessellation, board=board)
+    puzzle.boxorder = boxorder
+    puzzle.goalorder = goalorder
+    optimizer = SolutionOptimizer(puzzle)
+
+    retv: List[Optional[str]] = []
+    for moves_data in snapshots_data:
+        try:
+            retv.append(
+                optimizer.optimize(Snapshot(tessellation, moves_data)).moves_data
+            )
+        except ValueError:
+            # IllegalMoveError, NonPlayableBoardError and reverse snapshots
+            retv.append(None)
+    return retv
+
+
+def optimize_collection(
+    collection: Collection,
+    workers: int = 1,
+    replace: bool = False,
+    mp_context=None,
+) -> List[OptimizationResult]:
+    """
+    Optimizes all snapshots of all puzzles in ``collection`` with
+    :class:`SolutionOptimizer`.
+
+    Snapshots that can't be optimized (reverse snapshots, snapshots with illegal moves,
+    snapshots of non playable puzzles) are skipped and reported with
+    `OptimizationResult.snapshot` set to None.
+
+    Arguments:
+        workers: number of worker processes. If 1, everything runs in current
+            process. Work is distributed between workers puzzle by puzzle.
+        replace: if True, snapshots in ``collection`` are replaced by optimized ones
+            where that reduced moves or pushes count
+        mp_context: :mod:`multiprocessing` context used to start workers. Default is
+            default context of current platform.
+
+    Raises:
+        ValueError: ``workers`` < 1
+    """
+    if workers < 1:
+        raise ValueError("Optimization needs at least one worker!")
+
+    tasks = [
+        (
+            (puzzle.tessellation, puzzle.board, puzzle.boxorder, puzzle.goalorder),
+            [snapshot.moves_data for snapshot in puzzle.snapshots],
+        )
+        for puzzle in collection.puzzles
+    ]
+
+    if workers == 1:
+        optimized = [_optimize_puzzle(*task) for task in tasks]
+    else:
+        mp_context = mp_context or multiprocessing.get_context()
+        with mp_context.Pool(workers) as pool:
+            optimized = pool.starmap(_optimize_puzzle, tasks)
+
+    retv: List[OptimizationResult] = []
+    for puzzle_index, (puzzle, snapshots_data) in enumerate(
+        zip(collection.puzzles, optimized)
+    ):
+        for snapshot_index, (original, moves_data) in enumerate(
+            zip(puzzle.snapshots, snapshots_data)
+        ):
+            result = OptimizationResult(puzzle_index, snapshot_index, original)
+            if moves_data is not None:
+                result.snapshot = Snapshot(original.tessellation, moves_data)
+                result.snapshot.title = original.title
+                result.snapshot.solver = original.solver
+                result.snapshot.notes = original.notes
+            retv.append(result)
+
+            if replace and result.is_improved:
+                puzzle.snapshots[snapshot_index] = result.snapshot
+
+    return retv
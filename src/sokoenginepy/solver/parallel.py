@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import copy
+import multiprocessing
+import os
+import struct
+import time
+import tracemalloc
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from ..game import PackedBoardState
+from ..io import Puzzle
+from .deadlocks import DeadlockDetector, default_deadlock_detectors
+from .search_space import Push, SearchSpace
+from .solver import SearchAlgorithm, Solver, SolverResult, SolverStatistics
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+_BATCH_HEADER = struct.Struct("<I")
+_NO_DIRECTION = 255
+
+_EXPAND = 0
+_PARENT = 1
+_STOP = 2
+
+
+def _encode_batch(
+    states: Sequence[PackedBoardState], pushes: Sequence[Tuple[int, int]]
+) -> bytes:
+    """
+    Packs states together with pushes that produced them into single buffer.
+
+    Push of initial state is ``(NO_POS, _NO_DIRECTION)``.
+    """
+    states_data = PackedBoardState.pack_many(states)
+    boxes_positions = array("i", (_[0] for _ in pushes))
+    directions = bytes(_[1] for _ in pushes)
+    return (
+        _BATCH_HEADER.pack(len(states_data))
+        + states_data
+        + boxes_positions.tobytes()
+        + directions
+    )
+
+
+def _decode_batch(
+    data: bytes,
+) -> Tuple[List[PackedBoardState], List[Tuple[int, int]]]:
+    (states_size,) = _BATCH_HEADER.unpack_from(data)
+    offset = _BATCH_HEADER.size
+    states = PackedBoardState.unpack_many(data[offset : offset + states_size])
+    offset += states_size
+    boxes_positions = array("i")
+    boxes_positions.frombytes(data[offset : offset + 4 * len(states)])
+    directions = data[offset + 4 * len(states) :]
+    return states, list(zip(boxes_positions, directions))
+
+
+def _worker_main(
+    connection: Connection,
+    puzzle_data: Tuple,
+    deadlock_detectors: List[DeadlockDetector],
+    zobrist_seed: int,
+    workers_count: int,
+    track_memory: bool,
+):
+    """
+    Worker process of :class:`.ParallelSolver`.
+
+    Worker owns all states whose ``zobrist_hash % workers_count`` equals its index.
+    It remembers push that led to each of them, which is enough to reconstruct
+    solution.
+    """
+    tessellation, board, boxorder, goalorder = puzzle_data
+    puzzle = Puzzle(tessellation, board=board)
+    puzzle.boxorder = boxorder
+    puzzle.goalorder = goalorder
+
+    space = SearchSpace(puzzle, zobrist_seed)
+    for detector in deadlock_detectors:
+        detector.attach(space)
+    direction_indexes = {d: i for i, d in enumerate(space.directions)}
+
+    if track_memory:
+        tracemalloc.start()
+
+    visited: Dict[PackedBoardState, Optional[Tuple[int, int]]] = {}
+    statistics = SolverStatistics()
+
+    while True:
+        command, payload = connection.recv()
+
+        if command == _EXPAND:
+            started = time.perf_counter()
+
+            accepted = []
+            solved = None
+            for batch in payload:
+                for state, push in zip(*_decode_batch(batch)):
+                    if state in visited:
+                        continue
+                    visited[state] = push if push[1] != _NO_DIRECTION else None
+                    accepted.append(state)
+                    if solved is None and space.is_solved(state.boxes_positions):
+                        solved = state
+
+            outboxes = [([], []) for _ in range(workers_count)]
+            if solved is None:
+                for state in accepted:
+                    statistics.nodes_expanded += 1
+                    for child, _, push in space.successors(state, deadlock_detectors):
+                        statistics.nodes_generated += 1
+                        states, pushes = outboxes[child.zobrist_hash % workers_count]
+                        states.append(child)
+                        pushes.append(
+                            (push.box_position, direction_indexes[push.direction])
+                        )
+
+            statistics.seconds += time.perf_counter() - started
+            connection.send(
+                (
+                    [
+                        _encode_batch(states, pushes) if states else None
+                        for states, pushes in outboxes
+                    ],
+                    PackedBoardState.pack_many([solved]) if solved else None,
+                    statistics.nodes_expanded,
+                    statistics.nodes_generated,
+                )
+            )
+
+        elif command == _PARENT:
+            connection.send(visited[PackedBoardState.unpack_many(payload)[0]])
+
+        else:
+            if track_memory:
+                statistics.peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            connection.send(statistics)
+            connection.close()
+            return
+
+
+class ParallelSolver(Solver):
+    """
+    Push-optimal breadth first search distributed over multiple processes.
+
+    States are partitioned between worker processes by their Zobrist hash: each
+    worker owns states whose ``zobrist_hash % workers`` equals its index. Owner is the
+    only one that ever stores state, so workers don't need any shared visited set.
+
+    Search proceeds in layers. Each worker de-duplicates states it received, expands
+    new ones and sorts their successors by owner. Successors travel back to parent
+    process, packed in compact batches (see :meth:`.PackedBoardState.pack_many`), which
+    then routes them to their owners in next layer. Since whole layer is explored
+    before next one, the first solved state found is on shortest path.
+
+    Workers compute equal hashes for equal states because all of them use the same
+    ``zobrist_seed``.
+
+    Reported statistics are aggregated over all workers: ``nodes_per_second`` is
+    total number of expanded states divided by wall clock duration of whole search.
+    Per worker statistics are available in :attr:`workers_statistics`.
+
+    Arguments:
+        puzzle: puzzle to solve
+        workers: number of worker processes. Default is number of CPUs.
+        deadlock_detectors: used to prune deadlocked states. They must be picklable.
+            Default is :func:`.default_deadlock_detectors`.
+        time_limit: maximal duration of search in seconds. It is checked only between
+            layers.
+        nodes_limit: maximal number of expanded states. It is checked only between
+            layers.
+        track_memory: if True, peak memory allocated by parent and all workers is
+            measured with :mod:`tracemalloc` and summed.
+        zobrist_seed: seed for Zobrist hashing of states, shared by all workers
+        mp_context: :mod:`multiprocessing` context used to start workers. Default is
+            default context of current platform.
+
+    Raises:
+        NonPlayableBoardError: ``puzzle`` is not playable
+        ValueError: ``puzzle`` has more than one pusher or ``workers`` < 1
+        SokobanPlusDataError: ``puzzle`` has invalid Sokoban+ data
+    """
+
+    def __init__(
+        self,
+        puzzle: Puzzle,
+        workers: Optional[int] = None,
+        deadlock_detectors: Optional[Sequence[DeadlockDetector]] = None,
+        time_limit: Optional[float] = None,
+        nodes_limit: Optional[int] = None,
+        track_memory: bool = False,
+        zobrist_seed: int = 0,
+        mp_context=None,
+    ):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Parallel solver needs at least one worker!")
+
+        if deadlock_detectors is None:
+            deadlock_detectors = default_deadlock_detectors()
+        # Copies are taken before detectors are attached to search space, so workers
+        # receive them without any precomputed data.
+        self._workers_deadlock_detectors = copy.deepcopy(list(deadlock_detectors))
+
+        super().__init__(
+            puzzle,
+            SearchAlgorithm.BFS,
+            deadlock_detectors=deadlock_detectors,
+            time_limit=time_limit,
+            nodes_limit=nodes_limit,
+            track_memory=track_memory,
+            transposition_table_memory=0,
+            zobrist_seed=zobrist_seed,
+        )
+
+        self._workers = workers
+        self._zobrist_seed = zobrist_seed
+        self._mp_context = mp_context or multiprocessing.get_context()
+        self._workers_statistics: List[SolverStatistics] = []
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def workers_statistics(self) -> List[SolverStatistics]:
+        """Statistics of each worker from last :meth:`solve`."""
+        return self._workers_statistics
+
+    def solve(self, attach: bool = False) -> SolverResult:
+        retv = super().solve(attach)
+        if self.track_memory:
+            retv.statistics.peak_memory += sum(
+                _.peak_memory or 0 for _ in self._workers_statistics
+            )
+        return retv
+
+    def _search(self) -> Optional[List[Push]]:
+        puzzle_data = (
+            self._puzzle.tessellation,
+            self._puzzle.board,
+            self._puzzle.boxorder,
+            self._puzzle.goalorder,
+        )
+
+        connections = []
+        processes = []
+        for _ in range(self._workers):
+            parent_end, child_end = self._mp_context.Pipe()
+            process = self._mp_context.Process(
+                target=_worker_main,
+                args=(
+                    child_end,
+                    puzzle_data,
+                    self._workers_deadlock_detectors,
+                    self._zobrist_seed,
+                    self._workers,
+                    self.track_memory,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_end.close()
+            connections.append(parent_end)
+            processes.append(process)
+
+        try:
+            return self._distributed_bfs(connections)
+        finally:
+            self._workers_statistics = []
+            for connection, process in zip(connections, processes):
+                self._workers_statistics.append(self._stop_worker(connection, process))
+
+    @staticmethod
+    def _stop_worker(connection: Connection, process) -> SolverStatistics:
+        retv = SolverStatistics()
+        try:
+            connection.send((_STOP, None))
+            # If search was interrupted, worker may still be sending reply from
+            # previous command
+            reply = connection.recv()
+            while not isinstance(reply, SolverStatistics):
+                reply = connection.recv()
+            retv = reply
+        except (EOFError, OSError):
+            pass
+        connection.close()
+        process.join()
+        return retv
+
+    def _distributed_bfs(self, connections: List[Connection]) -> Optional[List[Push]]:
+        workers = self._workers
+        root = self._space.initial_state
+
+        inboxes: List[List[bytes]] = [[] for _ in range(workers)]
+        inboxes[root.zobrist_hash % workers].append(
+            _encode_batch([root], [(self.space.NO_POS, _NO_DIRECTION)])
+        )
+
+        while any(inboxes):
+            self._check_budget()
+
+            for connection, inbox in zip(connections, inboxes):
+                connection.send((_EXPAND, inbox))
+
+            inboxes = [[] for _ in range(workers)]
+            solved = None
+            nodes_expanded = nodes_generated = 0
+            for connection in connections:
+                outboxes, solved_data, expanded, generated = connection.recv()
+                nodes_expanded += expanded
+                nodes_generated += generated
+                if solved_data is not None and solved is None:
+                    solved = PackedBoardState.unpack_many(solved_data)[0]
+                for owner, batch in enumerate(outboxes):
+                    if batch is not None:
+                        inboxes[owner].append(batch)
+
+            self._statistics.nodes_expanded = nodes_expanded
+            self._statistics.nodes_generated = nodes_generated
+
+            if solved is not None:
+                return self._collect_pushes(connections, solved)
+
+        return None
+
+    def _collect_pushes(
+        self, connections: List[Connection], state: PackedBoardState
+    ) -> List[Push]:
+        """
+        Walks back from ``state`` to initial state, asking owners of states for pushes
+        that led to them. Parent state is recreated by undoing push.
+        """
+        space = self._space
+        neighbors = space.neighbors
+        pusher_sources = space.pusher_sources
+
+        retv = []
+        while True:
+            connection = connections[state.zobrist_hash % self._workers]
+            connection.send((_PARENT, PackedBoardState.pack_many([state])))
+            push = connection.recv()
+            if push is None:
+                break
+
+            box_position, direction_index = push
+            boxes_positions = state.boxes_positions
+            target = neighbors[box_position][direction_index]
+            boxes_positions[boxes_positions.index(target)] = box_position
+            state = space.state(
+                pusher_sources[box_position][direction_index], boxes_positions
+            )
+            retv.append(Push(box_position, space.directions[direction_index]))
+
+        retv.reverse()
+        return retv
@@ -0,0 +1,627 @@
+from __future__ import annotations
+
+import enum
+import hashlib
+import itertools
+import mmap
+import multiprocessing
+import os
+import struct
+from array import array
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from ..common import Config
+from .heuristics import Heuristic
+from .search_space import SearchSpace
+
+if TYPE_CHECKING:
+    from ..io import Puzzle
+
+_MAGIC = b"SPDB"
+_VERSION = 1
+# magic, version, tessellation, is_complete, width, height, pattern_size,
+# cells_count, layout fingerprint
+_HEADER = struct.Struct("<4sHBBIIII32s")
+# depth, frontier size
+_FRONTIER_HEADER = struct.Struct("<4sII")
+_FRONTIER_MAGIC = b"SPDF"
+
+#: Table value of pattern states from which goals can't be reached
+_UNREACHABLE = 255
+#: Larger distances are stored as this one, which keeps lookups admissible
+_MAX_DISTANCE = 254
+
+
+class PatternLookup(enum.Enum):
+    """How :class:`.PatternDatabase` combines distances of box subsets."""
+
+    #: Boxes are split into disjoint groups and their distances summed. Each push
+    #: moves single box, so sum is still lower bound.
+    ADDITIVE = 0
+
+    #: Largest distance of all box subsets.
+    MAX = 1
+
+    def __repr__(self):
+        return "PatternLookup." + self.name
+
+
+def _binomials(n: int, k: int) -> List[List[int]]:
+    retv = [[0] * (k + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        retv[i][0] = 1
+        for j in range(1, min(i, k) + 1):
+            retv[i][j] = retv[i - 1][j - 1] + retv[i - 1][j]
+    return retv
+
+
+def _layout_fingerprint(space: SearchSpace) -> bytes:
+    """Digest of everything pattern distances depend on: board size, walls and goals."""
+    board = space.board
+    data = [
+        space.puzzle.tessellation.value,
+        board.board_width,
+        board.board_height,
+        -1,
+        *(_ for _ in range(space.size) if space.is_wall(_)),
+        -1,
+        *sorted(space.goals_positions),
+    ]
+    return hashlib.sha256(array("i", data).tobytes()).digest()
+
+
+class _Expander:
+    """
+    Generates predecessors of pattern states. Lives in each of build worker
+    processes.
+
+    Pattern state is sorted tuple of boxes positions and normalized pusher position
+    (the smallest position of pusher area).
+    """
+
+    def __init__(self, neighbors, pusher_sources):
+        self.neighbors = neighbors
+        self.pusher_sources = pusher_sources
+
+    def area(self, pusher_position: int, boxes: Sequence[int]) -> List[int]:
+        neighbors = self.neighbors
+        visited = set(boxes)
+        visited.add(pusher_position)
+        retv = [pusher_position]
+        for position in retv:
+            for neighbor in neighbors[position]:
+                if neighbor != Config.NO_POS and neighbor not in visited:
+                    visited.add(neighbor)
+                    retv.append(neighbor)
+        return retv
+
+    def expand(
+        self, states: Sequence[Tuple[Tuple[int, ...], int]]
+    ) -> List[Tuple[Tuple[int, ...], List[int]]]:
+        """
+        Pulls each box of each state in each direction.
+
+        Returns:
+            For each predecessor, its boxes positions and all positions of pusher
+            area.
+        """
+        pusher_sources = self.pusher_sources
+        retv = []
+
+        for boxes, pusher_position in states:
+            reachable = set(self.area(pusher_position, boxes))
+            boxes_set = set(boxes)
+            for box_index, box_position in enumerate(boxes):
+                for direction_index, source in enumerate(pusher_sources[box_position]):
+                    # Before push, box was on ``source`` and pusher right behind it
+                    if source == Config.NO_POS or source not in reachable:
+                        continue
+                    pusher_source = pusher_sources[source][direction_index]
+                    if pusher_source == Config.NO_POS or pusher_source in boxes_set:
+                        continue
+                    parent_boxes = list(boxes)
+                    parent_boxes[box_index] = source
+                    parent_boxes.sort()
+                    retv.append(
+                        (tuple(parent_boxes), self.area(pusher_source, parent_boxes))
+                    )
+
+        return retv
+
+
+_worker_expander: Optional[_Expander] = None
+
+
+def _init_worker(neighbors, pusher_sources):
+    global _worker_expander
+    _worker_expander = _Expander(neighbors, pusher_sources)
+
+
+def _expand_in_worker(states):
+    return _worker_expander.expand(states)
+
+
+class PatternDatabase:
+    """
+    Exact push distances of all placements of small groups of boxes, stored in
+    memory mapped file.
+
+    For ``pattern_size`` boxes placed anywhere on board and pusher standing on any
+    position, database holds minimal number of pushes needed to put these boxes
+    onto any of goals, while all other boxes are ignored. Since removing boxes never
+    makes board harder, these distances are lower bounds of distances in real
+    puzzle.
+
+    Distances depend only on board walls and goals, so single database serves all
+    puzzles that share them (ie. levels from the same pack differing only in boxes
+    and pusher placement). Sokoban+ is ignored, which keeps distances admissible for
+    Sokoban+ puzzles too.
+
+    Database is built by reverse search: starting from all placements of boxes on
+    goals with pusher anywhere, boxes are pulled exactly as in
+    `.SolvingMode.REVERSE` (see `.SearchSpace.predecessors`) in breadth first order.
+
+    File contains header, followed by table of ``C(cells, pattern_size) * cells``
+    bytes (one for each combination of box positions and each pusher position) and
+    ``C(cells, pattern_size)`` bytes of distances minimized over pusher positions.
+    ``cells`` is number of non-wall board positions. Unreachable placements are
+    stored as 255. Lookups read bytes straight from memory mapped file, without
+    loading or copying it.
+
+    Don't create instances directly, use :meth:`build` or :meth:`open`.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self._path = path
+        self._file = open(path, "r+b" if writable else "rb")
+        try:
+            self._mmap = mmap.mmap(
+                self._file.fileno(),
+                0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+            )
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not pattern database file!")
+        self._data = memoryview(self._mmap)
+
+        if len(self._data) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not pattern database file!")
+
+        (
+            magic,
+            version,
+            tessellation,
+            is_complete,
+            width,
+            height,
+            pattern_size,
+            cells_count,
+            fingerprint,
+        ) = _HEADER.unpack_from(self._data)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not pattern database file!")
+
+        self._tessellation = tessellation
+        self._is_complete = bool(is_complete)
+        self._board_width = width
+        self._board_height = height
+        self._pattern_size = pattern_size
+        self._cells_count = cells_count
+        self._fingerprint = fingerprint
+
+        self._combinations = _binomials(cells_count, pattern_size)
+        self._combinations_count = self._combinations[cells_count][pattern_size]
+        self._table_offset = _HEADER.size
+        self._minimums_offset = (
+            self._table_offset + self._combinations_count * cells_count
+        )
+        if len(self._data) != self._minimums_offset + self._combinations_count:
+            self.close()
+            raise ValueError(f"{path} has wrong size!")
+
+        self._cells: Dict[int, int] = {}
+
+    @classmethod
+    def _create(
+        cls, path: str, space: SearchSpace, pattern_size: int
+    ) -> PatternDatabase:
+        cells_count = space.size - sum(1 for _ in range(space.size) if space.is_wall(_))
+        combinations_count = _binomials(cells_count, pattern_size)[cells_count][
+            pattern_size
+        ]
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            space.puzzle.tessellation.value,
+            False,
+            space.board.board_width,
+            space.board.board_height,
+            pattern_size,
+            cells_count,
+            _layout_fingerprint(space),
+        )
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            chunk = bytes([_UNREACHABLE]) * 2**20
+            remaining = combinations_count * (cells_count + 1)
+            while remaining > 0:
+                f.write(chunk[: min(remaining, len(chunk))])
+                remaining -= len(chunk)
+        os.replace(tmp_path, path)
+
+        return cls(path, writable=True)
+
+    @classmethod
+    def open(cls, path: str) -> PatternDatabase:
+        """
+        Memory maps existing database file for lookups.
+
+        Raises:
+            ValueError: ``path`` is not pattern database or its build hasn't been
+                completed
+        """
+        retv = cls(path)
+        if not retv.is_complete:
+            retv.close()
+            raise ValueError(f"Build of {path} hasn't been completed!")
+        return retv
+
+    @classmethod
+    def build(
+        cls,
+        puzzle: Puzzle,
+        path: str,
+        pattern_size: int = 2,
+        workers: int = 1,
+        mp_context=None,
+    ) -> PatternDatabase:
+        """
+        Builds database for walls and goals of ``puzzle`` into ``path``.
+
+        Each layer of reverse search is split among ``workers`` processes. After each
+        layer, table is flushed to disk together with next layer in ``path +
+        ".frontier"``. If build is interrupted, calling it again with the same
+        arguments continues from last completed layer. If ``path`` contains
+        completed database for the same board, it is simply opened.
+
+        Arguments:
+            puzzle: any puzzle with board walls and goals database is built for
+            path: database file path
+            pattern_size: number of boxes in single pattern
+            workers: number of processes used for build
+            mp_context: :mod:`multiprocessing` context used to start workers
+
+        Raises:
+            ValueError: ``path`` holds different database, ``pattern_size`` is
+                invalid or ``puzzle`` can't be searched (see :class:`.SearchSpace`)
+        """
+        space = SearchSpace(puzzle)
+        if not 1 <= pattern_size <= len(space.goals_positions):
+            raise ValueError(
+                f"Pattern size must be between 1 and {len(space.goals_positions)}!"
+            )
+
+        if os.path.exists(path):
+            retv = cls(path, writable=True)
+            if (
+                retv._pattern_size != pattern_size
+                or retv._fingerprint != _layout_fingerprint(space)
+            ):
+                retv.close()
+                raise ValueError(
+                    f"{path} contains pattern database for different board!"
+                )
+            if retv.is_complete:
+                retv.close()
+                return cls.open(path)
+        else:
+            retv = cls._create(path, space, pattern_size)
+
+        try:
+            retv._build(space, workers, mp_context)
+        finally:
+            retv.close()
+
+        return cls.open(path)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def pattern_size(self) -> int:
+        return self._pattern_size
+
+    @property
+    def is_complete(self) -> bool:
+        return self._is_complete
+
+    @property
+    def table(self) -> memoryview:
+        """
+        Zero-copy view of distances table.
+
+        Distance for boxes on cells ``c1 < c2 < ... < ck`` and pusher on cell ``p``
+        is at index ``rank * cells + p`` where ``rank`` is rank of boxes cells in
+        combinatorial number system (``C(c1, 1) + C(c2, 2) + ... + C(ck, k)``).
+        Cells are non-wall board positions, numbered in board positions order.
+
+        View must be released before database is closed.
+        """
+        return self._data[self._table_offset : self._minimums_offset]
+
+    def close(self):
+        if self._data is not None:
+            self._data.release()
+            self._data = None
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def is_compatible(self, puzzle: Puzzle) -> bool:
+        """True if ``puzzle`` has the same walls and goals as database."""
+        try:
+            return self._fingerprint == _layout_fingerprint(SearchSpace(puzzle))
+        except ValueError:
+            return False
+
+    def attach(self, space: SearchSpace):
+        """
+        Prepares database for lookups of positions from ``space``.
+
+        Raises:
+            ValueError: walls or goals of ``space`` differ from ones in database
+        """
+        if self._fingerprint != _layout_fingerprint(space):
+            raise ValueError("Pattern database was built for different board!")
+        self._cells = {
+            position: cell
+            for cell, position in enumerate(
+                _ for _ in range(space.size) if not space.is_wall(_)
+            )
+        }
+
+    def _rank(self, cells: Sequence[int]) -> int:
+        combinations = self._combinations
+        return sum(combinations[cell][i] for i, cell in enumerate(sorted(cells), 1))
+
+    def distance(
+        self, boxes_positions: Sequence[int], pusher_position: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Minimal number of pushes needed to put boxes on ``boxes_positions`` onto
+        goals, ignoring all other boxes. Database must be attached.
+
+        Arguments:
+            boxes_positions: exactly :attr:`pattern_size` box positions
+            pusher_position: position of pusher. If None, minimal distance over all
+                pusher positions is returned.
+
+        Returns:
+            Distance or None if boxes can't be put onto goals
+        """
+        cells = self._cells
+        rank = self._rank([cells[_] for _ in boxes_positions])
+        if pusher_position is None:
+            retv = self._data[self._minimums_offset + rank]
+        else:
+            retv = self._data[
+                self._table_offset + rank * self._cells_count + cells[pusher_position]
+            ]
+        return None if retv == _UNREACHABLE else retv
+
+    def estimate(
+        self,
+        boxes_positions: Sequence[int],
+        pusher_position: Optional[int] = None,
+        lookup: PatternLookup = PatternLookup.MAX,
+    ) -> Optional[int]:
+        """
+        Lower bound of number of pushes needed to solve board with boxes on
+        ``boxes_positions`` composed from :meth:`distance` of boxes subsets.
+
+        For `PatternLookup.ADDITIVE`, boxes are split into groups of
+        :attr:`pattern_size` in order of ``boxes_positions``. Boxes that don't fill
+        up last group are not counted. For `PatternLookup.MAX`, all subsets of
+        :attr:`pattern_size` boxes are looked up.
+
+        Returns:
+            Estimate or None if any of subsets can't be put onto goals
+        """
+        size = self._pattern_size
+        if lookup == PatternLookup.ADDITIVE:
+            groups = (
+                boxes_positions[i : i + size]
+                for i in range(0, len(boxes_positions) - size + 1, size)
+            )
+        else:
+            groups = itertools.combinations(boxes_positions, size)
+
+        retv = 0
+        for group in groups:
+            distance = self.distance(group, pusher_position)
+            if distance is None:
+                return None
+            if lookup == PatternLookup.ADDITIVE:
+                retv += distance
+            else:
+                retv = max(retv, distance)
+        return retv
+
+    def _frontier_path(self) -> str:
+        return self._path + ".frontier"
+
+    def _save_frontier(self, depth: int, frontier: List[Tuple[Tuple[int, ...], int]]):
+        data = array("I")
+        for boxes, pusher_position in frontier:
+            data.extend(boxes)
+            data.append(pusher_position)
+        tmp_path = self._frontier_path() + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_FRONTIER_HEADER.pack(_FRONTIER_MAGIC, depth, len(frontier)))
+            f.write(data.tobytes())
+        os.replace(tmp_path, self._frontier_path())
+
+    def _load_frontier(self) -> Tuple[int, List[Tuple[Tuple[int, ...], int]]]:
+        with open(self._frontier_path(), "rb") as f:
+            magic, depth, count = _FRONTIER_HEADER.unpack(f.read(_FRONTIER_HEADER.size))
+            if magic != _FRONTIER_MAGIC:
+                raise ValueError(f"{self._frontier_path()} is corrupted!")
+            data = array("I")
+            data.frombytes(f.read())
+        step = self._pattern_size + 1
+        return depth, [
+            (tuple(data[i : i + step - 1]), data[i + step - 1])
+            for i in range(0, count * step, step)
+        ]
+
+    def _build(self, space: SearchSpace, workers: int, mp_context):
+        self.attach(space)
+        table = self.table
+        try:
+            self._search(space, table, workers, mp_context)
+        finally:
+            table.release()
+
+        self._data[: _HEADER.size] = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self._tessellation,
+            True,
+            self._board_width,
+            self._board_height,
+            self._pattern_size,
+            self._cells_count,
+            self._fingerprint,
+        )
+        self._is_complete = True
+        self._mmap.flush()
+        os.remove(self._frontier_path())
+
+    def _search(self, space: SearchSpace, table: memoryview, workers: int, mp_context):
+        cells = self._cells
+        cells_count = self._cells_count
+        expander = _Expander(space.neighbors, space.pusher_sources)
+
+        if os.path.exists(self._frontier_path()):
+            depth, frontier = self._load_frontier()
+            # Entries written after last checkpoint belong to unfinished layer
+            translation = bytes(_ if _ <= depth else _UNREACHABLE for _ in range(256))
+            table[:] = bytes(table).translate(translation)
+        else:
+            depth = 0
+            frontier = []
+            for goals in itertools.combinations(
+                sorted(space.goals_positions), self._pattern_size
+            ):
+                base = self._rank([cells[_] for _ in goals]) * cells_count
+                for position in range(space.size):
+                    if (
+                        space.is_wall(position)
+                        or position in goals
+                        or table[base + cells[position]] != _UNREACHABLE
+                    ):
+                        continue
+                    area = expander.area(position, goals)
+                    for _ in area:
+                        table[base + cells[_]] = 0
+                    frontier.append((goals, min(area)))
+            self._mmap.flush()
+            self._save_frontier(depth, frontier)
+
+        pool = None
+        if workers > 1:
+            pool = (mp_context or multiprocessing.get_context()).Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(space.neighbors, space.pusher_sources),
+            )
+
+        try:
+            while frontier:
+                depth += 1
+                distance = min(depth, _MAX_DISTANCE)
+
+                if pool is None:
+                    expanded = [expander.expand(frontier)]
+                else:
+                    chunk_size = max(1, -(-len(frontier) // (workers * 4)))
+                    expanded = pool.map(
+                        _expand_in_worker,
+                        [
+                            frontier[i : i + chunk_size]
+                            for i in range(0, len(frontier), chunk_size)
+                        ],
+                    )
+
+                next_frontier = []
+                for predecessors in expanded:
+                    for boxes, area in predecessors:
+                        base = self._rank([cells[_] for _ in boxes]) * cells_count
+                        pusher_position = min(area)
+                        if table[base + cells[pusher_position]] != _UNREACHABLE:
+                            continue
+                        for _ in area:
+                            table[base + cells[_]] = distance
+                        next_frontier.append((boxes, pusher_position))
+
+                frontier = next_frontier
+                self._mmap.flush()
+                self._save_frontier(depth, frontier)
+
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        minimums_offset = self._minimums_offset
+        data = self._data
+        for rank in range(self._combinations_count):
+            start = rank * cells_count
+            data[minimums_offset + rank] = min(table[start : start + cells_count])
+
+
+class PatternDatabaseHeuristic(Heuristic):
+    """
+    Estimates pushes by looking up :class:`.PatternDatabase`.
+
+    Heuristic doesn't know where pusher is, so it uses distances minimized over
+    pusher positions.
+
+    Arguments:
+        database: completed database for the board of searched puzzle
+        lookup: how distances of boxes subsets are combined
+    """
+
+    def __init__(
+        self, database: PatternDatabase, lookup: PatternLookup = PatternLookup.MAX
+    ):
+        super().__init__()
+        self._database = database
+        self._lookup = lookup
+
+    @property
+    def database(self) -> PatternDatabase:
+        return self._database
+
+    def attach(self, space: SearchSpace):
+        """
+        Raises:
+            ValueError: database was built for different board
+        """
+        super().attach(space)
+        self._database.attach(space)
+
+    def estimate(self, boxes_positions: Sequence[int]) -> int:
+        retv = self._database.estimate(boxes_positions, lookup=self._lookup)
+        return self.INFINITY if retv is None else retv
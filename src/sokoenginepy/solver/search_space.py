@@ -0,0 +1,500 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from ..common import Config, Direction, TessellationImpl
+from ..game import (
+    BoardGraph,
+    HashedBoardManager,
+    NonPlayableBoardError,
+    PackedBoardState,
+)
+
+if TYPE_CHECKING:
+    from ..io import Puzzle
+
+
+class Push(NamedTuple):
+    """Single box push: position of box before push and direction of push."""
+
+    box_position: int
+    direction: Direction
+
+
+class Successor(NamedTuple):
+    """State reachable from other state by single push."""
+
+    state: PackedBoardState
+    boxes_positions: List[int]
+    push: Push
+
+
+class SearchSpace:
+    """
+    Precomputed, read-only view of puzzle board suitable for push-level search.
+
+    Board neighborhood is computed once, from :class:`.TessellationImpl`, into plain
+    lists. Search then works on :class:`.PackedBoardState` with normalized pusher
+    position (see `.BoardManager.packed_state`) and never touches
+    :class:`.BoardGraph` or :class:`.Mover`, which are too slow for exploring millions
+    of states.
+
+    States are produced by :attr:`board_manager` so they carry Zobrist hash and can be
+    used as keys of :class:`.TranspositionTable`.
+
+    Only puzzles with single pusher are supported.
+
+    Arguments:
+        puzzle: puzzle to search. If it has Sokoban+ data, Sokoban+ is enabled.
+        zobrist_seed: seed for Zobrist hashing of states, see `.HashedBoardManager`.
+            Search spaces created with the same seed for the same puzzle produce
+            equal states, even in different processes.
+
+    Raises:
+        NonPlayableBoardError: ``puzzle`` is not playable
+        ValueError: ``puzzle`` has more than one pusher
+        SokobanPlusDataError: ``puzzle`` has invalid Sokoban+ data
+    """
+
+    #: Marks missing neighbor and unreachable distance
+    NO_POS = Config.NO_POS
+
+    def __init__(self, puzzle: Puzzle, zobrist_seed: Optional[int] = None):
+        self._puzzle = puzzle
+        self._board = BoardGraph(puzzle)
+        self._manager = HashedBoardManager(self._board, zobrist_seed=zobrist_seed)
+
+        if not self._manager.is_playable:
+            raise NonPlayableBoardError
+        if self._manager.pushers_count != 1:
+            raise ValueError("Only puzzles with single pusher can be searched!")
+
+        if puzzle.has_sokoban_plus:
+            self._manager.boxorder = puzzle.boxorder
+            self._manager.goalorder = puzzle.goalorder
+            self._manager.enable_sokoban_plus()
+
+        tessellation = TessellationImpl.instance(puzzle.tessellation)
+        width = self._board.board_width
+        height = self._board.board_height
+
+        self._size: int = self._board.size
+        self._directions: Tuple[Direction, ...] = tessellation.legal_directions
+        self._walls: Set[int] = set(self._manager.walls_positions)
+
+        # neighbors[position][direction_index] is non-wall neighbor or NO_POS
+        self._neighbors: List[Tuple[int, ...]] = []
+        for position in range(self._size):
+            if position in self._walls:
+                self._neighbors.append((self.NO_POS,) * len(self._directions))
+                continue
+            row = []
+            for direction in self._directions:
+                neighbor = tessellation.neighbor_position(
+                    position, direction, width, height
+                )
+                if neighbor == Config.NO_POS or neighbor in self._walls:
+                    neighbor = self.NO_POS
+                row.append(neighbor)
+            self._neighbors.append(tuple(row))
+
+        # pusher_sources[position][direction_index] is position pusher must stand on
+        # to push box from position in direction
+        pusher_sources = [
+            [self.NO_POS] * len(self._directions) for _ in self._neighbors
+        ]
+        for position, neighbors in enumerate(self._neighbors):
+            for direction_index, neighbor in enumerate(neighbors):
+                if neighbor != self.NO_POS:
+                    pusher_sources[neighbor][direction_index] = position
+        self._pusher_sources: List[Tuple[int, ...]] = [tuple(_) for _ in pusher_sources]
+
+        self._pusher_position = self._manager.pusher_position(Config.DEFAULT_ID)
+        self._boxes_plus_ids: Tuple[int, ...] = tuple(
+            self._manager.box_plus_id(box_id) for box_id in self._manager.boxes_ids
+        )
+        self._goals_plus_ids: Dict[int, int] = {
+            position: self._manager.goal_plus_id(goal_id)
+            for goal_id, position in self._manager.goals_positions.items()
+        }
+        self._initial_state = self.state(
+            self._pusher_position, list(self._manager.boxes_positions.values())
+        )
+
+    @property
+    def puzzle(self) -> Puzzle:
+        return self._puzzle
+
+    @property
+    def board(self) -> BoardGraph:
+        """Board in its initial state. Search never modifies it."""
+        return self._board
+
+    @property
+    def board_manager(self) -> HashedBoardManager:
+        """
+        Manager used to pack and hash states. Search never moves its pieces.
+        """
+        return self._manager
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def directions(self) -> Tuple[Direction, ...]:
+        """Legal directions of puzzle tessellation, indexed by direction index."""
+        return self._directions
+
+    @property
+    def neighbors(self) -> List[Tuple[int, ...]]:
+        """
+        For each board position, tuple of its non-wall neighbors indexed by
+        direction index. Missing neighbors are `NO_POS`.
+        """
+        return self._neighbors
+
+    @property
+    def pusher_sources(self) -> List[Tuple[int, ...]]:
+        """
+        For each board position, tuple of positions indexed by direction index on which
+        pusher must stand to push box from that position in that direction.
+        """
+        return self._pusher_sources
+
+    def is_wall(self, position: int) -> bool:
+        return position in self._walls
+
+    @property
+    def pusher_position(self) -> int:
+        """Initial (not normalized) pusher position."""
+        return self._pusher_position
+
+    @property
+    def goals_positions(self) -> List[int]:
+        return list(self._goals_plus_ids.keys())
+
+    @property
+    def boxes_plus_ids(self) -> Tuple[int, ...]:
+        """Sokoban+ IDs of boxes, indexed by box index (box ID - 1)."""
+        return self._boxes_plus_ids
+
+    @property
+    def goals_plus_ids(self) -> Dict[int, int]:
+        """Sokoban+ IDs of goals, keyed by goal position."""
+        return self._goals_plus_ids
+
+    @property
+    def initial_state(self) -> PackedBoardState:
+        return self._initial_state
+
+    def reachable_positions(
+        self, pusher_position: int, boxes_positions: Set[int]
+    ) -> List[int]:
+        """
+        Positions pusher standing on ``pusher_position`` can reach without pushing any
+        of boxes. First element is always ``pusher_position``.
+        """
+        neighbors = self._neighbors
+        visited = {pusher_position}
+        retv = [pusher_position]
+        for position in retv:
+            for neighbor in neighbors[position]:
+                if (
+                    neighbor != Config.NO_POS
+                    and neighbor not in visited
+                    and neighbor not in boxes_positions
+                ):
+                    visited.add(neighbor)
+                    retv.append(neighbor)
+        return retv
+
+    def state(
+        self, pusher_position: int, boxes_positions: Sequence[int]
+    ) -> PackedBoardState:
+        """
+        Packs positions into canonical state with normalized pusher position.
+        """
+        return self._manager.pack_state(
+            [min(self.reachable_positions(pusher_position, set(boxes_positions)))],
+            boxes_positions,
+        )
+
+    def is_solved(self, boxes_positions: Sequence[int]) -> bool:
+        goals_plus_ids = self._goals_plus_ids
+        for box_index, box_position in enumerate(boxes_positions):
+            if goals_plus_ids.get(box_position) != self._boxes_plus_ids[box_index]:
+                return False
+        return True
+
+    def successors(
+        self, state: PackedBoardState, deadlock_detectors: Sequence = ()
+    ) -> Iterator[Successor]:
+        """
+        Generates all states reachable from ``state`` by single push.
+
+        Arguments:
+            deadlock_detectors: `.DeadlockDetector` instances. Successors any of them
+                recognizes as deadlocked are skipped.
+        """
+        boxes_positions = state.boxes_positions
+        boxes_set = set(boxes_positions)
+        reachable = set(self.reachable_positions(state.pushers_positions[0], boxes_set))
+        neighbors = self._neighbors
+        pusher_sources = self._pusher_sources
+        directions = self._directions
+
+        for box_index, box_position in enumerate(boxes_positions):
+            box_neighbors = neighbors[box_position]
+            box_pusher_sources = pusher_sources[box_position]
+
+            for direction_index, target in enumerate(box_neighbors):
+                if (
+                    target == Config.NO_POS
+                    or target in boxes_set
+                    or box_pusher_sources[direction_index] not in reachable
+                ):
+                    continue
+
+                boxes_set.discard(box_position)
+                boxes_set.add(target)
+
+                is_deadlock = any(
+                    detector.is_deadlock(boxes_set, target)
+                    for detector in deadlock_detectors
+                )
+
+                if not is_deadlock:
+                    child_boxes = list(boxes_positions)
+                    child_boxes[box_index] = target
+                    child_pusher = min(
+                        self.reachable_positions(box_position, boxes_set)
+                    )
+                    child = self._manager.pack_state([child_pusher], child_boxes)
+                    yield Successor(
+                        child,
+                        child.boxes_positions,
+                        Push(box_position, directions[direction_index]),
+                    )
+
+                boxes_set.discard(target)
+                boxes_set.add(box_position)
+
+    def predecessors(
+        self, state: PackedBoardState, deadlock_detectors: Sequence = ()
+    ) -> Iterator[Successor]:
+        """
+        Generates all states from which ``state`` is reachable by single push.
+
+        This is the same as pulling boxes in `.SolvingMode.REVERSE`: pusher standing
+        next to box steps away from it and drags the box along.
+
+        Yielded `Successor.push` is the forward push that leads from predecessor to
+        ``state``.
+
+        Arguments:
+            deadlock_detectors: `.DeadlockDetector` instances. Predecessors any of
+                them recognizes as deadlocked are skipped.
+        """
+        boxes_positions = state.boxes_positions
+        boxes_set = set(boxes_positions)
+        reachable = set(self.reachable_positions(state.pushers_positions[0], boxes_set))
+        pusher_sources = self._pusher_sources
+        directions = self._directions
+
+        for box_index, box_position in enumerate(boxes_positions):
+            for direction_index, source in enumerate(pusher_sources[box_position]):
+                # Before push, box was on ``source`` and pusher right behind it
+                if source == Config.NO_POS or source not in reachable:
+                    continue
+                pusher_position = pusher_sources[source][direction_index]
+                if pusher_position == Config.NO_POS or pusher_position in boxes_set:
+                    continue
+
+                boxes_set.discard(box_position)
+                boxes_set.add(source)
+
+                is_deadlock = any(
+                    detector.is_deadlock(boxes_set, source)
+                    for detector in deadlock_detectors
+                )
+
+                if not is_deadlock:
+                    parent_boxes = list(boxes_positions)
+                    parent_boxes[box_index] = source
+                    parent_pusher = min(
+                        self.reachable_positions(pusher_position, boxes_set)
+                    )
+                    parent = self._manager.pack_state([parent_pusher], parent_boxes)
+                    yield Successor(
+                        parent,
+                        parent.boxes_positions,
+                        Push(source, directions[direction_index]),
+                    )
+
+                boxes_set.discard(source)
+                boxes_set.add(box_position)
+
+    def goal_states(self) -> List[PackedBoardState]:
+        """
+        All solved states: boxes placed on goals (respecting Sokoban+ IDs) with pusher
+        in each of areas it could end up in.
+        """
+        goals_by_plus_id: Dict[int, List[int]] = {}
+        for position, plus_id in self._goals_plus_ids.items():
+            goals_by_plus_id.setdefault(plus_id, []).append(position)
+        boxes_positions = [
+            goals_by_plus_id[plus_id].pop() for plus_id in self._boxes_plus_ids
+        ]
+        boxes_set = set(boxes_positions)
+
+        retv = []
+        visited = set(boxes_set)
+        for position in self.reachable_positions(self._pusher_position, set()):
+            if position in visited:
+                continue
+            area = self.reachable_positions(position, boxes_set)
+            visited.update(area)
+            retv.append(self._manager.pack_state([min(area)], boxes_positions))
+
+        return retv
+
+    def push_distances(self, goals_positions: Sequence[int]) -> List[int]:
+        """
+        For each board position, minimal number of pushes needed to push box from it
+        onto any of ``goals_positions``, ignoring all other boxes. Unreachable
+        positions get `NO_POS`.
+        """
+        pusher_sources = self._pusher_sources
+        retv = [self.NO_POS] * self._size
+
+        to_inspect = deque()
+        for goal_position in goals_positions:
+            retv[goal_position] = 0
+            to_inspect.append(goal_position)
+
+        # Box can reach ``position`` from ``source`` if it is pushed in direction
+        # ``d`` and pusher has a place to stand behind ``source``.
+        while to_inspect:
+            position = to_inspect.popleft()
+            distance = retv[position] + 1
+            for direction_index, source in enumerate(pusher_sources[position]):
+                if (
+                    source != self.NO_POS
+                    and retv[source] == self.NO_POS
+                    and pusher_sources[source][direction_index] != self.NO_POS
+                ):
+                    retv[source] = distance
+                    to_inspect.append(source)
+
+        return retv
+
+    def pull_distances(self, boxes_positions: Sequence[int]) -> List[int]:
+        """
+        For each board position, minimal number of pushes needed to push box onto it
+        from any of ``boxes_positions``, ignoring all other boxes. Unreachable
+        positions get `NO_POS`.
+        """
+        neighbors = self._neighbors
+        pusher_sources = self._pusher_sources
+        retv = [self.NO_POS] * self._size
+
+        to_inspect = deque()
+        for box_position in boxes_positions:
+            retv[box_position] = 0
+            to_inspect.append(box_position)
+
+        while to_inspect:
+            position = to_inspect.popleft()
+            distance = retv[position] + 1
+            for direction_index, target in enumerate(neighbors[position]):
+                if (
+                    target != self.NO_POS
+                    and retv[target] == self.NO_POS
+                    and pusher_sources[position][direction_index] != self.NO_POS
+                ):
+                    retv[target] = distance
+                    to_inspect.append(target)
+
+        return retv
+
+    def move_path(
+        self, src: int, dst: int, boxes_positions: Set[int]
+    ) -> List[Direction]:
+        """
+        Shortest sequence of non-pushing moves from ``src`` to ``dst``.
+
+        Raises:
+            ValueError: ``dst`` is not reachable from ``src``
+        """
+        if src == dst:
+            return []
+
+        neighbors = self._neighbors
+        came_from = {src: None}
+        to_inspect = deque([src])
+        while to_inspect:
+            position = to_inspect.popleft()
+            for direction_index, neighbor in enumerate(neighbors[position]):
+                if (
+                    neighbor == Config.NO_POS
+                    or neighbor in came_from
+                    or neighbor in boxes_positions
+                ):
+                    continue
+                came_from[neighbor] = (position, direction_index)
+                if neighbor == dst:
+                    retv = []
+                    while came_from[neighbor] is not None:
+                        neighbor, direction_index = came_from[neighbor]
+                        retv.append(self._directions[direction_index])
+                    retv.reverse()
+                    return retv
+                to_inspect.append(neighbor)
+
+        raise ValueError(f"Position {dst} is not reachable from {src}!")
+
+    def pushes_to_directions(self, pushes: Sequence[Push]) -> List[Direction]:
+        """
+        Converts sequence of pushes starting from initial state into full sequence of
+        pusher moves and pushes.
+
+        Raises:
+            ValueError: ``pushes`` are not valid sequence of pushes
+        """
+        direction_indexes = {d: i for i, d in enumerate(self._directions)}
+        boxes_positions = set(self._manager.boxes_positions.values())
+        pusher_position = self._pusher_position
+        retv: List[Direction] = []
+
+        for push in pushes:
+            direction_index = direction_indexes[push.direction]
+            source = self._pusher_sources[push.box_position][direction_index]
+            target = self._neighbors[push.box_position][direction_index]
+            if (
+                push.box_position not in boxes_positions
+                or source == self.NO_POS
+                or target == self.NO_POS
+                or target in boxes_positions
+            ):
+                raise ValueError(f"Illegal push: {push}!")
+
+            retv.extend(self.move_path(pusher_position, source, boxes_positions))
+            retv.append(push.direction)
+
+            boxes_positions.discard(push.box_position)
+            boxes_positions.add(target)
+            pusher_position = push.box_position
+
+        return retv
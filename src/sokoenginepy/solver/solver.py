@@ -0,0 +1,569 @@
+from __future__ import annotations
+
+import enum
+import heapq
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from ..game import (
+    BoardGraph,
+    Mover,
+    PackedBoardState,
+    PusherStep,
+    ReplacementPolicy,
+    TranspositionTable,
+)
+from ..io import Snapshot
+from .deadlocks import (
+    DeadlockDetector,
+    ReverseDeadSquares,
+    default_deadlock_detectors,
+)
+from .heuristics import Heuristic, MinimumMatchingLowerBound, NullHeuristic
+from .search_space import Push, SearchSpace
+
+if TYPE_CHECKING:
+    from ..io import Puzzle
+
+
+class SearchAlgorithm(enum.Enum):
+    """Search algorithms implemented by :class:`.Solver`."""
+
+    #: Breadth first search. Finds push-optimal solutions. Ignores heuristic.
+    BFS = 0
+
+    #: A* search. Finds push-optimal solutions if heuristic is admissible.
+    ASTAR = 1
+
+    #: Iterative deepening A*. Finds push-optimal solutions if heuristic is
+    #: admissible, using memory proportional to solution length (plus optional
+    #: :class:`.TranspositionTable`).
+    IDASTAR = 2
+
+    #: Bidirectional breadth first search. Grows forward search from initial state
+    #: and reverse search (pulling boxes, as in `.SolvingMode.REVERSE`) from solved
+    #: states until they meet. Finds push-optimal solutions and usually explores far
+    #: fewer states than :attr:`BFS`. Ignores heuristic.
+    BIDIRECTIONAL = 3
+
+    def __repr__(self):
+        return "SearchAlgorithm." + self.name
+
+
+class SolverStatus(enum.Enum):
+    """Outcome of search."""
+
+    #: Solution was found
+    SOLVED = 0
+
+    #: Whole search space was explored without finding solution
+    UNSOLVABLE = 1
+
+    #: Search was interrupted by ``time_limit``
+    TIME_LIMIT = 2
+
+    #: Search was interrupted by ``nodes_limit``
+    NODES_LIMIT = 3
+
+    def __repr__(self):
+        return "SolverStatus." + self.name
+
+
+@dataclass
+class SolverStatistics:
+    """Search statistics."""
+
+    #: Number of states whose successors were generated
+    nodes_expanded: int = 0
+
+    #: Number of generated successors, including duplicates
+    nodes_generated: int = 0
+
+    #: Wall clock duration of search in seconds
+    seconds: float = 0.0
+
+    #: Peak memory allocated during search in bytes or None if it wasn't tracked
+    peak_memory: Optional[int] = None
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Expanded nodes per second."""
+        return self.nodes_expanded / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class SolverResult:
+    """Outcome of :meth:`.Solver.solve`."""
+
+    status: SolverStatus
+
+    #: Pushes that solve the puzzle, empty if it wasn't solved
+    pushes: List[Push] = field(default_factory=list)
+
+    #: Complete solution (moves and pushes) or None if puzzle wasn't solved
+    snapshot: Optional[Snapshot] = None
+
+    statistics: SolverStatistics = field(default_factory=SolverStatistics)
+
+    @property
+    def is_solved(self) -> bool:
+        return self.status == SolverStatus.SOLVED
+
+
+class _BudgetExceeded(Exception):
+    def __init__(self, status: SolverStatus):
+        super().__init__(status)
+        self.status = status
+
+
+class Solver:
+    """
+    Push-optimal single pusher puzzle solver.
+
+    States are explored on push level: successors of each state are all states
+    reachable by moving pusher around and pushing single box once. States are keyed
+    by :class:`.PackedBoardState` with normalized pusher position, which means that
+    all states that differ only in where pusher stands within the same area are
+    treated as one state.
+
+    Arguments:
+        puzzle: puzzle to solve
+        algorithm: search algorithm
+        heuristic: estimator used by A* and IDA*. Default is
+            :class:`.MinimumMatchingLowerBound`.
+        deadlock_detectors: used to prune deadlocked states. Default is
+            :func:`.default_deadlock_detectors`.
+        reverse_deadlock_detectors: used to prune deadlocked states in reverse part
+            of bidirectional search. Default is :class:`.ReverseDeadSquares`.
+        time_limit: maximal duration of search in seconds
+        nodes_limit: maximal number of expanded states
+        track_memory: if True, peak memory allocated during search is measured with
+            :mod:`tracemalloc`. This slows search down considerably.
+        transposition_table_memory: memory limit in bytes of
+            :class:`.TranspositionTable` used by IDA* to avoid re-exploring states
+            reached through different paths. It is used only if NumPy is installed
+            and only if this is greater than 0.
+        zobrist_seed: seed for Zobrist hashing of states, see :class:`.SearchSpace`
+
+    Raises:
+        NonPlayableBoardError: ``puzzle`` is not playable
+        ValueError: ``puzzle`` has more than one pusher
+        SokobanPlusDataError: ``puzzle`` has invalid Sokoban+ data
+
+    Example:
+
+        >>> from sokoenginepy import Puzzle, Tessellation
+        >>> from sokoenginepy.solver import Solver, SearchAlgorithm
+        >>> puzzle = Puzzle(Tessellation.SOKOBAN, board="#######\\n#@ $ .#\\n#######")
+        >>> result = Solver(puzzle, SearchAlgorithm.ASTAR).solve()
+        >>> result.status
+        SolverStatus.SOLVED
+        >>> result.snapshot.to_str()
+        'rRR'
+    """
+
+    def __init__(
+        self,
+        puzzle: Puzzle,
+        algorithm: SearchAlgorithm = SearchAlgorithm.ASTAR,
+        heuristic: Optional[Heuristic] = None,
+        deadlock_detectors: Optional[Sequence[DeadlockDetector]] = None,
+        reverse_deadlock_detectors: Optional[Sequence[DeadlockDetector]] = None,
+        time_limit: Optional[float] = None,
+        nodes_limit: Optional[int] = None,
+        track_memory: bool = False,
+        transposition_table_memory: int = 4 * 2**20,
+        zobrist_seed: Optional[int] = None,
+    ):
+        self._puzzle = puzzle
+        self._algorithm = algorithm
+        self._space = SearchSpace(puzzle, zobrist_seed)
+
+        self._heuristic = heuristic or MinimumMatchingLowerBound()
+        if algorithm in (SearchAlgorithm.BFS, SearchAlgorithm.BIDIRECTIONAL):
+            self._heuristic = NullHeuristic()
+        self._heuristic.attach(self._space)
+
+        if deadlock_detectors is None:
+            deadlock_detectors = default_deadlock_detectors()
+        self._deadlock_detectors = list(deadlock_detectors)
+        for detector in self._deadlock_detectors:
+            detector.attach(self._space)
+
+        if reverse_deadlock_detectors is None:
+            reverse_deadlock_detectors = [ReverseDeadSquares()]
+        self._reverse_deadlock_detectors = list(reverse_deadlock_detectors)
+        for detector in self._reverse_deadlock_detectors:
+            detector.attach(self._space)
+
+        self.time_limit = time_limit
+        self.nodes_limit = nodes_limit
+        self.track_memory = track_memory
+        self.transposition_table_memory = transposition_table_memory
+
+        self._statistics = SolverStatistics()
+        self._start_time = 0.0
+
+    @property
+    def puzzle(self) -> Puzzle:
+        return self._puzzle
+
+    @property
+    def algorithm(self) -> SearchAlgorithm:
+        return self._algorithm
+
+    @property
+    def space(self) -> SearchSpace:
+        return self._space
+
+    @property
+    def heuristic(self) -> Heuristic:
+        return self._heuristic
+
+    @property
+    def deadlock_detectors(self) -> List[DeadlockDetector]:
+        return self._deadlock_detectors
+
+    @property
+    def reverse_deadlock_detectors(self) -> List[DeadlockDetector]:
+        return self._reverse_deadlock_detectors
+
+    def solve(self, attach: bool = False) -> SolverResult:
+        """
+        Searches for solution.
+
+        Arguments:
+            attach: if True, found solution is appended to ``puzzle.snapshots``
+
+        Returns:
+            Search result. If puzzle was solved, result contains :class:`.Snapshot`
+            with full solution (moves and pushes).
+        """
+        self._statistics = SolverStatistics()
+
+        started_tracing = False
+        if self.track_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+
+        self._start_time = time.perf_counter()
+
+        try:
+            pushes = self._search()
+            status = (
+                SolverStatus.SOLVED if pushes is not None else SolverStatus.UNSOLVABLE
+            )
+
+        except _BudgetExceeded as exc:
+            pushes = None
+            status = exc.status
+
+        finally:
+            self._statistics.seconds = time.perf_counter() - self._start_time
+            if self.track_memory:
+                self._statistics.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+
+        retv = SolverResult(status=status, statistics=self._statistics)
+
+        if pushes is not None:
+            retv.pushes = pushes
+            retv.snapshot = self.snapshot_from_pushes(pushes)
+            if attach:
+                self._puzzle.snapshots.append(retv.snapshot)
+
+        return retv
+
+    def snapshot_from_pushes(self, pushes: Sequence[Push]) -> Snapshot:
+        """
+        Converts sequence of pushes from initial board position into complete
+        :class:`.Snapshot`.
+
+        Pusher movements between pushes are replayed with :class:`.Mover`, so
+        resulting snapshot is guaranteed to be valid.
+
+        Raises:
+            ValueError: ``pushes`` are not valid sequence of pushes
+        """
+        mover = Mover(BoardGraph(self._puzzle))
+        pusher_steps: List[PusherStep] = []
+        for direction in self._space.pushes_to_directions(pushes):
+            mover.move(direction)
+            pusher_steps.extend(mover.last_move)
+
+        retv = Snapshot(self._puzzle.tessellation)
+        retv.pusher_steps = pusher_steps
+        retv.solver = "sokoenginepy"
+        retv.notes = f"{self._algorithm.name}, {len(pushes)} pushes"
+        return retv
+
+    def _search(self) -> Optional[List[Push]]:
+        if self._algorithm == SearchAlgorithm.BFS:
+            return self._bfs()
+        elif self._algorithm == SearchAlgorithm.ASTAR:
+            return self._astar()
+        elif self._algorithm == SearchAlgorithm.IDASTAR:
+            return self._idastar()
+        return self._bidirectional()
+
+    def _check_budget(self):
+        if (
+            self.nodes_limit is not None
+            and self._statistics.nodes_expanded >= self.nodes_limit
+        ):
+            raise _BudgetExceeded(SolverStatus.NODES_LIMIT)
+
+        if (
+            self.time_limit is not None
+            and time.perf_counter() - self._start_time >= self.time_limit
+        ):
+            raise _BudgetExceeded(SolverStatus.TIME_LIMIT)
+
+    def _successors(self, state: PackedBoardState):
+        self._check_budget()
+        self._statistics.nodes_expanded += 1
+        for successor in self._space.successors(state, self._deadlock_detectors):
+            self._statistics.nodes_generated += 1
+            yield successor
+
+    def _predecessors(self, state: PackedBoardState):
+        self._check_budget()
+        self._statistics.nodes_expanded += 1
+        for predecessor in self._space.predecessors(
+            state, self._reverse_deadlock_detectors
+        ):
+            self._statistics.nodes_generated += 1
+            yield predecessor
+
+    @staticmethod
+    def _reconstruct(
+        came_from: Dict[PackedBoardState, Optional[Tuple[PackedBoardState, Push]]],
+        state: PackedBoardState,
+    ) -> List[Push]:
+        retv = []
+        while came_from[state] is not None:
+            state, push = came_from[state]
+            retv.append(push)
+        retv.reverse()
+        return retv
+
+    def _bfs(self) -> Optional[List[Push]]:
+        space = self._space
+        root = space.initial_state
+        if space.is_solved(root.boxes_positions):
+            return []
+
+        came_from = {root: None}
+        frontier = deque([root])
+
+        while frontier:
+            state = frontier.popleft()
+            for child, child_boxes, push in self._successors(state):
+                if child in came_from:
+                    continue
+                came_from[child] = (state, push)
+                if space.is_solved(child_boxes):
+                    return self._reconstruct(came_from, child)
+                frontier.append(child)
+
+        return None
+
+    def _bidirectional(self) -> Optional[List[Push]]:
+        space = self._space
+        root = space.initial_state
+        if space.is_solved(root.boxes_positions):
+            return []
+
+        # Both maps hold (linked state, push, depth). Forward map links states to
+        # their parents and backward one to their children.
+        forward = {root: (None, None, 0)}
+        backward = {goal: (None, None, 0) for goal in space.goal_states()}
+        forward_frontier = [root]
+        backward_frontier = list(backward.keys())
+
+        while forward_frontier and backward_frontier:
+            # Expand smaller frontier, whole layer at once. Of all meeting states
+            # found in that layer, one closest to the other side is on shortest path.
+            is_forward = len(forward_frontier) <= len(backward_frontier)
+            if is_forward:
+                frontier, visited, other = forward_frontier, forward, backward
+                expand = self._successors
+            else:
+                frontier, visited, other = backward_frontier, backward, forward
+                expand = self._predecessors
+
+            next_frontier = []
+            meeting = None
+            for state in frontier:
+                depth = visited[state][2] + 1
+                for linked, _, push in expand(state):
+                    if linked in visited:
+                        continue
+                    visited[linked] = (state, push, depth)
+                    next_frontier.append(linked)
+                    if linked in other and (
+                        meeting is None or other[linked][2] < other[meeting][2]
+                    ):
+                        meeting = linked
+
+            if meeting is not None:
+                return self._stitch(forward, backward, meeting)
+
+            if is_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None
+
+    @staticmethod
+    def _stitch(forward, backward, meeting: PackedBoardState) -> List[Push]:
+        retv = []
+        state = meeting
+        while forward[state][0] is not None:
+            state, push, _ = forward[state]
+            retv.append(push)
+        retv.reverse()
+
+        state = meeting
+        while backward[state][0] is not None:
+            state, push, _ = backward[state]
+            retv.append(push)
+
+        return retv
+
+    def _astar(self) -> Optional[List[Push]]:
+        space = self._space
+        estimate = self._heuristic.estimate
+        infinity = Heuristic.INFINITY
+
+        root = space.initial_state
+        root_estimate = estimate(root.boxes_positions)
+        if root_estimate == infinity:
+            return None
+
+        came_from = {root: None}
+        costs = {root: 0}
+        counter = 0
+        # Ties are broken in favor of deeper states, they are closer to solution
+        frontier = [(root_estimate, 0, counter, root)]
+
+        while frontier:
+            _, negative_cost, _, state = heapq.heappop(frontier)
+            cost = -negative_cost
+            if cost > costs[state]:
+                continue
+
+            if space.is_solved(state.boxes_positions):
+                return self._reconstruct(came_from, state)
+
+            child_cost = cost + 1
+            for child, child_boxes, push in self._successors(state):
+                if costs.get(child, child_cost + 1) <= child_cost:
+                    continue
+                child_estimate = estimate(child_boxes)
+                if child_estimate == infinity:
+                    continue
+                costs[child] = child_cost
+                came_from[child] = (state, push)
+                counter += 1
+                heapq.heappush(
+                    frontier,
+                    (child_cost + child_estimate, -child_cost, counter, child),
+                )
+
+        return None
+
+    def _transposition_table(self) -> Optional[TranspositionTable]:
+        if self.transposition_table_memory <= 0:
+            return None
+        try:
+            return TranspositionTable.for_board_manager(
+                self._space.board_manager,
+                memory_limit=self.transposition_table_memory,
+                policy=ReplacementPolicy.ALWAYS_REPLACE,
+            )
+        except ImportError:
+            return None
+
+    def _idastar(self) -> Optional[List[Push]]:
+        space = self._space
+        estimate = self._heuristic.estimate
+        infinity = Heuristic.INFINITY
+
+        root = space.initial_state
+        bound = estimate(root.boxes_positions)
+        if bound == infinity:
+            return None
+        if space.is_solved(root.boxes_positions):
+            return []
+
+        table = self._transposition_table()
+        iteration = 0
+
+        while True:
+            iteration += 1
+            next_bound = infinity
+            on_path = {root}
+            stack = [(root, 0, self._successors(root), None)]
+
+            while stack:
+                state, cost, successors, _ = stack[-1]
+                successor = next(successors, None)
+                if successor is None:
+                    stack.pop()
+                    on_path.discard(state)
+                    continue
+
+                child, child_boxes, push = successor
+                if child in on_path:
+                    continue
+
+                child_cost = cost + 1
+                child_estimate = estimate(child_boxes)
+                if child_estimate == infinity:
+                    continue
+                if child_cost + child_estimate > bound:
+                    next_bound = min(next_bound, child_cost + child_estimate)
+                    continue
+
+                if table is not None:
+                    # Same state already explored in this iteration from at most the
+                    # same depth
+                    entry = table.probe(child.zobrist_hash, child)
+                    if (
+                        entry is not None
+                        and entry.value == iteration
+                        and entry.depth <= child_cost
+                    ):
+                        continue
+                    table.store(child.zobrist_hash, child_cost, iteration, child)
+
+                if space.is_solved(child_boxes):
+                    return [_[3] for _ in stack[1:]] + [push]
+
+                on_path.add(child)
+                stack.append((child, child_cost, self._successors(child), push))
+
+            if next_bound == infinity:
+                return None
+            bound = next_bound
+
+
+def solve(
+    puzzle: Puzzle,
+    algorithm: SearchAlgorithm = SearchAlgorithm.ASTAR,
+    attach: bool = False,
+    **kwargs,
+) -> SolverResult:
+    """
+    Shortcut for ``Solver(puzzle, algorithm, **kwargs).solve(attach)``.
+    """
+    return Solver(puzzle, algorithm, **kwargs).solve(attach)
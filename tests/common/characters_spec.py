@@ -0,0 +1,45 @@
+from sokoenginepy.common import Characters, TextKind
+
+
+class DescribeCharacters:
+    def it_recognizes_boards(self):
+        assert Characters.is_board("  #  @$.* #")
+        assert Characters.is_board("#3-#|#-@-#")
+        assert Characters.is_board("#    #\n#@$.#")
+        assert not Characters.is_board("#  @$.* x#")
+        assert not Characters.is_board("  1 2 3  ")
+        assert not Characters.is_board("")
+        assert not Characters.is_board(None)
+
+    def it_recognizes_snapshots(self):
+        assert Characters.is_snapshot("[lu]rRDD{u*}")
+        assert Characters.is_snapshot("3(lU)\n2r")
+        assert not Characters.is_snapshot("lurd@")
+        assert not Characters.is_snapshot("  1 2 3  ")
+        assert not Characters.is_snapshot("   ")
+
+    def it_recognizes_sokoban_plus(self):
+        assert Characters.is_sokoban_plus("1 2\t3  4")
+        assert Characters.contains_only_digits_and_spaces("  ")
+        assert Characters.contains_only_digits_and_spaces(None)
+        assert not Characters.is_sokoban_plus("  ")
+        assert not Characters.is_sokoban_plus("1 2 x")
+
+    def it_classifies_text_in_single_call(self):
+        assert Characters.classify("#  @$.#") == TextKind.BOARD
+        assert Characters.classify("[lu]rRDD") == TextKind.SNAPSHOT
+        assert Characters.classify("1 2 3") == TextKind.SOKOBAN_PLUS
+        assert Characters.classify("***") == TextKind.BOARD | TextKind.SNAPSHOT
+        assert Characters.classify("Title: puzzle") == TextKind.NOTES
+        assert Characters.classify(" \n ") == TextKind.NOTES
+        assert Characters.classify("#  @$.#\n#  é  #") == TextKind.NOTES
+
+        text = "#####\n#@$.#\n#####\n\nlurd\n"
+        assert Characters.classify(text) == TextKind.NOTES
+        for line in text.splitlines():
+            assert bool(Characters.classify(line) & TextKind.BOARD) == (
+                Characters.is_board(line)
+            )
+            assert bool(Characters.classify(line) & TextKind.SNAPSHOT) == (
+                Characters.is_snapshot(line)
+            )
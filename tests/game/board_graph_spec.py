@@ -1,3 +1,4 @@
+import io
 import textwrap
 from itertools import permutations
 from typing import List
@@ -218,6 +219,25 @@ class DescribeBoardGraph:
             with pytest.raises(IndexError):
                 board_graph[-1] = " "
 
+    class describe_to_board_str:
+        def it_prints_current_board(self, puzzle, board_graph):
+            board_graph[index_1d(1, 7, puzzle.width)] = Puzzle.PUSHER
+
+            expected = puzzle.to_board_str(use_visible_floor=True).split("\n")
+            expected[7] = expected[7][:1] + Puzzle.PUSHER + expected[7][2:]
+            assert board_graph.to_board_str(use_visible_floor=True) == "\n".join(
+                expected
+            )
+
+        def it_writes_the_same_output_into_stream(self, board_graph):
+            for use_visible_floor in (False, True):
+                for rle_encode in (False, True):
+                    stream = io.StringIO()
+                    board_graph.write_board(stream, use_visible_floor, rle_encode)
+                    assert stream.getvalue() == board_graph.to_board_str(
+                        use_visible_floor, rle_encode
+                    )
+
     class describe_contains:
         def it_detects_if_position_is_in_graph(self, board_graph):
             assert 0 in board_graph
@@ -37,6 +37,14 @@ class DescribeHashedBoardManager:
 
         assert hashed_board_manager.state_hash is not None
 
+    def it_produces_equal_hashes_for_equal_zobrist_seeds(self, puzzle):
+        seeded = HashedBoardManager(BoardGraph(puzzle), zobrist_seed=42)
+        other_seeded = HashedBoardManager(BoardGraph(puzzle), zobrist_seed=42)
+        differently_seeded = HashedBoardManager(BoardGraph(puzzle), zobrist_seed=24)
+
+        assert seeded.state_hash == other_seeded.state_hash
+        assert seeded.state_hash != differently_seeded.state_hash
+
     def test_moving_box_modifies_hashes_consistently(self, board_graph):
         hashed_board_manager = HashedBoardManager(board_graph)
 
@@ -79,6 +87,30 @@ class DescribeHashedBoardManager:
         hashed_board_manager.move_pusher(Config.DEFAULT_ID, initial_pusher_position)
         assert hashed_board_manager.state_hash == initial_state_hash
 
+    def it_doesnt_change_boxes_hash_when_pusher_moves(self, board_graph):
+        hashed_board_manager = HashedBoardManager(board_graph)
+        initial_boxes_hash = hashed_board_manager.boxes_hash
+        pusher_position = hashed_board_manager.pusher_position(Config.DEFAULT_ID)
+
+        hashed_board_manager.move_pusher(Config.DEFAULT_ID, pusher_position - 1)
+        assert hashed_board_manager.boxes_hash == initial_boxes_hash
+
+        box_position = hashed_board_manager.box_position(Config.DEFAULT_ID)
+        hashed_board_manager.move_box(Config.DEFAULT_ID, box_position + 1)
+        assert hashed_board_manager.boxes_hash != initial_boxes_hash
+        assert hashed_board_manager.boxes_hash == (
+            hashed_board_manager.boxes_positions_hash(
+                list(hashed_board_manager.boxes_positions.values())
+            )
+        )
+
+    def it_recognizes_solved_board_regardless_of_pushers_positions(self, board_graph):
+        hashed_board_manager = HashedBoardManager(board_graph)
+        assert not hashed_board_manager.is_solved
+
+        hashed_board_manager.switch_boxes_and_goals()
+        assert hashed_board_manager.is_solved
+
     def test_setting_boxorder_or_goalorder_on_enabled_sokoban_plus_rehashes_board(
         self, board_graph
     ):
@@ -191,3 +223,103 @@ class DescribeHashedBoardManager:
         assert hashed_board_manager.state_hash == after_switch_hash
         hashed_board_manager.switch_boxes_and_goals()
         assert hashed_board_manager.state_hash == initial_hash
+
+
+@pytest.fixture
+def symmetric_puzzle():
+    data = """
+        #########
+        #   #   #
+        # $ . $ #
+        #   .   #
+        ##  @  ##
+         #######
+    """
+    return Puzzle(Tessellation.SOKOBAN, board=textwrap.dedent(data).strip())
+
+
+class DescribeSymmetricHashing:
+    def it_is_disabled_by_default(self, symmetric_puzzle):
+        manager = HashedBoardManager(BoardGraph(symmetric_puzzle))
+        assert not manager.symmetric_hashing
+        assert manager.symmetries == []
+        assert manager.symmetric_state_hash == manager.state_hash
+
+    def it_detects_board_symmetries(self, symmetric_puzzle, board_graph):
+        manager = HashedBoardManager(
+            BoardGraph(symmetric_puzzle), symmetric_hashing=True
+        )
+        assert len(manager.symmetries) == 1
+        # Mirror maps left box position to the right one
+        assert manager.symmetries[0][20] == 24
+
+        assert HashedBoardManager(board_graph, symmetric_hashing=True).symmetries == []
+
+    def it_gives_equal_hashes_to_mirrored_states(self, symmetric_puzzle):
+        manager = HashedBoardManager(
+            BoardGraph(symmetric_puzzle), zobrist_seed=42, symmetric_hashing=True
+        )
+        manager.move_box_from(20, 29)
+        left = (manager.symmetric_state_hash, manager.symmetric_boxes_hash)
+        left_exact = manager.state_hash
+
+        manager.move_box_from(29, 20)
+        manager.move_box_from(24, 33)
+        assert manager.state_hash != left_exact
+        assert (manager.symmetric_state_hash, manager.symmetric_boxes_hash) == left
+
+    def it_updates_symmetric_hashes_incrementally(self, symmetric_puzzle):
+        manager = HashedBoardManager(
+            BoardGraph(symmetric_puzzle), zobrist_seed=42, symmetric_hashing=True
+        )
+        manager.move_box_from(24, 33)
+        manager.move_pusher_from(40, 39)
+
+        board = BoardGraph(symmetric_puzzle)
+        board[24] = " "
+        board[33] = "$"
+        board[40] = " "
+        board[39] = "@"
+        fresh = HashedBoardManager(board, zobrist_seed=42, symmetric_hashing=True)
+
+        assert manager.symmetric_state_hash == fresh.symmetric_state_hash
+        assert manager.symmetric_boxes_hash == fresh.symmetric_boxes_hash
+        assert manager.symmetric_state_hash == manager.symmetric_positions_hash(
+            [39], [20, 33]
+        )
+
+    def it_ignores_symmetries_that_dont_preserve_sokoban_plus_goals(self):
+        data = """
+            #########
+            #   #   #
+            # $   $ #
+            #  . .  #
+            ##  @  ##
+             #######
+        """
+        puzzle = Puzzle(Tessellation.SOKOBAN, board=textwrap.dedent(data).strip())
+        manager = HashedBoardManager(
+            BoardGraph(puzzle), boxorder="1 2", goalorder="1 2", symmetric_hashing=True
+        )
+        assert len(manager.symmetries) == 1
+
+        manager.enable_sokoban_plus()
+        assert manager.symmetries == []
+
+    def it_normalizes_pusher_inside_its_area(self, symmetric_puzzle):
+        manager = HashedBoardManager(
+            BoardGraph(symmetric_puzzle), symmetric_hashing=True
+        )
+        board = manager.board
+
+        left = manager.symmetric_positions_hash(
+            [40],
+            [29, 24],
+            pusher_area=board.positions_reachable_by_pusher(40, [29, 24]),
+        )
+        right = manager.symmetric_positions_hash(
+            [10],
+            [20, 33],
+            pusher_area=board.positions_reachable_by_pusher(10, [20, 33]),
+        )
+        assert left == right
@@ -1309,3 +1309,33 @@ class DescribeMover:
         def when_fails_it_leaves_successful_moves_in_last_move(self):
             # TODO
             pass
+
+    class DescribeRestoringState:
+        def it_restores_pieces_pusher_selection_and_pull_count(
+            self, forward_board, jump_dest
+        ):
+            reverse_mover = Mover(forward_board, SolvingMode.REVERSE)
+            initial_board = str(reverse_mover.board)
+            state = reverse_mover.board_manager.state
+
+            reverse_mover.pulls_boxes = True
+            reverse_mover.move(Direction.DOWN)
+            reverse_mover.select_pusher(Config.DEFAULT_ID + 1)
+            assert reverse_mover.pull_count == 1
+
+            reverse_mover.restore_state(state)
+
+            assert str(reverse_mover.board) == initial_board
+            assert reverse_mover.selected_pusher == Config.DEFAULT_ID
+            assert reverse_mover.pull_count == 0
+            assert not reverse_mover.last_move
+            reverse_mover.jump(jump_dest)
+
+        def it_refuses_invalid_pusher_selection_and_pull_count(self, forward_board):
+            mover = Mover(forward_board)
+            state = mover.board_manager.state
+
+            with pytest.raises(KeyError):
+                mover.restore_state(state, selected_pusher=Config.DEFAULT_ID + 42)
+            with pytest.raises(ValueError):
+                mover.restore_state(state, pull_count=-1)
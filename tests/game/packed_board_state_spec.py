@@ -0,0 +1,211 @@
+import pickle
+import textwrap
+
+import pytest
+
+from sokoenginepy import (
+    BoardGraph,
+    BoardManager,
+    BoardState,
+    CellAlreadyOccupiedError,
+    Config,
+    HashedBoardManager,
+    PackedBoardState,
+    Puzzle,
+    Tessellation,
+)
+
+
+@pytest.fixture
+def puzzle():
+    #   0123456789012345678
+    data = """
+        ----#####----------
+        ----#--@#----------
+        ----#$--#----------
+        --###--$##---------
+        --#--$-$-#---------
+        ###-#-##-#---######
+        #---#-##-#####--..#
+        #-$--$----------..#
+        #####-###-#@##--..#
+        ----#-----#########
+        ----#######--------
+    """
+    data = textwrap.dedent(data)
+    return Puzzle(Tessellation.SOKOBAN, board=data)
+
+
+@pytest.fixture
+def board_graph(puzzle):
+    return BoardGraph(puzzle)
+
+
+class DescribePackedBoardState:
+    def it_packs_positions(self):
+        state = PackedBoardState([42, 24], [1, 2, 3], 123)
+
+        assert state.pushers_positions == [42, 24]
+        assert state.boxes_positions == [1, 2, 3]
+        assert state.pushers_count == 2
+        assert state.boxes_count == 3
+        assert state.zobrist_hash == 123
+
+    def it_is_immutable(self):
+        state = PackedBoardState([42], [1, 2, 3])
+
+        with pytest.raises(AttributeError):
+            state.boxes_positions = [4, 5, 6]
+
+        with pytest.raises(AttributeError):
+            state.foo = 42
+
+    def it_converts_to_and_from_board_state(self):
+        board_state = BoardState([42], [1, 2, 3], 123)
+        state = PackedBoardState.from_board_state(board_state)
+
+        assert state.to_board_state() == board_state
+
+    def it_is_hashable(self):
+        state1 = PackedBoardState([42], [1, 2, 3], 123)
+        state2 = PackedBoardState([42], [1, 2, 3], 123)
+        state3 = PackedBoardState([42], [1, 2, 4], 124)
+
+        assert state1 == state2
+        assert state1 != state3
+        assert len({state1, state2, state3}) == 2
+        assert hash(state1) == 123
+
+        unhashed1 = PackedBoardState([42], [1, 2, 3])
+        unhashed2 = PackedBoardState([42], [1, 2, 3])
+        assert unhashed1 == unhashed2
+        assert hash(unhashed1) == hash(unhashed2)
+
+    def it_distinguishes_pushers_from_boxes(self):
+        assert PackedBoardState([1], [2, 3]) != PackedBoardState([1, 2], [3])
+
+    def it_can_be_pickled(self):
+        state = PackedBoardState([42], [1, 2, 3], 123)
+        assert pickle.loads(pickle.dumps(state)) == state
+
+    def it_serializes_many_states_into_single_buffer(self):
+        states = [
+            PackedBoardState([42], [1, 2, 3], 123),
+            PackedBoardState([24], [4, 5, 6], 456),
+            PackedBoardState([Config.MAX_WIDTH * Config.MAX_HEIGHT - 1], [7, 8, 9]),
+        ]
+
+        buffer = PackedBoardState.pack_many(states)
+
+        assert PackedBoardState.unpack_many(buffer) == states
+        assert PackedBoardState.unpack_many(PackedBoardState.pack_many([])) == []
+
+    def it_refuses_to_pack_states_of_different_boards(self):
+        with pytest.raises(ValueError):
+            PackedBoardState.pack_many(
+                [PackedBoardState([42], [1, 2, 3]), PackedBoardState([42], [1, 2])]
+            )
+
+    def it_validates_buffer_when_unpacking(self):
+        buffer = PackedBoardState.pack_many([PackedBoardState([42], [1, 2, 3])])
+
+        with pytest.raises(ValueError):
+            PackedBoardState.unpack_many(buffer[:-1])
+
+        with pytest.raises(ValueError):
+            PackedBoardState.unpack_many(b"XXXX" + buffer[4:])
+
+
+class DescribeBoardManagerPackedState:
+    def it_packs_current_state_in_canonical_order(self, board_graph):
+        manager = BoardManager(board_graph)
+        state = manager.packed_state()
+
+        assert state.pushers_positions == [26, 163]
+        assert state.boxes_positions == sorted(manager.boxes_positions.values())
+        assert state.zobrist_hash == BoardState.NO_HASH
+
+    def it_packs_boxes_in_sokoban_plus_groups(self, board_graph):
+        manager = BoardManager(board_graph, "1 1 2 2 3 3", "1 1 2 2 3 3")
+        manager.enable_sokoban_plus()
+
+        state = manager.pack_state([163, 26], [64, 43, 83, 81, 138, 135])
+
+        assert state.pushers_positions == [26, 163]
+        assert state.boxes_positions == [43, 64, 81, 83, 135, 138]
+
+    def it_normalizes_pusher_position(self):
+        data = textwrap.dedent("""
+            #####
+            #  @#
+            # $.#
+            #####
+            """)
+        manager = HashedBoardManager(
+            BoardGraph(Puzzle(Tessellation.SOKOBAN, board=data))
+        )
+
+        state = manager.packed_state(normalize_pusher=True)
+        assert state.pushers_positions == [6]
+
+        manager.move_pusher_from(8, 7)
+        assert manager.packed_state(normalize_pusher=True) == state
+        assert manager.packed_state() != state
+
+    def it_restores_board_state(self, board_graph):
+        manager = HashedBoardManager(board_graph)
+        initial_hash = manager.state_hash
+        initial_state = manager.packed_state()
+        initial_board = str(board_graph)
+
+        manager.move_box_from(43, 44)
+        manager.move_pusher_from(26, 25)
+        manager.move_box_from(64, 63)
+        assert manager.state_hash != initial_hash
+
+        manager.restore_state(initial_state)
+
+        assert manager.state_hash == initial_hash
+        assert manager.packed_state() == initial_state
+        assert str(board_graph) == initial_board
+
+    def it_restores_board_state_with_overlapping_positions(self, board_graph):
+        manager = HashedBoardManager(board_graph)
+        state = manager.state
+        state.boxes_positions = state.boxes_positions[1:] + state.boxes_positions[:1]
+
+        manager.restore_state(state)
+
+        assert list(manager.boxes_positions.values()) == state.boxes_positions
+
+    def it_calculates_same_hash_for_packed_and_live_state(self, board_graph):
+        manager = HashedBoardManager(board_graph)
+        packed = manager.pack_state([25, 163], [44, 64, 81, 83, 135, 138])
+
+        manager.move_box_from(43, 44)
+        manager.move_pusher_from(26, 25)
+
+        assert manager.state_hash == packed.zobrist_hash
+        assert manager.packed_state() == packed
+
+    def it_validates_restored_state(self, board_graph):
+        manager = BoardManager(board_graph)
+        state = manager.state
+
+        with pytest.raises(ValueError):
+            manager.restore_state(BoardState(state.pushers_positions, []))
+
+        with pytest.raises(CellAlreadyOccupiedError):
+            manager.restore_state(
+                BoardState(state.pushers_positions, [4] + state.boxes_positions[1:])
+            )
+
+        with pytest.raises(CellAlreadyOccupiedError):
+            manager.restore_state(
+                BoardState(
+                    state.pushers_positions,
+                    state.boxes_positions[:1] + state.boxes_positions[:-1],
+                )
+            )
+
+        assert manager.state == state
@@ -288,3 +288,30 @@ class DescribePusherStep:
             pusher_step = PusherStep(is_pusher_selection=True)
             pusher_step.is_jump = False
             assert pusher_step.is_pusher_selection
+
+    class Describe_packed:
+        def it_packs_and_unpacks_step(self):
+            for direction in Direction:
+                for pusher_step in [
+                    PusherStep(direction),
+                    PusherStep(direction, moved_box_id=42),
+                    PusherStep(direction, is_jump=True),
+                    PusherStep(direction, is_pusher_selection=True, pusher_id=42),
+                    PusherStep(direction, is_current_pos=True),
+                ]:
+                    value = pusher_step.packed()
+                    assert 0 <= value < 128
+
+                    unpacked = PusherStep.from_packed(value)
+                    assert unpacked == pusher_step
+                    assert unpacked.is_current_pos == pusher_step.is_current_pos
+
+        def it_raises_on_invalid_packed_value(self):
+            for value in [
+                -1,
+                128,
+                PusherStep.PACKED_PUSH | PusherStep.PACKED_JUMP,
+                PusherStep.PACKED_JUMP | PusherStep.PACKED_PUSHER_SELECTION,
+            ]:
+                with pytest.raises(ValueError):
+                    PusherStep.from_packed(value)
@@ -0,0 +1,108 @@
+import pytest
+
+from sokoenginepy import (
+    BoardGraph,
+    Config,
+    Direction,
+    Mover,
+    PusherStep,
+    PusherSteps,
+    Puzzle,
+    Snapshot,
+    Tessellation,
+)
+
+
+@pytest.fixture
+def pusher_steps():
+    return [
+        PusherStep(Direction.LEFT, pusher_id=Config.DEFAULT_ID + 1),
+        PusherStep(Direction.UP, moved_box_id=Config.DEFAULT_ID + 2),
+        PusherStep(Direction.RIGHT, is_jump=True, is_current_pos=True),
+        PusherStep(Direction.DOWN, is_pusher_selection=True),
+    ]
+
+
+class DescribePusherSteps:
+    def it_stores_steps_in_columns(self, pusher_steps):
+        steps = PusherSteps(pusher_steps)
+
+        assert len(steps) == 4
+        assert list(steps.packed) == [_.packed() for _ in pusher_steps]
+        assert list(steps.pusher_ids) == [_.pusher_id for _ in pusher_steps]
+        assert list(steps.moved_box_ids) == [_.moved_box_id for _ in pusher_steps]
+
+    def it_returns_views_of_steps(self, pusher_steps):
+        steps = PusherSteps(pusher_steps)
+
+        for view, pusher_step in zip(steps, pusher_steps):
+            assert view == pusher_step
+            assert pusher_step == view
+            assert view.direction == pusher_step.direction
+            assert view.is_move == pusher_step.is_move
+            assert view.is_current_pos == pusher_step.is_current_pos
+            assert view.pusher_id == pusher_step.pusher_id
+            assert view.moved_box_id == pusher_step.moved_box_id
+
+        assert steps[-1] == pusher_steps[-1]
+        assert steps.to_list() == pusher_steps
+        assert steps == pusher_steps
+        with pytest.raises(IndexError):
+            steps[4]
+
+    def it_slices_steps(self, pusher_steps):
+        steps = PusherSteps(pusher_steps)
+
+        sliced = steps[1:3]
+        assert isinstance(sliced, PusherSteps)
+        assert sliced == pusher_steps[1:3]
+        assert list(sliced.moved_box_ids) == [Config.DEFAULT_ID + 2, Config.NO_ID]
+        assert steps[::-1] == pusher_steps[::-1]
+
+    def it_converts_to_and_from_moves_data(self):
+        steps = PusherSteps.from_moves_data(Tessellation.SOKOBAN, "[ur*]3(lU){d}")
+
+        assert len(steps) == 9
+        assert steps[0].is_jump
+        assert steps[1].is_current_pos
+        assert steps[3].is_push_or_pull
+        assert steps[8].is_pusher_selection
+        assert steps.to_moves_data(Tessellation.SOKOBAN) == "[ur*]lUlUlU{d}"
+
+        with pytest.raises(ValueError):
+            PusherSteps.from_moves_data(Tessellation.SOKOBAN, "lu[LU]")
+        with pytest.raises(ValueError):
+            steps.to_moves_data(Tessellation.HEXOBAN)
+
+    def it_creates_steps_from_packed_values(self, pusher_steps):
+        steps = PusherSteps.from_packed(_.packed() for _ in pusher_steps)
+
+        assert steps == pusher_steps
+        assert list(steps.pusher_ids) == [Config.DEFAULT_ID] * 4
+        assert list(steps.moved_box_ids) == [
+            Config.NO_ID,
+            Config.DEFAULT_ID,
+            Config.NO_ID,
+            Config.NO_ID,
+        ]
+
+        with pytest.raises(ValueError):
+            PusherSteps.from_packed([PusherStep.PACKED_PUSH | PusherStep.PACKED_JUMP])
+
+    def it_is_accepted_by_snapshot(self, pusher_steps):
+        snapshot = Snapshot(Tessellation.SOKOBAN)
+        snapshot.pusher_steps = PusherSteps(pusher_steps)
+
+        assert snapshot.moves_data == "[]lU[r*]{d}"
+        assert snapshot.pusher_steps == pusher_steps
+
+    def it_is_accepted_by_mover(self):
+        puzzle = Puzzle(Tessellation.SOKOBAN, board="######\n#@$ .#\n######")
+        mover = Mover(BoardGraph(puzzle))
+        mover.move(Direction.RIGHT)
+
+        mover.last_move = PusherSteps(mover.last_move)
+        mover.undo_last_move()
+
+        assert mover.board_manager.pushers_positions == {Config.DEFAULT_ID: 7}
+        assert mover.board_manager.boxes_positions == {Config.DEFAULT_ID: 8}
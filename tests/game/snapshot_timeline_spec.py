@@ -0,0 +1,138 @@
+import pytest
+
+from sokoenginepy import (
+    BoardGraph,
+    Config,
+    Direction,
+    IllegalMoveError,
+    Mover,
+    Puzzle,
+    Snapshot,
+    SnapshotTimeline,
+    SolvingMode,
+    Tessellation,
+)
+
+
+@pytest.fixture
+def puzzle():
+    data = "\n".join(
+        [
+            # 12345678
+            "#########",  # 0
+            "#$  .  .#",  # 1
+            "#   @$# #",  # 2
+            "#.$    @#",  # 3
+            "#########",  # 4
+        ]
+    )
+    return Puzzle(Tessellation.SOKOBAN, board=data)
+
+
+def record(puzzle, solving_mode, actions):
+    """
+    Performs actions on fresh mover and returns resulting snapshot together with board
+    state after each of its pusher steps.
+    """
+    mover = Mover(BoardGraph(puzzle), solving_mode)
+    pusher_steps = []
+    states = [mover.board_manager.state]
+
+    for action, argument in actions:
+        before = mover.board_manager.state
+        if action == "move":
+            mover.move(argument)
+        elif action == "jump":
+            mover.jump(argument)
+        else:
+            mover.select_pusher(argument)
+        pusher_steps.extend(mover.last_move)
+        if action == "move":
+            states.append(mover.board_manager.state)
+        else:
+            states.extend([before] * (len(mover.last_move) - 1))
+            states.append(mover.board_manager.state)
+
+    snapshot = Snapshot(Tessellation.SOKOBAN)
+    snapshot.pusher_steps = pusher_steps
+    return snapshot, states
+
+
+def positions(state):
+    return state.pushers_positions, state.boxes_positions
+
+
+class DescribeSnapshotTimeline:
+    @pytest.mark.parametrize("checkpoint_interval", [1, 2, 5, 100])
+    def it_reconstructs_board_state_after_each_step(self, puzzle, checkpoint_interval):
+        snapshot, states = record(
+            puzzle,
+            SolvingMode.FORWARD,
+            [
+                ("move", Direction.LEFT),
+                ("move", Direction.DOWN),
+                ("move", Direction.LEFT),
+                ("move", Direction.RIGHT),
+                ("select", Config.DEFAULT_ID + 1),
+                ("move", Direction.UP),
+                ("move", Direction.UP),
+                ("move", Direction.LEFT),
+                ("move", Direction.LEFT),
+                ("move", Direction.DOWN),
+                ("select", Config.DEFAULT_ID),
+                ("move", Direction.UP),
+            ],
+        )
+
+        timeline = SnapshotTimeline(puzzle, snapshot, checkpoint_interval)
+
+        assert len(timeline) == len(states) - 1
+        for step in [*range(len(states)), *reversed(range(len(states))), 4, 0, 9]:
+            assert positions(timeline.state_at(step)) == positions(states[step])
+
+    def it_replays_reverse_snapshots(self, puzzle):
+        snapshot, states = record(
+            puzzle,
+            SolvingMode.REVERSE,
+            [
+                ("jump", 11),
+                ("move", Direction.RIGHT),
+                ("move", Direction.DOWN),
+                ("move", Direction.LEFT),
+            ],
+        )
+        assert snapshot.is_reverse
+
+        timeline = SnapshotTimeline(puzzle, snapshot, checkpoint_interval=2)
+
+        for step in reversed(range(len(states))):
+            assert positions(timeline.state_at(step)) == positions(states[step])
+
+    def it_adapts_checkpoint_interval_to_memory_budget(self, puzzle):
+        snapshot = Snapshot(Tessellation.SOKOBAN, "lr" * 500)
+
+        unlimited = SnapshotTimeline(puzzle, snapshot, memory_budget=2**30)
+        limited = SnapshotTimeline(puzzle, snapshot, memory_budget=2**12)
+
+        assert unlimited.checkpoint_interval == 1
+        assert limited.checkpoint_interval > 1
+        assert limited.memory_usage <= 2**12 + limited.memory_usage // (
+            limited.checkpoints_count
+        )
+        assert positions(limited.state_at(777)) == positions(unlimited.state_at(777))
+
+    def it_refuses_out_of_range_steps(self, puzzle):
+        timeline = SnapshotTimeline(puzzle, Snapshot(Tessellation.SOKOBAN, "lr"))
+
+        with pytest.raises(IndexError):
+            timeline.state_at(3)
+        with pytest.raises(IndexError):
+            timeline.state_at(-1)
+
+    def it_refuses_illegal_snapshots(self, puzzle):
+        with pytest.raises(IllegalMoveError):
+            SnapshotTimeline(puzzle, Snapshot(Tessellation.SOKOBAN, "uu"))
+
+    def it_refuses_invalid_checkpoint_interval(self, puzzle):
+        with pytest.raises(ValueError):
+            SnapshotTimeline(puzzle, Snapshot(Tessellation.SOKOBAN, "lr"), 0)
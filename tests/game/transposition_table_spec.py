@@ -0,0 +1,209 @@
+import multiprocessing
+import pickle
+import textwrap
+import threading
+
+import pytest
+
+from sokoenginepy import (
+    BoardGraph,
+    HashedBoardManager,
+    Puzzle,
+    ReplacementPolicy,
+    Tessellation,
+    TranspositionTable,
+    TranspositionTableEntry,
+)
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def puzzle():
+    #   0123456789012345678
+    data = """
+        ----#####----------
+        ----#--@#----------
+        ----#$--#----------
+        --###--$##---------
+        --#--$-$-#---------
+        ###-#-##-#---######
+        #---#-##-#####--..#
+        #-$--$----------..#
+        #####-###-#@##--..#
+        ----#-----#########
+        ----#######--------
+    """
+    data = textwrap.dedent(data)
+    return Puzzle(Tessellation.SOKOBAN, board=data)
+
+
+@pytest.fixture
+def board_manager(puzzle):
+    return HashedBoardManager(BoardGraph(puzzle))
+
+
+def _store_in_worker(table, state_hashes):
+    for state_hash in state_hashes:
+        table.store(state_hash, depth=1, value=state_hash % 1000)
+    table.close()
+
+
+class DescribeTranspositionTable:
+    def it_stores_and_probes_entries(self):
+        table = TranspositionTable(memory_limit=2**12)
+
+        assert table.probe(42) is None
+        assert 42 not in table
+
+        assert table.store(42, depth=3, value=-7)
+
+        assert 42 in table
+        assert len(table) == 1
+        assert table.probe(42) == TranspositionTableEntry(depth=3, value=-7)
+
+        table.clear()
+        assert len(table) == 0
+
+    def it_respects_memory_limit(self):
+        table = TranspositionTable(memory_limit=1000, verify_size=8)
+
+        assert table.capacity == 32
+        assert table.memory_usage <= 1000
+
+        with pytest.raises(ValueError):
+            TranspositionTable(memory_limit=10)
+
+    def it_refuses_to_store_no_hash(self):
+        with pytest.raises(ValueError):
+            TranspositionTable(memory_limit=2**12).store(0)
+
+    def it_prefers_shallower_entries(self):
+        table = TranspositionTable(
+            memory_limit=16 * 4, policy=ReplacementPolicy.DEPTH_PREFERRED, max_probes=4
+        )
+        assert table.capacity == 4
+
+        for state_hash in [4, 8, 12, 16]:
+            assert table.store(state_hash, depth=state_hash)
+
+        # Existing entry is updated only if reached with smaller depth
+        assert not table.store(8, depth=10)
+        assert table.store(8, depth=2)
+        assert table.probe(8).depth == 2
+
+        # Full bucket, deeper entry is rejected
+        assert not table.store(20, depth=100)
+        assert 20 not in table
+
+        # Full bucket, deepest entry is replaced
+        assert table.store(20, depth=3)
+        assert 20 in table
+        assert 16 not in table
+        assert len(table) == 4
+
+    def it_always_replaces_when_configured(self):
+        table = TranspositionTable(
+            memory_limit=16 * 4, policy=ReplacementPolicy.ALWAYS_REPLACE, max_probes=4
+        )
+
+        for state_hash in [4, 8, 12, 16]:
+            assert table.store(state_hash, depth=1)
+
+        assert table.store(4, depth=10)
+        assert table.probe(4).depth == 10
+        assert table.store(20, depth=100)
+        assert 20 in table
+        assert len(table) == 4
+
+    def it_verifies_full_states(self, board_manager):
+        table = TranspositionTable.for_board_manager(board_manager, memory_limit=2**16)
+        state = board_manager.packed_state()
+        assert table.verify_size == len(bytes(state))
+
+        other_state = board_manager.pack_state(
+            state.pushers_positions, state.boxes_positions[::-1][:-1] + [0]
+        )
+
+        table.store(state.zobrist_hash, depth=1, value=2, state=state)
+
+        assert table.probe(state.zobrist_hash, state=state) == (1, 2)
+        # Simulated hash collision
+        assert table.probe(state.zobrist_hash, state=other_state) is None
+
+        table.store(state.zobrist_hash, depth=3, value=4, state=other_state)
+        assert table.probe(state.zobrist_hash, state=state) == (1, 2)
+        assert table.probe(state.zobrist_hash, state=other_state) == (3, 4)
+
+        with pytest.raises(ValueError):
+            table.probe(state.zobrist_hash)
+
+        with pytest.raises(ValueError):
+            table.store(state.zobrist_hash, state=b"foo")
+
+    def it_can_be_used_from_multiple_threads(self):
+        table = TranspositionTable(memory_limit=2**20)
+        hashes = [h * 7919 + 1 for h in range(4000)]
+
+        threads = [
+            threading.Thread(
+                target=lambda chunk: [table.store(h, value=h % 1000) for h in chunk],
+                args=(hashes[i::4],),
+            )
+            for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(table) == len(hashes)
+        assert all(table.probe(h).value == h % 1000 for h in hashes)
+
+    def it_can_live_in_shared_memory(self):
+        table = TranspositionTable.create_shared(memory_limit=2**16)
+
+        try:
+            table.store(42, depth=1, value=2)
+
+            other = TranspositionTable.attach(table.shared_memory_name)
+            assert other.capacity == table.capacity
+            assert other.probe(42) == (1, 2)
+            other.store(24, depth=3, value=4)
+            other.close()
+
+            assert table.probe(24) == (3, 4)
+
+            unpickled = pickle.loads(pickle.dumps(table))
+            assert unpickled.shared_memory_name == table.shared_memory_name
+            assert unpickled.probe(42) == (1, 2)
+            unpickled.close()
+
+        finally:
+            table.unlink()
+
+    def it_is_shared_between_worker_processes(self):
+        table = TranspositionTable.create_shared(memory_limit=2**16)
+        hashes = [h * 7919 + 1 for h in range(200)]
+
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            workers = [
+                ctx.Process(target=_store_in_worker, args=(table, hashes[i::2]))
+                for i in range(2)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+            assert all(table.probe(h) == (1, h % 1000) for h in hashes)
+
+        finally:
+            table.unlink()
+
+    def it_can_pickle_private_table(self):
+        table = TranspositionTable(memory_limit=2**12)
+        table.store(42, depth=1, value=2)
+
+        assert pickle.loads(pickle.dumps(table)).probe(42) == (1, 2)
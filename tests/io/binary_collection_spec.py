@@ -0,0 +1,152 @@
+import io
+import os
+
+import pytest
+
+from sokoenginepy import BinaryCompression, Collection, Puzzle, Snapshot, Tessellation
+from sokoenginepy.io import BinaryCollectionReader
+
+
+def collection_content(collection):
+    # SOK reader leaves missing metadata as None, which is written the same as ""
+    retv = [(collection.title, collection.author, collection.notes, collection.tags)]
+    for puzzle in collection.puzzles:
+        try:
+            board = (puzzle.internal_board, puzzle.width, puzzle.height)
+        except ValueError:
+            board = puzzle.board
+        retv.append(
+            (
+                puzzle.tessellation,
+                puzzle.title or "",
+                puzzle.author or "",
+                puzzle.boxorder or "",
+                puzzle.goalorder or "",
+                puzzle.notes or "",
+                puzzle.tags,
+                board,
+            )
+        )
+        for snapshot in puzzle.snapshots:
+            retv.append(
+                (
+                    snapshot.title or "",
+                    snapshot.solver or "",
+                    snapshot.notes or "",
+                    snapshot.tags,
+                    snapshot.to_str(),
+                    snapshot.is_reverse,
+                )
+            )
+    return retv
+
+
+def binary_copy(collection, compression=BinaryCompression.NONE):
+    out = io.BytesIO()
+    collection.dump_binary(out, compression)
+    retv = Collection()
+    retv.load_binary(io.BytesIO(out.getvalue()))
+    return retv
+
+
+class DescribeBinaryCollection:
+    @pytest.mark.parametrize("compression", list(BinaryCompression))
+    @pytest.mark.parametrize(
+        "file_name",
+        ["Original_and_Extra.sok", "hexoban_parser_tests.sok", "mixed_collection.sok"],
+    )
+    def it_round_trips_sok_collections(self, resources_root, file_name, compression):
+        collection = Collection()
+        collection.load(
+            os.path.join(resources_root, "test_data", file_name),
+            keep_unknown_tags=True,
+        )
+        # Otherwise dumps() writes current time in place of missing dates
+        collection.created_at = collection.created_at or "2026-10-19"
+        collection.updated_at = collection.updated_at or "2026-10-19"
+
+        loaded = binary_copy(collection, compression)
+        assert collection_content(loaded) == collection_content(collection)
+        assert loaded.dumps() == collection.dumps()
+
+        reloaded = Collection()
+        reloaded.loads(loaded.dumps(), keep_unknown_tags=True)
+        assert collection_content(reloaded)[1:] == collection_content(collection)[1:]
+
+    def it_reads_puzzles_by_index(self, resources_root, tmp_path):
+        collection = Collection()
+        collection.load(
+            os.path.join(resources_root, "test_data", "mixed_collection.sok")
+        )
+        path = tmp_path / "mixed_collection.sokb"
+        collection.dump_binary(path, BinaryCompression.ZLIB)
+
+        with open(path, "rb") as f:
+            reader = BinaryCollectionReader(f)
+            assert len(reader) == len(collection.puzzles)
+            assert reader[-1].title == collection.puzzles[-1].title
+            assert reader[3].internal_board == collection.puzzles[3].internal_board
+            with pytest.raises(IndexError):
+                reader[len(collection.puzzles)]
+
+    def it_keeps_snapshots_and_boards_that_cant_be_packed(self):
+        collection = Collection(title="Fallbacks")
+        puzzle = Puzzle(Tessellation.SOKOBAN, board="#####\n#@$.#\n#####")
+        for moves_data in ["[]Urrd", "{d}lU[r*]", "lu*rd", "lu[LU]", ""]:
+            puzzle.snapshots.append(Snapshot(Tessellation.SOKOBAN, moves_data))
+        collection.puzzles.append(puzzle)
+        # Misaligned Hexoban board can't be parsed
+        collection.puzzles.append(Puzzle(Tessellation.HEXOBAN, board="#  \n#@$.#\n##"))
+
+        loaded = binary_copy(collection)
+
+        snapshots = loaded.puzzles[0].snapshots
+        assert [_.moves_data for _ in snapshots] == [
+            "[]Urrd",
+            "{d}lU[r*]",
+            "lu*rd",
+            "lu[LU]",
+            "",
+        ]
+        assert snapshots[0].is_reverse
+        assert loaded.puzzles[0].board == "#####\n#@$.#\n#####"
+        assert loaded.puzzles[1].board == "#  \n#@$.#\n##"
+
+    def it_keeps_formatting_of_boards_and_snapshots(self):
+        collection = Collection(created_at="2026-10-19", updated_at="2026-10-19")
+        puzzle = Puzzle(Tessellation.SOKOBAN, board="#####\n#@$.#\n#####")
+        puzzle.snapshots.append(Snapshot(Tessellation.SOKOBAN, "3r2(lu)"))
+        puzzle.snapshots.append(Snapshot(Tessellation.SOKOBAN, "rr\nll"))
+        collection.puzzles.append(puzzle)
+        collection.puzzles.append(
+            Puzzle(Tessellation.HEXOBAN, board="-#-#-#\n#-@-$-.#\n-#-#-#")
+        )
+
+        loaded = binary_copy(collection)
+
+        assert [_.moves_data for _ in loaded.puzzles[0].snapshots] == [
+            "3r2(lu)",
+            "rr\nll",
+        ]
+        assert loaded.puzzles[1].board == "-#-#-#\n#-@-$-.#\n-#-#-#"
+        assert loaded.dumps() == collection.dumps()
+
+    def it_compresses_puzzle_blocks(self, resources_root):
+        collection = Collection()
+        collection.load(
+            os.path.join(resources_root, "test_data", "Original_and_Extra.sok")
+        )
+
+        sizes = {}
+        for compression in BinaryCompression:
+            out = io.BytesIO()
+            collection.dump_binary(out, compression)
+            sizes[compression] = len(out.getvalue())
+
+        assert sizes[BinaryCompression.ZLIB] < sizes[BinaryCompression.NONE]
+        assert sizes[BinaryCompression.LZMA] < sizes[BinaryCompression.NONE]
+        assert sizes[BinaryCompression.NONE] < len(collection.dumps().encode("utf-8"))
+
+    def it_rejects_data_that_is_not_binary_collection(self):
+        with pytest.raises(ValueError):
+            Collection().load_binary(io.BytesIO(b"Title\n\n#####\n#@$.#\n#####\n"))
@@ -7,8 +7,10 @@ from pathlib import Path
 
 import pytest
 
-from sokoenginepy import Collection, Tessellation
+from sokoenginepy import Collection, Puzzle, Snapshot, Tessellation
 from sokoenginepy.common import is_blank
+from sokoenginepy.io import SOKWriter
+from sokoenginepy.io.sok_file_format import SOKLineKind
 
 
 @pytest.fixture
@@ -122,6 +124,156 @@ class DescribeCollection:
         assert collection.puzzles[1].title == title
         assert collection.puzzles[1].notes == note
 
+    def it_splits_puzzles_and_snapshots_after_labeling_lines(self):
+        data = "\n".join(
+            [
+                "Collection: foo",
+                "Author: baz",
+                "Date Created: 2026-10-19",
+                "",
+                "#####",
+                "#@$.#",
+                "#####",
+                "",
+                "lurd",
+                "LURD",
+                "snapshot note",
+                "Solver: qux",
+                "more notes",
+                "***",
+                "Title: bar",
+                "",
+            ]
+        )
+        lines = io.StringIO(data).readlines()
+
+        assert list(SOKLineKind.classify_lines(lines)) == [
+            SOKLineKind.TAG,
+            SOKLineKind.TAG,
+            SOKLineKind.TAG,
+            SOKLineKind.BLANK,
+            SOKLineKind.BOARD,
+            SOKLineKind.BOARD,
+            SOKLineKind.BOARD,
+            SOKLineKind.BLANK,
+            SOKLineKind.SNAPSHOT,
+            SOKLineKind.SNAPSHOT,
+            SOKLineKind.NOTE,
+            SOKLineKind.TAG,
+            SOKLineKind.NOTE,
+            SOKLineKind.BOARD | SOKLineKind.SNAPSHOT,
+            SOKLineKind.TAG,
+        ]
+
+        collection = Collection()
+        collection.loads(data)
+
+        assert collection.title == "foo"
+        assert collection.author == "baz"
+        assert len(collection.puzzles) == 2
+        assert len(collection.puzzles[0].snapshots) == 1
+        assert collection.puzzles[0].snapshots[0].moves_data == "lurdLURD"
+        assert collection.puzzles[0].snapshots[0].solver == "qux"
+        assert collection.puzzles[0].snapshots[0].notes == "snapshot note\nmore notes"
+        assert collection.puzzles[1].board == "***\n"
+        assert collection.puzzles[1].title == "bar"
+
+    def it_optionally_keeps_unknown_tags(self):
+        data = "\n".join(
+            [
+                "Collection: foo",
+                "Copyright: bar",
+                "Date Created: 2026-10-19",
+                "",
+                "#####",
+                "#@$.#",
+                "#####",
+                "",
+                "Author: baz",
+                "Time: 00:01:00",
+                "Some puzzle notes",
+                "",
+                "lurd",
+                "Solver: qux",
+                "Optimizer: YASS",
+                "Date = 2026",
+                "",
+            ]
+        )
+
+        collection = Collection()
+        collection.loads(data)
+        assert collection.tags == {}
+        assert collection.puzzles[0].notes == "Time: 00:01:00\nSome puzzle notes"
+        assert (
+            collection.puzzles[0].snapshots[0].notes == "Optimizer: YASS\nDate = 2026"
+        )
+
+        collection = Collection()
+        collection.loads(data, keep_unknown_tags=True)
+        puzzle = collection.puzzles[0]
+        snapshot = puzzle.snapshots[0]
+
+        assert collection.title == "foo"
+        assert collection.created_at == "2026-10-19"
+        assert collection.tags == {"Copyright": ["bar"]}
+        assert puzzle.author == "baz"
+        assert puzzle.tags == {"Time": ["00:01:00"]}
+        assert puzzle.notes == "Some puzzle notes"
+        assert snapshot.solver == "qux"
+        assert snapshot.tags == {"Optimizer": ["YASS"]}
+        assert snapshot.notes == "Date = 2026"
+
+        loaded = Collection()
+        loaded.loads(collection.dumps(), keep_unknown_tags=True)
+        assert loaded.tags == collection.tags
+        assert loaded.puzzles[0].tags == puzzle.tags
+        assert loaded.puzzles[0].snapshots[0].tags == snapshot.tags
+
+    def it_keeps_repeated_and_empty_unknown_tags_when_saving(self):
+        data = "\n".join(
+            [
+                "Comment: first",
+                "Comment: second",
+                "Empty:",
+                "Collection notes",
+                "",
+                "Puzzle 1",
+                "",
+                "#####",
+                "#@$.#",
+                "#####",
+                "",
+                "Comment: a",
+                "Comment: b",
+                "Foo:",
+                "Some notes",
+                "Note: remember this",
+                "More notes",
+                "",
+            ]
+        )
+
+        collection = Collection()
+        collection.loads(data, keep_unknown_tags=True)
+        puzzle = collection.puzzles[0]
+
+        assert collection.tags == {"Comment": ["first", "second"], "Empty": [""]}
+        assert collection.notes == "Collection notes"
+        assert puzzle.tags == {"Comment": ["a", "b"], "Foo": [""]}
+        assert puzzle.notes == "Some notes\nNote: remember this\nMore notes"
+
+        dumped = collection.dumps()
+        loaded = Collection()
+        loaded.loads(dumped, keep_unknown_tags=True)
+
+        assert "\nFoo:\n" in dumped
+        assert loaded.tags == collection.tags
+        assert loaded.notes == collection.notes
+        assert loaded.puzzles[0].tags == puzzle.tags
+        assert loaded.puzzles[0].notes == puzzle.notes
+        assert loaded.dumps() == dumped
+
     def it_correctly_loads_mixed_tessellations_collection(self, input_files_root):
         collection = Collection()
         collection.load(input_files_root / "mixed_collection.sok")
@@ -481,6 +633,75 @@ class DescribeCollection:
             p2 = expected.puzzles[_]
             assert str(p1) == str(p2)
 
+    def it_appends_puzzles_and_snapshots_to_existing_file(
+        self, input_files_root, tmp_writeable_file_path
+    ):
+        expected = Collection()
+        expected.load(input_files_root / "small_collection.sok")
+        expected.dump(tmp_writeable_file_path)
+
+        puzzle = Puzzle(Tessellation.SOKOBAN, board="#####\n#@$.#\n#####")
+        puzzle.title = "Appended puzzle"
+        Collection.append_puzzles(tmp_writeable_file_path, [puzzle])
+        expected.puzzles.append(puzzle)
+
+        snapshot = Snapshot(Tessellation.SOKOBAN, "rR")
+        snapshot.title = "Appended snapshot"
+        snapshot.solver = "sokoenginepy"
+        snapshot.notes = "Snapshot notes"
+        for puzzle_index in [0, len(expected.puzzles) - 1]:
+            Collection.append_snapshots(
+                tmp_writeable_file_path, puzzle_index, [snapshot]
+            )
+            expected.puzzles[puzzle_index].snapshots.append(snapshot)
+
+        loaded = Collection()
+        loaded.load(tmp_writeable_file_path)
+
+        assert len(loaded.puzzles) == len(expected.puzzles)
+        for p1, p2 in zip(loaded.puzzles, expected.puzzles):
+            assert str(p1) == str(p2)
+            assert p1.title == p2.title
+            assert [_.moves_data for _ in p1.snapshots] == [
+                _.moves_data for _ in p2.snapshots
+            ]
+        for puzzle_index in [0, -1]:
+            appended = loaded.puzzles[puzzle_index].snapshots[-1]
+            assert appended.title == snapshot.title
+            assert appended.solver == snapshot.solver
+            assert appended.notes == snapshot.notes
+
+        with pytest.raises(IndexError):
+            Collection.append_snapshots(
+                tmp_writeable_file_path, len(expected.puzzles), [snapshot]
+            )
+
+    def it_streams_puzzles_with_writer(
+        self, input_files_root, tmp_writeable_file_path, monkeypatch
+    ):
+        expected = Collection()
+        expected.load(input_files_root / "mixed_collection.sok")
+        expected.created_at = expected.updated_at = "2026-10-19"
+
+        monkeypatch.setattr(SOKWriter, "BUFFER_SIZE", 512)
+        written = []
+        out = io.StringIO()
+        monkeypatch.setattr(out, "write", lambda data: written.append(data))
+
+        writer = SOKWriter.open(out, expected)
+        writer.write_puzzles(_ for _ in expected.puzzles)
+        writer.close()
+
+        assert len(written) > 1
+        assert all(len(_) >= 512 for _ in written[:-1])
+        assert "".join(written) == expected.dumps()
+
+        with SOKWriter.open(tmp_writeable_file_path, expected) as writer:
+            for puzzle in expected.puzzles:
+                writer.write_puzzle(puzzle)
+        with open(tmp_writeable_file_path) as f:
+            assert f.read() == expected.dumps()
+
     def it_dumps_to_str(self, input_files_root):
         path = input_files_root / "small_collection.sok"
         expected = Collection()
@@ -149,6 +149,16 @@ class DescribeHexobanPuzzle:
             assert puzzle.width == 7
             assert puzzle.height == old_height - 3
 
+        def it_resizes_and_centers_board_to_requested_size(self, tests_data):
+            board = "\n".join(tests_data[_PARSING_SCHEMES_KEY]["scheme1_type1"]["src"])
+            puzzle = Puzzle(Tessellation.HEXOBAN, board=board)
+            old_width = puzzle.width
+            old_height = puzzle.height
+
+            puzzle.resize_and_center(old_width + 7, old_height + 6)
+            assert puzzle.width == old_width + 7
+            assert puzzle.height == old_height + 6
+
 
 _PARSING_HEXOCET_KEY = "parsing - Hexocet"
 _PARSING_SCHEMES_KEY = "parsing - schemes"
@@ -0,0 +1,150 @@
+import json
+import os
+import textwrap
+
+import pytest
+
+from sokoenginepy import CanonicalBoard, Collection, Puzzle, Tessellation
+
+
+@pytest.fixture(scope="session")
+def hexoban_data(resources_root):
+    path = os.path.join(resources_root, "test_data", "hexoban_parser_tests.json")
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def board():
+    return textwrap.dedent("""\
+        #######
+        #.@ # #
+        #$* $ #
+        #   $ #
+        # ..  #
+        #  *  #
+        #######""")
+
+
+def rotated(board):
+    rows = board.split("\n")
+    return "\n".join(
+        "".join(row[column] for row in reversed(rows)) for column in range(len(rows[0]))
+    )
+
+
+def sokoban(board):
+    return Puzzle(Tessellation.SOKOBAN, board=board)
+
+
+class DescribePuzzleFingerprint:
+    def it_ignores_padding_and_cells_outside_of_play_area(self, board):
+        padded = "\n".join(
+            ["", "   ####  ## #"]
+            + ["  " + row + "  . #" for row in board.split("\n")]
+            + ["  ##", ""]
+        )
+
+        assert sokoban(padded).fingerprint() == sokoban(board).fingerprint()
+        assert sokoban(padded).canonical_board() == sokoban(board).canonical_board()
+
+    def it_is_same_for_rotated_and_mirrored_boards(self, board):
+        puzzle = sokoban(board)
+        fingerprint = puzzle.fingerprint()
+
+        for _ in range(4):
+            board = rotated(board)
+            assert sokoban(board).fingerprint() == fingerprint
+
+        puzzle.reverse_columns()
+        assert puzzle.fingerprint() == fingerprint
+        puzzle.reverse_rows()
+        assert puzzle.fingerprint() == fingerprint
+
+    def it_differs_for_different_boards(self, board):
+        other = board.replace("#.@ # #", "#.@   #")
+
+        assert sokoban(other).fingerprint() != sokoban(board).fingerprint()
+        assert (
+            Puzzle(Tessellation.OCTOBAN, board=board).fingerprint()
+            != sokoban(board).fingerprint()
+        )
+
+    def it_doesnt_modify_puzzle(self, board):
+        puzzle = sokoban("\n\n" + board)
+        before = puzzle.to_board_str()
+
+        puzzle.fingerprint()
+
+        assert puzzle.to_board_str() == before
+
+    def it_handles_empty_puzzles(self):
+        assert Puzzle(Tessellation.SOKOBAN).canonical_board() == CanonicalBoard(
+            0, 0, ""
+        )
+
+    def it_is_same_for_mirrored_octoban_boards(self, board):
+        puzzle = Puzzle(Tessellation.OCTOBAN, board=board)
+        fingerprint = puzzle.fingerprint()
+
+        puzzle.reverse_columns()
+        assert puzzle.fingerprint() == fingerprint
+        puzzle.reverse_rows()
+        assert puzzle.fingerprint() == fingerprint
+
+    def it_keeps_trioban_triangles_orientation(self, board):
+        puzzle = Puzzle(Tessellation.TRIOBAN, board=board)
+        fingerprint = puzzle.fingerprint()
+
+        puzzle.reverse_columns()
+        assert puzzle.fingerprint() == fingerprint
+
+        # Vertical mirror must also turn triangles upside down, which reversing
+        # rows of odd height board doesn't do.
+        puzzle.reverse_rows()
+        assert puzzle.fingerprint() != fingerprint
+        puzzle.add_row_top()
+        assert puzzle.fingerprint() == fingerprint
+
+    def it_is_same_for_different_hexoban_text_layouts(self, hexoban_data):
+        for board_type in ["type1", "type2"]:
+            fingerprints = {
+                Puzzle(
+                    Tessellation.HEXOBAN, board="\n".join(test_case["src"])
+                ).fingerprint()
+                for title, test_case in hexoban_data["parsing - schemes"].items()
+                if title.endswith(board_type)
+            }
+            assert len(fingerprints) == 1
+
+    def it_is_same_for_mirrored_hexoban_boards(self, hexoban_data):
+        board = "\n".join(hexoban_data["parsing - schemes"]["scheme1_type1"]["src"])
+        puzzle = Puzzle(Tessellation.HEXOBAN, board=board)
+        fingerprint = puzzle.fingerprint()
+
+        puzzle.reverse_columns()
+
+        assert puzzle.fingerprint() == fingerprint
+
+
+class DescribeCollectionDuplicates:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def it_groups_puzzles_with_equal_fingerprints(self, board, workers):
+        collection = Collection()
+        collection.puzzles = [
+            sokoban(board),
+            sokoban(board.replace("#.@ # #", "#.@   #")),
+            sokoban(rotated(board)),
+            sokoban("\n".join(row[::-1] for row in board.split("\n"))),
+            sokoban(rotated(board.replace("#.@ # #", "#.@   #"))),
+            Puzzle(Tessellation.OCTOBAN, board=board),
+        ]
+
+        assert collection.duplicates(workers=workers) == [[0, 2, 3], [1, 4]]
+        assert collection.fingerprints(workers=workers) == [
+            _.fingerprint() for _ in collection.puzzles
+        ]
+
+    def it_requires_at_least_one_worker(self):
+        with pytest.raises(ValueError):
+            Collection().duplicates(workers=0)
@@ -1,8 +1,9 @@
+import io
 import textwrap
 
 import pytest
 
-from sokoenginepy import BoardGraph, Puzzle, Tessellation
+from sokoenginepy import BoardGraph, Puzzle, Tessellation, index_1d
 
 
 class DescribePuzzle:
@@ -51,6 +52,63 @@ class DescribePuzzle:
             with pytest.raises(ValueError):
                 puzzle.resize_and_center(5, -1)
 
+    def it_reads_and_writes_single_board_cells(self):
+        puzzle = Puzzle(Tessellation.SOKOBAN, board="#####\n#@$.#\n#####")
+
+        assert puzzle[6] == "@"
+        assert puzzle[8] == "."
+        with pytest.raises(IndexError):
+            puzzle[15]
+
+        puzzle[8] = "*"
+        assert puzzle[8] == "*"
+        assert puzzle.internal_board == "######@$*######"
+
+        with pytest.raises(ValueError):
+            puzzle[8] = "z"
+
+    def it_stores_single_byte_per_board_cell(self):
+        width = 1024
+        row = "#" + (width - 2) * " " + "#"
+        board = "\n".join([width * "#"] + 100 * [row] + [width * "#"])
+        puzzle = Puzzle(Tessellation.SOKOBAN, board=board)
+
+        assert puzzle.size == width * 102
+        assert len(puzzle._parsed_board) == puzzle.size
+        assert puzzle.internal_board == board.replace(" ", "-").replace("\n", "")
+
+    def it_trims_blank_rows_and_columns_on_all_sides(self):
+        for tessellation in (Tessellation.SOKOBAN, Tessellation.OCTOBAN):
+            puzzle = Puzzle(tessellation, board="#####\n#@$.#\n#####")
+            puzzle.resize_and_center(11, 9)
+            assert (puzzle.width, puzzle.height) == (11, 9)
+            assert puzzle[index_1d(3, 3, 11)] == "#"
+
+            puzzle.trim()
+            assert (puzzle.width, puzzle.height) == (5, 3)
+            assert puzzle.internal_board == "######@$.######"
+
+    def it_trims_board_without_border_elements_to_empty_board(self):
+        puzzle = Puzzle(Tessellation.SOKOBAN, board="  @ \n  $.")
+        puzzle.trim()
+        assert (puzzle.width, puzzle.height) == (0, 0)
+
+    def it_writes_board_into_stream(self):
+        board = "\n".join(["  ####", "###  #", "#@$._#", "#######"])
+        for tessellation in (Tessellation.SOKOBAN, Tessellation.TRIOBAN):
+            puzzle = Puzzle(tessellation, board=board)
+            for use_visible_floor in (False, True):
+                for rle_encode in (False, True):
+                    stream = io.StringIO()
+                    puzzle.write_board(stream, use_visible_floor, rle_encode)
+                    assert stream.getvalue() == puzzle.to_board_str(
+                        use_visible_floor, rle_encode
+                    )
+
+        stream = io.StringIO()
+        Puzzle(Tessellation.SOKOBAN, board=board).write_board(stream)
+        assert stream.getvalue() == "  #### \n###  # \n#@$. # \n#######"
+
     def it_recognizes_alternative_characters_in_board_representation(self):
         board_str = textwrap.dedent(
             """
@@ -68,3 +68,40 @@ class DescribeRle:
 
         assert Rle.encode(board) == "3-#-#-#-#10-|2-#7-#9-|-#-@5-#10-"
         assert Rle.decode(Rle.encode(board)) == board
+
+    def it_decodes_and_encodes_the_same_as_parser(self):
+        for data in ["3(a2b)4b", "2(3|a)", "3|ab|", "aa2(bb)cc2(dd2(ee)ff)", "0a1b"]:
+            assert Rle.decode(data) == Rle._parse(data)
+
+        board = "\n".join(["#" * 20] + 3 * ["#" + 4 * "  $." + "  #"] + ["#" * 20])
+        encoded = Rle.encode(board)
+        assert encoded.startswith("20#|#2 $.")
+        assert Rle.decode(encoded) == Rle._parse(encoded) == board
+
+        for data in ["3", "a3", "()", "3()", "(a", "a)", "2(a3)", "(a))"]:
+            with pytest.raises(ValueError) as parser_error:
+                Rle._parse(data)
+            with pytest.raises(ValueError) as decoder_error:
+                Rle.decode(data)
+            assert str(decoder_error.value) == str(parser_error.value)
+
+    def it_decodes_in_chunks(self):
+        for data in [
+            "",
+            "abc|d",
+            "3(a2b)4b",
+            "2(3|a)",
+            "aa2(bb)cc2(dd2(ee)ff)",
+            "0a1b",
+        ]:
+            for chunk_size in [1, 2, 3, 1000]:
+                chunks = list(Rle.iter_decode(data, chunk_size))
+                assert "".join(chunks) == Rle.decode(data)
+
+        chunks = list(Rle.iter_decode("3(1000000a)b", 4096))
+        assert sum(len(_) for _ in chunks) == 3000001
+        assert max(len(_) for _ in chunks) < 2 * 4096
+
+        for data in ["3", "a3", "()", "(a", "a)"]:
+            with pytest.raises(ValueError):
+                list(Rle.iter_decode(data))
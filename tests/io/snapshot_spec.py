@@ -1,9 +1,11 @@
+from array import array
 from dataclasses import dataclass
 from typing import List
 
 import pytest
 
 from sokoenginepy import Config, Direction, PusherStep, Snapshot, Tessellation
+from sokoenginepy.common import TessellationImpl
 
 
 @dataclass
@@ -318,6 +320,74 @@ class DescribeSnapshot:
         assert snapshot.jumps_count == 0
         assert not snapshot.is_reverse
 
+    def it_generates_the_same_pusher_steps_as_parser(self):
+        for data in [
+            "lurdLURDL",
+            "l*urd[lu*]LU*RDL",
+            "[]lu rd\nLUR{ul}*D",
+            "3(lU)[2(rd)]{*ld}",
+        ]:
+            snapshot = Snapshot(Tessellation.SOKOBAN, data)
+            steps = list(snapshot.iter_pusher_steps())
+            assert steps == snapshot.pusher_steps
+            assert [_.is_current_pos for _ in steps] == [
+                _.is_current_pos for _ in snapshot.pusher_steps
+            ]
+
+        for data in ["lurd[lurd", "lurd}lurd", "lurd[LURD]", "{lu rd}"]:
+            snapshot = Snapshot(Tessellation.SOKOBAN, data)
+            with pytest.raises(ValueError):
+                list(snapshot.iter_pusher_steps())
+
+    def it_counts_steps_without_decoding_whole_snapshot(self):
+        snapshot = Snapshot(Tessellation.SOKOBAN, "[lu]1000000(rR)5000000(ud)")
+        assert snapshot.moves_count == 11000002
+        assert snapshot.pushes_count == 1000000
+        assert snapshot.jumps_count == 1
+        assert snapshot.is_reverse
+        assert not snapshot._was_parsed
+
+    def it_counts_steps_without_creating_pusher_steps(self, monkeypatch):
+        def fail(self, input_chr):
+            raise AssertionError("Counting must not create pusher steps!")
+
+        monkeypatch.setattr(TessellationImpl, "char_to_pusher_step", fail)
+
+        snapshot = Snapshot(Tessellation.SOKOBAN, "[lu]lurd 3(LU){ld}RDL")
+        assert snapshot.moves_count == 6
+        assert snapshot.pushes_count == 9
+        assert snapshot.jumps_count == 1
+
+    def it_converts_long_snapshots_to_pusher_steps(self):
+        snapshot = Snapshot(Tessellation.SOKOBAN, "lurdLURD" * 10000)
+        steps = snapshot.pusher_steps
+        assert len(steps) == 80000
+        assert steps[-1] == PusherStep(Direction.DOWN, Config.DEFAULT_ID)
+
+    def it_converts_sequence_of_packed_pusher_steps(self):
+        steps = [
+            PusherStep(Direction.LEFT, is_current_pos=True),
+            PusherStep(Direction.UP, moved_box_id=Config.DEFAULT_ID),
+            PusherStep(Direction.RIGHT, is_jump=True),
+            PusherStep(Direction.DOWN, is_pusher_selection=True),
+        ]
+        packed = bytes(_.packed() for _ in steps)
+
+        for data in [packed, bytearray(packed), array("B", packed)]:
+            snapshot = Snapshot(Tessellation.SOKOBAN)
+            snapshot.pusher_steps = data
+            assert str(snapshot) == "[]l*U[r]{d}"
+            assert snapshot.moves_count == 2
+            assert snapshot.pushes_count == 1
+            assert snapshot.jumps_count == 1
+            assert snapshot.pusher_steps == steps
+
+        snapshot = Snapshot(Tessellation.HEXOBAN)
+        with pytest.raises(ValueError):
+            snapshot.pusher_steps = bytes([PusherStep(Direction.UP).packed()])
+        with pytest.raises(ValueError):
+            snapshot.pusher_steps = bytes([255])
+
     def it_converts_legal_pusher_steps_to_characters(
         self,
         sokoban_conversion_data: SnapshotConversionTestCase,
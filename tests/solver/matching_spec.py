@@ -0,0 +1,129 @@
+import itertools
+
+import pytest
+
+from sokoenginepy import Config
+from sokoenginepy.solver import (
+    BoxGoalMatcher,
+    Heuristic,
+    MinimumMatchingLowerBound,
+    SearchSpace,
+    benchmark_puzzle,
+)
+
+
+def optimal_cost(space, boxes_positions):
+    distances = {goal: space.push_distances([goal]) for goal in space.goals_positions}
+    retv = None
+    for goals in itertools.permutations(space.goals_positions):
+        cost = 0
+        for box_index, (box, goal) in enumerate(zip(boxes_positions, goals)):
+            if (
+                space.boxes_plus_ids[box_index] != space.goals_plus_ids[goal]
+                or distances[goal][box] == Config.NO_POS
+            ):
+                break
+            cost += distances[goal][box]
+        else:
+            retv = cost if retv is None else min(retv, cost)
+    return retv
+
+
+@pytest.fixture
+def space():
+    return SearchSpace(benchmark_puzzle("Microban 5"))
+
+
+@pytest.fixture
+def matcher(space):
+    return BoxGoalMatcher(
+        space.board_manager,
+        {goal: space.push_distances([goal]) for goal in space.goals_positions},
+    )
+
+
+class DescribeBoxGoalMatcher:
+    def it_calculates_optimal_matching(self, space, matcher):
+        boxes = space.initial_state.boxes_positions
+
+        assert matcher.lower_bound(boxes) == optimal_cost(space, boxes)
+        assert set(matcher.matching.keys()) == set(boxes)
+        assert set(matcher.matching.values()) == set(space.goals_positions)
+
+    def it_repairs_previous_matching_after_single_box_moves(self, space, matcher):
+        matcher.lower_bound(space.initial_state.boxes_positions)
+
+        for successor in space.successors(space.initial_state):
+            assert matcher.lower_bound(successor.boxes_positions) == optimal_cost(
+                space, successor.boxes_positions
+            )
+
+        assert matcher.full_solves == 1
+        assert matcher.repairs > 0
+
+    def it_caches_matchings_by_boxes_layout(self, space, matcher):
+        boxes = space.initial_state.boxes_positions
+        other_boxes = next(space.successors(space.initial_state)).boxes_positions
+
+        first = matcher.lower_bound(boxes)
+        matcher.lower_bound(other_boxes)
+
+        assert matcher.lower_bound(boxes) == first
+        assert matcher.cache_hits == 1
+
+    def it_evicts_oldest_matchings_from_full_cache(self, space):
+        matcher = BoxGoalMatcher(
+            space.board_manager,
+            {goal: space.push_distances([goal]) for goal in space.goals_positions},
+            cache_size=1,
+        )
+        boxes = space.initial_state.boxes_positions
+        other_boxes = next(space.successors(space.initial_state)).boxes_positions
+
+        matcher.lower_bound(boxes)
+        matcher.lower_bound(other_boxes)
+        matcher.lower_bound(boxes)
+
+        assert matcher.cache_hits == 0
+
+    def it_uses_current_boxes_positions_from_board_manager(self, space, matcher):
+        manager = space.board_manager
+        successor = next(space.successors(space.initial_state))
+        box_position = successor.push.box_position
+        new_box_position = (
+            set(successor.boxes_positions) - set(manager.boxes_positions.values())
+        ).pop()
+
+        initial = matcher.lower_bound()
+        manager.move_box_from(box_position, new_box_position)
+        after_push = matcher.lower_bound()
+        manager.move_box_from(new_box_position, box_position)
+
+        assert initial == optimal_cost(space, space.initial_state.boxes_positions)
+        assert after_push == optimal_cost(space, successor.boxes_positions)
+        assert matcher.repairs == 1
+
+    def it_matches_boxes_only_to_goals_with_same_sokoban_plus_id(self):
+        puzzle = benchmark_puzzle("Microban 5")
+        puzzle.boxorder = "1 2"
+        puzzle.goalorder = "2 1"
+        space = SearchSpace(puzzle)
+        heuristic = MinimumMatchingLowerBound()
+        heuristic.attach(space)
+        boxes = space.initial_state.boxes_positions
+
+        assert heuristic.estimate(boxes) == optimal_cost(space, boxes)
+
+    def it_reports_layouts_without_matching(self, space):
+        heuristic = MinimumMatchingLowerBound()
+        heuristic.attach(space)
+        distances = space.push_distances(space.goals_positions)
+        dead_position = next(
+            position
+            for position in range(space.size)
+            if not space.is_wall(position) and distances[position] == space.NO_POS
+        )
+        boxes = list(space.initial_state.boxes_positions)
+        boxes[0] = dead_position
+
+        assert heuristic.estimate(boxes) == Heuristic.INFINITY
@@ -0,0 +1,265 @@
+import textwrap
+
+import pytest
+
+from sokoenginepy import (
+    BoardGraph,
+    Collection,
+    Direction,
+    IllegalMoveError,
+    Mover,
+    Puzzle,
+    Snapshot,
+    Tessellation,
+)
+from sokoenginepy.solver import (
+    SolutionOptimizer,
+    benchmark_puzzle,
+    optimize_collection,
+    solve,
+)
+
+
+@pytest.fixture
+def puzzle():
+    return Puzzle(
+        Tessellation.SOKOBAN,
+        board=textwrap.dedent("""\
+            #######
+            #@ $ .#
+            #     #
+            #######"""),
+    )
+
+
+def replay(puzzle, snapshot):
+    mover = Mover(BoardGraph(puzzle))
+    for pusher_step in snapshot.pusher_steps:
+        if pusher_step.is_pusher_selection:
+            continue
+        mover.move(pusher_step.direction)
+    return mover.board_manager
+
+
+def positions(board_manager):
+    state = board_manager.state
+    return state.pushers_positions, state.boxes_positions
+
+
+class DescribeSolutionOptimizer:
+    def it_shortens_walks_between_pushes(self, puzzle):
+        snapshot = Snapshot(Tessellation.SOKOBAN, "drulrRLRR")
+        snapshot.title = "wandering"
+        snapshot.solver = "someone"
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.to_str() == "rRR"
+        assert optimized.title == "wandering"
+        assert optimized.solver == "someone"
+
+    def it_removes_cycles(self, puzzle):
+        # Box is pushed right, then back left and then all the way to goal
+        snapshot = Snapshot(Tessellation.SOKOBAN, "rR" + "drruL" + "dllu" + "RR")
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.to_str() == "rRR"
+        assert replay(puzzle, optimized).is_solved
+
+    def it_keeps_final_pusher_position_of_unsolved_snapshots(self, puzzle):
+        snapshot = Snapshot(Tessellation.SOKOBAN, "rRdlur")
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.to_str() == "rR"
+        assert positions(replay(puzzle, optimized)) == positions(
+            replay(puzzle, snapshot)
+        )
+
+        snapshot = Snapshot(Tessellation.SOKOBAN, "rRdlrrr")
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+        assert optimized.to_str() == "rRdrr"
+        assert positions(replay(puzzle, optimized)) == positions(
+            replay(puzzle, snapshot)
+        )
+
+    def it_doesnt_change_optimal_solutions(self):
+        puzzle = benchmark_puzzle("Microban 3")
+        snapshot = solve(puzzle).snapshot
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.moves_count == snapshot.moves_count
+        assert optimized.pushes_count == snapshot.pushes_count
+        assert replay(puzzle, optimized).is_solved
+
+    def it_optimizes_snapshots_with_multiple_pushers(self):
+        puzzle = Puzzle(
+            Tessellation.SOKOBAN,
+            board=textwrap.dedent("""\
+                #########
+                #@ $ .  #
+                #       #
+                #  .$  @#
+                #########"""),
+        )
+        mover = Mover(BoardGraph(puzzle))
+        pusher_steps = []
+
+        def perform(*directions):
+            for direction in directions:
+                mover.move(direction)
+                pusher_steps.extend(mover.last_move)
+
+        perform(Direction.DOWN, Direction.UP, Direction.RIGHT)
+        perform(Direction.RIGHT, Direction.RIGHT)
+        mover.select_pusher(mover.board_manager.pushers_ids[1])
+        pusher_steps.extend(mover.last_move)
+        perform(Direction.UP, Direction.LEFT, Direction.DOWN, Direction.LEFT)
+        perform(Direction.LEFT)
+        assert mover.board_manager.is_solved
+        snapshot = Snapshot(Tessellation.SOKOBAN)
+        snapshot.pusher_steps = pusher_steps
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.to_str() == "rRR{rrrdd}llL"
+        assert replay_with_selections(puzzle, optimized).is_solved
+
+    def it_distinguishes_sokoban_plus_boxes(self):
+        puzzle = Puzzle(
+            Tessellation.SOKOBAN,
+            board=textwrap.dedent("""\
+                #######
+                #     #
+                # **  #
+                #     #
+                #@    #
+                #######"""),
+        )
+        puzzle.boxorder = "1 2"
+        puzzle.goalorder = "2 1"
+        # Boxes swap places, which looks like a cycle if Sokoban+ is ignored
+        snapshot = Snapshot(Tessellation.SOKOBAN, "ud" + "uuurDldRuurrdLrddlU")
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.to_str() == "uuurDldRuurrdLrddlU"
+        manager = replay(puzzle, optimized)
+        manager.boxorder = puzzle.boxorder
+        manager.goalorder = puzzle.goalorder
+        manager.enable_sokoban_plus()
+        assert manager.is_solved
+
+    def it_optimizes_snapshots_on_other_tessellations(self):
+        puzzle = Puzzle(
+            Tessellation.TRIOBAN,
+            board=textwrap.dedent("""\
+                #######
+                ## # .#
+                #@  $ #
+                #######"""),
+        )
+        snapshot = Snapshot(Tessellation.TRIOBAN, "rrllrrNN")
+
+        optimized = SolutionOptimizer(puzzle).optimize(snapshot)
+
+        assert optimized.to_str() == "rrNN"
+        assert replay(puzzle, optimized).is_solved
+
+    def it_refuses_reverse_snapshots(self, puzzle):
+        with pytest.raises(ValueError):
+            SolutionOptimizer(puzzle).optimize(Snapshot(Tessellation.SOKOBAN, "[dr]lL"))
+
+    def it_refuses_illegal_snapshots(self, puzzle):
+        with pytest.raises(IllegalMoveError):
+            SolutionOptimizer(puzzle).optimize(Snapshot(Tessellation.SOKOBAN, "uu"))
+
+
+def replay_with_selections(puzzle, snapshot):
+    mover = Mover(BoardGraph(puzzle))
+    manager = mover.board_manager
+    pusher_steps = snapshot.pusher_steps
+    index = 0
+    while index < len(pusher_steps):
+        if pusher_steps[index].is_pusher_selection:
+            end = index
+            while end < len(pusher_steps) and pusher_steps[end].is_pusher_selection:
+                end += 1
+            destination = manager.board.path_destination(
+                manager.pusher_position(mover.selected_pusher),
+                [_.direction for _ in pusher_steps[index:end]],
+            )
+            mover.select_pusher(manager.pusher_id_on(destination))
+            index = end
+        else:
+            mover.move(pusher_steps[index].direction)
+            index += 1
+    return manager
+
+
+class DescribeOptimizeCollection:
+    @pytest.fixture
+    def collection(self, puzzle):
+        retv = Collection()
+        retv.puzzles.append(puzzle)
+        puzzle.snapshots.append(Snapshot(Tessellation.SOKOBAN, "drulrRLRR"))
+        puzzle.snapshots.append(Snapshot(Tessellation.SOKOBAN, "rRR"))
+        puzzle.snapshots.append(Snapshot(Tessellation.SOKOBAN, "uu"))
+        other = benchmark_puzzle("Microban 1")
+        other.snapshots.append(solve(other).snapshot)
+        retv.puzzles.append(other)
+        return retv
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def it_optimizes_all_snapshots(self, collection, workers):
+        results = optimize_collection(collection, workers=workers)
+
+        assert [(_.puzzle_index, _.snapshot_index) for _ in results] == [
+            (0, 0),
+            (0, 1),
+            (0, 2),
+            (1, 0),
+        ]
+        assert [_.is_improved for _ in results] == [True, False, False, False]
+        assert results[0].snapshot.to_str() == "rRR"
+        assert results[2].snapshot is None
+        assert collection.puzzles[0].snapshots[0].to_str() == "drulrRLRR"
+
+    def it_replaces_improved_snapshots(self, collection):
+        optimize_collection(collection, replace=True)
+
+        assert [_.to_str() for _ in collection.puzzles[0].snapshots] == [
+            "rRR",
+            "rRR",
+            "uu",
+        ]
+
+    def it_keeps_sokoban_plus_solutions(self):
+        puzzle = Puzzle(
+            Tessellation.SOKOBAN,
+            board=textwrap.dedent("""\
+                #######
+                #     #
+                # **  #
+                #     #
+                #@    #
+                #######"""),
+        )
+        puzzle.boxorder = "1 2"
+        puzzle.goalorder = "2 1"
+        puzzle.snapshots.append(
+            Snapshot(Tessellation.SOKOBAN, "uuurDldRuurrdLrddlU")
+        )
+        collection = Collection()
+        collection.puzzles.append(puzzle)
+
+        results = optimize_collection(collection, replace=True)
+
+        assert not results[0].is_improved
+        assert puzzle.snapshots[0].to_str() == "uuurDldRuurrdLrddlU"
+
+    def it_requires_at_least_one_worker(self, collection):
+        with pytest.raises(ValueError):
+            optimize_collection(collection, workers=0)
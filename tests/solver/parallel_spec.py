@@ -0,0 +1,105 @@
+import textwrap
+
+import pytest
+
+from sokoenginepy import BoardGraph, Mover, Puzzle, Tessellation
+from sokoenginepy.solver import (
+    ParallelSolver,
+    SearchAlgorithm,
+    SearchSpace,
+    SolverStatus,
+    benchmark_puzzle,
+    run_scaling_benchmark,
+    solve,
+)
+from sokoenginepy.solver.parallel import _decode_batch, _encode_batch
+
+
+def replay(puzzle, snapshot):
+    mover = Mover(BoardGraph(puzzle))
+    for pusher_step in snapshot.pusher_steps:
+        mover.move(pusher_step.direction)
+    manager = mover.board_manager
+    return set(manager.boxes_positions.values()) == set(
+        manager.goals_positions.values()
+    )
+
+
+class DescribeParallelSolver:
+    @pytest.mark.parametrize("workers", [1, 2, 3])
+    def it_finds_push_optimal_solution(self, workers):
+        puzzle = benchmark_puzzle("Microban 3")
+
+        result = ParallelSolver(puzzle, workers=workers).solve()
+
+        assert result.is_solved
+        assert len(result.pushes) == len(solve(puzzle, SearchAlgorithm.BFS).pushes)
+        assert replay(puzzle, result.snapshot)
+
+    def it_aggregates_workers_statistics(self):
+        solver = ParallelSolver(benchmark_puzzle("Microban 1"), workers=2)
+
+        result = solver.solve()
+
+        assert len(solver.workers_statistics) == 2
+        assert result.statistics.nodes_expanded == sum(
+            _.nodes_expanded for _ in solver.workers_statistics
+        )
+        assert result.statistics.nodes_per_second > 0
+
+    def it_reports_unsolvable_puzzles(self):
+        puzzle = Puzzle(
+            Tessellation.SOKOBAN,
+            board=textwrap.dedent("""\
+                ######
+                #@  .#
+                #    #
+                #$   #
+                ######"""),
+        )
+
+        result = ParallelSolver(puzzle, workers=2).solve()
+
+        assert result.status == SolverStatus.UNSOLVABLE
+
+    def it_stops_on_nodes_limit(self):
+        result = ParallelSolver(
+            benchmark_puzzle("Microban 5"), workers=2, nodes_limit=2
+        ).solve()
+
+        assert result.status == SolverStatus.NODES_LIMIT
+
+    def it_attaches_solution_to_puzzle(self):
+        puzzle = benchmark_puzzle("Microban 1")
+
+        ParallelSolver(puzzle, workers=2).solve(attach=True)
+
+        assert len(puzzle.snapshots) == 1
+
+    def it_requires_at_least_one_worker(self):
+        with pytest.raises(ValueError):
+            ParallelSolver(benchmark_puzzle("Microban 1"), workers=0)
+
+
+class DescribeBatchEncoding:
+    def it_round_trips_states_and_pushes(self):
+        space = SearchSpace(benchmark_puzzle("Microban 5"), zobrist_seed=0)
+        successors = list(space.successors(space.initial_state))
+        states = [_.state for _ in successors]
+        pushes = [(_.push.box_position, i) for i, _ in enumerate(successors)]
+
+        decoded_states, decoded_pushes = _decode_batch(_encode_batch(states, pushes))
+
+        assert decoded_states == states
+        assert decoded_pushes == pushes
+
+
+class DescribeScalingBenchmark:
+    def it_compares_worker_counts(self):
+        results = run_scaling_benchmark(
+            workers=(1, 2), puzzle=benchmark_puzzle("Microban 1"), verbose=False
+        )
+
+        assert [_.workers for _ in results] == [1, 2]
+        assert all(_.result.is_solved for _ in results)
+        assert results[0].speedup == 1.0
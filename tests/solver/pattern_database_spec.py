@@ -0,0 +1,151 @@
+import textwrap
+
+import pytest
+
+from sokoenginepy import Puzzle, Tessellation
+from sokoenginepy.solver import (
+    PatternDatabase,
+    PatternDatabaseHeuristic,
+    PatternLookup,
+    SearchAlgorithm,
+    SearchSpace,
+    Solver,
+    benchmark_puzzle,
+    solve,
+)
+from sokoenginepy.solver.pattern_database import _Expander
+
+
+@pytest.fixture
+def puzzle():
+    return benchmark_puzzle("Microban 5")
+
+
+@pytest.fixture
+def space(puzzle):
+    return SearchSpace(puzzle)
+
+
+def file_contents(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class DescribePatternDatabase:
+    def it_stores_push_distances_of_single_boxes(self, puzzle, space, tmp_path):
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 1) as db:
+            db.attach(space)
+            distances = space.push_distances(space.goals_positions)
+
+            for position in range(space.size):
+                if not space.is_wall(position):
+                    expected = distances[position]
+                    assert db.distance([position]) == (
+                        None if expected == space.NO_POS else expected
+                    )
+
+    def it_stores_exact_distances_for_pusher_positions(self, tmp_path):
+        puzzle = Puzzle(
+            Tessellation.SOKOBAN,
+            board=textwrap.dedent("""\
+                ########
+                #  .   #
+                # $$ @ #
+                #  .   #
+                ########"""),
+        )
+        space = SearchSpace(puzzle)
+
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 2) as db:
+            db.attach(space)
+            assert db.distance(
+                space.initial_state.boxes_positions, space.pusher_position
+            ) == len(solve(puzzle, SearchAlgorithm.BFS).pushes)
+
+    def it_combines_subsets_distances(self, puzzle, space, tmp_path):
+        boxes = space.initial_state.boxes_positions
+
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 2) as db:
+            db.attach(space)
+            additive = db.estimate(boxes, lookup=PatternLookup.ADDITIVE)
+            maximal = db.estimate(boxes, lookup=PatternLookup.MAX)
+
+            assert additive == db.distance(boxes[:2]) + db.distance(boxes[2:])
+            assert maximal >= db.distance(boxes[:2])
+            assert max(additive, maximal) <= len(solve(puzzle).pushes)
+
+    def it_serves_all_puzzles_with_same_walls_and_goals(self, puzzle, tmp_path):
+        other = Puzzle(
+            Tessellation.SOKOBAN, board=puzzle.board.replace("@", " ").replace("$", " ")
+        )
+
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 1) as db:
+            assert db.is_compatible(puzzle)
+            assert not db.is_compatible(benchmark_puzzle("Microban 1"))
+            assert not db.is_compatible(other)
+
+    def it_builds_same_file_with_multiple_processes(self, puzzle, tmp_path):
+        PatternDatabase.build(puzzle, str(tmp_path / "single"), 2).close()
+        PatternDatabase.build(puzzle, str(tmp_path / "multi"), 2, workers=2).close()
+
+        assert file_contents(tmp_path / "single") == file_contents(tmp_path / "multi")
+
+    def it_resumes_interrupted_build(self, puzzle, tmp_path, monkeypatch):
+        PatternDatabase.build(puzzle, str(tmp_path / "expected"), 2).close()
+
+        expand = _Expander.expand
+        calls = 0
+
+        def interrupted_expand(self, states):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise KeyboardInterrupt
+            return expand(self, states)
+
+        monkeypatch.setattr(_Expander, "expand", interrupted_expand)
+        with pytest.raises(KeyboardInterrupt):
+            PatternDatabase.build(puzzle, str(tmp_path / "db"), 2)
+        with pytest.raises(ValueError):
+            PatternDatabase.open(str(tmp_path / "db"))
+        assert (tmp_path / "db.frontier").exists()
+
+        monkeypatch.setattr(_Expander, "expand", expand)
+        PatternDatabase.build(puzzle, str(tmp_path / "db"), 2).close()
+
+        assert file_contents(tmp_path / "db") == file_contents(tmp_path / "expected")
+        assert not (tmp_path / "db.frontier").exists()
+
+    def it_refuses_to_overwrite_database_for_different_board(self, puzzle, tmp_path):
+        PatternDatabase.build(puzzle, str(tmp_path / "db"), 1).close()
+
+        with pytest.raises(ValueError):
+            PatternDatabase.build(benchmark_puzzle("Microban 1"), str(tmp_path / "db"))
+
+    def it_looks_up_distances_without_copying_table(self, puzzle, space, tmp_path):
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 1) as db:
+            table = db.table
+            assert isinstance(table, memoryview)
+            assert table.readonly
+            table.release()
+
+
+class DescribePatternDatabaseHeuristic:
+    @pytest.mark.parametrize("lookup", list(PatternLookup))
+    def it_guides_solver_to_optimal_solution(self, puzzle, tmp_path, lookup):
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 2) as db:
+            result = Solver(
+                puzzle,
+                SearchAlgorithm.ASTAR,
+                heuristic=PatternDatabaseHeuristic(db, lookup),
+            ).solve()
+
+        assert len(result.pushes) == len(solve(puzzle, SearchAlgorithm.BFS).pushes)
+
+    def it_refuses_database_for_different_board(self, puzzle, tmp_path):
+        with PatternDatabase.build(puzzle, str(tmp_path / "db"), 1) as db:
+            with pytest.raises(ValueError):
+                Solver(
+                    benchmark_puzzle("Microban 1"),
+                    heuristic=PatternDatabaseHeuristic(db),
+                )
@@ -0,0 +1,294 @@
+import textwrap
+
+import pytest
+
+from sokoenginepy import (
+    BoardGraph,
+    Direction,
+    Mover,
+    NonPlayableBoardError,
+    Puzzle,
+    Tessellation,
+)
+from sokoenginepy.solver import (
+    BENCHMARK_PUZZLES,
+    DeadSquares,
+    FrozenBlocks,
+    NullHeuristic,
+    Push,
+    SearchAlgorithm,
+    SearchSpace,
+    SimpleLowerBound,
+    Solver,
+    SolverStatus,
+    benchmark_puzzle,
+    run_symmetry_benchmark,
+    solve,
+)
+
+
+def puzzle_from(data: str) -> Puzzle:
+    return Puzzle(
+        Tessellation.SOKOBAN, board=textwrap.dedent(data.lstrip("\n").rstrip())
+    )
+
+
+def replay(puzzle, snapshot):
+    mover = Mover(BoardGraph(puzzle))
+    for pusher_step in snapshot.pusher_steps:
+        mover.move(pusher_step.direction)
+    manager = mover.board_manager
+    return set(manager.boxes_positions.values()) == set(
+        manager.goals_positions.values()
+    )
+
+
+@pytest.fixture
+def corridor():
+    return puzzle_from("""
+        #######
+        #@ $ .#
+        #######
+        """)
+
+
+@pytest.fixture
+def unsolvable():
+    return puzzle_from("""
+        ######
+        #@  .#
+        #    #
+        #$   #
+        ######
+        """)
+
+
+class DescribeSearchSpace:
+    def it_normalizes_pusher_position(self, corridor):
+        space = SearchSpace(corridor)
+
+        assert space.pusher_position == 8
+        assert space.initial_state.pushers_positions == [8]
+        assert space.state(9, [10]) == space.initial_state
+
+    def it_generates_successors(self, corridor):
+        space = SearchSpace(corridor)
+
+        successors = list(space.successors(space.initial_state))
+
+        assert len(successors) == 1
+        assert successors[0].push == Push(10, Direction.RIGHT)
+        assert successors[0].boxes_positions == [11]
+
+    def it_calculates_push_distances(self, corridor):
+        space = SearchSpace(corridor)
+
+        distances = space.push_distances(space.goals_positions)
+
+        assert distances[12] == 0
+        assert distances[11] == 1
+        assert distances[10] == 2
+        assert distances[9] == 3
+        assert distances[8] == space.NO_POS
+
+    def it_generates_predecessors(self):
+        space = SearchSpace(benchmark_puzzle("Microban 3"))
+
+        for successor in space.successors(space.initial_state):
+            predecessors = list(space.predecessors(successor.state))
+            assert (space.initial_state, successor.push) in [
+                (_.state, _.push) for _ in predecessors
+            ]
+
+    def it_generates_goal_states_for_each_pusher_area(self):
+        space = SearchSpace(puzzle_from("""
+                #######
+                #@ $. #
+                #######
+                """))
+
+        goal_states = space.goal_states()
+
+        assert [_.boxes_positions for _ in goal_states] == [[11], [11]]
+        assert sorted(_.pushers_positions[0] for _ in goal_states) == [8, 12]
+
+    def it_refuses_multiple_pushers(self):
+        with pytest.raises(ValueError):
+            SearchSpace(puzzle_from("#######\n#@$.@ #\n#######"))
+
+    def it_refuses_non_playable_puzzles(self):
+        with pytest.raises(NonPlayableBoardError):
+            SearchSpace(puzzle_from("#######\n#@ $  #\n#######"))
+
+
+class DescribeDeadlockDetectors:
+    def it_detects_dead_squares(self, unsolvable):
+        space = SearchSpace(unsolvable)
+        detector = DeadSquares()
+        detector.attach(space)
+
+        assert 13 in detector.dead_positions
+        assert detector.is_deadlock({13}, 13)
+        assert not detector.is_deadlock({10}, 10)
+
+    def it_detects_frozen_blocks(self):
+        space = SearchSpace(puzzle_from("""
+                ######
+                #@ ..#
+                # $$ #
+                #    #
+                ######
+                """))
+        detector = FrozenBlocks()
+        detector.attach(space)
+
+        assert detector.is_deadlock({7, 8}, 8)
+        assert not detector.is_deadlock({14, 15}, 15)
+        assert detector.is_deadlock({20, 26}, 26) is False
+
+
+class DescribeSolver:
+    @pytest.mark.parametrize("algorithm", list(SearchAlgorithm))
+    def it_solves_simple_puzzle(self, corridor, algorithm):
+        result = Solver(corridor, algorithm).solve()
+
+        assert result.status == SolverStatus.SOLVED
+        assert result.is_solved
+        assert len(result.pushes) == 2
+        assert result.snapshot.to_str() == "rRR"
+        assert result.snapshot.pushes_count == 2
+        assert result.statistics.nodes_expanded > 0
+
+    @pytest.mark.parametrize("algorithm", list(SearchAlgorithm))
+    def it_finds_push_optimal_solutions(self, algorithm):
+        puzzle = benchmark_puzzle("Microban 3")
+
+        result = Solver(puzzle, algorithm).solve()
+
+        assert result.is_solved
+        assert result.snapshot.pushes_count == 13
+        assert replay(puzzle, result.snapshot)
+
+    @pytest.mark.parametrize("algorithm", list(SearchAlgorithm))
+    def it_detects_unsolvable_puzzles(self, unsolvable, algorithm):
+        result = Solver(unsolvable, algorithm).solve()
+
+        assert result.status == SolverStatus.UNSOLVABLE
+        assert result.snapshot is None
+        assert result.pushes == []
+
+    def it_solves_already_solved_puzzle(self):
+        result = solve(puzzle_from("#####\n#@* #\n#####"))
+
+        assert result.is_solved
+        assert result.pushes == []
+        assert result.snapshot.to_str() == ""
+
+    def it_attaches_solution_to_puzzle(self, corridor):
+        result = solve(corridor, attach=True)
+
+        assert corridor.snapshots == [result.snapshot]
+
+    def it_respects_sokoban_plus(self):
+        puzzle = puzzle_from("""
+            #######
+            #.$@$.#
+            #######
+            """)
+        puzzle.boxorder = "1 2"
+        puzzle.goalorder = "2 1"
+
+        result = solve(puzzle, SearchAlgorithm.BFS)
+        assert result.status == SolverStatus.UNSOLVABLE
+
+        puzzle.goalorder = "1 2"
+        assert solve(puzzle, SearchAlgorithm.BFS).is_solved
+
+    def it_works_without_heuristic_and_deadlock_detection(self):
+        puzzle = benchmark_puzzle("Microban 1")
+
+        result = Solver(
+            puzzle,
+            SearchAlgorithm.ASTAR,
+            heuristic=NullHeuristic(),
+            deadlock_detectors=[],
+        ).solve()
+
+        assert result.is_solved
+        assert len(result.pushes) == 8
+
+    def it_stops_on_nodes_limit(self):
+        result = Solver(benchmark_puzzle("Microban 5"), nodes_limit=2).solve()
+
+        assert result.status == SolverStatus.NODES_LIMIT
+        assert result.statistics.nodes_expanded == 2
+
+    def it_stops_on_time_limit(self):
+        result = Solver(
+            benchmark_puzzle("Microban 5"), SearchAlgorithm.BFS, time_limit=0
+        ).solve()
+
+        assert result.status == SolverStatus.TIME_LIMIT
+
+    def it_tracks_peak_memory(self, corridor):
+        assert Solver(corridor).solve().statistics.peak_memory is None
+        result = Solver(corridor, track_memory=True).solve()
+        assert result.statistics.peak_memory > 0
+
+
+class DescribeBidirectionalSearch:
+    def it_stitches_forward_and_reverse_searches(self):
+        puzzle = benchmark_puzzle("Microban 3")
+
+        result = solve(puzzle, SearchAlgorithm.BIDIRECTIONAL)
+
+        assert result.is_solved
+        assert not result.snapshot.is_reverse
+        assert result.snapshot.pushes_count == 13
+        assert replay(puzzle, result.snapshot)
+
+    def it_explores_less_states_than_bfs(self):
+        bidirectional = solve(
+            benchmark_puzzle("Microban 3"), SearchAlgorithm.BIDIRECTIONAL
+        )
+        bfs = solve(benchmark_puzzle("Microban 3"), SearchAlgorithm.BFS)
+
+        assert len(bidirectional.pushes) == len(bfs.pushes)
+        assert bidirectional.statistics.nodes_expanded < bfs.statistics.nodes_expanded
+
+    def it_solves_puzzle_where_pusher_ends_in_other_area(self):
+        puzzle = puzzle_from("""
+            #######
+            #@ $. #
+            #######
+            """)
+
+        result = solve(puzzle, SearchAlgorithm.BIDIRECTIONAL)
+
+        assert result.snapshot.to_str() == "rR"
+
+
+class DescribeSimpleLowerBound:
+    def it_sums_distances_to_nearest_goals(self):
+        space = SearchSpace(benchmark_puzzle("Microban 4"))
+        heuristic = SimpleLowerBound()
+        heuristic.attach(space)
+
+        assert heuristic.estimate(space.goals_positions) == 0
+        assert heuristic.estimate(space.initial_state.boxes_positions) > 0
+
+
+class DescribeSolverBenchmark:
+    @pytest.mark.parametrize("title", list(BENCHMARK_PUZZLES.keys()))
+    def it_solves_all_benchmark_puzzles(self, title):
+        assert solve(benchmark_puzzle(title), SearchAlgorithm.ASTAR).is_solved
+
+
+class DescribeSymmetryBenchmark:
+    def it_reduces_number_of_states_of_symmetric_puzzles(self):
+        results = run_symmetry_benchmark(["Mirror"], verbose=False)
+
+        assert results[0].symmetries == 1
+        assert results[0].is_complete
+        assert results[0].symmetric_states < results[0].states
+        assert results[0].reduction > 1